@@ -3,9 +3,10 @@ import multiprocessing as mp
 from statistics import mean
 
 import numpy as np
+from pydantic import TypeAdapter
 
 import frigate.util as util
-from frigate.config import DetectorTypeEnum
+from frigate.config import DetectorConfig, ModelConfig
 from frigate.object_detection import (
     ObjectDetectProcess,
     RemoteObjectDetector,
@@ -14,6 +15,10 @@ from frigate.object_detection import (
 
 my_frame = np.expand_dims(np.full((300, 300, 3), 1, np.uint8), axis=0)
 labels = load_labels("/labelmap.txt")
+model_config = ModelConfig()
+detector_config = TypeAdapter(DetectorConfig).validate_python(
+    {"type": "cpu", "model": model_config.model_dump()}
+)
 
 ######
 # Minimal same process runner
@@ -47,7 +52,7 @@ labels = load_labels("/labelmap.txt")
 
 def start(id, num_detections, detection_queue, event):
     object_detector = RemoteObjectDetector(
-        str(id), "/labelmap.txt", detection_queue, event
+        str(id), labels, detection_queue, event, model_config, mp.Event()
     )
     start = datetime.datetime.now().timestamp()
 
@@ -58,10 +63,9 @@ def start(id, num_detections, detection_queue, event):
         frame_times.append(datetime.datetime.now().timestamp() - start_frame)
 
     duration = datetime.datetime.now().timestamp() - start
-    object_detector.cleanup()
     print(f"{id} - Processed for {duration:.2f} seconds.")
     print(f"{id} - FPS: {object_detector.fps.eps():.2f}")
-    print(f"{id} - Average frame processing time: {mean(frame_times)*1000:.2f}ms")
+    print(f"{id} - Average frame processing time: {mean(frame_times) * 1000:.2f}ms")
 
 
 ######
@@ -80,15 +84,22 @@ def start(id, num_detections, detection_queue, event):
 camera_processes = []
 
 events = {}
+shms = []
 for x in range(0, 10):
     events[str(x)] = mp.Event()
+    shms.append(
+        mp.shared_memory.SharedMemory(
+            name=str(x),
+            create=True,
+            size=model_config.height * model_config.width * 3,
+        )
+    )
+    shms.append(
+        mp.shared_memory.SharedMemory(name=f"out-{x}", create=True, size=20 * 6 * 4)
+    )
 detection_queue = mp.Queue()
-edgetpu_process_1 = ObjectDetectProcess(
-    detection_queue, events, DetectorTypeEnum.edgetpu, "usb:0"
-)
-edgetpu_process_2 = ObjectDetectProcess(
-    detection_queue, events, DetectorTypeEnum.edgetpu, "usb:1"
-)
+cpu_process_1 = ObjectDetectProcess("cpu1", detection_queue, events, detector_config)
+cpu_process_2 = ObjectDetectProcess("cpu2", detection_queue, events, detector_config)
 
 for x in range(0, 10):
     camera_process = util.Process(
@@ -107,3 +118,10 @@ for p in camera_processes:
 
 duration = datetime.datetime.now().timestamp() - start_time
 print(f"Total - Processed for {duration:.2f} seconds.")
+
+cpu_process_1.stop()
+cpu_process_2.stop()
+
+for shm in shms:
+    shm.close()
+    shm.unlink()
@@ -0,0 +1,274 @@
+"""Measure API read latency while recordings and timeline rows are written.
+
+A synthetic database is created in a temporary directory and the API is
+served with uvicorn. A writer inserts recording segments and timeline entries
+through the write queue the way the recording and timeline maintainers do,
+while clients request recordings, review and event listings. The latency of
+the requests is reported with the read pool, and with the previous setup
+where endpoints ran on the default thread pool and the database connection
+was opened and closed around every request.
+
+Usage: python benchmark_api_reads.py [--cameras 20] [--duration 30] [--clients 8]
+"""
+
+import argparse
+import datetime
+import logging
+import os
+import random
+import shutil
+import statistics
+import tempfile
+import threading
+import time
+
+import httpx
+import uvicorn
+from fastapi import Request
+from peewee import chunked
+from peewee_migrate import Router
+from playhouse.sqlite_ext import SqliteExtDatabase
+
+from frigate.api.fastapi_app import create_fastapi_app
+from frigate.config import FrigateConfig
+from frigate.db.sqlitevecq import SqliteVecQueueDatabase
+from frigate.models import (
+    Event,
+    Recordings,
+    RecordingsRollup,
+    ReviewSegment,
+    Timeline,
+)
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--cameras", type=int, default=20)
+parser.add_argument("--days", type=int, default=3)
+parser.add_argument("--duration", type=float, default=30)
+parser.add_argument("--clients", type=int, default=8)
+# timeline entries per second of all cameras
+parser.add_argument("--timeline-rate", type=float, default=20)
+args = parser.parse_args()
+
+logging.getLogger("peewee_migrate").setLevel(logging.WARNING)
+logging.getLogger("frigate").setLevel(logging.WARNING)
+logging.getLogger("httpx").setLevel(logging.WARNING)
+tmp_dir = tempfile.mkdtemp()
+db_path = os.path.join(tmp_dir, "frigate.db")
+migrate_db = SqliteExtDatabase(db_path, pragmas={"journal_mode": "wal"})
+Router(migrate_db).run()
+db = SqliteVecQueueDatabase(
+    db_path,
+    pragmas={
+        "auto_vacuum": "FULL",
+        "cache_size": -512 * 1000,
+        "synchronous": "NORMAL",
+    },
+    timeout=60,
+)
+db.bind([Event, Recordings, RecordingsRollup, ReviewSegment, Timeline])
+
+cameras = [f"camera_{i}" for i in range(args.cameras)]
+now = datetime.datetime.now().timestamp()
+start = now - args.days * 86400
+
+
+def recording(camera: str, start_time: float) -> dict:
+    return {
+        "id": f"{start_time}-{camera}",
+        "camera": camera,
+        "path": f"/media/frigate/recordings/{camera}/{start_time}.mp4",
+        "start_time": start_time,
+        "end_time": start_time + 10,
+        "duration": 10,
+        "motion": random.randint(0, 100),
+        "objects": random.randint(0, 5),
+        "segment_size": 1.5,
+    }
+
+
+print("creating database...")
+created = time.perf_counter()
+recordings = [
+    recording(camera, start_time)
+    for start_time in range(int(start), int(now) - 60, 10)
+    for camera in cameras
+]
+events = [
+    {
+        "id": f"{start_time}-{n}",
+        "label": random.choice(["person", "car", "dog"]),
+        "camera": random.choice(cameras),
+        "start_time": start_time,
+        "end_time": start_time + 20,
+        "top_score": 0.8,
+        "false_positive": False,
+        "zones": [],
+        "thumbnail": "",
+        "has_clip": True,
+        "has_snapshot": True,
+        "region": [],
+        "box": [],
+        "area": 0,
+        "data": {"score": 0.8},
+    }
+    for n, start_time in enumerate(
+        random.uniform(start, now) for _ in range(args.days * 5000)
+    )
+]
+reviews = [
+    {
+        "id": f"review-{n}",
+        "camera": e["camera"],
+        "start_time": e["start_time"],
+        "end_time": e["end_time"],
+        "severity": "alert" if n % 3 == 0 else "detection",
+        "thumb_path": f"/media/frigate/clips/review/{n}.webp",
+        "data": {"objects": [e["label"]], "zones": [], "audio": []},
+    }
+    for n, e in enumerate(events[::2])
+]
+
+# the initial data is written in one transaction
+with migrate_db.bind_ctx([Event, Recordings, ReviewSegment]):
+    with migrate_db.atomic():
+        for model, rows in [
+            (Recordings, recordings),
+            (Event, events),
+            (ReviewSegment, reviews),
+        ]:
+            for batch in chunked(rows, 500):
+                model.insert_many(batch).execute()
+
+migrate_db.close()
+
+print(f"created {len(recordings)} recordings in {time.perf_counter() - created:.1f}s")
+
+config = FrigateConfig(
+    **{
+        "mqtt": {"host": "mqtt"},
+        "cameras": {
+            camera: {
+                "ffmpeg": {
+                    "inputs": [{"path": "rtsp://10.0.0.1/video", "roles": ["detect"]}]
+                },
+                "detect": {"width": 1280, "height": 720},
+            }
+            for camera in cameras
+        },
+    }
+)
+
+
+def writer(stop: threading.Event) -> None:
+    """Writes segments every 10 seconds for each camera and timeline entries."""
+    next_segment = time.time()
+    timeline_interval = 1 / args.timeline_rate
+
+    while not stop.is_set():
+        if time.time() >= next_segment:
+            for camera in cameras:
+                Recordings.insert(recording(camera, next_segment)).execute()
+
+            next_segment += 10
+
+        Timeline.insert(
+            timestamp=time.time(),
+            camera=random.choice(cameras),
+            source="tracked_object",
+            source_id=random.choice(events)["id"],
+            class_type="visible",
+            data={"box": [0.1, 0.1, 0.2, 0.2]},
+        ).execute()
+        stop.wait(timeline_interval)
+
+
+def requests() -> list[str]:
+    camera = random.choice(cameras)
+    after = now - 3600 * random.randint(1, 24)
+    return [
+        f"/{camera}/recordings?after={after}&before={after + 3600}",
+        f"/{camera}/recordings/summary",
+        "/review?reviewed=1&limit=100",
+        "/review/summary",
+        f"/events?cameras={camera}&limit=50",
+    ]
+
+
+def client(port: int, stop: threading.Event, latencies: list[float]) -> None:
+    with httpx.Client(base_url=f"http://127.0.0.1:{port}", timeout=60) as http:
+        while not stop.is_set():
+            for path in requests():
+                started = time.perf_counter()
+                response = http.get(path)
+                latencies.append(time.perf_counter() - started)
+                assert response.status_code == 200, (path, response.text)
+
+
+def measure(name: str, app, port: int) -> None:
+    server = uvicorn.Server(
+        uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning")
+    )
+    server_thread = threading.Thread(target=server.run)
+    server_thread.start()
+
+    while not server.started:
+        time.sleep(0.1)
+
+    stop = threading.Event()
+    latencies: list[float] = []
+    threads = [threading.Thread(target=writer, args=(stop,))] + [
+        threading.Thread(target=client, args=(port, stop, latencies))
+        for _ in range(args.clients)
+    ]
+
+    for thread in threads:
+        thread.start()
+
+    time.sleep(args.duration)
+    stop.set()
+
+    for thread in threads:
+        thread.join()
+
+    server.should_exit = True
+    server_thread.join()
+    latencies.sort()
+    print(
+        f"{name:<10} {len(latencies) / args.duration:7.1f} req/s,"
+        f" p50 {statistics.median(latencies) * 1000:7.1f}ms,"
+        f" p99 {latencies[int(len(latencies) * 0.99)] * 1000:7.1f}ms,"
+        f" max {latencies[-1] * 1000:7.1f}ms"
+    )
+
+
+def create_previous_app():
+    """The app with endpoints on the default thread pool and the database
+    connected and closed around each request."""
+    app = create_fastapi_app(config, db, None, None, None, None, None, None, None)
+    app.read_pool.close()
+    app.read_pool = None
+
+    @app.middleware("http")
+    async def connect_middleware(request: Request, call_next):
+        if db.is_closed():
+            db.connect()
+
+        response = await call_next(request)
+
+        if not db.is_closed():
+            db.close()
+
+        return response
+
+    return app
+
+
+measure("previous", create_previous_app(), 5101)
+measure(
+    "read pool",
+    create_fastapi_app(config, db, None, None, None, None, None, None, None),
+    5102,
+)
+
+db.stop()
+shutil.rmtree(tmp_dir)
@@ -0,0 +1,154 @@
+"""Compare per camera audio models with the shared audio detector.
+
+Simulated cameras send a window of audio every AUDIO_DURATION seconds, the
+same way the ffmpeg readers of the audio maintainers do. Each configuration
+runs in its own process and the resident memory and CPU usage of that process
+are reported.
+
+The YAMNet model from the docker image is used when it exists, otherwise a
+stand-in interpreter with a similar size and amount of computation is used.
+
+Usage: python benchmark_audio.py [--streams 1 10 30] [--duration 10]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import threading
+import time
+from unittest.mock import patch
+
+import numpy as np
+
+from frigate.const import AUDIO_DURATION
+from frigate.events.audio import AUDIO_SAMPLES, AudioDetectorService, AudioTfl
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--streams", type=int, nargs="+", default=[1, 10, 30])
+parser.add_argument("--duration", type=float, default=10)
+parser.add_argument("--mode", choices=["per_camera", "shared"])
+args = parser.parse_args()
+
+
+class StandInInterpreter:
+    """16MB of weights and about 60M multiply-adds per window, like YAMNet."""
+
+    def __init__(self, model_path: str, num_threads: int) -> None:
+        self.weights = np.random.rand(1024, 4096).astype(np.float32)
+        self.input = np.zeros(AUDIO_SAMPLES, np.float32)
+        self.output = np.zeros((1, 521), np.float32)
+
+    def allocate_tensors(self) -> None:
+        pass
+
+    def get_input_details(self):
+        return [{"index": 0, "shape": np.array([AUDIO_SAMPLES])}]
+
+    def get_output_details(self):
+        return [{"index": 0, "shape": np.array([1, 521])}]
+
+    def set_tensor(self, index, tensor_input) -> None:
+        self.input[:] = tensor_input
+
+    def invoke(self) -> None:
+        features = self.input[: 15 * 1024].reshape(15, 1024) @ self.weights
+        self.output[0] = 1 / (1 + np.exp(-features.mean(axis=0)[:521]))
+
+    def get_tensor(self, index):
+        return self.output
+
+
+def rss_mb() -> float:
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+
+    return 0
+
+
+def run(mode: str, streams: int) -> None:
+    stop_event = threading.Event()
+    cameras = [f"camera_{i}" for i in range(streams)]
+
+    if mode == "shared":
+        service = AudioDetectorService(cameras, stop_event)
+        service.start()
+        detectors = {camera: service for camera in cameras}
+    else:
+        detectors = {camera: AudioTfl(stop_event) for camera in cameras}
+
+    latencies: list[float] = []
+
+    def stream(camera: str) -> None:
+        detector = detectors[camera]
+        waveform = (np.random.rand(AUDIO_SAMPLES).astype(np.float32) - 0.5) / 4
+        start = time.monotonic()
+        windows = 0
+
+        while not stop_event.is_set():
+            sent = time.monotonic()
+
+            if mode == "shared":
+                detector.detect(camera, waveform)
+            else:
+                detector.detect(waveform)
+
+            latencies.append(time.monotonic() - sent)
+            windows += 1
+            time.sleep(max(0, start + windows * AUDIO_DURATION - time.monotonic()))
+
+    threads = [threading.Thread(target=stream, args=(c,)) for c in cameras]
+    cpu_start = time.process_time()
+    start = time.monotonic()
+
+    for thread in threads:
+        thread.start()
+
+    time.sleep(args.duration)
+    memory = rss_mb()
+    stop_event.set()
+
+    for thread in threads:
+        thread.join()
+
+    cpu = time.process_time() - cpu_start
+    wall = time.monotonic() - start
+    print(
+        f"{mode:<11} {streams:>3} streams: {memory:7.1f}MB rss, "
+        f"{cpu / wall * 100:5.1f}% cpu, "
+        f"p95 latency {np.percentile(latencies, 95) * 1000:6.1f}ms"
+    )
+
+
+if args.mode:
+    with patch(
+        "frigate.events.audio.load_labels",
+        lambda *a, **k: {i: str(i) for i in range(521)},
+    ):
+        if os.path.exists("/cpu_audio_model.tflite"):
+            run(args.mode, args.streams[0])
+        else:
+            with patch("frigate.events.audio.Interpreter", StandInInterpreter):
+                run(args.mode, args.streams[0])
+else:
+    if not os.path.exists("/cpu_audio_model.tflite"):
+        print("/cpu_audio_model.tflite not found, using a stand-in interpreter")
+
+    for streams in args.streams:
+        for mode in ["per_camera", "shared"]:
+            subprocess.run(
+                [
+                    sys.executable,
+                    __file__,
+                    "--mode",
+                    mode,
+                    "--streams",
+                    str(streams),
+                    "--duration",
+                    str(args.duration),
+                ],
+                env={**os.environ, "OMP_NUM_THREADS": "1"},
+                check=True,
+            )
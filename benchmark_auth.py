@@ -0,0 +1,147 @@
+"""Load test of the /auth endpoint used by the nginx auth subrequest.
+
+The api is served with uvicorn and clients request /auth with the jwt cookie
+of a logged in user, the way nginx checks every proxied request of a live
+view. The requests per second are reported with the verified token cache,
+and without it where the token is decoded and verified for every request.
+The endpoint is also called directly to report its own cost without the
+http server and clients.
+
+Usage: python benchmark_auth.py [--duration 10] [--clients 16]
+"""
+
+import argparse
+import logging
+import os
+import shutil
+import statistics
+import tempfile
+import threading
+import time
+from unittest.mock import patch
+
+import httpx
+import uvicorn
+from peewee_migrate import Router
+from playhouse.sqlite_ext import SqliteExtDatabase
+from playhouse.sqliteq import SqliteQueueDatabase
+from starlette.requests import Request
+
+from frigate.api.auth import VerifiedTokenCache, auth, create_encoded_jwt
+from frigate.api.fastapi_app import create_fastapi_app
+from frigate.config import FrigateConfig
+from frigate.const import JWT_SECRET_ENV_VAR
+from frigate.models import User
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--duration", type=float, default=10)
+# e.g. a live view of 16 cameras
+parser.add_argument("--clients", type=int, default=16)
+args = parser.parse_args()
+
+logging.getLogger("peewee_migrate").setLevel(logging.WARNING)
+logging.getLogger("httpx").setLevel(logging.WARNING)
+tmp_dir = tempfile.mkdtemp()
+db_path = os.path.join(tmp_dir, "frigate.db")
+migrate_db = SqliteExtDatabase(db_path)
+Router(migrate_db).run()
+migrate_db.close()
+db = SqliteQueueDatabase(db_path)
+db.bind([User])
+
+jwt_secret = "0" * 64
+config = FrigateConfig(
+    **{"mqtt": {"host": "mqtt"}, "auth": {"enabled": True}, "cameras": {}}
+)
+token = create_encoded_jwt("admin", int(time.time()) + 86400, jwt_secret)
+
+
+def client(port: int, stop: threading.Event, latencies: list[float]) -> None:
+    with httpx.Client(
+        base_url=f"http://127.0.0.1:{port}",
+        cookies={config.auth.cookie_name: token},
+        timeout=60,
+    ) as http:
+        while not stop.is_set():
+            started = time.perf_counter()
+            response = http.get("/auth")
+            latencies.append(time.perf_counter() - started)
+            assert response.status_code == 202, response.status_code
+
+
+def measure(name: str, token_cache: VerifiedTokenCache, port: int) -> None:
+    with patch.dict(os.environ, {JWT_SECRET_ENV_VAR: jwt_secret}):
+        app = create_fastapi_app(config, db, None, None, None, None, None, None, None)
+
+    app.jwt_token_cache = token_cache
+    server = uvicorn.Server(
+        uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning")
+    )
+    server_thread = threading.Thread(target=server.run)
+    server_thread.start()
+
+    while not server.started:
+        time.sleep(0.1)
+
+    stop = threading.Event()
+    latencies: list[float] = []
+    threads = [
+        threading.Thread(target=client, args=(port, stop, latencies))
+        for _ in range(args.clients)
+    ]
+
+    for thread in threads:
+        thread.start()
+
+    time.sleep(args.duration)
+    stop.set()
+
+    for thread in threads:
+        thread.join()
+
+    server.should_exit = True
+    server_thread.join()
+    latencies.sort()
+    print(
+        f"{name:<10} {len(latencies) / args.duration:7.1f} req/s,"
+        f" p50 {statistics.median(latencies) * 1000:7.1f}ms,"
+        f" p99 {latencies[int(len(latencies) * 0.99)] * 1000:7.1f}ms"
+    )
+
+
+def measure_endpoint(name: str, token_cache: VerifiedTokenCache) -> None:
+    with patch.dict(os.environ, {JWT_SECRET_ENV_VAR: jwt_secret}):
+        app = create_fastapi_app(config, db, None, None, None, None, None, None, None)
+
+    app.jwt_token_cache = token_cache
+    request = Request(
+        {
+            "type": "http",
+            "app": app,
+            "headers": [
+                (b"cookie", f"{config.auth.cookie_name}={token}".encode()),
+            ],
+        }
+    )
+    calls = 20000
+    started = time.perf_counter()
+
+    for _ in range(calls):
+        assert auth(request).status_code == 202
+
+    duration = time.perf_counter() - started
+    print(
+        f"{name:<10} {calls / duration:7.0f} calls/s,"
+        f" {duration / calls * 1000000:5.1f}us per call of the endpoint"
+    )
+    app.read_pool.close()
+
+
+# a cache without entries verifies every token
+measure_endpoint("previous", VerifiedTokenCache(max_entries=0))
+measure_endpoint("cached", VerifiedTokenCache())
+measure("previous", VerifiedTokenCache(max_entries=0), 5103)
+measure("cached", VerifiedTokenCache(), 5104)
+
+db.stop()
+shutil.rmtree(tmp_dir)
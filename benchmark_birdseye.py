@@ -0,0 +1,95 @@
+"""Measure the CPU usage of compositing the birdseye frame.
+
+Cameras send frames at their detect fps in real time, the same way the output
+process calls birdseye, and the CPU time used by compositing and converting
+the birdseye frame is reported. Sending the frame to ffmpeg is not included.
+
+Usage: python benchmark_birdseye.py [--cameras 16] [--fps 5] [--duration 10]
+"""
+
+import argparse
+import multiprocessing as mp
+import time
+
+import numpy as np
+
+from frigate.config import FrigateConfig
+from frigate.output.birdseye import BirdsEyeFrameManager
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--cameras", type=int, default=16)
+parser.add_argument("--fps", type=int, default=5)
+parser.add_argument("--duration", type=float, default=10)
+parser.add_argument("--width", type=int, default=1280)
+parser.add_argument("--height", type=int, default=720)
+args = parser.parse_args()
+
+
+class CameraFrameManager:
+    """Returns the same frame for every frame time of a camera."""
+
+    def __init__(self, cameras: list[str]) -> None:
+        self.frame_ids: dict[str, str] = {}
+        self.frames = {
+            camera: np.random.randint(
+                0, 255, (args.height * 3 // 2, args.width), np.uint8
+            )
+            for camera in cameras
+        }
+
+    def add(self, camera: str, frame_time: float) -> None:
+        self.frame_ids[f"{camera}{frame_time}"] = camera
+
+    def get(self, name, shape):
+        return self.frames[self.frame_ids[name]]
+
+    def close(self, name):
+        pass
+
+
+cameras = [f"camera_{i:02d}" for i in range(args.cameras)]
+config = FrigateConfig(
+    **{
+        "mqtt": {"host": "mqtt"},
+        "birdseye": {"mode": "continuous"},
+        "cameras": {
+            camera: {
+                "ffmpeg": {
+                    "inputs": [
+                        {"path": f"rtsp://10.0.0.1/{camera}", "roles": ["detect"]}
+                    ]
+                },
+                "detect": {"width": args.width, "height": args.height, "fps": args.fps},
+            }
+            for camera in cameras
+        },
+    }
+)
+frame_manager = CameraFrameManager(cameras)
+manager = BirdsEyeFrameManager(config, frame_manager, mp.Event())
+
+interval = 1 / (args.fps * len(cameras))
+start = time.monotonic()
+cpu_start = time.process_time()
+sent = 0
+updates = 0
+
+while (now := time.monotonic()) - start < args.duration:
+    camera = cameras[updates % len(cameras)]
+    frame_time = time.time()
+    frame_manager.add(camera, frame_time)
+
+    if manager.update(camera, 1, 1, frame_time, None):
+        manager.get_frame_bytes()
+        sent += 1
+
+    updates += 1
+    next_update = start + updates * interval
+    time.sleep(max(0, next_update - time.monotonic()))
+
+cpu = time.process_time() - cpu_start
+wall = time.monotonic() - start
+print(
+    f"{len(cameras)} cameras: {cpu / wall * 100:.1f}% cpu, "
+    f"{cpu / max(1, sent) * 1000:.2f}ms per birdseye frame, {sent} frames sent"
+)
@@ -0,0 +1,174 @@
+"""Compare embedding descriptions one by one with embedding them in batches.
+
+A synthetic transformer encoder with random weights is written to a temporary
+directory as an onnx model and run with onnxruntime through the same embedding
+function as the real text model, together with a word level tokenizer. The
+descriptions have between --min-words and --max-words words, the fastest of
+--repeat runs is reported.
+
+Usage: python benchmark_embeddings.py [--descriptions 256] [--layers 4] [--hidden 256]
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+
+import numpy as np
+import onnx
+from onnx import TensorProto, helper, numpy_helper
+from tokenizers import Tokenizer, models, pre_tokenizers
+from transformers import PreTrainedTokenizerFast
+
+from frigate.embeddings.functions.onnx import GenericONNXEmbedding, ModelTypeEnum
+from frigate.util.model import ONNXModelRunner
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--descriptions", type=int, default=256)
+parser.add_argument("--layers", type=int, default=4)
+parser.add_argument("--hidden", type=int, default=256)
+parser.add_argument("--vocab", type=int, default=2000)
+parser.add_argument("--min-words", type=int, default=20)
+parser.add_argument("--max-words", type=int, default=120)
+parser.add_argument("--repeat", type=int, default=3)
+args = parser.parse_args()
+
+rng = np.random.default_rng(0)
+
+
+def weight(name: str, *shape: int) -> onnx.TensorProto:
+    return numpy_helper.from_array(
+        (rng.standard_normal(shape) / np.sqrt(shape[0])).astype(np.float32), name
+    )
+
+
+def build_model(path: str, with_mask: bool) -> None:
+    hidden = args.hidden
+    initializers = [
+        weight("embeddings", args.vocab, hidden),
+        numpy_helper.from_array(np.array([1], np.int64), "axis_1"),
+        numpy_helper.from_array(np.array(-1e4, np.float32), "mask_value"),
+        numpy_helper.from_array(np.array(1.0, np.float32), "one"),
+        numpy_helper.from_array(np.array(np.sqrt(hidden), np.float32), "scale"),
+    ]
+    nodes = [helper.make_node("Gather", ["embeddings", "input_ids"], ["x0"])]
+    inputs = [helper.make_tensor_value_info("input_ids", TensorProto.INT64, ["b", "t"])]
+
+    if with_mask:
+        inputs.append(
+            helper.make_tensor_value_info(
+                "attention_mask", TensorProto.INT64, ["b", "t"]
+            )
+        )
+        nodes += [
+            helper.make_node("Cast", ["attention_mask"], ["mask"], to=1),
+            helper.make_node("Sub", ["one", "mask"], ["inverted"]),
+            helper.make_node("Mul", ["inverted", "mask_value"], ["bias_2d"]),
+            helper.make_node("Unsqueeze", ["bias_2d", "axis_1"], ["bias"]),
+        ]
+
+    for layer in range(args.layers):
+        x, n = f"x{layer}", f"l{layer}"
+        initializers += [
+            weight(f"{n}_q", hidden, hidden),
+            weight(f"{n}_k", hidden, hidden),
+            weight(f"{n}_v", hidden, hidden),
+            weight(f"{n}_up", hidden, hidden * 4),
+            weight(f"{n}_down", hidden * 4, hidden),
+        ]
+        nodes += [
+            helper.make_node("MatMul", [x, f"{n}_q"], [f"{n}_qx"]),
+            helper.make_node("MatMul", [x, f"{n}_k"], [f"{n}_kx"]),
+            helper.make_node("MatMul", [x, f"{n}_v"], [f"{n}_vx"]),
+            helper.make_node("Transpose", [f"{n}_kx"], [f"{n}_kt"], perm=[0, 2, 1]),
+            helper.make_node("MatMul", [f"{n}_qx", f"{n}_kt"], [f"{n}_s"]),
+            helper.make_node("Div", [f"{n}_s", "scale"], [f"{n}_scaled"]),
+        ]
+        scores = f"{n}_scaled"
+
+        if with_mask:
+            nodes.append(helper.make_node("Add", [scores, "bias"], [f"{n}_masked"]))
+            scores = f"{n}_masked"
+
+        nodes += [
+            helper.make_node("Softmax", [scores], [f"{n}_p"], axis=-1),
+            helper.make_node("MatMul", [f"{n}_p", f"{n}_vx"], [f"{n}_a"]),
+            helper.make_node("Add", [x, f"{n}_a"], [f"{n}_r"]),
+            helper.make_node("MatMul", [f"{n}_r", f"{n}_up"], [f"{n}_h"]),
+            helper.make_node("Relu", [f"{n}_h"], [f"{n}_relu"]),
+            helper.make_node("MatMul", [f"{n}_relu", f"{n}_down"], [f"{n}_f"]),
+            helper.make_node("Add", [f"{n}_r", f"{n}_f"], [f"x{layer + 1}"]),
+        ]
+
+    nodes.append(
+        helper.make_node(
+            "ReduceMean", [f"x{args.layers}", "axis_1"], ["embedding"], keepdims=0
+        )
+    )
+    graph = helper.make_graph(
+        nodes,
+        "encoder",
+        inputs,
+        [helper.make_tensor_value_info("embedding", TensorProto.FLOAT, ["b", hidden])],
+        initializers,
+    )
+    onnx.save(
+        helper.make_model(
+            graph, ir_version=8, opset_imports=[helper.make_opsetid("", 18)]
+        ),
+        path,
+    )
+
+
+def get_embedding(path: str) -> GenericONNXEmbedding:
+    vocab = {"[PAD]": 0, "[UNK]": 1}
+    vocab.update({f"w{i}": i for i in range(2, args.vocab)})
+    tokenizer = Tokenizer(models.WordLevel(vocab, unk_token="[UNK]"))
+    tokenizer.pre_tokenizer = pre_tokenizers.Whitespace()
+    embedding = GenericONNXEmbedding.__new__(GenericONNXEmbedding)
+    embedding.model_name = "benchmark"
+    embedding.model_type = ModelTypeEnum.text
+    embedding.feature_extractor = None
+    embedding.tokenizer = PreTrainedTokenizerFast(
+        tokenizer_object=tokenizer,
+        pad_token="[PAD]",
+        unk_token="[UNK]",
+        model_max_length=512,
+    )
+    embedding.runner = ONNXModelRunner(path, "CPU")
+    return embedding
+
+
+random.seed(0)
+descriptions = [
+    " ".join(
+        f"w{random.randrange(2, args.vocab)}"
+        for _ in range(random.randint(args.min_words, args.max_words))
+    )
+    for _ in range(args.descriptions)
+]
+tmp_dir = tempfile.mkdtemp()
+
+for with_mask in [True, False]:
+    path = os.path.join(tmp_dir, f"encoder_{with_mask}.onnx")
+    build_model(path, with_mask)
+    embedding = get_embedding(path)
+    embedding(descriptions[:4])
+    print("with attention mask" if with_mask else "without attention mask")
+
+    for batch_size in [1, 8, 16, 32]:
+        durations = []
+
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+
+            for i in range(0, len(descriptions), batch_size):
+                embedding(descriptions[i : i + batch_size])
+
+            durations.append(time.perf_counter() - start)
+
+        duration = min(durations)
+        print(
+            f"  batch size {batch_size:>2}: {len(descriptions) / duration:7.1f} descriptions/s"
+        )
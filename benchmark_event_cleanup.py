@@ -0,0 +1,265 @@
+"""Compare the previous per-label event expiration with the set-based one.
+
+A synthetic database of events over the last 60 days with timeline entries
+and snapshot files is created in a temporary directory, and one cleanup run
+of each implementation is timed on a fresh copy. The first run has all media
+past retention to expire, the second run is the following periodic run.
+
+The writer lock is held for the duration of each write statement, the total
+and the longest hold of the writes are reported.
+
+Usage: python benchmark_event_cleanup.py [--events 500000] [--cameras 20]
+"""
+
+import argparse
+import datetime
+import logging
+import os
+import random
+import shutil
+import tempfile
+import threading
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+from peewee import chunked
+from peewee_migrate import Router
+from playhouse.sqlite_ext import SqliteExtDatabase
+
+from frigate.config import FrigateConfig
+from frigate.events.cleanup import EventCleanup, EventCleanupType
+from frigate.models import Event, Timeline
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--events", type=int, default=500000)
+parser.add_argument("--cameras", type=int, default=20)
+parser.add_argument("--days", type=int, default=60)
+parser.add_argument("--skip-previous", action="store_true")
+args = parser.parse_args()
+
+# the largest number of variables in a statement of sqlite
+MAX_VARIABLES = 32766
+
+
+class TimedDatabase(SqliteExtDatabase):
+    """Records how long each write statement holds the database."""
+
+    writes: list[float] = []
+
+    def execute_sql(self, sql, params=None, commit=None):
+        if sql.lstrip().upper().startswith("SELECT"):
+            return super().execute_sql(sql, params)
+
+        started = time.perf_counter()
+        cursor = super().execute_sql(sql, params)
+        self.writes.append(time.perf_counter() - started)
+        return cursor
+
+
+logging.getLogger("peewee_migrate").setLevel(logging.WARNING)
+tmp_dir = tempfile.mkdtemp()
+clips_dir = os.path.join(tmp_dir, "clips")
+os.makedirs(clips_dir)
+template_path = os.path.join(tmp_dir, "template.db")
+db_path = os.path.join(tmp_dir, "frigate.db")
+
+cameras = [f"camera_{i}" for i in range(args.cameras)]
+removed_cameras = ["removed_0", "removed_1"]
+labels = ["person", "car", "dog", "cat", "bicycle", "bird", "horse", "package"]
+camera_config = {
+    "ffmpeg": {"inputs": [{"path": "rtsp://10.0.0.1/video", "roles": ["detect"]}]},
+    "detect": {"width": 1280, "height": 720},
+    "record": {
+        "alerts": {"retain": {"days": 10}},
+        "detections": {"retain": {"days": 7}},
+    },
+    "snapshots": {
+        "retain": {"default": 30, "objects": {"car": 14, "dog": 7, "package": 45}}
+    },
+}
+config = FrigateConfig(
+    **{
+        "mqtt": {"host": "mqtt"},
+        "cameras": {camera: camera_config for camera in cameras},
+    }
+)
+
+print(f"creating {args.events} events...")
+created = time.perf_counter()
+template_db = SqliteExtDatabase(template_path)
+Router(template_db).run()
+template_db.bind([Event, Timeline])
+now = datetime.datetime.now().timestamp()
+events = []
+event_rows = []
+timeline_rows = []
+
+for n in range(args.events):
+    start_time = now - random.random() * args.days * 86400
+    camera = random.choice(cameras + removed_cameras)
+    events.append((camera, f"{start_time:.6f}-{n:06d}"))
+    event_rows.append(
+        {
+            "id": events[-1][1],
+            "label": random.choice(labels),
+            "camera": camera,
+            "start_time": start_time,
+            "end_time": start_time + 20,
+            "top_score": 0.8,
+            "false_positive": False,
+            "zones": [],
+            "thumbnail": "",
+            "has_clip": True,
+            "has_snapshot": True,
+            "region": [],
+            "box": [],
+            "area": 0,
+            "retain_indefinitely": n % 100 == 0,
+        }
+    )
+    timeline_rows.append(
+        {
+            "timestamp": start_time,
+            "camera": camera,
+            "source": "tracked_object",
+            "source_id": events[-1][1],
+            "class_type": "visible",
+            "data": {},
+        }
+    )
+
+with template_db.atomic():
+    for batch in chunked(event_rows, 1000):
+        Event.insert_many(batch).execute()
+
+    for batch in chunked(timeline_rows, 1000):
+        Timeline.insert_many(batch).execute()
+
+template_db.close()
+print(f"created in {time.perf_counter() - created:.1f}s")
+
+
+def previous_expire(media_type: EventCleanupType) -> list[str]:
+    """The previous expiration with queries for every camera and label.
+
+    Only the expiration of events from configured cameras is included. The
+    ids are updated in chunks so the statements stay within the variable limit
+    of sqlite, which a single update of all of them would exceed.
+    """
+    events_to_update = []
+
+    for name, camera in config.cameras.items():
+        if media_type == EventCleanupType.clips:
+            expire_days = max(
+                camera.record.alerts.retain.days,
+                camera.record.detections.retain.days,
+            )
+        else:
+            retain_config = camera.snapshots.retain
+
+        distinct_labels = list(
+            Event.select(Event.label).where(Event.camera == name).distinct()
+        )
+
+        for event in distinct_labels:
+            if media_type == EventCleanupType.snapshots:
+                expire_days = retain_config.objects.get(
+                    event.label, retain_config.default
+                )
+
+            expire_after = (
+                datetime.datetime.now() - datetime.timedelta(days=expire_days)
+            ).timestamp()
+            expired_events = (
+                Event.select(Event.id, Event.camera)
+                .where(
+                    Event.camera == name,
+                    Event.start_time < expire_after,
+                    Event.label == event.label,
+                    Event.retain_indefinitely == False,
+                )
+                .namedtuples()
+                .iterator()
+            )
+
+            for expired in expired_events:
+                events_to_update.append(expired.id)
+
+                if media_type == EventCleanupType.snapshots:
+                    media_name = os.path.join(
+                        clips_dir, f"{expired.camera}-{expired.id}"
+                    )
+                    Path(f"{media_name}.jpg").unlink(missing_ok=True)
+                    Path(f"{media_name}-clean.png").unlink(missing_ok=True)
+
+    update_params = (
+        {"has_clip": False}
+        if media_type == EventCleanupType.clips
+        else {"has_snapshot": False}
+    )
+
+    for chunk in chunked(events_to_update, MAX_VARIABLES - 10):
+        Event.update(update_params).where(Event.id << chunk).execute()
+
+    return events_to_update
+
+
+def previous_cleanup() -> None:
+    expired = previous_expire(EventCleanupType.clips)
+
+    for chunk in chunked(expired, MAX_VARIABLES - 10):
+        Timeline.delete().where(Timeline.source_id << chunk).execute()
+
+    previous_expire(EventCleanupType.snapshots)
+    events_to_delete = [
+        e.id
+        for e in Event.select().where(
+            Event.has_clip == False, Event.has_snapshot == False
+        )
+    ]
+
+    for chunk in chunked(events_to_delete, 50):
+        Event.delete().where(Event.id << chunk).execute()
+
+
+def run(name: str, cleanup) -> None:
+    shutil.copy(template_path, db_path)
+
+    for camera, id in events:
+        open(os.path.join(clips_dir, f"{camera}-{id}.jpg"), "wb").close()
+
+    db = TimedDatabase(db_path, pragmas={"journal_mode": "wal"})
+    db.bind([Event, Timeline])
+
+    for run_name in ["first run", "next run"]:
+        TimedDatabase.writes = []
+        started = time.perf_counter()
+        cleanup()
+        duration = time.perf_counter() - started
+        writes = TimedDatabase.writes
+        print(
+            f"{name:<10} {run_name:<10} {duration:8.2f}s wall,"
+            f" writer held {sum(writes):6.2f}s total,"
+            f" {max(writes, default=0) * 1000:8.1f}ms longest,"
+            f" {len(writes)} writes"
+        )
+
+    print(
+        f"{'':<10} {Event.select().count()} events,"
+        f" {Timeline.select(Timeline.source_id).count()} timeline entries,"
+        f" {len(os.listdir(clips_dir))} snapshots left"
+    )
+    db.close()
+
+    for file in os.listdir(clips_dir):
+        os.remove(os.path.join(clips_dir, file))
+
+
+with patch("frigate.events.cleanup.CLIPS_DIR", clips_dir):
+    if not args.skip_previous:
+        run("previous", previous_cleanup)
+
+    run("set-based", EventCleanup(config, threading.Event(), None).cleanup)
+
+shutil.rmtree(tmp_dir)
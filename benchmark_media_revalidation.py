@@ -0,0 +1,140 @@
+"""Measure the cost of re-fetching the media of a review page.
+
+A synthetic database of finished events with thumbnails and snapshots is
+created in a temporary directory. A client loads the thumbnails and snapshots
+of a page of events once and then reloads the page. The reloads are done
+without validators, as before the api returned them, and by revalidating
+with the ETag of the first load. The bytes received and the cpu time of the
+process are reported per page load.
+
+Usage: python benchmark_media_revalidation.py [--events 100] [--reloads 20]
+"""
+
+import argparse
+import base64
+import datetime
+import logging
+import os
+import shutil
+import tempfile
+import time
+from unittest.mock import patch
+
+import cv2
+import numpy as np
+from fastapi.testclient import TestClient
+from peewee_migrate import Router
+from playhouse.sqlite_ext import SqliteExtDatabase
+from playhouse.sqliteq import SqliteQueueDatabase
+
+from frigate.api.fastapi_app import create_fastapi_app
+from frigate.config import FrigateConfig
+from frigate.models import Event
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--events", type=int, default=100)
+parser.add_argument("--reloads", type=int, default=20)
+args = parser.parse_args()
+
+logging.getLogger("peewee_migrate").setLevel(logging.WARNING)
+logging.getLogger("httpx").setLevel(logging.WARNING)
+tmp_dir = tempfile.mkdtemp()
+clips_dir = os.path.join(tmp_dir, "clips")
+os.makedirs(clips_dir)
+db_path = os.path.join(tmp_dir, "frigate.db")
+migrate_db = SqliteExtDatabase(db_path)
+Router(migrate_db).run()
+migrate_db.close()
+db = SqliteQueueDatabase(db_path)
+db.bind([Event])
+
+
+def encode(width: int, height: int) -> bytes:
+    frame = np.random.randint(0, 255, (height, width, 3), np.uint8)
+    frame = cv2.GaussianBlur(frame, (15, 15), 0)
+    return cv2.imencode(".jpg", frame, [int(cv2.IMWRITE_JPEG_QUALITY), 70])[1]
+
+
+thumbnail = base64.b64encode(encode(175, 175)).decode()
+snapshot = encode(1280, 720).tobytes()
+now = datetime.datetime.now().timestamp()
+ids = []
+
+for n in range(args.events):
+    id = f"{now - n * 60}-{n}"
+    ids.append(id)
+    Event.insert(
+        id=id,
+        label="person",
+        camera="front",
+        start_time=now - n * 60,
+        end_time=now - n * 60 + 20,
+        top_score=0.8,
+        false_positive=False,
+        zones=[],
+        thumbnail=thumbnail,
+        region=[],
+        box=[],
+        area=0,
+        has_clip=True,
+        has_snapshot=True,
+    ).execute()
+
+    with open(os.path.join(clips_dir, f"front-{id}.jpg"), "wb") as f:
+        f.write(snapshot)
+
+config = FrigateConfig(
+    **{
+        "mqtt": {"host": "mqtt"},
+        "cameras": {
+            "front": {
+                "ffmpeg": {
+                    "inputs": [{"path": "rtsp://10.0.0.1/video", "roles": ["detect"]}]
+                },
+                "detect": {"width": 1280, "height": 720},
+            }
+        },
+    }
+)
+app = create_fastapi_app(config, db, None, None, None, None, None, None, None)
+page = [f"/events/{id}/thumbnail.jpg" for id in ids]
+page += [f"/events/{id}/thumbnail.jpg?format=android" for id in ids[:20]]
+page += [f"/events/{id}/snapshot.jpg" for id in ids[:20]]
+
+
+def load_page(client: TestClient, etags: dict[str, str]) -> int:
+    received = 0
+
+    for path in page:
+        headers = {"If-None-Match": etags[path]} if path in etags else {}
+        response = client.get(path, headers=headers)
+        assert response.status_code in (200, 304), (path, response.status_code)
+        received += len(response.content)
+
+        if "ETag" in response.headers:
+            etags[path] = response.headers["ETag"]
+
+    return received
+
+
+with patch("frigate.api.media.CLIPS_DIR", clips_dir), TestClient(app) as client:
+    etags: dict[str, str] = {}
+    first = load_page(client, etags)
+    print(f"first load {first / 1024:8.1f}KB, {len(page)} requests")
+
+    for name, reload_etags in [("previous", None), ("revalidate", etags)]:
+        received = 0
+        started = time.perf_counter()
+        cpu_started = time.process_time()
+
+        for _ in range(args.reloads):
+            received += load_page(client, dict(reload_etags or {}))
+
+        print(
+            f"{name:<10} reload {received / args.reloads / 1024:8.1f}KB,"
+            f" cpu {(time.process_time() - cpu_started) / args.reloads * 1000:7.1f}ms,"
+            f" wall {(time.perf_counter() - started) / args.reloads * 1000:7.1f}ms"
+        )
+
+db.stop()
+shutil.rmtree(tmp_dir)
@@ -0,0 +1,64 @@
+"""Measure the latency and per frame allocations of the ONNX detector.
+
+Usage: python benchmark_onnx.py --model yolo_nas_s.onnx [--nchw] [--inferences 500]
+"""
+
+import argparse
+import datetime
+import tracemalloc
+from statistics import mean
+
+import numpy as np
+from pydantic import TypeAdapter
+
+from frigate.detectors import DetectorConfig
+from frigate.object_detection import LocalObjectDetector
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--model", required=True)
+parser.add_argument("--width", type=int, default=320)
+parser.add_argument("--height", type=int, default=320)
+parser.add_argument("--nchw", action="store_true")
+parser.add_argument("--inferences", type=int, default=500)
+args = parser.parse_args()
+
+object_detector = LocalObjectDetector(
+    detector_config=TypeAdapter(DetectorConfig).validate_python(
+        {
+            "type": "onnx",
+            "device": "CPU",
+            "model": {
+                "path": args.model,
+                "width": args.width,
+                "height": args.height,
+                "model_type": "yolonas",
+                "input_tensor": "nchw" if args.nchw else "nhwc",
+            },
+        }
+    )
+)
+tensor_input = np.random.randint(
+    0, 255, (1, args.height, args.width, 3), dtype=np.uint8
+)
+
+# warm up
+for _ in range(10):
+    object_detector.detect_raw(tensor_input)
+
+durations = []
+for _ in range(args.inferences):
+    start = datetime.datetime.now().timestamp()
+    object_detector.detect_raw(tensor_input)
+    durations.append(datetime.datetime.now().timestamp() - start)
+
+tracemalloc.start()
+allocations = []
+for _ in range(args.inferences):
+    before = tracemalloc.get_traced_memory()[0]
+    tracemalloc.reset_peak()
+    object_detector.detect_raw(tensor_input)
+    allocations.append(tracemalloc.get_traced_memory()[1] - before)
+tracemalloc.stop()
+
+print(f"{mean(durations) * 1000:.2f}ms average latency")
+print(f"{mean(allocations) / 1024:.1f}KiB allocated per inference")
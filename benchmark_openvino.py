@@ -0,0 +1,93 @@
+"""Compare the latency and throughput modes of the OpenVINO detector.
+
+Runs the same number of inferences through both modes to measure how many
+detections per second the detector process can serve when several cameras
+are waiting for results.
+
+Usage: python benchmark_openvino.py [--device CPU] [--inferences 500]
+"""
+
+import argparse
+import datetime
+import threading
+from statistics import mean
+
+import numpy as np
+from pydantic import TypeAdapter
+
+from frigate.detectors import DetectorConfig
+from frigate.object_detection import LocalObjectDetector
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--model", default="/openvino-model/ssdlite_mobilenet_v2.xml")
+parser.add_argument("--width", type=int, default=300)
+parser.add_argument("--height", type=int, default=300)
+parser.add_argument("--device", default="CPU")
+parser.add_argument("--num-requests", type=int, default=None)
+parser.add_argument("--inferences", type=int, default=500)
+args = parser.parse_args()
+
+tensor_input = np.random.randint(
+    0, 255, (1, args.height, args.width, 3), dtype=np.uint8
+)
+
+
+def create_detector(mode: str) -> LocalObjectDetector:
+    return LocalObjectDetector(
+        detector_config=TypeAdapter(DetectorConfig).validate_python(
+            {
+                "type": "openvino",
+                "device": args.device,
+                "mode": mode,
+                "num_requests": args.num_requests,
+                "model": {
+                    "path": args.model,
+                    "width": args.width,
+                    "height": args.height,
+                },
+            }
+        )
+    )
+
+
+def run_latency() -> list[float]:
+    object_detector = create_detector("latency")
+    durations = []
+
+    for _ in range(args.inferences):
+        start = datetime.datetime.now().timestamp()
+        object_detector.detect_raw(tensor_input)
+        durations.append(datetime.datetime.now().timestamp() - start)
+
+    return durations
+
+
+def run_throughput() -> list[float]:
+    object_detector = create_detector("throughput")
+    durations = []
+    lock = threading.Lock()
+
+    def done(start: float):
+        duration = datetime.datetime.now().timestamp() - start
+
+        with lock:
+            durations.append(duration)
+
+    for _ in range(args.inferences):
+        start = datetime.datetime.now().timestamp()
+        object_detector.detect_raw_async(
+            tensor_input, lambda _, start=start: done(start)
+        )
+
+    object_detector.wait_async()
+    return durations
+
+
+for mode, run in [("latency", run_latency), ("throughput", run_throughput)]:
+    start = datetime.datetime.now().timestamp()
+    durations = run()
+    duration = datetime.datetime.now().timestamp() - start
+    print(
+        f"{mode:>10}: {len(durations) / duration:.1f} detections/s, "
+        f"{mean(durations) * 1000:.2f}ms average latency"
+    )
@@ -0,0 +1,153 @@
+"""Compare the page latency of offset and cursor pagination of events.
+
+A synthetic database of events is created in a temporary directory and a page
+at the start and a page deep into the results are requested from the /events
+endpoint with a cursor, and with the offset that was needed before.
+
+Usage: python benchmark_pagination.py [--events 1000000] [--depth 500000]
+"""
+
+import argparse
+import logging
+import os
+import random
+import shutil
+import statistics
+import tempfile
+import time
+from functools import partial
+
+from peewee import chunked
+from peewee_migrate import Router
+from playhouse.sqlite_ext import SqliteExtDatabase
+
+from frigate.api.defs.events_query_parameters import EventsQueryParams
+from frigate.api.event import events
+from frigate.api.pagination import NEXT_CURSOR_HEADER, encode_cursor
+from frigate.models import Event
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--events", type=int, default=1000000)
+parser.add_argument("--depth", type=int, default=500000)
+parser.add_argument("--cameras", type=int, default=20)
+parser.add_argument("--limit", type=int, default=100)
+parser.add_argument("--runs", type=int, default=20)
+args = parser.parse_args()
+
+logging.getLogger("peewee_migrate").setLevel(logging.WARNING)
+tmp_dir = tempfile.mkdtemp()
+db = SqliteExtDatabase(
+    os.path.join(tmp_dir, "frigate.db"), pragmas={"journal_mode": "wal"}
+)
+Router(db).run()
+db.bind([Event])
+
+cameras = [f"camera_{i}" for i in range(args.cameras)]
+labels = ["person", "car", "dog", "cat", "bicycle"]
+start = 1704067200
+
+print(f"creating {args.events} events...")
+created = time.perf_counter()
+
+
+def rows():
+    for n in range(args.events):
+        start_time = start + n * 3 + random.random()
+        yield {
+            "id": f"{start_time:.6f}-{random.randint(0, 999999):06d}",
+            "label": random.choice(labels),
+            "camera": random.choice(cameras),
+            "start_time": start_time,
+            "end_time": start_time + 20,
+            "top_score": 0.8,
+            "false_positive": False,
+            "zones": [],
+            "thumbnail": "",
+            "has_clip": True,
+            "has_snapshot": True,
+            "region": [],
+            "box": [],
+            "area": 0,
+            "retain_indefinitely": False,
+            "ratio": 1,
+            "plus_id": None,
+            "model_hash": None,
+            "detector_type": "cpu",
+            "model_type": "ssd",
+            "data": {"score": 0.8, "top_score": 0.8},
+        }
+
+
+with db.atomic():
+    for batch in chunked(rows(), 500):
+        Event.insert_many(batch).execute()
+
+db.execute_sql("ANALYZE")
+print(f"created in {time.perf_counter() - created:.1f}s")
+
+
+def cursor_at(depth: int, camera: str = "all", ascending: bool = False):
+    """The cursor that the previous page at depth would have returned."""
+    if depth == 0:
+        return None
+
+    query = Event.select(Event.start_time, Event.id)
+
+    if camera != "all":
+        query = query.where(Event.camera == camera)
+
+    if ascending:
+        query = query.order_by(Event.start_time.asc(), Event.id.asc())
+    else:
+        query = query.order_by(Event.start_time.desc(), Event.id.desc())
+
+    row = query.offset(depth - 1).limit(1).get()
+    return encode_cursor(row.start_time, row.id)
+
+
+def offset_page(depth: int, camera: str, ascending: bool) -> list:
+    """A page of the previous endpoint at an offset."""
+    query = Event.select().where(True if camera == "all" else Event.camera == camera)
+
+    if ascending:
+        query = query.order_by(Event.start_time.asc())
+    else:
+        query = query.order_by(Event.start_time.desc())
+
+    return list(query.offset(depth).limit(args.limit).dicts())
+
+
+def measure(page) -> float:
+    times = []
+
+    for _ in range(args.runs):
+        started = time.perf_counter()
+        page()
+        times.append(time.perf_counter() - started)
+
+    return statistics.median(times) * 1000
+
+
+scenarios = [
+    ("date_desc", "all", False),
+    ("date_asc", "all", True),
+    ("one camera", cameras[0], False),
+]
+print(f"{'':<12}{'depth':>8}{'offset ms':>12}{'cursor ms':>12}")
+
+for name, camera, ascending in scenarios:
+    for depth in [0, args.depth // (1 if camera == "all" else args.cameras)]:
+        cursor = cursor_at(depth, camera, ascending)
+        params = EventsQueryParams(
+            cameras=camera,
+            limit=args.limit,
+            sort="date_asc" if ascending else None,
+            cursor=cursor,
+        )
+        response = events(params)
+        assert NEXT_CURSOR_HEADER.lower() in response.headers
+        offset_ms = measure(partial(offset_page, depth, camera, ascending))
+        cursor_ms = measure(partial(events, params))
+        print(f"{name:<12}{depth:>8}{offset_ms:>12.2f}{cursor_ms:>12.2f}")
+
+shutil.rmtree(tmp_dir)
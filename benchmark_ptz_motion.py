@@ -0,0 +1,115 @@
+"""Compare the full and downscaled PTZ autotracking motion estimation on a clip.
+
+The full resolution estimate is used as the reference for the camera motion
+error of the downscaled estimate.
+
+Usage: python benchmark_ptz_motion.py debug/ptz_clip.mp4 [--zooming]
+"""
+
+import argparse
+import time
+
+import cv2
+import numpy as np
+
+from frigate.camera import PTZMetrics
+from frigate.config import FrigateConfig
+from frigate.ptz.autotrack import PtzMotionEstimator
+
+parser = argparse.ArgumentParser()
+parser.add_argument("clip")
+parser.add_argument("--zooming", action="store_true", help="use homography")
+parser.add_argument("--max-frames", type=int, default=1000)
+args = parser.parse_args()
+
+cap = cv2.VideoCapture(args.clip)
+width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+
+# convert up front so decoding is not part of the timings
+frames = []
+while len(frames) < args.max_frames:
+    ret, frame = cap.read()
+
+    if not ret:
+        break
+
+    frames.append(cv2.cvtColor(frame, cv2.COLOR_BGR2YUV_I420))
+
+cap.release()
+
+
+def create_estimator(mode: str) -> PtzMotionEstimator:
+    config = FrigateConfig(
+        **{
+            "mqtt": {"host": "mqtt"},
+            "cameras": {
+                "ptz": {
+                    "ffmpeg": {
+                        "inputs": [
+                            {"path": "rtsp://10.0.0.1:554/video", "roles": ["detect"]}
+                        ]
+                    },
+                    "detect": {"width": width, "height": height},
+                    "onvif": {
+                        "autotracking": {
+                            "zooming": "absolute" if args.zooming else "disabled",
+                            "motion_estimation": mode,
+                        }
+                    },
+                }
+            },
+        }
+    )
+    estimator = PtzMotionEstimator(
+        config.cameras["ptz"], PTZMetrics(autotracker_enabled=False)
+    )
+    estimator.reset("ptz")
+    return estimator
+
+
+# points spread over the frame used to measure the camera motion error
+grid = np.array(
+    [[x, y] for x in np.linspace(0, width, 5) for y in np.linspace(0, height, 5)]
+)
+# a stationary object in the middle of the frame
+boxes = [(width // 3, height // 3, width // 2, height // 2)]
+
+results = {}
+for mode in ["full", "downscaled"]:
+    estimator = create_estimator(mode)
+    durations = []
+    transformations = []
+
+    for frame_time, yuv_frame in enumerate(frames):
+        start = time.perf_counter()
+        transformations.append(estimator.estimate(yuv_frame, boxes, "ptz", frame_time))
+        durations.append(time.perf_counter() - start)
+
+    results[mode] = (durations, transformations)
+
+errors = []
+for full, downscaled in zip(results["full"][1], results["downscaled"][1]):
+    if full is None or downscaled is None:
+        continue
+
+    errors.append(
+        np.linalg.norm(
+            full.rel_to_abs(grid) - downscaled.rel_to_abs(grid), axis=1
+        ).mean()
+    )
+
+print(f"{len(frames)} frames at {width}x{height}")
+for mode, (durations, transformations) in results.items():
+    failed = sum(t is None for t in transformations)
+    print(
+        f"{mode:>10}: {np.mean(durations) * 1000:.2f} ms/frame avg, "
+        f"{np.percentile(durations, 95) * 1000:.2f} ms/frame p95, "
+        f"{failed} failed estimates"
+    )
+
+if errors:
+    print(
+        f"camera motion error vs full: {np.mean(errors):.2f} px avg, "
+        f"{np.max(errors):.2f} px max"
+    )
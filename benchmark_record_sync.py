@@ -0,0 +1,146 @@
+"""Compare the previous per-row recordings sync with the set-based sync.
+
+A synthetic recordings tree (day/hour/camera/MM.SS.mp4) with a matching
+recordings table is created in a temporary directory. Before each run a few
+files are removed and a few orphaned files are added so both kinds of
+differences have to be found.
+
+Usage: python benchmark_record_sync.py [--segments 1000000] [--cameras 20]
+"""
+
+import argparse
+import datetime
+import logging
+import os
+import shutil
+import tempfile
+import time
+from unittest.mock import patch
+
+from peewee_migrate import Router
+from playhouse.sqlite_ext import SqliteExtDatabase
+
+from frigate.models import Recordings, RecordingsToDelete
+from frigate.record.util import sync_recordings
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--segments", type=int, default=1000000)
+parser.add_argument("--cameras", type=int, default=20)
+parser.add_argument("--differences", type=int, default=100)
+parser.add_argument("--skip-previous", action="store_true")
+args = parser.parse_args()
+
+logging.getLogger("peewee_migrate").setLevel(logging.WARNING)
+tmp_dir = tempfile.mkdtemp()
+record_dir = os.path.join(tmp_dir, "recordings")
+db = SqliteExtDatabase(
+    os.path.join(tmp_dir, "frigate.db"), pragmas={"journal_mode": "wal"}
+)
+Router(db).run()
+db.bind([Recordings, RecordingsToDelete])
+
+cameras = [f"camera_{i}" for i in range(args.cameras)]
+start = datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc)
+segments_per_camera = args.segments // len(cameras)
+paths = []
+
+print(f"creating {segments_per_camera * len(cameras)} segments...")
+created = time.perf_counter()
+
+with db.atomic():
+    rows = []
+
+    for n in range(segments_per_camera):
+        # 10 second segments
+        segment_start = start + datetime.timedelta(seconds=n * 10)
+        directory = os.path.join(record_dir, segment_start.strftime("%Y-%m-%d/%H"))
+        name = segment_start.strftime("%M.%S.mp4")
+
+        for camera in cameras:
+            path = os.path.join(directory, camera, name)
+
+            if n % 360 == 0:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+
+            open(path, "wb").close()
+            paths.append(path)
+            rows.append(
+                {
+                    "id": f"{segment_start.timestamp()}-{camera}",
+                    "camera": camera,
+                    "path": path,
+                    "start_time": segment_start.timestamp(),
+                    "end_time": segment_start.timestamp() + 10,
+                    "duration": 10,
+                }
+            )
+
+        if len(rows) >= 5000:
+            Recordings.insert_many(rows).execute()
+            rows = []
+
+    if rows:
+        Recordings.insert_many(rows).execute()
+
+print(f"created in {time.perf_counter() - created:.1f}s")
+
+
+def make_differences(offset: int) -> None:
+    step = len(paths) // (args.differences * 2)
+
+    for i in range(args.differences):
+        # remove a file that has a db entry
+        os.remove(paths[offset + i * 2 * step])
+        # add a file that has no db entry
+        orphan = paths[offset + (i * 2 + 1) * step].replace(".mp4", ".orphan.mp4")
+        open(orphan, "wb").close()
+
+
+def previous_sync() -> None:
+    """The previous sync with a check for every db entry and file."""
+    recordings_to_delete = [
+        recording.id
+        for recording in Recordings.select(Recordings.id, Recordings.path).iterator()
+        if not os.path.exists(recording.path)
+    ]
+    Recordings.delete().where(Recordings.id << recordings_to_delete).execute()
+
+    for root, _, files in os.walk(record_dir):
+        for file in files:
+            path = os.path.join(root, file)
+
+            if not Recordings.select().where(Recordings.path == path).exists():
+                os.unlink(path)
+
+
+def check(name: str, duration: float) -> None:
+    orphans = sum(
+        1
+        for _, _, files in os.walk(record_dir)
+        for file in files
+        if file.endswith(".orphan.mp4")
+    )
+    print(
+        f"{name:<15} {duration:8.2f}s  {Recordings.select().count()} entries,"
+        f" {orphans} orphaned files left"
+    )
+
+
+with patch("frigate.record.util.RECORD_DIR", record_dir):
+    if not args.skip_previous:
+        make_differences(0)
+        started = time.perf_counter()
+        previous_sync()
+        check("previous", time.perf_counter() - started)
+
+    make_differences(1)
+    started = time.perf_counter()
+    sync_recordings(limited=False)
+    check("set-based", time.perf_counter() - started)
+
+    make_differences(2)
+    started = time.perf_counter()
+    sync_recordings(limited=False, cameras=cameras[:1], days=["2024-01-01"])
+    check("one day/camera", time.perf_counter() - started)
+
+shutil.rmtree(tmp_dir)
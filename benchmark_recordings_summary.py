@@ -0,0 +1,129 @@
+"""Compare the recordings summary from the raw tables with the rollups.
+
+A database with continuous 10 second segments and an event every 10 minutes
+is created for one camera. The time to insert the segments (which now also
+updates the rollups), to answer the summary for a few timezones, and to
+delete a day of segments like the cleanup does is reported.
+
+Usage: python benchmark_recordings_summary.py [--days 365]
+"""
+
+import argparse
+import logging
+import os
+import shutil
+import tempfile
+import time
+
+from peewee import chunked, fn
+from peewee_migrate import Router
+from playhouse.sqlite_ext import SqliteExtDatabase
+
+from frigate.api.media import recordings_summary
+from frigate.models import Event, Recordings, RecordingsRollup
+from frigate.util.builtin import get_tz_modifiers
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--days", type=int, default=365)
+args = parser.parse_args()
+
+logging.getLogger("peewee_migrate").setLevel(logging.WARNING)
+tmp_dir = tempfile.mkdtemp()
+db = SqliteExtDatabase(
+    os.path.join(tmp_dir, "frigate.db"), pragmas={"journal_mode": "wal"}
+)
+Router(db).run()
+db.bind([Event, Recordings, RecordingsRollup])
+
+start = 1704067200  # 2024-01-01
+segments = args.days * 24 * 360
+inserted = time.perf_counter()
+
+with db.atomic():
+    for batch_start in range(0, segments, 5000):
+        Recordings.insert_many(
+            [
+                {
+                    "id": f"{start + i * 10}-front",
+                    "camera": "front",
+                    "path": f"/media/frigate/recordings/front/{i}.mp4",
+                    "start_time": start + i * 10,
+                    "end_time": start + i * 10 + 10,
+                    "duration": 10,
+                    "motion": i % 50,
+                    "objects": i % 3,
+                }
+                for i in range(batch_start, min(segments, batch_start + 5000))
+            ]
+        ).execute()
+
+    events = [
+        {
+            "id": f"event_{i}",
+            "label": "person",
+            "camera": "front",
+            "start_time": start + i * 600,
+            "end_time": start + i * 600 + 30,
+            "top_score": 0.9,
+            "false_positive": False,
+            "zones": [],
+            "thumbnail": "",
+            "has_clip": True,
+            "has_snapshot": True,
+            "region": [],
+            "box": [],
+            "area": 0,
+            "data": {},
+        }
+        for i in range(segments // 60)
+    ]
+
+    for batch in chunked(events, 1000):
+        Event.insert_many(batch).execute()
+
+print(
+    f"inserted {segments} segments with rollups in {time.perf_counter() - inserted:.1f}s"
+)
+
+
+def raw_summary(timezone: str) -> None:
+    hour_modifier, minute_modifier, seconds_offset = get_tz_modifiers(timezone)
+    hour = fn.strftime(
+        "%Y-%m-%d %H",
+        fn.datetime(Recordings.start_time, "unixepoch", hour_modifier, minute_modifier),
+    )
+    list(
+        Recordings.select(
+            hour.alias("hour"),
+            fn.SUM(Recordings.duration),
+            fn.SUM(Recordings.motion),
+            fn.SUM(Recordings.objects),
+        )
+        .where(Recordings.camera == "front")
+        .group_by((Recordings.start_time + seconds_offset).cast("int") / 3600)
+        .order_by(Recordings.start_time.desc())
+        .namedtuples()
+    )
+    list(
+        Event.select(fn.COUNT(Event.id))
+        .where(Event.camera == "front", Event.has_clip)
+        .group_by((Event.start_time + seconds_offset).cast("int") / 3600)
+        .namedtuples()
+    )
+
+
+for timezone in ["utc", "America/New_York", "Asia/Kolkata"]:
+    started = time.perf_counter()
+    raw_summary(timezone)
+    raw = time.perf_counter() - started
+    started = time.perf_counter()
+    recordings_summary("front", timezone)
+    rollup = time.perf_counter() - started
+    print(f"{timezone:<17} raw tables {raw:6.3f}s  rollups {rollup:6.3f}s")
+
+started = time.perf_counter()
+Recordings.delete().where(Recordings.start_time < start + 86400).execute()
+print(f"deleted a day of segments in {time.perf_counter() - started:.2f}s")
+
+db.close()
+shutil.rmtree(tmp_dir)
@@ -0,0 +1,194 @@
+"""Compare the serial OFFSET reindex with the pipelined keyset reindex.
+
+A synthetic event database is created in a temporary directory. The embedding
+model is simulated by decoding the thumbnails when they are not decoded yet and
+waiting --model-ms for each batch, which is how long a run of the real model
+blocks the reindex.
+
+Usage: python benchmark_reindex.py [--events 50000] [--model-ms 20]
+"""
+
+import argparse
+import base64
+import logging
+import os
+import tempfile
+import time
+from io import BytesIO
+from unittest.mock import Mock
+
+import cv2
+import numpy as np
+from peewee_migrate import Router
+from PIL import Image
+from playhouse.sqlite_ext import SqliteExtDatabase
+
+from frigate.embeddings.reindex import ReindexPipeline, get_reindex_query
+from frigate.models import Event
+from frigate.util.builtin import serialize
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--events", type=int, default=50000)
+parser.add_argument("--batch-size", type=int, default=32)
+parser.add_argument("--model-ms", type=float, default=20)
+args = parser.parse_args()
+
+tmp_dir = tempfile.mkdtemp()
+db_path = os.path.join(tmp_dir, "frigate.db")
+db = SqliteExtDatabase(db_path, pragmas={"journal_mode": "wal"})
+logging.getLogger("peewee_migrate").setLevel(logging.WARNING)
+Router(db).run()
+db.bind([Event])
+db.execute_sql(
+    "CREATE TABLE vec_thumbnails (id TEXT PRIMARY KEY, thumbnail_embedding BLOB)"
+)
+db.execute_sql(
+    "CREATE TABLE vec_descriptions (id TEXT PRIMARY KEY, description_embedding BLOB)"
+)
+
+_, jpg = cv2.imencode(
+    ".jpg",
+    np.random.randint(0, 255, (175, 175, 3), np.uint8),
+    [cv2.IMWRITE_JPEG_QUALITY, 70],
+)
+thumbnail = base64.b64encode(jpg.tobytes()).decode()
+start_time = time.time() - args.events
+
+with db.atomic():
+    for i in range(0, args.events, 1000):
+        Event.insert_many(
+            [
+                {
+                    "id": f"{start_time + n:.6f}-{n:06x}",
+                    "label": "person",
+                    "camera": "front_door",
+                    "start_time": start_time + n,
+                    "end_time": start_time + n + 10,
+                    "top_score": 0.9,
+                    "false_positive": False,
+                    "zones": [],
+                    "thumbnail": thumbnail,
+                    "has_clip": True,
+                    "has_snapshot": True,
+                    "data": {"description": "a person walking" if n % 3 else ""},
+                }
+                for n in range(i, min(i + 1000, args.events))
+            ]
+        ).execute()
+
+
+class SimulatedEmbeddings:
+    def batch_embed_thumbnail(self, event_thumbs, upsert=True):
+        for thumb in event_thumbs.values():
+            if isinstance(thumb, bytes):
+                Image.open(BytesIO(thumb)).convert("RGB")
+
+        time.sleep(args.model_ms / 1000)
+        embeddings = [np.random.rand(768).astype(np.float32) for _ in event_thumbs]
+
+        if upsert:
+            self.upsert_thumbnails(list(event_thumbs.keys()), embeddings)
+
+        return embeddings
+
+    def batch_embed_description(self, event_descriptions, upsert=True):
+        time.sleep(args.model_ms / 4000)
+        embeddings = [
+            np.random.rand(768).astype(np.float32) for _ in event_descriptions
+        ]
+
+        if upsert:
+            self.upsert_descriptions(list(event_descriptions.keys()), embeddings)
+
+        return embeddings
+
+    def _upsert(self, table, column, ids, embeddings):
+        items = []
+
+        for i in range(len(ids)):
+            items.append(ids[i])
+            items.append(serialize(embeddings[i]))
+
+        return db.execute_sql(
+            f"INSERT OR REPLACE INTO {table}(id, {column}) VALUES "
+            + ", ".join(["(?, ?)"] * len(ids)),
+            items,
+        )
+
+    def upsert_thumbnails(self, ids, embeddings):
+        return self._upsert("vec_thumbnails", "thumbnail_embedding", ids, embeddings)
+
+    def upsert_descriptions(self, ids, embeddings):
+        return self._upsert(
+            "vec_descriptions", "description_embedding", ids, embeddings
+        )
+
+
+def offset_reindex(embeddings: SimulatedEmbeddings) -> dict[str, float]:
+    """The previous serial reindex with OFFSET pagination."""
+    page = 1
+    page_times = []
+
+    while True:
+        page_start = time.perf_counter()
+        events = list(
+            get_reindex_query()
+            .order_by(Event.start_time.desc())
+            .paginate(page, args.batch_size)
+        )
+        page_times.append(time.perf_counter() - page_start)
+
+        if not events:
+            break
+
+        thumbs = {}
+        descs = {}
+
+        for event in events:
+            thumbs[event.id] = base64.b64decode(event.thumbnail)
+
+            if description := event.data.get("description", "").strip():
+                descs[event.id] = description
+
+        embeddings.batch_embed_thumbnail(thumbs)
+
+        if descs:
+            embeddings.batch_embed_description(descs)
+
+        page += 1
+
+    return {"first_page": page_times[0], "last_page": page_times[-2]}
+
+
+def clear() -> None:
+    db.execute_sql("DELETE FROM vec_thumbnails")
+    db.execute_sql("DELETE FROM vec_descriptions")
+
+
+def count() -> int:
+    return db.execute_sql("SELECT COUNT(*) FROM vec_thumbnails").fetchone()[0]
+
+
+embeddings = SimulatedEmbeddings()
+print(f"{args.events} events, batch size {args.batch_size}, model {args.model_ms}ms")
+
+start = time.perf_counter()
+pages = offset_reindex(embeddings)
+offset_duration = time.perf_counter() - start
+print(
+    f"offset serial:    {offset_duration:7.2f}s  {count()} thumbnails"
+    f"  (page query first {pages['first_page'] * 1000:.1f}ms,"
+    f" last {pages['last_page'] * 1000:.1f}ms)"
+)
+
+clear()
+start = time.perf_counter()
+ReindexPipeline(
+    embeddings,
+    Mock(),
+    batch_size=args.batch_size,
+    checkpoint_path=os.path.join(tmp_dir, "checkpoint.json"),
+).run()
+pipeline_duration = time.perf_counter() - start
+print(f"keyset pipeline:  {pipeline_duration:7.2f}s  {count()} thumbnails")
+print(f"speedup:          {offset_duration / pipeline_duration:7.2f}x")
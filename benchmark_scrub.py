@@ -0,0 +1,116 @@
+"""Measure snapshot-from-recording requests under a timeline scrub workload.
+
+Synthetic 10 second segments are written to a temporary directory and a
+scrubbing cursor that moves back and forth over them requests a frame 50
+times per second, the way the object lifecycle pane does. The latency of each
+request and the number of processes started are reported for the previous
+ffmpeg based path (when ffmpeg is installed) and the cached decoders.
+
+Usage: python benchmark_scrub.py [--rate 50] [--duration 10] [--segments 6]
+"""
+
+import argparse
+import os
+import random
+import shutil
+import subprocess as sp
+import tempfile
+import time
+from unittest.mock import patch
+
+import cv2
+import numpy as np
+
+from frigate.config import FfmpegConfig
+from frigate.record.keyframes import RecordingFrameService, get_keyframe_times
+from frigate.util.image import get_image_from_recording
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--rate", type=int, default=50)
+parser.add_argument("--duration", type=float, default=10)
+parser.add_argument("--segments", type=int, default=6)
+parser.add_argument("--width", type=int, default=1280)
+parser.add_argument("--height", type=int, default=720)
+args = parser.parse_args()
+
+tmp_dir = tempfile.mkdtemp()
+segments = []
+
+for s in range(args.segments):
+    path = os.path.join(tmp_dir, f"{s:02d}.00.mp4")
+    writer = cv2.VideoWriter(
+        path, cv2.VideoWriter_fourcc(*"mp4v"), 10, (args.width, args.height)
+    )
+    noise = np.random.randint(0, 255, (args.height, args.width, 3), np.uint8)
+
+    for i in range(100):
+        writer.write(np.roll(noise, i * 8, axis=1))
+
+    writer.release()
+    segments.append((path, get_keyframe_times(path)))
+
+# the cursor scrubs back and forth, sometimes jumping to another point
+random.seed(1)
+requests = []
+position = 0.0
+
+for _ in range(int(args.rate * args.duration)):
+    if random.random() < 0.05:
+        position = random.uniform(0, args.segments * 10 - 0.1)
+    else:
+        position = min(
+            max(0, position + random.uniform(-0.1, 0.3)), args.segments * 10 - 0.1
+        )
+
+    requests.append(position)
+
+
+def run(name: str, get_image) -> None:
+    spawned = 0
+    popen = sp.Popen
+
+    def counting_popen(*a, **kw):
+        nonlocal spawned
+        spawned += 1
+        return popen(*a, **kw)
+
+    latencies = []
+    start = time.monotonic()
+
+    with patch("subprocess.Popen", counting_popen):
+        for i, position in enumerate(requests):
+            time.sleep(max(0, start + i / args.rate - time.monotonic()))
+            path, keyframes = segments[int(position // 10)]
+            requested = time.perf_counter()
+            image = get_image(path, position % 10, keyframes)
+            latencies.append(time.perf_counter() - requested)
+            assert image, f"no image at {position}"
+
+    print(
+        f"{name:<16} p50 {np.percentile(latencies, 50) * 1000:6.1f}ms  "
+        f"p95 {np.percentile(latencies, 95) * 1000:6.1f}ms  "
+        f"{spawned} processes for {len(requests)} requests"
+    )
+
+
+ffmpeg = FfmpegConfig()
+
+if shutil.which(ffmpeg.ffmpeg_path):
+    run(
+        "ffmpeg process",
+        lambda path, offset, keyframes: get_image_from_recording(
+            ffmpeg, path, offset, "mjpeg", 500
+        ),
+    )
+else:
+    print(f"{ffmpeg.ffmpeg_path} not found, skipping the ffmpeg process path")
+
+service = RecordingFrameService()
+run(
+    "cached decoder",
+    lambda path, offset, keyframes: service.get_encoded_frame(
+        path, offset, keyframes, "jpg", 500
+    ),
+)
+
+shutil.rmtree(tmp_dir)
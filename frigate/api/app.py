@@ -20,6 +20,7 @@ from peewee import operator
 from frigate.api.defs.app_body import AppConfigSetBody
 from frigate.api.defs.app_query_parameters import AppTimelineHourlyQueryParameters
 from frigate.api.defs.tags import Tags
+from frigate.api.read_pool import ReadRoute, read_only_endpoint
 from frigate.config import FrigateConfig
 from frigate.const import CONFIG_DIR
 from frigate.models import Event, Timeline
@@ -39,7 +40,7 @@ from frigate.version import VERSION
 logger = logging.getLogger(__name__)
 
 
-router = APIRouter(tags=[Tags.app])
+router = APIRouter(tags=[Tags.app], route_class=ReadRoute)
 
 
 @router.get("/", response_class=PlainTextResponse)
@@ -510,6 +511,7 @@ def restart():
 
 
 @router.get("/labels")
+@read_only_endpoint
 def get_labels(camera: str = ""):
     try:
         if camera:
@@ -528,6 +530,7 @@ def get_labels(camera: str = ""):
 
 
 @router.get("/sub_labels")
+@read_only_endpoint
 def get_sub_labels(split_joined: Optional[int] = None):
     try:
         events = Event.select(Event.sub_label).distinct()
@@ -559,6 +562,7 @@ def get_sub_labels(split_joined: Optional[int] = None):
 
 
 @router.get("/timeline")
+@read_only_endpoint
 def timeline(camera: str = "all", limit: int = 100, source_id: Optional[str] = None):
     clauses = []
 
@@ -592,6 +596,7 @@ def timeline(camera: str = "all", limit: int = 100, source_id: Optional[str] = N
 
 
 @router.get("/timeline/hourly")
+@read_only_endpoint
 def hourly_timeline(params: AppTimelineHourlyQueryParameters = Depends()):
     """Get hourly summary for timeline."""
     cameras = params.cameras
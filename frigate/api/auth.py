@@ -8,9 +8,12 @@ import logging
 import os
 import re
 import secrets
+import threading
 import time
+from collections import OrderedDict
 from datetime import datetime
 from pathlib import Path
+from typing import Optional
 
 from fastapi import APIRouter, Request, Response
 from fastapi.responses import JSONResponse, RedirectResponse
@@ -24,13 +27,14 @@ from frigate.api.defs.app_body import (
     AppPutPasswordBody,
 )
 from frigate.api.defs.tags import Tags
+from frigate.api.read_pool import ReadRoute, read_only_endpoint
 from frigate.config import AuthConfig, ProxyConfig
 from frigate.const import CONFIG_DIR, JWT_SECRET_ENV_VAR, PASSWORD_HASH_ALGORITHM
 from frigate.models import User
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter(tags=[Tags.auth])
+router = APIRouter(tags=[Tags.auth], route_class=ReadRoute)
 
 
 class RateLimiter:
@@ -46,6 +50,56 @@ class RateLimiter:
 rateLimiter = RateLimiter()
 
 
+class VerifiedTokenCache:
+    """Claims of recently verified jwt tokens.
+
+    nginx checks every proxied request with /auth, so the signature of the
+    same token would be verified many times a second. Tokens are kept for
+    up to ttl seconds and never beyond their expiration, the expiration and
+    refresh time are still checked on every request.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl: float = 60) -> None:
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        # token -> (user, expiration, cached until)
+        self.tokens: OrderedDict[str, tuple[str, int, float]] = OrderedDict()
+
+    def get(self, encoded_token: str) -> Optional[tuple[str, int]]:
+        """Get the user and expiration of a verified token."""
+        with self.lock:
+            cached = self.tokens.get(encoded_token)
+
+            if cached is None:
+                return None
+
+            if cached[2] <= time.time():
+                del self.tokens[encoded_token]
+                return None
+
+            self.tokens.move_to_end(encoded_token)
+            return cached[0], cached[1]
+
+    def set(self, encoded_token: str, user: str, expiration: int) -> None:
+        with self.lock:
+            self.tokens[encoded_token] = (
+                user,
+                expiration,
+                min(time.time() + self.ttl, expiration),
+            )
+            self.tokens.move_to_end(encoded_token)
+
+            while len(self.tokens) > self.max_entries:
+                self.tokens.popitem(last=False)
+
+    def invalidate(self, user: str) -> None:
+        """Drop the tokens of a user so they are verified again."""
+        with self.lock:
+            for token in [t for t, c in self.tokens.items() if c[0] == user]:
+                del self.tokens[token]
+
+
 def get_remote_addr(request: Request):
     route = list(reversed(request.headers.get("x-forwarded-for").split(",")))
     logger.debug(f"IP Route: {[r for r in route]}")
@@ -242,19 +296,25 @@ def auth(request: Request):
         return fail_response
 
     try:
-        token = jwt.decode(encoded_token, request.app.jwt_token)
-        if "sub" not in token.claims:
-            logger.debug("user not set in jwt token")
-            return fail_response
-        if "exp" not in token.claims:
-            logger.debug("exp not set in jwt token")
-            return fail_response
+        token_cache: VerifiedTokenCache = request.app.jwt_token_cache
+        claims = token_cache.get(encoded_token)
+
+        if claims is None:
+            token = jwt.decode(encoded_token, request.app.jwt_token)
+            if "sub" not in token.claims:
+                logger.debug("user not set in jwt token")
+                return fail_response
+            if "exp" not in token.claims:
+                logger.debug("exp not set in jwt token")
+                return fail_response
+
+            claims = (token.claims.get("sub"), int(token.claims.get("exp")))
+            token_cache.set(encoded_token, *claims)
 
-        user = token.claims.get("sub")
+        user, expiration = claims
         current_time = int(time.time())
 
         # if the jwt is expired
-        expiration = int(token.claims.get("exp"))
         logger.debug(
             f"current time:   {datetime.fromtimestamp(current_time).strftime('%c')}"
         )
@@ -275,6 +335,7 @@ def auth(request: Request):
             try:
                 User.get_by_id(user)
             except DoesNotExist:
+                token_cache.invalidate(user)
                 return fail_response
             new_expiration = current_time + JWT_SESSION_LENGTH
             new_encoded_jwt = create_encoded_jwt(
@@ -339,6 +400,7 @@ def login(request: Request, body: AppPostLoginBody):
 
 
 @router.get("/users")
+@read_only_endpoint
 def get_users():
     exports = User.select(User.username).order_by(User.username).dicts().iterator()
     return JSONResponse([e for e in exports])
@@ -364,8 +426,9 @@ def create_user(request: Request, body: AppPostUsersBody):
 
 
 @router.delete("/users/{username}")
-def delete_user(username: str):
+def delete_user(request: Request, username: str):
     User.delete_by_id(username)
+    request.app.jwt_token_cache.invalidate(username)
     return JSONResponse(content={"success": True})
 
 
@@ -381,4 +444,5 @@ def update_password(request: Request, username: str, body: AppPutPasswordBody):
             User.password_hash: password_hash,
         },
     )
+    request.app.jwt_token_cache.invalidate(username)
     return JSONResponse(content={"success": True})
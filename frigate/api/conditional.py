@@ -0,0 +1,61 @@
+"""Validators and conditional responses for media served by the api."""
+
+import hashlib
+import json
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Optional
+
+from fastapi import Request, Response
+
+# media that can no longer change, such as the snapshot of a finished event
+IMMUTABLE_CACHE_CONTROL = "private, max-age=31536000, immutable"
+# media that changes, the client has to check it is still current
+REVALIDATE_CACHE_CONTROL = "private, no-cache"
+
+
+def get_etag(*parts) -> str:
+    """Get a strong etag for the values identifying a response."""
+    digest = hashlib.sha256(json.dumps(parts, default=str).encode()).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+def get_validator_headers(
+    etag: str, last_modified: Optional[float], cache_control: str
+) -> dict[str, str]:
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+
+    if last_modified is not None:
+        headers["Last-Modified"] = formatdate(last_modified, usegmt=True)
+
+    return headers
+
+
+def is_not_modified(
+    request: Request, etag: str, last_modified: Optional[float] = None
+) -> bool:
+    """Returns True if the client already has the response with the validators.
+
+    If-Modified-Since is only checked when there is no If-None-Match header.
+    """
+    if_none_match = request.headers.get("if-none-match")
+
+    if if_none_match is not None:
+        tags = [tag.strip() for tag in if_none_match.split(",")]
+        return "*" in tags or any(tag.removeprefix("W/") == etag for tag in tags)
+
+    if_modified_since = request.headers.get("if-modified-since")
+
+    if if_modified_since is None or last_modified is None:
+        return False
+
+    try:
+        since = parsedate_to_datetime(if_modified_since).timestamp()
+    except (TypeError, ValueError):
+        return False
+
+    # Last-Modified has a resolution of seconds
+    return int(last_modified) <= since
+
+
+def not_modified_response(headers: dict[str, str]) -> Response:
+    return Response(status_code=304, headers=headers)
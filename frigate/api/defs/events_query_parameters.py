@@ -30,6 +30,7 @@ class EventsQueryParams(BaseModel):
     max_length: Optional[float] = None
     sort: Optional[str] = None
     timezone: Optional[str] = "utc"
+    cursor: Optional[str] = None
 
 
 class EventsSearchQueryParams(BaseModel):
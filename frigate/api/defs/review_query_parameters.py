@@ -15,6 +15,7 @@ class ReviewQueryParams(BaseModel):
     severity: Union[SeverityEnum, SkipJsonSchema[None]] = None
     before: Union[float, SkipJsonSchema[None]] = None
     after: Union[float, SkipJsonSchema[None]] = None
+    cursor: Union[str, SkipJsonSchema[None]] = None
 
 
 class ReviewSummaryQueryParams(BaseModel):
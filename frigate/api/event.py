@@ -31,6 +31,12 @@ from frigate.api.defs.regenerate_query_parameters import (
     RegenerateQueryParameters,
 )
 from frigate.api.defs.tags import Tags
+from frigate.api.pagination import (
+    invalid_cursor_response,
+    paginate,
+    paginated_response,
+)
+from frigate.api.read_pool import ReadRoute, read_only_endpoint
 from frigate.const import (
     CLIPS_DIR,
 )
@@ -41,10 +47,11 @@ from frigate.util.builtin import get_tz_modifiers
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter(tags=[Tags.events])
+router = APIRouter(tags=[Tags.events], route_class=ReadRoute)
 
 
 @router.get("/events")
+@read_only_endpoint
 def events(params: EventsQueryParams = Depends()):
     camera = params.camera
     cameras = params.cameras
@@ -233,31 +240,31 @@ def events(params: EventsQueryParams = Depends()):
     if len(clauses) == 0:
         clauses.append((True))
 
-    if sort:
+    events = Event.select(*selected_columns).where(reduce(operator.and_, clauses))
+
+    if sort == "score_asc" or sort == "score_desc":
+        if params.cursor is not None:
+            # cursors are positions in time
+            return invalid_cursor_response()
+
         if sort == "score_asc":
-            order_by = Event.data["score"].asc()
-        elif sort == "score_desc":
-            order_by = Event.data["score"].desc()
-        elif sort == "date_asc":
-            order_by = Event.start_time.asc()
-        elif sort == "date_desc":
-            order_by = Event.start_time.desc()
+            events = events.order_by(Event.data["score"].asc())
+        else:
+            events = events.order_by(Event.data["score"].desc())
     else:
-        order_by = Event.start_time.desc()
-
-    events = (
-        Event.select(*selected_columns)
-        .where(reduce(operator.and_, clauses))
-        .order_by(order_by)
-        .limit(limit)
-        .dicts()
-        .iterator()
-    )
+        try:
+            events = paginate(
+                events, Event, params.cursor, descending=sort != "date_asc"
+            )
+        except ValueError:
+            return invalid_cursor_response()
 
-    return JSONResponse(content=list(events))
+    events = list(events.limit(limit).dicts().iterator())
+    return paginated_response(events, limit)
 
 
 @router.get("/events/explore")
+@read_only_endpoint
 def events_explore(limit: int = 10):
     # get distinct labels for all events
     distinct_labels = Event.select(Event.label).distinct().order_by(Event.label)
@@ -319,6 +326,7 @@ def events_explore(limit: int = 10):
 
 
 @router.get("/event_ids")
+@read_only_endpoint
 def event_ids(ids: str):
     ids = ids.split(",")
 
@@ -590,6 +598,7 @@ def events_search(request: Request, params: EventsSearchQueryParams = Depends())
 
 
 @router.get("/events/summary")
+@read_only_endpoint
 def events_summary(params: EventsSummaryQueryParams = Depends()):
     tz_name = params.timezone
     hour_modifier, minute_modifier, seconds_offset = get_tz_modifiers(tz_name)
@@ -635,6 +644,7 @@ def events_summary(params: EventsSummaryQueryParams = Depends()):
 
 
 @router.get("/events/{event_id}")
+@read_only_endpoint
 def event(event_id: str):
     try:
         return model_to_dict(Event.get(Event.id == event_id))
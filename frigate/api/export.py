@@ -12,6 +12,7 @@ from fastapi.responses import JSONResponse
 from peewee import DoesNotExist
 
 from frigate.api.defs.tags import Tags
+from frigate.api.read_pool import ReadRoute, read_only_endpoint
 from frigate.const import EXPORT_DIR
 from frigate.models import Export, Previews, Recordings
 from frigate.record.export import (
@@ -22,10 +23,11 @@ from frigate.record.export import (
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter(tags=[Tags.export])
+router = APIRouter(tags=[Tags.export], route_class=ReadRoute)
 
 
 @router.get("/exports")
+@read_only_endpoint
 def get_exports():
     exports = Export.select().order_by(Export.date.desc()).dicts().iterator()
     return JSONResponse(content=[e for e in exports])
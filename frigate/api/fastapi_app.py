@@ -12,7 +12,9 @@ from starlette_context.plugins import Plugin
 
 from frigate.api import app as main_app
 from frigate.api import auth, event, export, media, notification, preview, review
-from frigate.api.auth import get_jwt_secret, limiter
+from frigate.api.auth import VerifiedTokenCache, get_jwt_secret, limiter
+from frigate.api.read_pool import ReadConnectionPool
+from frigate.camera.latest_frame import LatestFrameService
 from frigate.comms.event_metadata_updater import (
     EventMetadataPublisher,
 )
@@ -20,6 +22,7 @@ from frigate.config import FrigateConfig
 from frigate.embeddings import EmbeddingsContext
 from frigate.events.external import ExternalEventProcessor
 from frigate.ptz.onvif import OnvifController
+from frigate.record.keyframes import RecordingFrameService
 from frigate.stats.emitter import StatsEmitter
 from frigate.storage import StorageMaintainer
 
@@ -65,27 +68,24 @@ def create_fastapi_app(
         plugins=(plugins.ForwardedForPlugin(),),
     )
 
-    # Middleware to connect to DB before and close connection after request
-    # https://github.com/fastapi/full-stack-fastapi-template/issues/224#issuecomment-737423886
+    # GET endpoints run on threads with their own read-only connection,
+    # other endpoints connect on the thread they run on
     # https://fastapi.tiangolo.com/tutorial/middleware/#before-and-after-the-response
     @app.middleware("http")
     async def frigate_middleware(request: Request, call_next):
         # Before request
         check_csrf(request)
-        if database.is_closed():
-            database.connect()
-
-        response = await call_next(request)
-
-        # After request https://stackoverflow.com/a/75487519
-        if not database.is_closed():
-            database.close()
-        return response
+        return await call_next(request)
 
     @app.on_event("startup")
     async def startup():
         logger.info("FastAPI started")
 
+    @app.on_event("shutdown")
+    async def shutdown():
+        if app.read_pool is not None:
+            app.read_pool.close()
+
     # Rate limiter (used for login endpoint)
     auth.rateLimiter.set_limit(frigate_config.auth.failed_login_rate_limit or "")
     app.state.limiter = limiter
@@ -104,8 +104,11 @@ def create_fastapi_app(
     app.include_router(media.router)
     # App Properties
     app.frigate_config = frigate_config
+    app.read_pool = ReadConnectionPool(database)
     app.embeddings = embeddings
     app.detected_frames_processor = detected_frames_processor
+    app.latest_frames = LatestFrameService(detected_frames_processor)
+    app.recording_frames = RecordingFrameService()
     app.storage_maintainer = storage_maintainer
     app.camera_error_image = None
     app.onvif = onvif
@@ -113,5 +116,6 @@ def create_fastapi_app(
     app.event_metadata_updater = event_metadata_updater
     app.external_processor = external_processor
     app.jwt_token = get_jwt_secret() if frigate_config.auth.enabled else None
+    app.jwt_token_cache = VerifiedTokenCache()
 
     return app
@@ -1,25 +1,35 @@
 """Image and video apis."""
 
+import asyncio
 import base64
 import glob
 import logging
 import os
 import subprocess as sp
-import time
 from datetime import datetime, timedelta, timezone
 from pathlib import Path as FilePath
+from typing import Callable, Optional
 from urllib.parse import unquote
 
 import cv2
 import numpy as np
 import pytz
 from fastapi import APIRouter, Path, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
 from fastapi.params import Depends
 from fastapi.responses import FileResponse, JSONResponse, StreamingResponse
 from pathvalidate import sanitize_filename
 from peewee import DoesNotExist, fn
 from tzlocal import get_localzone_name
 
+from frigate.api.conditional import (
+    IMMUTABLE_CACHE_CONTROL,
+    REVALIDATE_CACHE_CONTROL,
+    get_etag,
+    get_validator_headers,
+    is_not_modified,
+    not_modified_response,
+)
 from frigate.api.defs.media_query_parameters import (
     Extension,
     MediaEventsSnapshotQueryParams,
@@ -27,22 +37,39 @@ from frigate.api.defs.media_query_parameters import (
     MediaMjpegFeedQueryParams,
 )
 from frigate.api.defs.tags import Tags
+from frigate.api.pagination import (
+    invalid_cursor_response,
+    paginate,
+    paginated_response,
+)
+from frigate.api.read_pool import ReadRoute, read_only_endpoint
+from frigate.camera.latest_frame import LatestFrameService
 from frigate.config import FrigateConfig
 from frigate.const import (
     CACHE_DIR,
     CLIPS_DIR,
     MAX_SEGMENT_DURATION,
-    PREVIEW_FRAME_TYPE,
     RECORD_DIR,
 )
-from frigate.models import Event, Previews, Recordings, Regions, ReviewSegment
+from frigate.models import (
+    Event,
+    Previews,
+    Recordings,
+    RecordingsRollup,
+    Regions,
+    ReviewSegment,
+)
+from frigate.output.preview_cache import FOLDER_PREVIEW_MEDIA, preview_media_cache
+from frigate.output.preview_index import get_cache_image_name, get_preview_frame_times
+from frigate.record.keyframes import RecordingFrameService
+from frigate.record.vod import vod_playlist_cache
 from frigate.util.builtin import get_tz_modifiers
 from frigate.util.image import get_image_from_recording
 
 logger = logging.getLogger(__name__)
 
 
-router = APIRouter(tags=[Tags.media])
+router = APIRouter(tags=[Tags.media], route_class=ReadRoute)
 
 
 @router.get("/{camera_name}")
@@ -63,7 +90,7 @@ def mjpeg_feed(
         # return a multipart response
         return StreamingResponse(
             imagestream(
-                request.app.detected_frames_processor,
+                request.app.latest_frames,
                 camera_name,
                 params.fps,
                 params.height,
@@ -78,24 +105,31 @@ def mjpeg_feed(
         )
 
 
-def imagestream(
-    detected_frames_processor, camera_name: str, fps: int, height: int, draw_options
+async def imagestream(
+    latest_frames: LatestFrameService,
+    camera_name: str,
+    fps: int,
+    height: int,
+    draw_options,
 ):
     while True:
         # max out at specified FPS
-        time.sleep(1 / fps)
-        frame = detected_frames_processor.get_current_frame(camera_name, draw_options)
-        if frame is None:
-            frame = np.zeros((height, int(height * 16 / 9), 3), np.uint8)
+        await asyncio.sleep(1 / fps)
+        jpg = await run_in_threadpool(
+            latest_frames.get_encoded_frame,
+            camera_name,
+            draw_options,
+            height,
+            "jpg",
+            [int(cv2.IMWRITE_JPEG_QUALITY), 70],
+        )
 
-        width = int(height * frame.shape[1] / frame.shape[0])
-        frame = cv2.resize(frame, dsize=(width, height), interpolation=cv2.INTER_LINEAR)
+        if jpg is None:
+            frame = np.zeros((height, int(height * 16 / 9), 3), np.uint8)
+            _, img = cv2.imencode(".jpg", frame, [int(cv2.IMWRITE_JPEG_QUALITY), 70])
+            jpg = img.tobytes()
 
-        ret, jpg = cv2.imencode(".jpg", frame, [int(cv2.IMWRITE_JPEG_QUALITY), 70])
-        yield (
-            b"--frame\r\n"
-            b"Content-Type: image/jpeg\r\n\r\n" + bytearray(jpg.tobytes()) + b"\r\n\r\n"
-        )
+        yield (b"--frame\r\nContent-Type: image/jpeg\r\n\r\n" + jpg + b"\r\n\r\n")
 
 
 @router.get("/{camera_name}/ptz/info")
@@ -128,19 +162,50 @@ def latest_frame(
     }
     quality = params.quality
 
-    if camera_name in request.app.frigate_config.cameras:
-        frame = request.app.detected_frames_processor.get_current_frame(
-            camera_name, draw_options
+    if params.height is not None and params.height < 0:
+        return JSONResponse(
+            content=f"Invalid height requested :: {params.height}",
+            status_code=400,
         )
+
+    if camera_name in request.app.frigate_config.cameras:
+        latest_frames: LatestFrameService = request.app.latest_frames
         retry_interval = float(
             request.app.frigate_config.cameras.get(camera_name).ffmpeg.retry_interval
             or 10
         )
+        img = None
+        headers = {"Content-Type": f"image/{extension}", "Cache-Control": "no-store"}
+        frame_time = latest_frames.get_frame_time(camera_name)
+
+        if datetime.now().timestamp() <= frame_time + retry_interval:
+            # without Last-Modified, there are several frames every second
+            headers.update(
+                get_validator_headers(
+                    get_etag(
+                        camera_name,
+                        frame_time,
+                        extension.value,
+                        sorted(request.query_params.multi_items()),
+                    ),
+                    None,
+                    REVALIDATE_CACHE_CONTROL,
+                )
+            )
 
-        if frame is None or datetime.now().timestamp() > (
-            request.app.detected_frames_processor.get_current_frame_time(camera_name)
-            + retry_interval
-        ):
+            if is_not_modified(request, headers["ETag"]):
+                return not_modified_response(headers)
+
+            # encoded frames are shared between all requests for the same frame
+            img = latest_frames.get_encoded_frame(
+                camera_name,
+                draw_options,
+                params.height,
+                extension.value,
+                [int(cv2.IMWRITE_WEBP_QUALITY), quality],
+            )
+
+        if img is None:
             if request.app.camera_error_image is None:
                 error_image = glob.glob("/opt/frigate/frigate/images/camera-error.jpg")
 
@@ -151,32 +216,39 @@ def latest_frame(
 
             frame = request.app.camera_error_image
 
-        height = int(params.height or str(frame.shape[0]))
-        width = int(height * frame.shape[1] / frame.shape[0])
+            if frame is None:
+                return JSONResponse(
+                    content={"success": False, "message": "Unable to get valid frame"},
+                    status_code=500,
+                )
 
-        if frame is None:
-            return JSONResponse(
-                content={"success": False, "message": "Unable to get valid frame"},
-                status_code=500,
-            )
+            height = int(params.height or str(frame.shape[0]))
+            width = int(height * frame.shape[1] / frame.shape[0])
 
-        if height < 1 or width < 1:
-            return JSONResponse(
-                content="Invalid height / width requested :: {} / {}".format(
-                    height, width
-                ),
-                status_code=400,
-            )
+            if height < 1 or width < 1:
+                return JSONResponse(
+                    content="Invalid height / width requested :: {} / {}".format(
+                        height, width
+                    ),
+                    status_code=400,
+                )
 
-        frame = cv2.resize(frame, dsize=(width, height), interpolation=cv2.INTER_AREA)
+            frame = cv2.resize(
+                frame, dsize=(width, height), interpolation=cv2.INTER_AREA
+            )
+            _, img = cv2.imencode(
+                f".{extension}", frame, [int(cv2.IMWRITE_WEBP_QUALITY), quality]
+            )
+            img = img.tobytes()
+            headers = {
+                "Content-Type": f"image/{extension}",
+                "Cache-Control": "no-store",
+            }
 
-        ret, img = cv2.imencode(
-            f".{extension}", frame, [int(cv2.IMWRITE_WEBP_QUALITY), quality]
-        )
         return Response(
-            content=img.tobytes(),
+            content=img,
             media_type=f"image/{extension}",
-            headers={"Content-Type": f"image/{extension}", "Cache-Control": "no-store"},
+            headers=headers,
         )
     elif camera_name == "birdseye" and request.app.frigate_config.birdseye.restream:
         frame = cv2.cvtColor(
@@ -222,6 +294,7 @@ def get_snapshot_from_recording(
         Recordings.select(
             Recordings.path,
             Recordings.start_time,
+            Recordings.keyframes,
         )
         .where(
             (
@@ -237,13 +310,20 @@ def get_snapshot_from_recording(
     try:
         recording: Recordings = recording_query.get()
         time_in_segment = frame_time - recording.start_time
-        codec = "png" if format == "png" else "mjpeg"
-        config: FrigateConfig = request.app.frigate_config
+        recording_frames: RecordingFrameService = request.app.recording_frames
 
-        image_data = get_image_from_recording(
-            config.ffmpeg, recording.path, time_in_segment, codec, height
+        image_data = recording_frames.get_encoded_frame(
+            recording.path, time_in_segment, recording.keyframes, format, height
         )
 
+        if image_data is None:
+            # the segment can't be decoded without ffmpeg
+            codec = "png" if format == "png" else "mjpeg"
+            config: FrigateConfig = request.app.frigate_config
+            image_data = get_image_from_recording(
+                config.ffmpeg, recording.path, time_in_segment, codec, height
+            )
+
         if not image_data:
             return JSONResponse(
                 content=(
@@ -280,6 +360,7 @@ def submit_recording_snapshot_to_plus(
         Recordings.select(
             Recordings.path,
             Recordings.start_time,
+            Recordings.keyframes,
         )
         .where(
             (
@@ -296,20 +377,29 @@ def submit_recording_snapshot_to_plus(
         config: FrigateConfig = request.app.frigate_config
         recording: Recordings = recording_query.get()
         time_in_segment = frame_time - recording.start_time
-        image_data = get_image_from_recording(
-            config.ffmpeg, recording.path, time_in_segment, "png"
+        recording_frames: RecordingFrameService = request.app.recording_frames
+        nd = recording_frames.get_frame(
+            recording.path, time_in_segment, recording.keyframes
         )
 
-        if not image_data:
-            return JSONResponse(
-                content={
-                    "success": False,
-                    "message": f"Unable to parse frame at time {frame_time}",
-                },
-                status_code=404,
+        if nd is None:
+            # the segment can't be decoded without ffmpeg
+            image_data = get_image_from_recording(
+                config.ffmpeg, recording.path, time_in_segment, "png"
             )
 
-        nd = cv2.imdecode(np.frombuffer(image_data, dtype=np.int8), cv2.IMREAD_COLOR)
+            if not image_data:
+                return JSONResponse(
+                    content={
+                        "success": False,
+                        "message": f"Unable to parse frame at time {frame_time}",
+                    },
+                    status_code=404,
+                )
+
+            nd = cv2.imdecode(
+                np.frombuffer(image_data, dtype=np.int8), cv2.IMREAD_COLOR
+            )
         request.app.frigate_config.plus_api.upload_image(nd, camera_name)
 
         return JSONResponse(
@@ -354,51 +444,41 @@ def get_recordings_storage_usage(request: Request):
 
 
 @router.get("/{camera_name}/recordings/summary")
+@read_only_endpoint
 def recordings_summary(camera_name: str, timezone: str = "utc"):
     """Returns hourly summary for recordings of given camera"""
     hour_modifier, minute_modifier, seconds_offset = get_tz_modifiers(timezone)
+    # rollups are kept per 15 minutes so they fit in the hours of any timezone
     recording_groups = (
-        Recordings.select(
-            fn.strftime(
-                "%Y-%m-%d %H",
-                fn.datetime(
-                    Recordings.start_time, "unixepoch", hour_modifier, minute_modifier
-                ),
-            ).alias("hour"),
-            fn.SUM(Recordings.duration).alias("duration"),
-            fn.SUM(Recordings.motion).alias("motion"),
-            fn.SUM(Recordings.objects).alias("objects"),
-        )
-        .where(Recordings.camera == camera_name)
-        .group_by((Recordings.start_time + seconds_offset).cast("int") / 3600)
-        .order_by(Recordings.start_time.desc())
-        .namedtuples()
-    )
-
-    event_groups = (
-        Event.select(
+        RecordingsRollup.select(
             fn.strftime(
                 "%Y-%m-%d %H",
                 fn.datetime(
-                    Event.start_time, "unixepoch", hour_modifier, minute_modifier
+                    RecordingsRollup.start_time,
+                    "unixepoch",
+                    hour_modifier,
+                    minute_modifier,
                 ),
             ).alias("hour"),
-            fn.COUNT(Event.id).alias("count"),
-        )
-        .where(Event.camera == camera_name, Event.has_clip)
-        .group_by((Event.start_time + seconds_offset).cast("int") / 3600)
+            fn.SUM(RecordingsRollup.duration).alias("duration"),
+            fn.SUM(RecordingsRollup.motion).alias("motion"),
+            fn.SUM(RecordingsRollup.objects).alias("objects"),
+            fn.SUM(RecordingsRollup.events).alias("events"),
+        )
+        .where(RecordingsRollup.camera == camera_name)
+        .group_by((RecordingsRollup.start_time + seconds_offset).cast("int") / 3600)
+        .having(fn.SUM(RecordingsRollup.segments) > 0)
+        .order_by(fn.MAX(RecordingsRollup.start_time).desc())
         .namedtuples()
     )
 
-    event_map = {g.hour: g.count for g in event_groups}
-
     days = {}
 
     for recording_group in recording_groups:
         parts = recording_group.hour.split()
         hour = parts[1]
         day = parts[0]
-        events_count = event_map.get(recording_group.hour, 0)
+        events_count = recording_group.events
         hour_data = {
             "hour": hour,
             "events": events_count,
@@ -416,33 +496,36 @@ def recordings_summary(camera_name: str, timezone: str = "utc"):
 
 
 @router.get("/{camera_name}/recordings")
+@read_only_endpoint
 def recordings(
     camera_name: str,
     after: float = (datetime.now() - timedelta(hours=1)).timestamp(),
     before: float = datetime.now().timestamp(),
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
 ):
     """Return specific camera recordings between the given 'after'/'end' times. If not provided the last hour will be used"""
-    recordings = (
-        Recordings.select(
-            Recordings.id,
-            Recordings.start_time,
-            Recordings.end_time,
-            Recordings.segment_size,
-            Recordings.motion,
-            Recordings.objects,
-            Recordings.duration,
-        )
-        .where(
-            Recordings.camera == camera_name,
-            Recordings.end_time >= after,
-            Recordings.start_time <= before,
-        )
-        .order_by(Recordings.start_time)
-        .dicts()
-        .iterator()
+    recordings = Recordings.select(
+        Recordings.id,
+        Recordings.start_time,
+        Recordings.end_time,
+        Recordings.segment_size,
+        Recordings.motion,
+        Recordings.objects,
+        Recordings.duration,
+    ).where(
+        Recordings.camera == camera_name,
+        Recordings.end_time >= after,
+        Recordings.start_time <= before,
     )
 
-    return JSONResponse(content=list(recordings))
+    try:
+        recordings = paginate(recordings, Recordings, cursor, descending=False)
+    except ValueError:
+        return invalid_cursor_response()
+
+    recordings = list(recordings.limit(limit).dicts().iterator())
+    return paginated_response(recordings, limit)
 
 
 @router.get("/{camera_name}/start/{start_ts}/end/{end_ts}/clip.mp4")
@@ -487,6 +570,33 @@ def recording_clip(
         .order_by(Recordings.start_time.asc())
     )
 
+    recordings = list(recordings)
+
+    if not recordings:
+        return JSONResponse(
+            content={
+                "success": False,
+                "message": "No recordings found.",
+            },
+            status_code=404,
+        )
+
+    # the clip only changes when segments are added or removed, it is
+    # revalidated as the headers are sent before ffmpeg is known to succeed
+    validator_headers = get_validator_headers(
+        get_etag(
+            camera_name,
+            start_ts,
+            end_ts,
+            [(r.path, r.start_time, r.end_time) for r in recordings],
+        ),
+        None,
+        REVALIDATE_CACHE_CONTROL,
+    )
+
+    if is_not_modified(request, validator_headers["ETag"]):
+        return not_modified_response(validator_headers)
+
     file_name = sanitize_filename(f"playlist_{camera_name}_{start_ts}-{end_ts}.txt")
     file_path = f"/tmp/cache/{file_name}"
     with open(file_path, "w") as file:
@@ -535,19 +645,28 @@ def recording_clip(
     return StreamingResponse(
         run_download(ffmpeg_cmd, file_path),
         media_type="video/mp4",
+        headers=validator_headers,
     )
 
 
 @router.get("/vod/{camera_name}/start/{start_ts}/end/{end_ts}")
+@read_only_endpoint
 def vod_ts(camera_name: str, start_ts: float, end_ts: float):
+    cached_playlist = vod_playlist_cache.get(camera_name, start_ts, end_ts)
+
+    if cached_playlist is not None:
+        return JSONResponse(content=cached_playlist)
+
+    # segments can not be longer than MAX_SEGMENT_DURATION so bounding
+    # the start time allows the (camera, start_time) index to be used
     recordings = (
         Recordings.select(Recordings.path, Recordings.duration, Recordings.end_time)
         .where(
-            Recordings.start_time.between(start_ts, end_ts)
-            | Recordings.end_time.between(start_ts, end_ts)
-            | ((start_ts > Recordings.start_time) & (end_ts < Recordings.end_time))
+            (Recordings.camera == camera_name)
+            & (Recordings.start_time > start_ts - MAX_SEGMENT_DURATION)
+            & (Recordings.start_time < end_ts)
+            & (Recordings.end_time > start_ts)
         )
-        .where(Recordings.camera == camera_name)
         .order_by(Recordings.start_time.asc())
         .iterator()
     )
@@ -590,19 +709,20 @@ def vod_ts(camera_name: str, start_ts: float, end_ts: float):
         )
 
     hour_ago = datetime.now() - timedelta(hours=1)
-    return JSONResponse(
-        content={
-            "cache": hour_ago.timestamp() > start_ts,
-            "discontinuity": False,
-            "consistentSequenceMediaInfo": True,
-            "durations": durations,
-            "segment_duration": max(durations),
-            "sequences": [{"clips": clips}],
-        }
-    )
+    playlist = {
+        "cache": hour_ago.timestamp() > start_ts,
+        "discontinuity": False,
+        "consistentSequenceMediaInfo": True,
+        "durations": durations,
+        "segment_duration": max(durations),
+        "sequences": [{"clips": clips}],
+    }
+    vod_playlist_cache.set(camera_name, start_ts, end_ts, playlist)
+    return JSONResponse(content=playlist)
 
 
 @router.get("/vod/{year_month}/{day}/{hour}/{camera_name}")
+@read_only_endpoint
 def vod_hour_no_timezone(year_month: str, day: int, hour: int, camera_name: str):
     """VOD for specific hour. Uses the default timezone (UTC)."""
     return vod_hour(
@@ -611,6 +731,7 @@ def vod_hour_no_timezone(year_month: str, day: int, hour: int, camera_name: str)
 
 
 @router.get("/vod/{year_month}/{day}/{hour}/{camera_name}/{tz_name}")
+@read_only_endpoint
 def vod_hour(year_month: str, day: int, hour: int, camera_name: str, tz_name: str):
     parts = year_month.split("-")
     start_date = (
@@ -625,6 +746,7 @@ def vod_hour(year_month: str, day: int, hour: int, camera_name: str, tz_name: st
 
 
 @router.get("/vod/event/{event_id}")
+@read_only_endpoint
 def vod_event(event_id: str):
     try:
         event: Event = Event.get(Event.id == event_id)
@@ -684,6 +806,7 @@ def event_snapshot(
 ):
     event_complete = False
     jpg_bytes = None
+    validator_headers = {}
     try:
         event = Event.get(Event.id == event_id, Event.end_time != None)
         event_complete = True
@@ -692,10 +815,19 @@ def event_snapshot(
                 content={"success": False, "message": "Snapshot not available"},
                 status_code=404,
             )
+        snapshot_path = os.path.join(CLIPS_DIR, f"{event.camera}-{event.id}.jpg")
+        stat = os.stat(snapshot_path)
+        validator_headers = get_validator_headers(
+            get_etag(event.id, stat.st_mtime_ns, stat.st_size),
+            stat.st_mtime,
+            IMMUTABLE_CACHE_CONTROL,
+        )
+
+        if is_not_modified(request, validator_headers["ETag"], stat.st_mtime):
+            return not_modified_response(validator_headers)
+
         # read snapshot from disk
-        with open(
-            os.path.join(CLIPS_DIR, f"{event.camera}-{event.id}.jpg"), "rb"
-        ) as image_file:
+        with open(snapshot_path, "rb") as image_file:
             jpg_bytes = image_file.read()
     except DoesNotExist:
         # see if the object is currently being tracked
@@ -730,6 +862,7 @@ def event_snapshot(
     headers = {
         "Content-Type": "image/jpeg",
         "Cache-Control": "private, max-age=31536000" if event_complete else "no-store",
+        **validator_headers,
     }
 
     if params.download:
@@ -753,10 +886,20 @@ def event_thumbnail(
 ):
     thumbnail_bytes = None
     event_complete = False
+    validator_headers = {}
     try:
         event = Event.get(Event.id == event_id)
         if event.end_time is not None:
             event_complete = True
+            validator_headers = get_validator_headers(
+                get_etag(event.id, event.end_time, format),
+                event.end_time,
+                f"private, max-age={max_cache_age}, immutable",
+            )
+
+            if is_not_modified(request, validator_headers["ETag"], event.end_time):
+                return not_modified_response(validator_headers)
+
         thumbnail_bytes = base64.b64decode(event.thumbnail)
     except DoesNotExist:
         # see if the object is currently being tracked
@@ -803,6 +946,7 @@ def event_thumbnail(
             if event_complete
             else "no-store",
             "Content-Type": "image/jpeg",
+            **validator_headers,
         },
     )
 
@@ -813,15 +957,15 @@ def grid_snapshot(
 ):
     if camera_name in request.app.frigate_config.cameras:
         detect = request.app.frigate_config.cameras[camera_name].detect
-        frame = request.app.detected_frames_processor.get_current_frame(camera_name, {})
+        latest_frames: LatestFrameService = request.app.latest_frames
+        frame = latest_frames.get_frame(camera_name, {})
         retry_interval = float(
             request.app.frigate_config.cameras.get(camera_name).ffmpeg.retry_interval
             or 10
         )
 
         if frame is None or datetime.now().timestamp() > (
-            request.app.detected_frames_processor.get_current_frame_time(camera_name)
-            + retry_interval
+            latest_frames.get_frame_time(camera_name) + retry_interval
         ):
             return JSONResponse(
                 content={"success": False, "message": "Unable to get valid frame"},
@@ -841,6 +985,8 @@ def grid_snapshot(
                 status_code=500,
             )
 
+        # the latest frame is shared with other requests
+        frame = frame.copy()
         color_arg = color.lower()
 
         if color_arg == "red":
@@ -917,7 +1063,7 @@ def grid_snapshot(
         ret, jpg = cv2.imencode(".jpg", frame, [int(cv2.IMWRITE_JPEG_QUALITY), 70])
 
         return Response(
-            jpg.tobytes,
+            jpg.tobytes(),
             media_type="image/jpeg",
             headers={"Cache-Control": "no-store"},
         )
@@ -931,6 +1077,7 @@ def grid_snapshot(
 @router.get("/events/{event_id}/snapshot-clean.png")
 def event_snapshot_clean(request: Request, event_id: str, download: bool = False):
     png_bytes = None
+    validator_headers = {}
     try:
         event = Event.get(Event.id == event_id)
         snapshot_config = request.app.frigate_config.cameras[event.camera].snapshots
@@ -981,9 +1128,18 @@ def event_snapshot_clean(request: Request, event_id: str, download: bool = False
                     },
                     status_code=404,
                 )
-            with open(
-                os.path.join(CLIPS_DIR, f"{event.camera}-{event.id}-clean.png"), "rb"
-            ) as image_file:
+
+            stat = os.stat(clean_snapshot_path)
+            validator_headers = get_validator_headers(
+                get_etag(event.id, stat.st_mtime_ns, stat.st_size),
+                stat.st_mtime,
+                IMMUTABLE_CACHE_CONTROL,
+            )
+
+            if is_not_modified(request, validator_headers["ETag"], stat.st_mtime):
+                return not_modified_response(validator_headers)
+
+            with open(clean_snapshot_path, "rb") as image_file:
                 png_bytes = image_file.read()
         except Exception:
             logger.error(f"Unable to load clean png for event: {event.id}")
@@ -998,6 +1154,7 @@ def event_snapshot_clean(request: Request, event_id: str, download: bool = False
     headers = {
         "Content-Type": "image/png",
         "Cache-Control": "private, max-age=31536000",
+        **validator_headers,
     }
 
     if download:
@@ -1035,13 +1192,23 @@ def event_clip(request: Request, event_id: str):
         )
         return recording_clip(request, event.camera, event.start_time, end_ts)
 
+    stat = os.stat(clip_path)
+    validator_headers = get_validator_headers(
+        get_etag(event.id, stat.st_mtime_ns, stat.st_size),
+        stat.st_mtime,
+        "no-cache" if event.end_time is None else IMMUTABLE_CACHE_CONTROL,
+    )
+
+    if is_not_modified(request, validator_headers["ETag"], stat.st_mtime):
+        return not_modified_response(validator_headers)
+
     headers = {
         "Content-Description": "File Transfer",
-        "Cache-Control": "no-cache",
         "Content-Type": "video/mp4",
-        "Content-Length": str(os.path.getsize(clip_path)),
+        "Content-Length": str(stat.st_size),
         # nginx: https://nginx.org/en/docs/http/ngx_http_proxy_module.html#proxy_ignore_headers
         "X-Accel-Redirect": f"/clips/{file_name}",
+        **validator_headers,
     }
 
     return FileResponse(
@@ -1068,19 +1235,32 @@ def event_preview(request: Request, event_id: str):
     return preview_gif(request, event.camera, start_ts, end_ts)
 
 
-@router.get("/{camera_name}/start/{start_ts}/end/{end_ts}/preview.gif")
-def preview_gif(
-    request: Request,
-    camera_name: str,
-    start_ts: float,
-    end_ts: float,
-    max_cache_age: int = Query(
-        2592000, description="Max cache age in seconds. Default 30 days in seconds."
-    ),
-):
-    if datetime.fromtimestamp(start_ts) < datetime.now().replace(minute=0, second=0):
-        # has preview mp4
-        preview: Previews = (
+def _create_with_ffmpeg(
+    ffmpeg_cmd: list[str], input: Optional[str] = None
+) -> Callable[[str], bool]:
+    """Create a file by running ffmpeg with the path as the output."""
+
+    def create(path: str) -> bool:
+        process = sp.run(
+            ffmpeg_cmd + [path],
+            input=str.encode(input) if input is not None else None,
+            capture_output=True,
+        )
+
+        if process.returncode != 0:
+            logger.error(process.stderr)
+            return False
+
+        return True
+
+    return create
+
+
+def _get_preview_recording(
+    camera_name: str, start_ts: float, end_ts: float
+) -> Optional[Previews]:
+    try:
+        return (
             Previews.select(
                 Previews.camera,
                 Previews.path,
@@ -1097,8 +1277,58 @@ def preview_gif(
             .limit(1)
             .get()
         )
+    except DoesNotExist:
+        return None
+
+
+def _get_preview_frames_input(
+    camera_name: str, start_ts: float, end_ts: float
+) -> Optional[str]:
+    """Get the concat input of the cached preview frames in the time range."""
+    selected_previews = []
+
+    for frame_time in get_preview_frame_times(camera_name, start_ts, end_ts):
+        selected_previews.append(
+            f"file '{get_cache_image_name(camera_name, frame_time)}'"
+        )
+        selected_previews.append("duration 0.12")
+
+    if not selected_previews:
+        return None
+
+    last_file = selected_previews[-2]
+    selected_previews.append(last_file)
+    return "\n".join(selected_previews)
+
 
-        if not preview:
+def _get_source_stat(path: str) -> Optional[list]:
+    """Get the mtime and size identifying the contents of a source file."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+
+    return [path, stat.st_mtime_ns, stat.st_size]
+
+
+@router.get("/{camera_name}/start/{start_ts}/end/{end_ts}/preview.gif")
+def preview_gif(
+    request: Request,
+    camera_name: str,
+    start_ts: float,
+    end_ts: float,
+    max_cache_age: int = Query(
+        2592000, description="Max cache age in seconds. Default 30 days in seconds."
+    ),
+):
+    config: FrigateConfig = request.app.frigate_config
+
+    if datetime.fromtimestamp(start_ts) < datetime.now().replace(minute=0, second=0):
+        # has preview mp4
+        preview = _get_preview_recording(camera_name, start_ts, end_ts)
+        source = _get_source_stat(preview.path) if preview else None
+
+        if not source:
             return JSONResponse(
                 content={"success": False, "message": "Preview not found"},
                 status_code=404,
@@ -1107,12 +1337,13 @@ def preview_gif(
         diff = start_ts - preview.start_time
         minutes = int(diff / 60)
         seconds = int(diff % 60)
-        config: FrigateConfig = request.app.frigate_config
+        ffmpeg_input = None
         ffmpeg_cmd = [
             config.ffmpeg.ffmpeg_path,
             "-hide_banner",
             "-loglevel",
             "warning",
+            "-y",
             "-ss",
             f"00:{minutes}:{seconds}",
             "-t",
@@ -1129,53 +1360,18 @@ def preview_gif(
             "gif",
             "-f",
             "gif",
-            "-",
         ]
-
-        process = sp.run(
-            ffmpeg_cmd,
-            capture_output=True,
-        )
-
-        if process.returncode != 0:
-            logger.error(process.stderr)
-            return JSONResponse(
-                content={"success": False, "message": "Unable to create preview gif"},
-                status_code=500,
-            )
-
-        gif_bytes = process.stdout
     else:
         # need to generate from existing images
-        preview_dir = os.path.join(CACHE_DIR, "preview_frames")
-        file_start = f"preview_{camera_name}"
-        start_file = f"{file_start}-{start_ts}.{PREVIEW_FRAME_TYPE}"
-        end_file = f"{file_start}-{end_ts}.{PREVIEW_FRAME_TYPE}"
-        selected_previews = []
-
-        for file in sorted(os.listdir(preview_dir)):
-            if not file.startswith(file_start):
-                continue
-
-            if file < start_file:
-                continue
+        ffmpeg_input = _get_preview_frames_input(camera_name, start_ts, end_ts)
 
-            if file > end_file:
-                break
-
-            selected_previews.append(f"file '{os.path.join(preview_dir, file)}'")
-            selected_previews.append("duration 0.12")
-
-        if not selected_previews:
+        if not ffmpeg_input:
             return JSONResponse(
                 content={"success": False, "message": "Preview not found"},
                 status_code=404,
             )
 
-        last_file = selected_previews[-2]
-        selected_previews.append(last_file)
-        config: FrigateConfig = request.app.frigate_config
-
+        source = ffmpeg_input
         ffmpeg_cmd = [
             config.ffmpeg.ffmpeg_path,
             "-hide_banner",
@@ -1196,26 +1392,25 @@ def preview_gif(
             "gif",
             "-f",
             "gif",
-            "-",
         ]
 
-        process = sp.run(
-            ffmpeg_cmd,
-            input=str.encode("\n".join(selected_previews)),
-            capture_output=True,
-        )
-
-        if process.returncode != 0:
-            logger.error(process.stderr)
-            return JSONResponse(
-                content={"success": False, "message": "Unable to create preview gif"},
-                status_code=500,
-            )
+    path = preview_media_cache.get_or_create(
+        camera_name,
+        start_ts,
+        end_ts,
+        "gif",
+        [ffmpeg_cmd, source],
+        _create_with_ffmpeg(ffmpeg_cmd, ffmpeg_input),
+    )
 
-        gif_bytes = process.stdout
+    if path is None:
+        return JSONResponse(
+            content={"success": False, "message": "Unable to create preview gif"},
+            status_code=500,
+        )
 
-    return Response(
-        gif_bytes,
+    return FileResponse(
+        path,
         media_type="image/gif",
         headers={
             "Cache-Control": f"private, max-age={max_cache_age}",
@@ -1247,32 +1442,14 @@ def preview_mp4(
             status_code=403,
         )
 
-    path = os.path.join(CACHE_DIR, file_name)
+    config: FrigateConfig = request.app.frigate_config
 
     if datetime.fromtimestamp(start_ts) < datetime.now().replace(minute=0, second=0):
         # has preview mp4
-        try:
-            preview: Previews = (
-                Previews.select(
-                    Previews.camera,
-                    Previews.path,
-                    Previews.duration,
-                    Previews.start_time,
-                    Previews.end_time,
-                )
-                .where(
-                    Previews.start_time.between(start_ts, end_ts)
-                    | Previews.end_time.between(start_ts, end_ts)
-                    | ((start_ts > Previews.start_time) & (end_ts < Previews.end_time))
-                )
-                .where(Previews.camera == camera_name)
-                .limit(1)
-                .get()
-            )
-        except DoesNotExist:
-            preview = None
+        preview = _get_preview_recording(camera_name, start_ts, end_ts)
+        source = _get_source_stat(preview.path) if preview else None
 
-        if not preview:
+        if not source:
             return JSONResponse(
                 content={"success": False, "message": "Preview not found"},
                 status_code=404,
@@ -1281,7 +1458,7 @@ def preview_mp4(
         diff = start_ts - preview.start_time
         minutes = int(diff / 60)
         seconds = int(diff % 60)
-        config: FrigateConfig = request.app.frigate_config
+        ffmpeg_input = None
         ffmpeg_cmd = [
             config.ffmpeg.ffmpeg_path,
             "-hide_banner",
@@ -1302,52 +1479,18 @@ def preview_mp4(
             "libx264",
             "-movflags",
             "+faststart",
-            path,
         ]
-
-        process = sp.run(
-            ffmpeg_cmd,
-            capture_output=True,
-        )
-
-        if process.returncode != 0:
-            logger.error(process.stderr)
-            return JSONResponse(
-                content={"success": False, "message": "Unable to create preview gif"},
-                status_code=500,
-            )
-
     else:
         # need to generate from existing images
-        preview_dir = os.path.join(CACHE_DIR, "preview_frames")
-        file_start = f"preview_{camera_name}"
-        start_file = f"{file_start}-{start_ts}.{PREVIEW_FRAME_TYPE}"
-        end_file = f"{file_start}-{end_ts}.{PREVIEW_FRAME_TYPE}"
-        selected_previews = []
-
-        for file in sorted(os.listdir(preview_dir)):
-            if not file.startswith(file_start):
-                continue
-
-            if file < start_file:
-                continue
-
-            if file > end_file:
-                break
+        ffmpeg_input = _get_preview_frames_input(camera_name, start_ts, end_ts)
 
-            selected_previews.append(f"file '{os.path.join(preview_dir, file)}'")
-            selected_previews.append("duration 0.12")
-
-        if not selected_previews:
+        if not ffmpeg_input:
             return JSONResponse(
                 content={"success": False, "message": "Preview not found"},
                 status_code=404,
             )
 
-        last_file = selected_previews[-2]
-        selected_previews.append(last_file)
-        config: FrigateConfig = request.app.frigate_config
-
+        source = ffmpeg_input
         ffmpeg_cmd = [
             config.ffmpeg.ffmpeg_path,
             "-hide_banner",
@@ -1366,21 +1509,22 @@ def preview_mp4(
             "libx264",
             "-movflags",
             "+faststart",
-            path,
         ]
 
-        process = sp.run(
-            ffmpeg_cmd,
-            input=str.encode("\n".join(selected_previews)),
-            capture_output=True,
-        )
+    path = preview_media_cache.get_or_create(
+        camera_name,
+        start_ts,
+        end_ts,
+        "mp4",
+        [ffmpeg_cmd, source],
+        _create_with_ffmpeg(ffmpeg_cmd, ffmpeg_input),
+    )
 
-        if process.returncode != 0:
-            logger.error(process.stderr)
-            return JSONResponse(
-                content={"success": False, "message": "Unable to create preview gif"},
-                status_code=500,
-            )
+    if path is None:
+        return JSONResponse(
+            content={"success": False, "message": "Unable to create preview gif"},
+            status_code=500,
+        )
 
     headers = {
         "Content-Description": "File Transfer",
@@ -1388,7 +1532,7 @@ def preview_mp4(
         "Content-Type": "video/mp4",
         "Content-Length": str(os.path.getsize(path)),
         # nginx: https://nginx.org/en/docs/http/ngx_http_proxy_module.html#proxy_ignore_headers
-        "X-Accel-Redirect": f"/cache/{file_name}",
+        "X-Accel-Redirect": f"/cache/{FOLDER_PREVIEW_MEDIA}/{os.path.basename(path)}",
     }
 
     return FileResponse(
@@ -1476,7 +1620,7 @@ def label_thumbnail(request: Request, camera_name: str, label: str):
     try:
         event_id = event_query.scalar()
 
-        return event_thumbnail(request, event_id, 60)
+        return event_thumbnail(request, event_id, 60, "ios")
     except DoesNotExist:
         frame = np.zeros((175, 175, 3), np.uint8)
         ret, jpg = cv2.imencode(".jpg", frame, [int(cv2.IMWRITE_JPEG_QUALITY), 70])
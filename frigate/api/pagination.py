@@ -0,0 +1,71 @@
+"""Keyset pagination for list endpoints."""
+
+import base64
+import json
+from typing import Optional
+
+from fastapi.responses import JSONResponse
+from peewee import Model, ModelSelect, Tuple
+
+# header with the cursor for the next page, only set when the page is full
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(start_time: float, id: str) -> str:
+    return base64.urlsafe_b64encode(json.dumps([start_time, id]).encode()).decode()
+
+
+def decode_cursor(cursor: str) -> tuple[float, str]:
+    """Decode a cursor, raises ValueError when it is not valid."""
+    try:
+        start_time, id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Invalid cursor {cursor}") from e
+
+    if not isinstance(start_time, (int, float)) or not isinstance(id, str):
+        raise ValueError(f"Invalid cursor {cursor}")
+
+    return start_time, id
+
+
+def paginate(
+    query: ModelSelect,
+    model: type[Model],
+    cursor: Optional[str],
+    descending: bool = True,
+) -> ModelSelect:
+    """Order a query by (start_time, id) and continue it after the cursor.
+
+    The position is found with the index on start_time, so a page takes the
+    same time at any depth.
+    """
+    if descending:
+        query = query.order_by(model.start_time.desc(), model.id.desc())
+    else:
+        query = query.order_by(model.start_time.asc(), model.id.asc())
+
+    if cursor is None:
+        return query
+
+    position = Tuple(model.start_time, model.id)
+    value = Tuple(*decode_cursor(cursor))
+    return query.where(position < value if descending else position > value)
+
+
+def invalid_cursor_response() -> JSONResponse:
+    return JSONResponse(
+        content={"success": False, "message": "Invalid cursor"},
+        status_code=400,
+    )
+
+
+def paginated_response(rows: list[dict], limit: Optional[int]) -> JSONResponse:
+    """Respond with the rows and the cursor of the next page if there may be one."""
+    headers = {}
+
+    if limit and len(rows) == limit:
+        headers[NEXT_CURSOR_HEADER] = encode_cursor(
+            rows[-1]["start_time"], rows[-1]["id"]
+        )
+
+    return JSONResponse(content=rows, headers=headers)
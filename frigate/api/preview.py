@@ -9,16 +9,18 @@ from fastapi import APIRouter
 from fastapi.responses import JSONResponse
 
 from frigate.api.defs.tags import Tags
-from frigate.const import CACHE_DIR, PREVIEW_FRAME_TYPE
+from frigate.api.read_pool import ReadRoute, read_only_endpoint
 from frigate.models import Previews
+from frigate.output.preview_index import get_cache_image_name, get_preview_frame_times
 
 logger = logging.getLogger(__name__)
 
 
-router = APIRouter(tags=[Tags.preview])
+router = APIRouter(tags=[Tags.preview], route_class=ReadRoute)
 
 
 @router.get("/preview/{camera_name}/start/{start_ts}/end/{end_ts}")
+@read_only_endpoint
 def preview_ts(camera_name: str, start_ts: float, end_ts: float):
     """Get all mp4 previews relevant for time period."""
     if camera_name != "all":
@@ -72,6 +74,7 @@ def preview_ts(camera_name: str, start_ts: float, end_ts: float):
 
 
 @router.get("/preview/{year_month}/{day}/{hour}/{camera_name}/{tz_name}")
+@read_only_endpoint
 def preview_hour(year_month: str, day: int, hour: int, camera_name: str, tz_name: str):
     """Get all mp4 previews relevant for time period given the timezone"""
     parts = year_month.split("-")
@@ -89,23 +92,10 @@ def preview_hour(year_month: str, day: int, hour: int, camera_name: str, tz_name
 @router.get("/preview/{camera_name}/start/{start_ts}/end/{end_ts}/frames")
 def get_preview_frames_from_cache(camera_name: str, start_ts: float, end_ts: float):
     """Get list of cached preview frames"""
-    preview_dir = os.path.join(CACHE_DIR, "preview_frames")
-    file_start = f"preview_{camera_name}"
-    start_file = f"{file_start}-{start_ts}.{PREVIEW_FRAME_TYPE}"
-    end_file = f"{file_start}-{end_ts}.{PREVIEW_FRAME_TYPE}"
-    selected_previews = []
-
-    for file in sorted(os.listdir(preview_dir)):
-        if not file.startswith(file_start):
-            continue
-
-        if file < start_file:
-            continue
-
-        if file > end_file:
-            break
-
-        selected_previews.append(file)
+    selected_previews = [
+        os.path.basename(get_cache_image_name(camera_name, frame_time))
+        for frame_time in get_preview_frame_times(camera_name, start_ts, end_ts)
+    ]
 
     return JSONResponse(
         content=selected_previews,
@@ -0,0 +1,160 @@
+"""Read-only database connections for api requests."""
+
+import asyncio
+import contextvars
+import functools
+import inspect
+import logging
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+from urllib.request import pathname2url
+
+from fastapi import Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.routing import APIRoute
+from playhouse.sqliteq import SqliteQueueDatabase
+
+logger = logging.getLogger(__name__)
+
+MAX_READ_CONNECTIONS = 8
+# pragmas that change the database file, these are set by the writer
+WRITER_PRAGMAS = ["auto_vacuum", "journal_mode"]
+# parameter added to endpoints that run on the pool to find the app
+POOL_REQUEST_PARAMETER = "read_pool_request"
+# attribute of the endpoints that are marked to run on the pool
+READ_ONLY_ATTRIBUTE = "read_only_endpoint"
+
+
+class ReadConnectionPool:
+    """Threads with a read-only connection to the database.
+
+    Each thread keeps its connection open between requests. Reads run on
+    that connection while writes still go to the write queue of the
+    database, so endpoints that write keep working.
+    """
+
+    def __init__(
+        self,
+        database: SqliteQueueDatabase,
+        max_connections: int = MAX_READ_CONNECTIONS,
+    ) -> None:
+        self.database = database
+        self.local = threading.local()
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_connections, thread_name_prefix="api_reader"
+        )
+
+    def _connect(self) -> None:
+        self.local.connected = True
+
+        try:
+            conn = sqlite3.connect(
+                f"file:{pathname2url(self.database.database)}?mode=ro",
+                uri=True,
+                timeout=self.database._timeout,
+                isolation_level=None,
+                **self.database.connect_params,
+            )
+
+            for pragma, value in self.database._pragmas:
+                if pragma not in WRITER_PRAGMAS:
+                    conn.execute(f"PRAGMA {pragma} = {value};")
+
+            if getattr(self.database, "load_vec_extension", False):
+                self.database._load_vec_extension(conn)
+        except sqlite3.Error as e:
+            # the connection of the thread is opened as usual
+            logger.debug(f"Unable to open a read-only database connection: {e}")
+            return
+
+        self.database._state.set_connection(conn)
+
+    def _run(self, func: Callable, *args, **kwargs) -> Any:
+        if not getattr(self.local, "connected", False):
+            self._connect()
+
+        return func(*args, **kwargs)
+
+    async def run(self, func: Callable, *args, **kwargs) -> Any:
+        """Run func on a thread of the pool."""
+        context = contextvars.copy_context()
+        return await asyncio.get_running_loop().run_in_executor(
+            self.executor,
+            functools.partial(context.run, self._run, func, *args, **kwargs),
+        )
+
+    def close(self) -> None:
+        self.executor.shutdown(wait=False)
+
+
+def run_on_read_pool(endpoint: Callable) -> Callable:
+    """Wrap an endpoint to run it on the read pool of the app."""
+    signature = inspect.signature(endpoint)
+    # fastapi passes the request to a single parameter
+    request_parameter = next(
+        (
+            p.name
+            for p in signature.parameters.values()
+            if inspect.isclass(p.annotation) and issubclass(p.annotation, Request)
+        ),
+        None,
+    )
+
+    if request_parameter is None:
+        request_parameter = POOL_REQUEST_PARAMETER
+        signature = signature.replace(
+            parameters=[
+                *signature.parameters.values(),
+                inspect.Parameter(
+                    POOL_REQUEST_PARAMETER,
+                    inspect.Parameter.KEYWORD_ONLY,
+                    annotation=Request,
+                ),
+            ]
+        )
+
+    @functools.wraps(endpoint)
+    async def run(*args, **kwargs):
+        if request_parameter == POOL_REQUEST_PARAMETER:
+            request: Request = kwargs.pop(POOL_REQUEST_PARAMETER)
+        else:
+            request: Request = kwargs[request_parameter]
+
+        pool: ReadConnectionPool = getattr(request.app, "read_pool", None)
+
+        if pool is None:
+            return await run_in_threadpool(endpoint, *args, **kwargs)
+
+        return await pool.run(endpoint, *args, **kwargs)
+
+    run.__signature__ = signature
+    return run
+
+
+def read_only_endpoint(endpoint: Callable) -> Callable:
+    """Mark an endpoint that only reads the database to run it on the read pool.
+
+    Endpoints that are called for every request of the ui, like /auth, or that
+    block on ffmpeg or OpenCV are not marked so they can not be held up by a
+    busy pool. The endpoint function itself is not changed.
+    """
+    setattr(endpoint, READ_ONLY_ATTRIBUTE, True)
+    return endpoint
+
+
+class ReadRoute(APIRoute):
+    """Runs GET endpoints that are marked with read_only_endpoint on the read
+    pool instead of the default thread pool."""
+
+    def __init__(self, path: str, endpoint: Callable, **kwargs) -> None:
+        if (
+            getattr(endpoint, READ_ONLY_ATTRIBUTE, False)
+            and set(kwargs.get("methods") or ["GET"]) == {"GET"}
+            and not asyncio.iscoroutinefunction(endpoint)
+            and not inspect.isgeneratorfunction(endpoint)
+        ):
+            endpoint = run_on_read_pool(endpoint)
+
+        super().__init__(path, endpoint, **kwargs)
@@ -5,7 +5,6 @@ import logging
 from functools import reduce
 from pathlib import Path
 
-import pandas as pd
 from fastapi import APIRouter
 from fastapi.params import Depends
 from fastapi.responses import JSONResponse
@@ -25,15 +24,24 @@ from frigate.api.defs.review_responses import (
     ReviewSummaryResponse,
 )
 from frigate.api.defs.tags import Tags
+from frigate.api.pagination import (
+    invalid_cursor_response,
+    paginate,
+    paginated_response,
+)
+from frigate.api.read_pool import ReadRoute, read_only_endpoint
+from frigate.const import MAX_SEGMENT_DURATION
 from frigate.models import Recordings, ReviewSegment
+from frigate.record.vod import vod_playlist_cache
 from frigate.util.builtin import get_tz_modifiers
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter(tags=[Tags.review])
+router = APIRouter(tags=[Tags.review], route_class=ReadRoute)
 
 
 @router.get("/review", response_model=list[ReviewSegmentResponse])
+@read_only_endpoint
 def review(params: ReviewQueryParams = Depends()):
     cameras = params.cameras
     labels = params.labels
@@ -96,20 +104,21 @@ def review(params: ReviewQueryParams = Depends()):
     if severity:
         clauses.append((ReviewSegment.severity == severity))
 
-    review = (
-        ReviewSegment.select()
-        .where(reduce(operator.and_, clauses))
-        .order_by(ReviewSegment.severity.asc())
-        .order_by(ReviewSegment.start_time.desc())
-        .limit(limit)
-        .dicts()
-        .iterator()
-    )
+    try:
+        review = paginate(
+            ReviewSegment.select().where(reduce(operator.and_, clauses)),
+            ReviewSegment,
+            params.cursor,
+        )
+    except ValueError:
+        return invalid_cursor_response()
 
-    return JSONResponse(content=[r for r in review])
+    review = list(review.limit(limit).dicts().iterator())
+    return paginated_response(review, limit)
 
 
 @router.get("/review/summary", response_model=ReviewSummaryResponse)
+@read_only_endpoint
 def review_summary(params: ReviewSummaryQueryParams = Depends()):
     hour_modifier, minute_modifier, seconds_offset = get_tz_modifiers(params.timezone)
     day_ago = (datetime.datetime.now() - datetime.timedelta(hours=24)).timestamp()
@@ -333,6 +342,7 @@ def delete_reviews(body: ReviewModifyMultipleBody):
         .iterator()
     )
     recording_ids = []
+    deleted_ranges = []
 
     for review in reviews:
         start_time = review["start_time"]
@@ -357,10 +367,24 @@ def delete_reviews(body: ReviewModifyMultipleBody):
             Path(recording["path"]).unlink(missing_ok=True)
             recording_ids.append(recording["id"])
 
+        # deleted segments can extend past either end of the review
+        deleted_ranges.append(
+            (
+                camera_name,
+                start_time - MAX_SEGMENT_DURATION,
+                (end_time or float("inf")) + MAX_SEGMENT_DURATION,
+            )
+        )
+
     # delete recordings and review segments
     Recordings.delete().where(Recordings.id << recording_ids).execute()
     ReviewSegment.delete().where(ReviewSegment.id << list_of_ids).execute()
 
+    # invalidate after the delete so a playlist of the deleted segments is not
+    # cached again in between
+    for camera_name, start_time, end_time in deleted_ranges:
+        vod_playlist_cache.invalidate(camera_name, start_time, end_time)
+
     return JSONResponse(
         content=({"success": True, "message": "Delete reviews"}), status_code=200
     )
@@ -369,6 +393,7 @@ def delete_reviews(body: ReviewModifyMultipleBody):
 @router.get(
     "/review/activity/motion", response_model=list[ReviewActivityMotionResponse]
 )
+@read_only_endpoint
 def motion_activity(params: ReviewActivityMotionQueryParams = Depends()):
     """Get motion and audio activity."""
     cameras = params.cameras
@@ -400,6 +425,8 @@ def motion_activity(params: ReviewActivityMotionQueryParams = Depends()):
     )
 
     # resample data using pandas to get activity on scaled basis
+    import pandas as pd
+
     df = pd.DataFrame(data, columns=["start_time", "motion", "camera"])
 
     if df.empty:
@@ -443,6 +470,7 @@ def motion_activity(params: ReviewActivityMotionQueryParams = Depends()):
 
 
 @router.get("/review/event/{event_id}", response_model=ReviewSegmentResponse)
+@read_only_endpoint
 def get_review_from_event(event_id: str):
     try:
         return JSONResponse(
@@ -460,6 +488,7 @@ def get_review_from_event(event_id: str):
 
 
 @router.get("/review/{review_id}", response_model=ReviewSegmentResponse)
+@read_only_endpoint
 def get_review(review_id: str):
     try:
         return JSONResponse(
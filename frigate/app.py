@@ -25,7 +25,6 @@ from frigate.comms.event_metadata_updater import (
 )
 from frigate.comms.inter_process import InterProcessCommunicator
 from frigate.comms.mqtt import MqttClient
-from frigate.comms.webpush import WebPushClient
 from frigate.comms.ws import WebSocketClient
 from frigate.comms.zmq_proxy import ZmqProxy
 from frigate.config.config import FrigateConfig
@@ -43,11 +42,13 @@ from frigate.events.audio import AudioProcessor
 from frigate.events.cleanup import EventCleanup
 from frigate.events.external import ExternalEventProcessor
 from frigate.events.maintainer import EventProcessor
+from frigate.genai.pool import GenAIMetrics
 from frigate.models import (
     Event,
     Export,
     Previews,
     Recordings,
+    RecordingsRollup,
     RecordingsToDelete,
     Regions,
     ReviewSegment,
@@ -87,6 +88,7 @@ class FrigateApp:
         self.log_queue: Queue = mp.Queue()
         self.camera_metrics: dict[str, CameraMetrics] = {}
         self.ptz_metrics: dict[str, PTZMetrics] = {}
+        self.genai_metrics = GenAIMetrics()
         self.processes: dict[str, int] = {}
         self.embeddings: Optional[EmbeddingsContext] = None
         self.region_grids: dict[str, list[list[dict[str, int]]]] = {}
@@ -226,7 +228,7 @@ class FrigateApp:
         embedding_process = util.Process(
             target=manage_embeddings,
             name="embeddings_manager",
-            args=(self.config,),
+            args=(self.config, self.genai_metrics),
         )
         embedding_process.daemon = True
         self.embedding_process = embedding_process
@@ -254,6 +256,7 @@ class FrigateApp:
             Export,
             Previews,
             Recordings,
+            RecordingsRollup,
             RecordingsToDelete,
             Regions,
             ReviewSegment,
@@ -299,6 +302,8 @@ class FrigateApp:
             comms.append(MqttClient(self.config))
 
         if self.config.notifications.enabled_in_config:
+            from frigate.comms.webpush import WebPushClient
+
             comms.append(WebPushClient(self.config))
 
         comms.append(WebSocketClient(self.config))
@@ -482,7 +487,14 @@ class FrigateApp:
         self.stats_emitter = StatsEmitter(
             self.config,
             stats_init(
-                self.config, self.camera_metrics, self.detectors, self.processes
+                self.config,
+                self.camera_metrics,
+                self.detectors,
+                self.processes,
+                # descriptions are generated by the embeddings process
+                self.genai_metrics
+                if self.config.genai.enabled and self.config.semantic_search.enabled
+                else None,
             ),
             self.stop_event,
         )
@@ -13,6 +13,7 @@ class CameraMetrics:
     read_start: Synchronized
     audio_rms: Synchronized
     audio_dBFS: Synchronized
+    audio_dropped: Synchronized
 
     frame_queue: mp.Queue
 
@@ -29,6 +30,7 @@ class CameraMetrics:
         self.read_start = mp.Value("d", 0)
         self.audio_rms = mp.Value("d", 0)
         self.audio_dBFS = mp.Value("d", 0)
+        self.audio_dropped = mp.Value("i", 0)
 
         self.frame_queue = mp.Queue(maxsize=2)
 
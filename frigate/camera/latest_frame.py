@@ -0,0 +1,152 @@
+"""Shared rendering and encoding of the latest camera frames."""
+
+import logging
+import threading
+from collections import OrderedDict
+from typing import Callable, Optional
+
+import cv2
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class LatestFrameService:
+    """Renders and encodes the latest frame of a camera once for all consumers.
+
+    Results are cached by camera, frame time and render options. Concurrent
+    requests for the same result wait for the request that is already
+    rendering it instead of converting and encoding the frame again.
+    """
+
+    def __init__(self, detected_frames_processor, max_entries: int = 128) -> None:
+        self.detected_frames_processor = detected_frames_processor
+        self.max_entries = max_entries
+        self.lock = threading.Lock()
+        self.results: OrderedDict[tuple, any] = OrderedDict()
+        self.pending: dict[tuple, threading.Event] = {}
+
+    def _get_or_create(self, key: tuple, create: Callable[[], any]) -> any:
+        while True:
+            with self.lock:
+                if key in self.results:
+                    self.results.move_to_end(key)
+                    return self.results[key]
+
+                pending = self.pending.get(key)
+
+                if pending is None:
+                    pending = threading.Event()
+                    self.pending[key] = pending
+                    break
+
+            # another request is creating this result
+            pending.wait()
+
+            with self.lock:
+                if key in self.results:
+                    self.results.move_to_end(key)
+                    return self.results[key]
+
+            # the other request failed, try to create it here
+
+        try:
+            result = create()
+        except Exception:
+            with self.lock:
+                del self.pending[key]
+
+            pending.set()
+            raise
+
+        with self.lock:
+            del self.pending[key]
+
+            if result is not None:
+                self._store(key, result)
+
+        pending.set()
+        return result
+
+    def _store(self, key: tuple, result: any) -> None:
+        camera, frame_time = key[0], key[1]
+
+        # results for older frames of this camera will not be requested again
+        for cached_key in [
+            k for k in self.results.keys() if k[0] == camera and k[1] < frame_time
+        ]:
+            del self.results[cached_key]
+
+        self.results[key] = result
+
+        while len(self.results) > self.max_entries:
+            self.results.popitem(last=False)
+
+    def get_frame_time(self, camera: str) -> float:
+        return self.detected_frames_processor.get_current_frame_time(camera)
+
+    def get_frame(
+        self, camera: str, draw_options: dict[str, any]
+    ) -> Optional[np.ndarray]:
+        """Get the latest BGR frame with overlays drawn.
+
+        The returned frame is shared with other consumers and must not be modified.
+        """
+        key = (
+            camera,
+            self.get_frame_time(camera),
+            "frame",
+            tuple(sorted(draw_options.items())),
+        )
+
+        def render() -> Optional[np.ndarray]:
+            frame = self.detected_frames_processor.get_current_frame(
+                camera, draw_options
+            )
+
+            if frame is not None:
+                frame.flags.writeable = False
+
+            return frame
+
+        return self._get_or_create(key, render)
+
+    def get_encoded_frame(
+        self,
+        camera: str,
+        draw_options: dict[str, any],
+        height: Optional[int],
+        extension: str,
+        encode_params: list[int],
+    ) -> Optional[bytes]:
+        """Get the latest frame resized to height and encoded as extension."""
+        key = (
+            camera,
+            self.get_frame_time(camera),
+            extension,
+            tuple(sorted(draw_options.items())),
+            height,
+            tuple(encode_params),
+        )
+
+        def encode() -> Optional[bytes]:
+            frame = self.get_frame(camera, draw_options)
+
+            if frame is None:
+                return None
+
+            if height and height != frame.shape[0]:
+                width = max(1, int(height * frame.shape[1] / frame.shape[0]))
+                frame = cv2.resize(
+                    frame, dsize=(width, height), interpolation=cv2.INTER_AREA
+                )
+
+            ret, img = cv2.imencode(f".{extension}", frame, encode_params)
+
+            if not ret:
+                logger.error(f"Failed to encode latest frame for {camera}")
+                return None
+
+            return img.tobytes()
+
+        return self._get_or_create(key, encode)
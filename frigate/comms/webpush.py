@@ -4,6 +4,9 @@ import datetime
 import json
 import logging
 import os
+import queue
+import threading
+from dataclasses import dataclass
 from typing import Any, Callable
 
 from py_vapid import Vapid01
@@ -17,6 +20,23 @@ from frigate.models import User
 
 logger = logging.getLogger(__name__)
 
+MAX_PUSH_WORKERS = 4
+MAX_QUEUED_PUSHES = 100
+# seconds to wait for a push service to respond
+PUSH_TIMEOUT = 10
+MAX_PUSH_RETRIES = 3
+# seconds before the first retry, doubled for every following retry
+PUSH_RETRY_BACKOFF = 2
+
+
+@dataclass
+class PushNotification:
+    user: str
+    pusher: WebPusher
+    headers: dict[str, str]
+    ttl: int
+    data: str
+
 
 class WebPushClient(Communicator):  # type: ignore[misc]
     """Frigate wrapper for webpush client."""
@@ -27,6 +47,11 @@ class WebPushClient(Communicator):  # type: ignore[misc]
         self.refresh: int = 0
         self.web_pushers: dict[str, list[WebPusher]] = {}
         self.expired_subs: dict[str, list[str]] = {}
+        self.expired_lock = threading.Lock()
+        self.notification_queue: queue.Queue[PushNotification] = queue.Queue(
+            MAX_QUEUED_PUSHES
+        )
+        self.stop_event = threading.Event()
 
         if not self.config.notifications.email:
             logger.warning("Email must be provided for push notifications to be sent.")
@@ -45,6 +70,20 @@ class WebPushClient(Communicator):  # type: ignore[misc]
         # notification config updater
         self.config_subscriber = ConfigSubscriber("config/notifications")
 
+        # deliver notifications in the background so a slow push service
+        # does not hold up the dispatcher
+        self.workers = [
+            threading.Thread(
+                target=self._deliver_notifications,
+                name=f"webpush_worker:{i}",
+                daemon=True,
+            )
+            for i in range(MAX_PUSH_WORKERS)
+        ]
+
+        for worker in self.workers:
+            worker.start()
+
     def subscribe(self, receiver: Callable) -> None:
         """Wrapper for allowing dispatcher to subscribe."""
         pass
@@ -74,9 +113,14 @@ class WebPushClient(Communicator):  # type: ignore[misc]
                 self.claim_headers[endpoint] = self.vapid.sign(claim)
 
     def cleanup_registrations(self) -> None:
+        # take the subs that expired since the last cleanup
+        with self.expired_lock:
+            expired_subs = self.expired_subs
+            self.expired_subs = {}
+
         # delete any expired subs
-        if len(self.expired_subs) > 0:
-            for user, expired in self.expired_subs.items():
+        if len(expired_subs) > 0:
+            for user, expired in expired_subs.items():
                 user_subs = []
 
                 # get all subscriptions, removing ones that are expired
@@ -101,8 +145,6 @@ class WebPushClient(Communicator):  # type: ignore[misc]
                     f"Cleaned up {len(expired)} notification subscriptions for {user}"
                 )
 
-        self.expired_subs = {}
-
     def publish(self, topic: str, payload: Any, retain: bool = False) -> None:
         """Wrapper for publishing when client is in valid state."""
         # check for updated notification config
@@ -122,6 +164,7 @@ class WebPushClient(Communicator):  # type: ignore[misc]
             return
 
         self.check_registrations()
+        self.cleanup_registrations()
 
         # Only notify for alerts
         if payload["after"]["severity"] != "alert":
@@ -167,37 +210,81 @@ class WebPushClient(Communicator):  # type: ignore[misc]
                 headers["urgency"] = "high"
                 ttl = 3600 if state == "end" else 0
 
-                # send message
-                resp = pusher.send(
-                    headers=headers,
-                    ttl=ttl,
-                    data=json.dumps(
-                        {
-                            "title": title,
-                            "message": message,
-                            "direct_url": direct_url,
-                            "image": image,
-                            "id": reviewId,
-                            "type": "alert",
-                        }
-                    ),
+                try:
+                    self.notification_queue.put_nowait(
+                        PushNotification(
+                            user,
+                            pusher,
+                            headers,
+                            ttl,
+                            json.dumps(
+                                {
+                                    "title": title,
+                                    "message": message,
+                                    "direct_url": direct_url,
+                                    "image": image,
+                                    "id": reviewId,
+                                    "type": "alert",
+                                }
+                            ),
+                        )
+                    )
+                except queue.Full:
+                    logger.warning(
+                        f"Too many notifications are waiting to be sent, dropping notification for {user}"
+                    )
+
+    def _send_notification(self, notification: PushNotification) -> None:
+        endpoint = notification.pusher.subscription_info["endpoint"]
+        error: Any = None
+
+        for attempt in range(MAX_PUSH_RETRIES + 1):
+            if attempt > 0 and self.stop_event.wait(
+                PUSH_RETRY_BACKOFF * 2 ** (attempt - 1)
+            ):
+                return
+
+            try:
+                resp = notification.pusher.send(
+                    headers=notification.headers,
+                    ttl=notification.ttl,
+                    data=notification.data,
+                    timeout=PUSH_TIMEOUT,
                 )
+            except Exception as e:
+                # timed out or unable to connect
+                error = e
+                continue
 
-                if resp.status_code == 201:
-                    pass
-                elif resp.status_code == 404 or resp.status_code == 410:
-                    # subscription is not found or has been unsubscribed
-                    if not self.expired_subs.get(user):
-                        self.expired_subs[user] = []
+            if resp.status_code == 201:
+                return
+            elif resp.status_code == 404 or resp.status_code == 410:
+                # subscription is not found or has been unsubscribed
+                # the subscription no longer exists and should be removed
+                with self.expired_lock:
+                    self.expired_subs.setdefault(notification.user, []).append(endpoint)
 
-                    self.expired_subs[user].append(pusher.subscription_info["endpoint"])
-                    # the subscription no longer exists and should be removed
-                else:
-                    logger.warning(
-                        f"Failed to send notification to {user} :: {resp.headers}"
-                    )
+                return
 
-        self.cleanup_registrations()
+            error = resp.headers
+
+            # retry only when the push service is overloaded or unavailable
+            if resp.status_code != 429 and resp.status_code < 500:
+                break
+
+        logger.warning(f"Failed to send notification to {notification.user} :: {error}")
+
+    def _deliver_notifications(self) -> None:
+        while not self.stop_event.is_set():
+            try:
+                notification = self.notification_queue.get(timeout=1)
+            except queue.Empty:
+                continue
+
+            self._send_notification(notification)
 
     def stop(self) -> None:
-        pass
+        self.stop_event.set()
+
+        for worker in self.workers:
+            worker.join(1)
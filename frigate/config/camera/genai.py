@@ -64,3 +64,19 @@ class GenAIConfig(FrigateBaseModel):
     provider: GenAIProviderEnum = Field(
         default=GenAIProviderEnum.openai, title="GenAI provider."
     )
+    workers: int = Field(
+        default=2, title="Number of descriptions generated at the same time.", ge=1
+    )
+    queue_size: int = Field(
+        default=100, title="Maximum number of queued description requests.", ge=1
+    )
+    requests_per_minute: Optional[int] = Field(
+        default=None,
+        title="Maximum number of requests per minute to the provider.",
+        ge=1,
+    )
+    max_queued_memory: int = Field(
+        default=64,
+        title="Maximum size in MB of the images held by queued requests.",
+        ge=1,
+    )
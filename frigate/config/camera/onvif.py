@@ -7,7 +7,12 @@ from ..base import FrigateBaseModel
 from ..env import EnvString
 from .objects import DEFAULT_TRACKED_OBJECTS
 
-__all__ = ["OnvifConfig", "PtzAutotrackConfig", "ZoomingModeEnum"]
+__all__ = [
+    "MotionEstimationModeEnum",
+    "OnvifConfig",
+    "PtzAutotrackConfig",
+    "ZoomingModeEnum",
+]
 
 
 class ZoomingModeEnum(str, Enum):
@@ -16,6 +21,11 @@ class ZoomingModeEnum(str, Enum):
     relative = "relative"
 
 
+class MotionEstimationModeEnum(str, Enum):
+    full = "full"
+    downscaled = "downscaled"
+
+
 class PtzAutotrackConfig(FrigateBaseModel):
     enabled: bool = Field(default=False, title="Enable PTZ object autotracking.")
     calibrate_on_startup: bool = Field(
@@ -30,6 +40,10 @@ class PtzAutotrackConfig(FrigateBaseModel):
         ge=0.1,
         le=0.75,
     )
+    motion_estimation: MotionEstimationModeEnum = Field(
+        default=MotionEstimationModeEnum.full,
+        title="Resolution used to estimate camera motion while tracking.",
+    )
     track: list[str] = Field(default=DEFAULT_TRACKED_OBJECTS, title="Objects to track.")
     required_zones: list[str] = Field(
         default_factory=list,
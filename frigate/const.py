@@ -87,7 +87,6 @@ CACHE_SEGMENT_FORMAT = "%Y%m%d%H%M%S%z"
 MAX_PRE_CAPTURE = 60
 MAX_SEGMENT_DURATION = 600
 MAX_SEGMENTS_IN_CACHE = 6
-MAX_PLAYLIST_SECONDS = 7200  # support 2 hour segments for a single playlist to account for cameras with inconsistent segment times
 
 # Internal Comms Topics
 
@@ -110,6 +109,7 @@ FREQUENCY_STATS_POINTS = 15
 AUTOTRACKING_MAX_AREA_RATIO = 0.6
 AUTOTRACKING_MOTION_MIN_DISTANCE = 20
 AUTOTRACKING_MOTION_MAX_POINTS = 500
+AUTOTRACKING_MOTION_ESTIMATION_HEIGHT = 360
 AUTOTRACKING_MAX_MOVE_METRICS = 500
 AUTOTRACKING_ZOOM_OUT_HYSTERESIS = 1.1
 AUTOTRACKING_ZOOM_IN_HYSTERESIS = 0.95
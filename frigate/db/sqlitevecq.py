@@ -21,6 +21,14 @@ class SqliteVecQueueDatabase(SqliteQueueDatabase):
         conn.load_extension(self.sqlite_vec_path)
         conn.enable_load_extension(False)
 
+    def execute_sql(self, sql, params=None, commit=None, timeout=None):
+        # queries that start with whitespace are reads as well, they do not
+        # need to wait for the writes in the queue
+        if sql.lstrip()[:6].lower() == "select":
+            return self._execute(sql.lstrip(), params)
+
+        return super().execute_sql(sql, params, commit, timeout)
+
     def delete_embeddings_thumbnail(self, event_ids: list[str]) -> None:
         ids = ",".join(["?" for _ in event_ids])
         self.execute_sql(f"DELETE FROM vec_thumbnails WHERE id IN ({ids})", event_ids)
@@ -1,6 +1,6 @@
 import logging
 from abc import ABC, abstractmethod
-from typing import List
+from typing import Callable, List
 
 import numpy as np
 
@@ -12,6 +12,8 @@ logger = logging.getLogger(__name__)
 class DetectionApi(ABC):
     type_key: str
     supported_models: List[ModelTypeEnum]
+    # detectors that can run several inferences at once set this to True
+    supports_async: bool = False
 
     @abstractmethod
     def __init__(self, detector_config):
@@ -24,6 +26,20 @@ class DetectionApi(ABC):
     def detect_raw(self, tensor_input):
         pass
 
+    def detect_raw_async(
+        self, tensor_input, callback: Callable[[np.ndarray], None]
+    ) -> None:
+        """Run detection and pass the result to callback once it completes.
+
+        The callback may be called from another thread, the tensor input can
+        be reused by the caller once this returns.
+        """
+        callback(self.detect_raw(tensor_input))
+
+    def wait_async(self) -> None:
+        """Wait for all detections started with detect_raw_async to complete."""
+        pass
+
     def post_process_yolonas(self, output):
         """
         @param output: output of inference
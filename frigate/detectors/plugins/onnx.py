@@ -7,6 +7,7 @@ from typing_extensions import Literal
 from frigate.detectors.detection_api import DetectionApi
 from frigate.detectors.detector_config import (
     BaseDetectorConfig,
+    InputTensorEnum,
     ModelTypeEnum,
 )
 from frigate.util.model import get_ort_providers
@@ -15,6 +16,13 @@ logger = logging.getLogger(__name__)
 
 DETECTOR_KEY = "onnx"
 
+ORT_TYPES = {
+    "tensor(uint8)": np.uint8,
+    "tensor(int8)": np.int8,
+    "tensor(float16)": np.float16,
+    "tensor(float)": np.float32,
+}
+
 
 class ONNXDetectorConfig(BaseDetectorConfig):
     type: Literal[DETECTOR_KEY]
@@ -52,34 +60,101 @@ class ONNXDetector(DetectionApi):
         self.onnx_model_shape = detector_config.model.input_tensor
         path = detector_config.model.path
 
+        if self.onnx_model_type != ModelTypeEnum.yolonas:
+            logger.error(
+                f"{self.onnx_model_type} is currently not supported for onnx. See the docs for more info on supported models."
+            )
+
+        # the model metadata and buffers are looked up once and bound to the
+        # session so no arrays are allocated for each inference
+        model_input = self.model.get_inputs()[0]
+        self.input_name = model_input.name
+        expected_shape = (
+            [1, 3, self.h, self.w]
+            if self.onnx_model_shape == InputTensorEnum.nchw
+            else [1, self.h, self.w, 3]
+        )
+        self.input_buffer = np.zeros(
+            [
+                dim if isinstance(dim, int) else expected
+                for dim, expected in zip(model_input.shape, expected_shape)
+            ],
+            ORT_TYPES.get(model_input.type, np.uint8),
+        )
+        self.io_binding = self.model.io_binding()
+        self.io_binding.bind_cpu_input(self.input_name, self.input_buffer)
+
+        # outputs with a dynamic shape are allocated by onnxruntime
+        self.output_buffers = []
+        for model_output in self.model.get_outputs():
+            if all(isinstance(dim, int) for dim in model_output.shape):
+                buffer = np.zeros(
+                    model_output.shape, ORT_TYPES.get(model_output.type, np.float32)
+                )
+                self.io_binding.bind_output(
+                    model_output.name,
+                    "cpu",
+                    0,
+                    buffer.dtype,
+                    buffer.shape,
+                    buffer.ctypes.data,
+                )
+                self.output_buffers.append(buffer)
+            else:
+                self.io_binding.bind_output(model_output.name, "cpu")
+                self.output_buffers.append(None)
+
+        self.detections = np.zeros((20, 6), np.float32)
+
         logger.info(f"ONNX: {path} loaded")
 
+    def get_outputs(self) -> list[np.ndarray]:
+        if all(buffer is not None for buffer in self.output_buffers):
+            return self.output_buffers
+
+        return [
+            buffer if buffer is not None else output.numpy()
+            for buffer, output in zip(
+                self.output_buffers, self.io_binding.get_outputs()
+            )
+        ]
+
     def detect_raw(self, tensor_input):
-        model_input_name = self.model.get_inputs()[0].name
-        tensor_output = self.model.run(None, {model_input_name: tensor_input})
+        """Run detection on the tensor input.
+
+        The returned array is reused by the next call.
+        """
+        np.copyto(self.input_buffer, tensor_input, casting="unsafe")
+        self.model.run_with_iobinding(self.io_binding)
+        tensor_output = self.get_outputs()
 
         if self.onnx_model_type == ModelTypeEnum.yolonas:
-            predictions = tensor_output[0]
-
-            detections = np.zeros((20, 6), np.float32)
-
-            for i, prediction in enumerate(predictions):
-                if i == 20:
-                    break
-                (_, x_min, y_min, x_max, y_max, confidence, class_id) = prediction
-                # when running in GPU mode, empty predictions in the output have class_id of -1
-                if class_id < 0:
-                    break
-                detections[i] = [
-                    class_id,
-                    confidence,
-                    y_min / self.h,
-                    x_min / self.w,
-                    y_max / self.h,
-                    x_max / self.w,
-                ]
-            return detections
+            return self.process_yolonas(tensor_output[0])
         else:
             raise Exception(
-                f"{self.onnx_model_type} is currently not supported for rocm. See the docs for more info on supported models."
+                f"{self.onnx_model_type} is currently not supported for onnx. See the docs for more info on supported models."
             )
+
+    def process_yolonas(self, predictions: np.ndarray) -> np.ndarray:
+        """Convert flat yolonas predictions to detections.
+
+        Predictions are (batch, x_min, y_min, x_max, y_max, confidence, class_id).
+        """
+        detections = self.detections
+        detections.fill(0)
+        count = min(20, len(predictions))
+
+        # when running in GPU mode, empty predictions in the output have class_id of -1
+        empty = np.flatnonzero(predictions[:count, 6] < 0)
+
+        if len(empty) > 0:
+            count = empty[0]
+
+        predictions = predictions[:count]
+        detections[:count, 0] = predictions[:, 6]
+        detections[:count, 1] = predictions[:, 5]
+        np.divide(predictions[:, 2], self.h, out=detections[:count, 2])
+        np.divide(predictions[:, 1], self.w, out=detections[:count, 3])
+        np.divide(predictions[:, 4], self.h, out=detections[:count, 4])
+        np.divide(predictions[:, 3], self.w, out=detections[:count, 5])
+        return detections
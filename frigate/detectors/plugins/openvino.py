@@ -1,9 +1,9 @@
 import logging
 import os
+from enum import Enum
+from typing import Callable, Optional
 
 import numpy as np
-import openvino as ov
-import openvino.properties as props
 from pydantic import Field
 from typing_extensions import Literal
 
@@ -15,9 +15,22 @@ logger = logging.getLogger(__name__)
 DETECTOR_KEY = "openvino"
 
 
+class OvPerformanceModeEnum(str, Enum):
+    latency = "latency"
+    throughput = "throughput"
+
+
 class OvDetectorConfig(BaseDetectorConfig):
     type: Literal[DETECTOR_KEY]
     device: str = Field(default=None, title="Device Type")
+    mode: OvPerformanceModeEnum = Field(
+        default=OvPerformanceModeEnum.latency, title="Performance Mode"
+    )
+    num_requests: Optional[int] = Field(
+        default=None,
+        title="Number of parallel infer requests in throughput mode.",
+        ge=1,
+    )
 
 
 class OvDetector(DetectionApi):
@@ -25,6 +38,10 @@ class OvDetector(DetectionApi):
     supported_models = [ModelTypeEnum.ssd, ModelTypeEnum.yolonas, ModelTypeEnum.yolox]
 
     def __init__(self, detector_config: OvDetectorConfig):
+        import openvino as ov
+        import openvino.properties as props
+
+        self.ov = ov
         self.ov_core = ov.Core()
         self.ov_model_type = detector_config.model.model_type
 
@@ -37,10 +54,31 @@ class OvDetector(DetectionApi):
 
         os.makedirs("/config/model_cache/openvino", exist_ok=True)
         self.ov_core.set_property({props.cache_dir: "/config/model_cache/openvino"})
+
+        config = {}
+
+        if detector_config.mode == OvPerformanceModeEnum.throughput:
+            config[props.hint.performance_mode] = props.hint.PerformanceMode.THROUGHPUT
+
         self.interpreter = self.ov_core.compile_model(
-            model=detector_config.model.path, device_name=detector_config.device
+            model=detector_config.model.path,
+            device_name=detector_config.device,
+            config=config,
         )
 
+        self.infer_queue = None
+
+        if detector_config.mode == OvPerformanceModeEnum.throughput:
+            # 0 lets the device decide how many requests keep it busy
+            self.infer_queue = ov.AsyncInferQueue(
+                self.interpreter, detector_config.num_requests or 0
+            )
+            self.infer_queue.set_callback(self._async_callback)
+            self.supports_async = True
+            logger.info(
+                f"OpenVino detector running {len(self.infer_queue)} parallel infer requests"
+            )
+
         self.model_invalid = False
 
         if self.ov_model_type not in self.supported_models:
@@ -153,9 +191,35 @@ class OvDetector(DetectionApi):
     def detect_raw(self, tensor_input):
         infer_request = self.interpreter.create_infer_request()
         # TODO: see if we can use shared_memory=True
-        input_tensor = ov.Tensor(array=tensor_input)
+        input_tensor = self.ov.Tensor(array=tensor_input)
         infer_request.infer(input_tensor)
+        return self.process_output(infer_request)
+
+    def detect_raw_async(
+        self, tensor_input, callback: Callable[[np.ndarray], None]
+    ) -> None:
+        if self.infer_queue is None:
+            callback(self.detect_raw(tensor_input))
+            return
+
+        # blocks until one of the infer requests is idle, the input is
+        # copied to the request so the caller can reuse its buffer
+        self.infer_queue.start_async(np.ascontiguousarray(tensor_input), callback)
+
+    def _async_callback(self, infer_request, callback) -> None:
+        try:
+            detections = self.process_output(infer_request)
+        except Exception:
+            logger.exception("Failed to process OpenVino infer request output")
+            detections = np.zeros((20, 6), np.float32)
+
+        callback(detections)
+
+    def wait_async(self) -> None:
+        if self.infer_queue is not None:
+            self.infer_queue.wait_all()
 
+    def process_output(self, infer_request):
         detections = np.zeros((20, 6), np.float32)
 
         if self.model_invalid:
@@ -15,17 +15,17 @@ from frigate.comms.embeddings_updater import EmbeddingsRequestEnum, EmbeddingsRe
 from frigate.config import FrigateConfig
 from frigate.const import CONFIG_DIR
 from frigate.db.sqlitevecq import SqliteVecQueueDatabase
+from frigate.genai.pool import GenAIMetrics
 from frigate.models import Event
 from frigate.util.builtin import serialize
 from frigate.util.services import listen
 
-from .maintainer import EmbeddingMaintainer
 from .util import ZScoreNormalization
 
 logger = logging.getLogger(__name__)
 
 
-def manage_embeddings(config: FrigateConfig) -> None:
+def manage_embeddings(config: FrigateConfig, genai_metrics: GenAIMetrics) -> None:
     # Only initialize embeddings if semantic search is enabled
     if not config.semantic_search.enabled:
         return
@@ -56,10 +56,14 @@ def manage_embeddings(config: FrigateConfig) -> None:
     models = [Event]
     db.bind(models)
 
+    # the models and their runtimes are only loaded by the embeddings process
+    from .maintainer import EmbeddingMaintainer
+
     maintainer = EmbeddingMaintainer(
         db,
         config,
         stop_event,
+        genai_metrics,
     )
     maintainer.start()
 
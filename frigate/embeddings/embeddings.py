@@ -1,26 +1,24 @@
 """SQLite-vec embeddings database."""
 
-import base64
 import logging
 import os
 import time
+from typing import Union
 
 from numpy import ndarray
+from PIL import Image
 from playhouse.shortcuts import model_to_dict
 
 from frigate.comms.inter_process import InterProcessRequestor
 from frigate.config.semantic_search import SemanticSearchConfig
-from frigate.const import (
-    CONFIG_DIR,
-    UPDATE_EMBEDDINGS_REINDEX_PROGRESS,
-    UPDATE_MODEL_STATE,
-)
+from frigate.const import CONFIG_DIR, UPDATE_MODEL_STATE
 from frigate.db.sqlitevecq import SqliteVecQueueDatabase
 from frigate.models import Event
 from frigate.types import ModelStatusTypesEnum
 from frigate.util.builtin import serialize
 
 from .functions.onnx import GenericONNXEmbedding, ModelTypeEnum
+from .reindex import ReindexPipeline, load_checkpoint
 
 logger = logging.getLogger(__name__)
 
@@ -145,30 +143,18 @@ class Embeddings:
         return embedding
 
     def batch_embed_thumbnail(
-        self, event_thumbs: dict[str, bytes], upsert: bool = True
+        self, event_thumbs: dict[str, Union[bytes, Image.Image]], upsert: bool = True
     ) -> list[ndarray]:
         """Embed thumbnails and optionally insert into DB.
 
-        @param: event_thumbs Map of Event IDs in DB to thumbnail bytes in jpg format
+        @param: event_thumbs Map of Event IDs in DB to thumbnail bytes in jpg format or decoded images
         @param: upsert If embedding should be upserted into vec DB
         """
         ids = list(event_thumbs.keys())
         embeddings = self.vision_embedding(list(event_thumbs.values()))
 
         if upsert:
-            items = []
-
-            for i in range(len(ids)):
-                items.append(ids[i])
-                items.append(serialize(embeddings[i]))
-
-            self.db.execute_sql(
-                """
-                INSERT OR REPLACE INTO vec_thumbnails(id, thumbnail_embedding)
-                VALUES {}
-                """.format(", ".join(["(?, ?)"] * len(ids))),
-                items,
-            )
+            self.upsert_thumbnails(ids, embeddings)
 
         return embeddings
 
@@ -191,129 +177,64 @@ class Embeddings:
     def batch_embed_description(
         self, event_descriptions: dict[str, str], upsert: bool = True
     ) -> ndarray:
-        # upsert embeddings one by one to avoid token limit
-        embeddings = []
-
-        for desc in event_descriptions.values():
-            embeddings.append(self.text_embedding([desc])[0])
+        # descriptions are tokenized and embedded in batches, descriptions
+        # over the token limit of the model are embedded on their own
+        embeddings = self.text_embedding(list(event_descriptions.values()))
 
         if upsert:
-            ids = list(event_descriptions.keys())
-            items = []
-
-            for i in range(len(ids)):
-                items.append(ids[i])
-                items.append(serialize(embeddings[i]))
-
-            self.db.execute_sql(
-                """
-                INSERT OR REPLACE INTO vec_descriptions(id, description_embedding)
-                VALUES {}
-                """.format(", ".join(["(?, ?)"] * len(ids))),
-                items,
-            )
+            self.upsert_descriptions(list(event_descriptions.keys()), embeddings)
 
         return embeddings
 
-    def reindex(self) -> None:
-        logger.info("Indexing tracked object embeddings...")
+    def upsert_thumbnails(self, ids: list[str], embeddings: list[ndarray]):
+        """Bulk insert thumbnail embeddings into the vec DB."""
+        items = []
 
-        self.db.drop_embeddings_tables()
-        logger.debug("Dropped embeddings tables.")
-        self.db.create_embeddings_tables()
-        logger.debug("Created embeddings tables.")
+        for i in range(len(ids)):
+            items.append(ids[i])
+            items.append(serialize(embeddings[i]))
 
-        # Delete the saved stats file
-        if os.path.exists(os.path.join(CONFIG_DIR, ".search_stats.json")):
-            os.remove(os.path.join(CONFIG_DIR, ".search_stats.json"))
+        return self.db.execute_sql(
+            """
+            INSERT OR REPLACE INTO vec_thumbnails(id, thumbnail_embedding)
+            VALUES {}
+            """.format(", ".join(["(?, ?)"] * len(ids))),
+            items,
+        )
 
-        st = time.time()
+    def upsert_descriptions(self, ids: list[str], embeddings: list[ndarray]):
+        """Bulk insert description embeddings into the vec DB."""
+        items = []
 
-        # Get total count of events to process
-        total_events = (
-            Event.select()
-            .where(
-                (Event.has_clip == True | Event.has_snapshot == True)
-                & Event.thumbnail.is_null(False)
-            )
-            .count()
-        )
+        for i in range(len(ids)):
+            items.append(ids[i])
+            items.append(serialize(embeddings[i]))
 
-        batch_size = 32
-        current_page = 1
+        return self.db.execute_sql(
+            """
+            INSERT OR REPLACE INTO vec_descriptions(id, description_embedding)
+            VALUES {}
+            """.format(", ".join(["(?, ?)"] * len(ids))),
+            items,
+        )
 
-        totals = {
-            "thumbnails": 0,
-            "descriptions": 0,
-            "processed_objects": total_events - 1 if total_events < batch_size else 0,
-            "total_objects": total_events,
-            "time_remaining": 0 if total_events < batch_size else -1,
-            "status": "indexing",
-        }
+    def reindex(self) -> None:
+        checkpoint = load_checkpoint()
 
-        self.requestor.send_data(UPDATE_EMBEDDINGS_REINDEX_PROGRESS, totals)
+        if checkpoint is None:
+            logger.info("Indexing tracked object embeddings...")
 
-        events = (
-            Event.select()
-            .where(
-                (Event.has_clip == True | Event.has_snapshot == True)
-                & Event.thumbnail.is_null(False)
-            )
-            .order_by(Event.start_time.desc())
-            .paginate(current_page, batch_size)
-        )
+            self.db.drop_embeddings_tables()
+            logger.debug("Dropped embeddings tables.")
+            self.db.create_embeddings_tables()
+            logger.debug("Created embeddings tables.")
 
-        while len(events) > 0:
-            event: Event
-            batch_thumbs = {}
-            batch_descs = {}
-            for event in events:
-                batch_thumbs[event.id] = base64.b64decode(event.thumbnail)
-                totals["thumbnails"] += 1
-
-                if description := event.data.get("description", "").strip():
-                    batch_descs[event.id] = description
-                    totals["descriptions"] += 1
-
-                totals["processed_objects"] += 1
-
-            # run batch embedding
-            self.batch_embed_thumbnail(batch_thumbs)
-
-            if batch_descs:
-                self.batch_embed_description(batch_descs)
-
-            # report progress every batch so we don't spam the logs
-            progress = (totals["processed_objects"] / total_events) * 100
-            logger.debug(
-                "Processed %d/%d events (%.2f%% complete) | Thumbnails: %d, Descriptions: %d",
-                totals["processed_objects"],
-                total_events,
-                progress,
-                totals["thumbnails"],
-                totals["descriptions"],
-            )
+            # Delete the saved stats file
+            if os.path.exists(os.path.join(CONFIG_DIR, ".search_stats.json")):
+                os.remove(os.path.join(CONFIG_DIR, ".search_stats.json"))
 
-            # Calculate time remaining
-            elapsed_time = time.time() - st
-            avg_time_per_event = elapsed_time / totals["processed_objects"]
-            remaining_events = total_events - totals["processed_objects"]
-            time_remaining = avg_time_per_event * remaining_events
-            totals["time_remaining"] = int(time_remaining)
-
-            self.requestor.send_data(UPDATE_EMBEDDINGS_REINDEX_PROGRESS, totals)
-
-            # Move to the next page
-            current_page += 1
-            events = (
-                Event.select()
-                .where(
-                    (Event.has_clip == True | Event.has_snapshot == True)
-                    & Event.thumbnail.is_null(False)
-                )
-                .order_by(Event.start_time.desc())
-                .paginate(current_page, batch_size)
-            )
+        st = time.time()
+        totals = ReindexPipeline(self, self.requestor).run(checkpoint)
 
         logger.info(
             "Embedded %d thumbnails and %d descriptions in %s seconds",
@@ -321,6 +242,3 @@ class Embeddings:
             totals["descriptions"],
             round(time.time() - st, 1),
         )
-        totals["status"] = "completed"
-
-        self.requestor.send_data(UPDATE_EMBEDDINGS_REINDEX_PROGRESS, totals)
@@ -31,6 +31,10 @@ warnings.filterwarnings(
 disable_progress_bar()
 logger = logging.getLogger(__name__)
 
+MAX_TOKEN_LENGTH = 8192
+# texts are batched with others up to this many tokens longer or shorter
+TEXT_BUCKET_TOKENS = 16
+
 
 class ModelTypeEnum(str, Enum):
     face = "face"
@@ -153,28 +157,80 @@ class GenericONNXEmbedding:
             f"{MODEL_CACHE_DIR}/{self.model_name}",
         )
 
-    def _preprocess_inputs(self, raw_inputs: any) -> any:
+    def _get_max_length(self) -> Optional[int]:
+        max_length = self.tokenizer.model_max_length
+
+        # tokenizers without a configured limit report a huge sentinel value
+        if max_length is None or max_length > MAX_TOKEN_LENGTH:
+            return None
+
+        return max_length
+
+    def _preprocess_inputs(
+        self, raw_inputs: any, input_names: list[str]
+    ) -> list[tuple[list[int], dict[str, np.ndarray]]]:
+        """Preprocess all inputs with a single tokenizer or feature extractor call.
+
+        Returns the indexes of the inputs in each batch with the model inputs
+        of the batch.
+        """
         if self.model_type == ModelTypeEnum.text:
-            max_length = max(len(self.tokenizer.encode(text)) for text in raw_inputs)
+            encodings = self.tokenizer(list(raw_inputs))
             return [
-                self.tokenizer(
-                    text,
-                    padding="max_length",
-                    truncation=True,
-                    max_length=max_length,
-                    return_tensors="np",
+                (
+                    batch,
+                    self.tokenizer.pad(
+                        {
+                            key: [value[idx] for idx in batch]
+                            for key, value in encodings.items()
+                        },
+                        padding="longest",
+                        return_tensors="np",
+                    ),
                 )
-                for text in raw_inputs
+                for batch in self._get_batches(encodings["input_ids"], input_names)
             ]
         elif self.model_type == ModelTypeEnum.vision:
             processed_images = [self._process_image(img) for img in raw_inputs]
             return [
-                self.feature_extractor(images=image, return_tensors="np")
-                for image in processed_images
+                (
+                    list(range(len(processed_images))),
+                    self.feature_extractor(
+                        images=processed_images, return_tensors="np"
+                    ),
+                )
             ]
         else:
             raise ValueError(f"Unable to preprocess inputs for {self.model_type}")
 
+    def _get_batches(
+        self, token_ids: list[list[int]], input_names: list[str]
+    ) -> list[list[int]]:
+        """Split the inputs into batches that can be run together.
+
+        Texts are grouped by their token length so little time is spent on
+        padding, which can only be batched when the model takes an attention
+        mask. Without one the padding tokens are attended to and pooled like
+        any other token, so texts are grouped by their exact token length to
+        get the same embeddings as when they run one by one. Texts longer than
+        the limit of the model run on their own, so they are embedded whole as
+        before and do not pad the rest of the batch to their length.
+        """
+        has_mask = "attention_mask" in input_names
+        max_length = self._get_max_length()
+        batches: dict[int, list[int]] = {}
+        long_batches: list[list[int]] = []
+
+        for idx, ids in enumerate(token_ids):
+            if max_length is not None and len(ids) > max_length:
+                long_batches.append([idx])
+            elif has_mask:
+                batches.setdefault(len(ids) // TEXT_BUCKET_TOKENS, []).append(idx)
+            else:
+                batches.setdefault(len(ids), []).append(idx)
+
+        return list(batches.values()) + long_batches
+
     def _process_image(self, image):
         if isinstance(image, str):
             if image.startswith("http"):
@@ -197,20 +253,21 @@ class GenericONNXEmbedding:
             )
             return []
 
-        processed_inputs = self._preprocess_inputs(inputs)
         input_names = self.runner.get_input_names()
-        onnx_inputs = {name: [] for name in input_names}
-        input: dict[str, any]
-        for input in processed_inputs:
-            for key, value in input.items():
-                if key in input_names:
-                    onnx_inputs[key].append(value[0])
-
-        for key in input_names:
-            if onnx_inputs.get(key):
-                onnx_inputs[key] = np.stack(onnx_inputs[key])
-            else:
-                logger.warning(f"Expected input '{key}' not found in onnx_inputs")
+        embeddings: list[Optional[np.ndarray]] = [None] * len(inputs)
+
+        for batch, processed_inputs in self._preprocess_inputs(inputs, input_names):
+            onnx_inputs = {}
+
+            for key in input_names:
+                if key in processed_inputs:
+                    onnx_inputs[key] = processed_inputs[key]
+                else:
+                    logger.warning(f"Expected input '{key}' not found in onnx_inputs")
+
+            results = self.runner.run(onnx_inputs)[0]
+
+            for idx, embedding in zip(batch, results):
+                embeddings[idx] = embedding
 
-        embeddings = self.runner.run(onnx_inputs)[0]
-        return [embedding for embedding in embeddings]
+        return embeddings
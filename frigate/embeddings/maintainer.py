@@ -3,6 +3,7 @@
 import base64
 import logging
 import os
+import queue
 import threading
 from multiprocessing.synchronize import Event as MpEvent
 from typing import Optional
@@ -23,15 +24,23 @@ from frigate.config import FrigateConfig
 from frigate.const import CLIPS_DIR, UPDATE_EVENT_DESCRIPTION
 from frigate.events.types import EventTypeEnum
 from frigate.genai import get_genai_client
+from frigate.genai.pool import (
+    GenAIMetrics,
+    GenAIRequest,
+    GenAIRequestPriority,
+    GenAIWorkerPool,
+)
 from frigate.models import Event
 from frigate.util.builtin import serialize
 from frigate.util.image import SharedMemoryFrameManager, calculate_region
 
 from .embeddings import Embeddings
+from .reindex import load_checkpoint
 
 logger = logging.getLogger(__name__)
 
 MAX_THUMBNAILS = 10
+MAX_EMBEDDING_BATCH = 32
 
 
 class EmbeddingMaintainer(threading.Thread):
@@ -42,13 +51,14 @@ class EmbeddingMaintainer(threading.Thread):
         db: SqliteQueueDatabase,
         config: FrigateConfig,
         stop_event: MpEvent,
+        genai_metrics: Optional[GenAIMetrics] = None,
     ) -> None:
         super().__init__(name="embeddings_maintainer")
         self.config = config
         self.embeddings = Embeddings(config.semantic_search, db)
 
-        # Check if we need to re-index events
-        if config.semantic_search.reindex:
+        # Check if we need to re-index events or finish an interrupted reindex
+        if config.semantic_search.reindex or load_checkpoint() is not None:
             self.embeddings.reindex()
 
         self.event_subscriber = EventUpdateSubscriber()
@@ -62,7 +72,21 @@ class EmbeddingMaintainer(threading.Thread):
         self.requestor = InterProcessRequestor()
         self.stop_event = stop_event
         self.tracked_events = {}
+        # descriptions generated by genai threads waiting to be embedded
+        self.pending_descriptions: queue.Queue[tuple[str, str]] = queue.Queue()
         self.genai_client = get_genai_client(config.genai)
+        self.genai_pool = None
+
+        if self.genai_client is not None:
+            self.genai_pool = GenAIWorkerPool(
+                config.genai,
+                self._process_genai_request,
+                genai_metrics,
+                is_valid=lambda event_id: (
+                    Event.select().where(Event.id == event_id).exists()
+                ),
+            )
+            self.genai_pool.start()
 
     def run(self) -> None:
         """Maintain a SQLite-vec database for semantic search."""
@@ -71,12 +95,17 @@ class EmbeddingMaintainer(threading.Thread):
             self._process_updates()
             self._process_finalized()
             self._process_event_metadata()
+            self._process_descriptions()
 
         self.event_subscriber.stop()
         self.event_end_subscriber.stop()
         self.event_metadata_subscriber.stop()
         self.embeddings_responder.stop()
         self.requestor.stop()
+
+        if self.genai_pool is not None:
+            self.genai_pool.stop()
+
         logger.info("Exiting embeddings maintenance...")
 
     def _process_requests(self) -> None:
@@ -152,6 +181,8 @@ class EmbeddingMaintainer(threading.Thread):
 
     def _process_finalized(self) -> None:
         """Process the end of an event."""
+        thumbnails: dict[str, bytes] = {}
+
         while True:
             ended = self.event_end_subscriber.check_for_update(timeout=0.1)
 
@@ -174,8 +205,8 @@ class EmbeddingMaintainer(threading.Thread):
                 # Extract valid thumbnail
                 thumbnail = base64.b64decode(event.thumbnail)
 
-                # Embed the thumbnail
-                self._embed_thumbnail(event_id, thumbnail)
+                # Embed the thumbnails of all ended events together
+                thumbnails[event_id] = thumbnail
 
                 if (
                     camera_config.genai.enabled
@@ -225,21 +256,42 @@ class EmbeddingMaintainer(threading.Thread):
                         )
                     )
 
-                    # Generate the description. Call happens in a thread since it is network bound.
-                    threading.Thread(
-                        target=self._embed_description,
-                        name=f"_embed_description_{event.id}",
-                        daemon=True,
-                        args=(
-                            event,
-                            embed_image,
-                        ),
-                    ).start()
+                    # Generate the description in the worker pool since it is network bound.
+                    self.genai_pool.submit(event.id, event, embed_image)
 
             # Delete tracked events based on the event_id
             if event_id in self.tracked_events:
                 del self.tracked_events[event_id]
 
+        for batch_start in range(0, len(thumbnails), MAX_EMBEDDING_BATCH):
+            self._embed_thumbnails(
+                dict(
+                    list(thumbnails.items())[
+                        batch_start : batch_start + MAX_EMBEDDING_BATCH
+                    ]
+                )
+            )
+
+    def _process_descriptions(self) -> None:
+        """Embed the descriptions that have been generated since the last pass."""
+        descriptions: dict[str, str] = {}
+
+        while len(descriptions) < MAX_EMBEDDING_BATCH:
+            try:
+                event_id, description = self.pending_descriptions.get_nowait()
+            except queue.Empty:
+                break
+
+            descriptions[event_id] = description
+
+        if not descriptions:
+            return
+
+        try:
+            self.embeddings.batch_embed_description(descriptions)
+        except Exception as e:
+            logger.error(f"Unable to embed {len(descriptions)} descriptions: {e}")
+
     def _process_event_metadata(self):
         # Check for regenerate description requests
         (topic, event_id, source) = self.event_metadata_subscriber.check_for_update(
@@ -268,9 +320,15 @@ class EmbeddingMaintainer(threading.Thread):
 
         return None
 
-    def _embed_thumbnail(self, event_id: str, thumbnail: bytes) -> None:
-        """Embed the thumbnail for an event."""
-        self.embeddings.embed_thumbnail(event_id, thumbnail)
+    def _embed_thumbnails(self, thumbnails: dict[str, bytes]) -> None:
+        """Embed the thumbnails for a batch of events."""
+        try:
+            self.embeddings.batch_embed_thumbnail(thumbnails)
+        except Exception as e:
+            logger.error(f"Unable to embed {len(thumbnails)} thumbnails: {e}")
+
+    def _process_genai_request(self, request: GenAIRequest) -> None:
+        self._embed_description(request.payload, request.images)
 
     def _embed_description(self, event: Event, thumbnails: list[bytes]) -> None:
         """Embed the description for an event."""
@@ -290,8 +348,8 @@ class EmbeddingMaintainer(threading.Thread):
             {"id": event.id, "description": description},
         )
 
-        # Embed the description
-        self.embeddings.embed_description(event.id, description)
+        # Embed the description together with others in the maintainer loop
+        self.pending_descriptions.put((event.id, description))
 
         logger.debug(
             "Generated description for %s (%d images): %s",
@@ -350,4 +408,6 @@ class EmbeddingMaintainer(threading.Thread):
             )
         )
 
-        self._embed_description(event, embed_image)
+        self.genai_pool.submit(
+            event.id, event, embed_image, GenAIRequestPriority.regenerate
+        )
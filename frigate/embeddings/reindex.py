@@ -0,0 +1,309 @@
+"""Pipelined reindexing of tracked object embeddings."""
+
+import base64
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from io import BytesIO
+from typing import Any, Callable, Optional
+
+from PIL import Image
+
+from frigate.comms.inter_process import InterProcessRequestor
+from frigate.const import CONFIG_DIR, UPDATE_EMBEDDINGS_REINDEX_PROGRESS
+from frigate.models import Event
+
+logger = logging.getLogger(__name__)
+
+REINDEX_CHECKPOINT = os.path.join(CONFIG_DIR, ".reindex_checkpoint.json")
+# times a reindex is resumed without finishing a batch before it is given up
+MAX_RESUME_ATTEMPTS = 3
+
+
+def get_reindex_query():
+    """Events that are included in the reindex."""
+    return Event.select(Event.id, Event.thumbnail, Event.data).where(
+        ((Event.has_clip == True) | (Event.has_snapshot == True))
+        & Event.thumbnail.is_null(False)
+    )
+
+
+def wait_for_writes(cursors: list[Any]) -> int:
+    """Block until queued writes are executed, returns the rows written.
+
+    The row count of a queued database cursor is only available once the
+    writer thread has executed the statement, errors of the write are raised.
+    """
+    return sum(cursor.rowcount for cursor in cursors)
+
+
+def load_checkpoint(path: str = REINDEX_CHECKPOINT) -> Optional[dict[str, Any]]:
+    """Load the checkpoint of an unfinished reindex."""
+    if not os.path.exists(path):
+        return None
+
+    try:
+        with open(path) as f:
+            checkpoint = json.load(f)
+    except (OSError, ValueError) as e:
+        logger.warning(f"Unable to read reindex checkpoint, starting over: {e}")
+        return None
+
+    if not checkpoint.get("last_id"):
+        return None
+
+    # an input that fails every time would otherwise restart the reindex
+    # at every startup
+    if checkpoint.get("attempts", 0) >= MAX_RESUME_ATTEMPTS:
+        logger.warning(
+            f"Reindex failed {MAX_RESUME_ATTEMPTS} times without progress after "
+            f"event {checkpoint['last_id']}, it will not be resumed. "
+            "Set semantic_search.reindex to start a new reindex."
+        )
+        clear_checkpoint(path)
+        return None
+
+    return checkpoint
+
+
+def save_checkpoint(checkpoint: dict[str, Any], path: str = REINDEX_CHECKPOINT) -> None:
+    """Atomically save the checkpoint of a running reindex."""
+    tmp_path = f"{path}.tmp"
+
+    with open(tmp_path, "w") as f:
+        json.dump(checkpoint, f)
+
+    os.replace(tmp_path, path)
+
+
+def clear_checkpoint(path: str = REINDEX_CHECKPOINT) -> None:
+    if os.path.exists(path):
+        os.remove(path)
+
+
+class ReindexCancelled(Exception):
+    pass
+
+
+class ReindexPipeline:
+    """Reindex embeddings with a reader, decode, embed and writer stage.
+
+    The reader pages through events with keyset pagination on the event id so
+    every page is an index lookup regardless of how far the reindex is. Each
+    stage runs in its own thread and stages are connected by bounded queues,
+    so reading and decoding the next batches overlaps with running the models
+    while memory use stays limited to a few batches.
+
+    The id of the last event that was written is saved to a checkpoint after
+    every batch so an interrupted reindex continues where it left off. The
+    checkpoint counts the attempts to resume it, which are reset when a batch
+    is written.
+    """
+
+    def __init__(
+        self,
+        embeddings,
+        requestor: InterProcessRequestor,
+        batch_size: int = 32,
+        queue_size: int = 4,
+        checkpoint_path: str = REINDEX_CHECKPOINT,
+    ) -> None:
+        self.embeddings = embeddings
+        self.requestor = requestor
+        self.batch_size = batch_size
+        self.checkpoint_path = checkpoint_path
+        self.decode_queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self.embed_queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self.write_queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self.cancelled = threading.Event()
+        self.errors: list[Exception] = []
+
+    def _put(self, q: queue.Queue, item: Any) -> None:
+        while True:
+            if self.cancelled.is_set():
+                raise ReindexCancelled()
+
+            try:
+                q.put(item, timeout=0.5)
+                return
+            except queue.Full:
+                pass
+
+    def _get(self, q: queue.Queue) -> Any:
+        # batches that are already queued are still processed after a failure
+        # so the checkpoint includes all of the work that was done
+        while True:
+            try:
+                return q.get(timeout=0.5)
+            except queue.Empty:
+                if self.cancelled.is_set():
+                    raise ReindexCancelled()
+
+    def _run_stage(self, target: Callable[..., None], *args) -> None:
+        try:
+            target(*args)
+        except ReindexCancelled:
+            pass
+        except Exception as e:
+            logger.error(f"Reindex stage {target.__name__} failed: {e}")
+            self.errors.append(e)
+            self.cancelled.set()
+
+    def _read(self, last_id: Optional[str]) -> None:
+        while True:
+            query = get_reindex_query()
+
+            if last_id is not None:
+                query = query.where(Event.id > last_id)
+
+            rows = list(query.order_by(Event.id).limit(self.batch_size).tuples())
+
+            if not rows:
+                break
+
+            self._put(self.decode_queue, rows)
+            last_id = rows[-1][0]
+
+        self._put(self.decode_queue, None)
+
+    def _decode(self) -> None:
+        while (rows := self._get(self.decode_queue)) is not None:
+            thumbnails = {}
+            descriptions = {}
+
+            for event_id, thumbnail, data in rows:
+                # decode the jpg here so the embed stage only runs the model
+                thumbnails[event_id] = Image.open(
+                    BytesIO(base64.b64decode(thumbnail))
+                ).convert("RGB")
+
+                if description := ((data or {}).get("description") or "").strip():
+                    descriptions[event_id] = description
+
+            self._put(self.embed_queue, (rows[-1][0], thumbnails, descriptions))
+
+        self._put(self.embed_queue, None)
+
+    def _embed(self) -> None:
+        while (batch := self._get(self.embed_queue)) is not None:
+            last_id, thumbnails, descriptions = batch
+            thumbnail_embeddings = self.embeddings.batch_embed_thumbnail(
+                thumbnails, upsert=False
+            )
+            description_embeddings = (
+                self.embeddings.batch_embed_description(descriptions, upsert=False)
+                if descriptions
+                else []
+            )
+            self._put(
+                self.write_queue,
+                (
+                    last_id,
+                    list(thumbnails.keys()),
+                    thumbnail_embeddings,
+                    list(descriptions.keys()),
+                    description_embeddings,
+                ),
+            )
+
+        self._put(self.write_queue, None)
+
+    def _write(self, totals: dict[str, Any], start_processed: int) -> None:
+        start = time.monotonic()
+
+        while (batch := self._get(self.write_queue)) is not None:
+            last_id, thumb_ids, thumb_embeddings, desc_ids, desc_embeddings = batch
+            cursors = [self.embeddings.upsert_thumbnails(thumb_ids, thumb_embeddings)]
+
+            if desc_ids:
+                cursors.append(
+                    self.embeddings.upsert_descriptions(desc_ids, desc_embeddings)
+                )
+
+            # wait for the writes to be committed before moving the checkpoint
+            wait_for_writes(cursors)
+
+            totals["thumbnails"] += len(thumb_ids)
+            totals["descriptions"] += len(desc_ids)
+            totals["processed_objects"] += len(thumb_ids)
+
+            processed = totals["processed_objects"] - start_processed
+            remaining = max(0, totals["total_objects"] - totals["processed_objects"])
+            totals["time_remaining"] = int(
+                remaining * (time.monotonic() - start) / processed
+            )
+
+            save_checkpoint(
+                {"last_id": last_id, "totals": totals}, self.checkpoint_path
+            )
+            logger.debug(
+                "Processed %d/%d events | Thumbnails: %d, Descriptions: %d | ETA %ds",
+                totals["processed_objects"],
+                totals["total_objects"],
+                totals["thumbnails"],
+                totals["descriptions"],
+                totals["time_remaining"],
+            )
+            self.requestor.send_data(UPDATE_EMBEDDINGS_REINDEX_PROGRESS, totals)
+
+    def run(self, checkpoint: Optional[dict[str, Any]] = None) -> dict[str, Any]:
+        """Run the reindex, resuming from checkpoint if one is given."""
+        last_id = None
+        totals = {
+            "thumbnails": 0,
+            "descriptions": 0,
+            "processed_objects": 0,
+        }
+
+        if checkpoint:
+            last_id = checkpoint["last_id"]
+
+            for key in totals.keys():
+                totals[key] = checkpoint.get("totals", {}).get(key, 0)
+
+            save_checkpoint(
+                {**checkpoint, "attempts": checkpoint.get("attempts", 0) + 1},
+                self.checkpoint_path,
+            )
+
+            logger.info(
+                f"Resuming reindex after {totals['processed_objects']} tracked objects"
+            )
+
+        totals["total_objects"] = get_reindex_query().count()
+        totals["time_remaining"] = -1
+        totals["status"] = "indexing"
+        self.requestor.send_data(UPDATE_EMBEDDINGS_REINDEX_PROGRESS, totals)
+
+        stages = [
+            threading.Thread(
+                target=self._run_stage,
+                name=f"reindex_{stage.__name__.strip('_')}",
+                args=(stage, *args),
+                daemon=True,
+            )
+            for stage, args in (
+                (self._read, (last_id,)),
+                (self._decode, ()),
+                (self._embed, ()),
+                (self._write, (totals, totals["processed_objects"])),
+            )
+        ]
+
+        for stage in stages:
+            stage.start()
+
+        for stage in stages:
+            stage.join()
+
+        if self.errors:
+            raise self.errors[0]
+
+        clear_checkpoint(self.checkpoint_path)
+        totals["time_remaining"] = 0
+        totals["status"] = "completed"
+        self.requestor.send_data(UPDATE_EMBEDDINGS_REINDEX_PROGRESS, totals)
+        return totals
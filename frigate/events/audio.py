@@ -4,7 +4,7 @@ import datetime
 import logging
 import threading
 import time
-from typing import Tuple
+from typing import Optional, Tuple
 
 import numpy as np
 import requests
@@ -29,10 +29,18 @@ from frigate.service_manager import ServiceProcess
 from frigate.util.builtin import get_ffmpeg_arg_list
 from frigate.video import start_or_restart_ffmpeg, stop_ffmpeg
 
-try:
-    from tflite_runtime.interpreter import Interpreter
-except ModuleNotFoundError:
-    from tensorflow.lite.python.interpreter import Interpreter
+logger = logging.getLogger(__name__)
+
+AUDIO_SAMPLES = int(round(AUDIO_DURATION * AUDIO_SAMPLE_RATE))
+# cameras that share one audio model, more cameras are split over more models
+AUDIO_CAMERAS_PER_DETECTOR = 4
+# every camera has at most one window queued, so a window waits for the batch in
+# progress and then for its own batch. A detector that keeps up classifies the
+# windows of all of its cameras within AUDIO_DURATION, so whatever the queue
+# depth a window has its result within two window lengths.
+AUDIO_DETECTION_TIMEOUT = 2 * AUDIO_DURATION
+# dropped windows of a camera are reported at most this often
+AUDIO_DROPPED_WARNING_INTERVAL = 60
 
 
 def get_ffmpeg_command(ffmpeg: FfmpegConfig) -> list[str]:
@@ -84,10 +92,29 @@ class AudioProcessor(ServiceProcess):
         if len(self.cameras) == 0:
             return
 
+        detectors: list[AudioDetectorService] = []
+        camera_detectors: dict[str, AudioDetectorService] = {}
+
+        # non batched models classify window by window, so cameras are split
+        # over a few models to keep classifying them in parallel
+        for i in range(0, len(self.cameras), AUDIO_CAMERAS_PER_DETECTOR):
+            cameras = self.cameras[i : i + AUDIO_CAMERAS_PER_DETECTOR]
+            detector = AudioDetectorService(
+                [camera.name for camera in cameras],
+                self.stop_event,
+                max(camera.audio.num_threads for camera in cameras),
+            )
+            detector.start()
+            detectors.append(detector)
+
+            for camera in cameras:
+                camera_detectors[camera.name] = detector
+
         for camera in self.cameras:
             audio_thread = AudioEventMaintainer(
                 camera,
                 self.camera_metrics,
+                camera_detectors[camera.name],
                 self.stop_event,
             )
             audio_threads.append(audio_thread)
@@ -108,14 +135,97 @@ class AudioProcessor(ServiceProcess):
             if thread.is_alive():
                 self.logger.warning(f"Thread {thread.name} is still alive")
 
+        for detector in detectors:
+            detector.join(1)
+
         self.logger.info("Exiting audio processor")
 
 
+class AudioDetectorService(threading.Thread):
+    """Classify the audio of a group of cameras with a single model.
+
+    Every camera has a slot in a preallocated waveform buffer. The windows of
+    all cameras that are waiting when the model is free are classified as one
+    batch, and a camera that does not get its result within the timeout skips
+    that window instead of falling behind its audio stream.
+    """
+
+    def __init__(
+        self,
+        cameras: list[str],
+        stop_event: threading.Event,
+        num_threads: int = 2,
+        timeout: float = AUDIO_DETECTION_TIMEOUT,
+        detector: Optional["AudioTfl"] = None,
+    ) -> None:
+        super().__init__(name="audio_detector")
+        self.stop_event = stop_event
+        self.timeout = timeout
+        self.detector = detector or AudioTfl(stop_event, num_threads)
+        self.slots = {camera: i for i, camera in enumerate(cameras)}
+        self.waveforms = np.zeros((len(cameras), AUDIO_SAMPLES), np.float32)
+        self.sequences = [0] * len(cameras)
+        self.results: list[list[tuple]] = [[] for _ in cameras]
+        self.finished = [threading.Event() for _ in cameras]
+        self.pending: list[int] = []
+        self.condition = threading.Condition()
+
+    def detect(self, camera: str, waveform: np.ndarray) -> Optional[list[tuple]]:
+        """Classify a window of audio, returns None if the window was skipped."""
+        slot = self.slots[camera]
+
+        with self.condition:
+            self.waveforms[slot] = waveform
+            self.sequences[slot] += 1
+            self.finished[slot].clear()
+
+            if slot not in self.pending:
+                self.pending.append(slot)
+
+            self.condition.notify()
+
+        if self.finished[slot].wait(self.timeout):
+            return self.results[slot]
+
+        with self.condition:
+            if slot in self.pending:
+                self.pending.remove(slot)
+
+        return None
+
+    def run(self) -> None:
+        while not self.stop_event.is_set():
+            with self.condition:
+                if not self.pending:
+                    self.condition.wait(timeout=1)
+                    continue
+
+                slots = self.pending
+                self.pending = []
+                # copy the windows so cameras can write their next one
+                batch = self.waveforms[slots]
+                sequences = [self.sequences[slot] for slot in slots]
+
+            try:
+                detections = self.detector.detect_batch(batch)
+            except Exception as e:
+                logger.error(f"Error running audio detection: {e}")
+                detections = [[] for _ in slots]
+
+            with self.condition:
+                for slot, sequence, result in zip(slots, sequences, detections):
+                    # the camera may have already moved on to its next window
+                    if self.sequences[slot] == sequence:
+                        self.results[slot] = result
+                        self.finished[slot].set()
+
+
 class AudioEventMaintainer(threading.Thread):
     def __init__(
         self,
         camera: CameraConfig,
         camera_metrics: dict[str, CameraMetrics],
+        detector: AudioDetectorService,
         stop_event: threading.Event,
     ) -> None:
         super().__init__(name=f"{camera.name}_audio_event_processor")
@@ -124,13 +234,15 @@ class AudioEventMaintainer(threading.Thread):
         self.camera_metrics = camera_metrics
         self.detections: dict[dict[str, any]] = {}
         self.stop_event = stop_event
-        self.detector = AudioTfl(stop_event, self.config.audio.num_threads)
-        self.shape = (int(round(AUDIO_DURATION * AUDIO_SAMPLE_RATE)),)
-        self.chunk_size = int(round(AUDIO_DURATION * AUDIO_SAMPLE_RATE * 2))
+        self.detector = detector
+        self.shape = (AUDIO_SAMPLES,)
+        self.chunk_size = AUDIO_SAMPLES * 2
         self.logger = logging.getLogger(f"audio.{self.config.name}")
         self.ffmpeg_cmd = get_ffmpeg_command(self.config.ffmpeg)
         self.logpipe = LogPipe(f"ffmpeg.{self.config.name}.audio")
         self.audio_listener = None
+        self.dropped_windows = 0
+        self.last_dropped_warning: Optional[float] = None
 
         # create communication for audio detections
         self.requestor = InterProcessRequestor()
@@ -151,9 +263,13 @@ class AudioEventMaintainer(threading.Thread):
         if rms >= self.config.audio.min_volume:
             # create waveform relative to max range and look for detections
             waveform = (audio / AUDIO_MAX_BIT_RANGE).astype(np.float32)
-            model_detections = self.detector.detect(waveform)
+            model_detections = self.detector.detect(self.config.name, waveform)
             audio_detections = []
 
+            if model_detections is None:
+                self.handle_dropped_window()
+                model_detections = []
+
             for label, score, _ in model_detections:
                 self.logger.debug(
                     f"{self.config.name} heard {label} with a score of {score}"
@@ -196,6 +312,21 @@ class AudioEventMaintainer(threading.Thread):
 
         return float(rms), float(dBFS)
 
+    def handle_dropped_window(self) -> None:
+        self.camera_metrics[self.config.name].audio_dropped.value += 1
+        self.dropped_windows += 1
+        now = time.monotonic()
+
+        if (
+            self.last_dropped_warning is None
+            or now - self.last_dropped_warning >= AUDIO_DROPPED_WARNING_INTERVAL
+        ):
+            self.logger.warning(
+                f"Audio detection for {self.config.name} is not keeping up, skipped {self.dropped_windows} audio windows"
+            )
+            self.dropped_windows = 0
+            self.last_dropped_warning = now
+
     def handle_detection(self, label: str, score: float) -> None:
         if self.detections.get(label):
             self.detections[label]["last_detection"] = (
@@ -306,6 +437,12 @@ class AudioTfl:
         self.stop_event = stop_event
         self.num_threads = num_threads
         self.labels = load_labels("/audio-labelmap.txt", prefill=521)
+
+        try:
+            from tflite_runtime.interpreter import Interpreter
+        except ModuleNotFoundError:
+            from tensorflow.lite.python.interpreter import Interpreter
+
         self.interpreter = Interpreter(
             model_path="/cpu_audio_model.tflite",
             num_threads=self.num_threads,
@@ -315,13 +452,27 @@ class AudioTfl:
 
         self.tensor_input_details = self.interpreter.get_input_details()
         self.tensor_output_details = self.interpreter.get_output_details()
+        # models with a batch dimension classify all windows in one invoke
+        self.batched = len(self.tensor_input_details[0]["shape"]) > 1
+        self.batch_size = 1
+
+    def _invoke(self, tensor_input):
+        if self.batched and tensor_input.shape[0] != self.batch_size:
+            self.interpreter.resize_tensor_input(
+                self.tensor_input_details[0]["index"], tensor_input.shape
+            )
+            self.interpreter.allocate_tensors()
+            self.batch_size = tensor_input.shape[0]
 
-    def _detect_raw(self, tensor_input):
         self.interpreter.set_tensor(self.tensor_input_details[0]["index"], tensor_input)
         self.interpreter.invoke()
-        detections = np.zeros((20, 6), np.float32)
+        return self.interpreter.get_tensor(self.tensor_output_details[0]["index"])
+
+    def _detect_raw(self, tensor_input, res=None):
+        if res is None:
+            res = self._invoke(tensor_input)[0]
 
-        res = self.interpreter.get_tensor(self.tensor_output_details[0]["index"])[0]
+        detections = np.zeros((20, 6), np.float32)
         non_zero_indices = res > 0
         class_ids = np.argpartition(-res, 20)[:20]
         class_ids = class_ids[np.argsort(-res[class_ids])]
@@ -344,14 +495,9 @@ class AudioTfl:
 
         return detections
 
-    def detect(self, tensor_input, threshold=AUDIO_MIN_CONFIDENCE):
+    def _to_detections(self, raw_detections, threshold):
         detections = []
 
-        if self.stop_event.is_set():
-            return detections
-
-        raw_detections = self._detect_raw(tensor_input)
-
         for d in raw_detections:
             if d[1] < threshold:
                 break
@@ -359,3 +505,23 @@ class AudioTfl:
                 (self.labels[int(d[0])], float(d[1]), (d[2], d[3], d[4], d[5]))
             )
         return detections
+
+    def detect(self, tensor_input, threshold=AUDIO_MIN_CONFIDENCE):
+        if self.stop_event.is_set():
+            return []
+
+        return self._to_detections(self._detect_raw(tensor_input), threshold)
+
+    def detect_batch(self, tensor_inputs, threshold=AUDIO_MIN_CONFIDENCE):
+        """Classify a batch of windows, returns the detections of each window."""
+        if self.stop_event.is_set():
+            return [[] for _ in tensor_inputs]
+
+        if self.batched:
+            results = self._invoke(tensor_inputs)
+            return [
+                self._to_detections(self._detect_raw(None, res), threshold)
+                for res in results
+            ]
+
+        return [self.detect(tensor_input, threshold) for tensor_input in tensor_inputs]
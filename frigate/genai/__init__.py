@@ -1,7 +1,6 @@
 """Generative AI module for Frigate."""
 
 import importlib
-import os
 from typing import Optional
 
 from playhouse.shortcuts import model_to_dict
@@ -55,16 +54,13 @@ class GenAIClient:
 def get_genai_client(genai_config: GenAIConfig) -> Optional[GenAIClient]:
     """Get the GenAI client."""
     if genai_config.enabled:
-        load_providers()
+        load_provider(genai_config.provider)
         provider = PROVIDERS.get(genai_config.provider)
         if provider:
             return provider(genai_config)
     return None
 
 
-def load_providers():
-    package_dir = os.path.dirname(__file__)
-    for filename in os.listdir(package_dir):
-        if filename.endswith(".py") and filename != "__init__.py":
-            module_name = f"frigate.genai.{filename[:-3]}"
-            importlib.import_module(module_name)
+def load_provider(provider: GenAIProviderEnum) -> None:
+    """Import only the module of the configured provider and its sdk."""
+    importlib.import_module(f"frigate.genai.{provider.value.replace('_', '-')}")
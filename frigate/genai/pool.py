@@ -0,0 +1,229 @@
+"""Bounded worker pool for GenAI description requests."""
+
+import logging
+import multiprocessing as mp
+import threading
+import time
+from dataclasses import dataclass, field
+from enum import IntEnum
+from multiprocessing.sharedctypes import Synchronized
+from typing import Any, Callable, Optional
+
+from frigate.config import GenAIConfig
+
+logger = logging.getLogger(__name__)
+
+
+class GenAIMetrics:
+    queue_depth: Synchronized
+    in_flight: Synchronized
+    queued_bytes: Synchronized
+    wait_time: Synchronized
+    processed: Synchronized
+    coalesced: Synchronized
+    dropped: Synchronized
+
+    def __init__(self):
+        self.queue_depth = mp.Value("i", 0)
+        self.in_flight = mp.Value("i", 0)
+        self.queued_bytes = mp.Value("i", 0)
+        self.wait_time = mp.Value("d", 0)
+        self.processed = mp.Value("i", 0)
+        self.coalesced = mp.Value("i", 0)
+        self.dropped = mp.Value("i", 0)
+
+
+class GenAIRequestPriority(IntEnum):
+    """Lower values are processed first."""
+
+    regenerate = 0
+    tracked_object = 1
+
+
+@dataclass
+class GenAIRequest:
+    event_id: str
+    payload: Any
+    images: list[bytes]
+    priority: GenAIRequestPriority
+    sequence: int
+    submitted: float = field(default_factory=time.monotonic)
+
+    @property
+    def size(self) -> int:
+        return sum(len(image) for image in self.images)
+
+
+class GenAIWorkerPool:
+    """Generate descriptions with a fixed number of workers.
+
+    Requests wait in a bounded queue ordered by priority and then by arrival.
+    A request for an event that is already queued replaces the queued one.
+    When the queue is full or the images of queued and in progress requests
+    would exceed the memory limit, the newest request of the lowest priority
+    is dropped. Requests are dropped when they are taken from the queue if
+    is_valid no longer accepts their event, and workers start at most
+    requests_per_minute requests towards the provider.
+    """
+
+    def __init__(
+        self,
+        config: GenAIConfig,
+        handler: Callable[[GenAIRequest], None],
+        metrics: Optional[GenAIMetrics] = None,
+        is_valid: Callable[[str], bool] = lambda event_id: True,
+    ) -> None:
+        self.config = config
+        self.handler = handler
+        self.metrics = metrics or GenAIMetrics()
+        self.is_valid = is_valid
+        self.max_bytes = config.max_queued_memory * 1024 * 1024
+        self.condition = threading.Condition()
+        self.queued: dict[str, GenAIRequest] = {}
+        self.in_flight = 0
+        self.queued_bytes = 0
+        self.sequence = 0
+        self.rate_lock = threading.Lock()
+        self.next_request = 0.0
+        self.stop_event = threading.Event()
+        self.workers = [
+            threading.Thread(target=self._run, name=f"genai_worker:{i}", daemon=True)
+            for i in range(config.workers)
+        ]
+
+    def start(self) -> None:
+        for worker in self.workers:
+            worker.start()
+
+    def stop(self) -> None:
+        self.stop_event.set()
+
+        with self.condition:
+            self.condition.notify_all()
+
+        for worker in self.workers:
+            if worker.is_alive():
+                worker.join()
+
+    def submit(
+        self,
+        event_id: str,
+        payload: Any,
+        images: list[bytes],
+        priority: GenAIRequestPriority = GenAIRequestPriority.tracked_object,
+    ) -> bool:
+        """Queue a request, returns False if it was dropped."""
+        with self.condition:
+            self.sequence += 1
+            request = GenAIRequest(event_id, payload, images, priority, self.sequence)
+            existing = self.queued.pop(event_id, None)
+
+            if existing is not None:
+                # keep the place in the queue of the earlier request
+                request.priority = min(priority, existing.priority)
+                request.sequence = existing.sequence
+                request.submitted = existing.submitted
+                self.queued_bytes -= existing.size
+                self.metrics.coalesced.value += 1
+
+            while len(self.queued) >= self.config.queue_size or (
+                self.queued_bytes > 0
+                and self.queued_bytes + request.size > self.max_bytes
+            ):
+                lowest = max(
+                    self.queued.values(),
+                    key=lambda r: (r.priority, r.sequence),
+                    default=None,
+                )
+
+                if lowest is None or lowest.priority <= request.priority:
+                    logger.debug(
+                        f"GenAI queue is full, dropping request for {event_id}"
+                    )
+                    self.metrics.dropped.value += 1
+                    self._update_metrics()
+                    return False
+
+                logger.debug(
+                    f"GenAI queue is full, dropping request for {lowest.event_id}"
+                )
+                del self.queued[lowest.event_id]
+                self.queued_bytes -= lowest.size
+                self.metrics.dropped.value += 1
+
+            self.queued[event_id] = request
+            self.queued_bytes += request.size
+            self._update_metrics()
+            self.condition.notify()
+
+        return True
+
+    def _update_metrics(self) -> None:
+        self.metrics.queue_depth.value = len(self.queued)
+        self.metrics.in_flight.value = self.in_flight
+        self.metrics.queued_bytes.value = self.queued_bytes
+
+    def _next_request(self) -> Optional[GenAIRequest]:
+        with self.condition:
+            while not self.queued:
+                if self.stop_event.is_set():
+                    return None
+
+                self.condition.wait(timeout=1)
+
+            request = min(self.queued.values(), key=lambda r: (r.priority, r.sequence))
+            del self.queued[request.event_id]
+            self.in_flight += 1
+            self._update_metrics()
+            return request
+
+    def _finish_request(self, request: GenAIRequest) -> None:
+        with self.condition:
+            self.in_flight -= 1
+            self.queued_bytes -= request.size
+            self._update_metrics()
+
+    def _wait_for_rate_limit(self) -> bool:
+        if not self.config.requests_per_minute:
+            return True
+
+        with self.rate_lock:
+            now = time.monotonic()
+            start = max(now, self.next_request)
+            self.next_request = start + 60 / self.config.requests_per_minute
+
+        return not self.stop_event.wait(start - now) if start > now else True
+
+    def _run(self) -> None:
+        while not self.stop_event.is_set():
+            request = self._next_request()
+
+            if request is None:
+                break
+
+            try:
+                if not self.is_valid(request.event_id):
+                    logger.debug(f"Dropping GenAI request for {request.event_id}")
+
+                    with self.condition:
+                        self.metrics.dropped.value += 1
+
+                    continue
+
+                if not self._wait_for_rate_limit():
+                    break
+
+                wait_time = time.monotonic() - request.submitted
+                self.metrics.wait_time.value = (
+                    self.metrics.wait_time.value * 9 + wait_time
+                ) / 10
+                self.handler(request)
+
+                with self.condition:
+                    self.metrics.processed.value += 1
+            except Exception as e:
+                logger.error(
+                    f"Failed to process GenAI request for {request.event_id}: {e}"
+                )
+            finally:
+                self._finish_request(request)
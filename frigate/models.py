@@ -1,6 +1,7 @@
 from peewee import (
     BooleanField,
     CharField,
+    CompositeKey,
     DateTimeField,
     FloatField,
     IntegerField,
@@ -75,6 +76,21 @@ class Recordings(Model):  # type: ignore[misc]
     dBFS = IntegerField(null=True)
     segment_size = FloatField(default=0)  # this should be stored as MB
     regions = IntegerField(null=True)
+    keyframes = JSONField(null=True)  # seconds from the start of the segment
+
+
+# Kept up to date by triggers on the recordings and event tables
+class RecordingsRollup(Model):  # type: ignore[misc]
+    camera = CharField(max_length=20)
+    start_time = IntegerField()  # start of the 15 minute period
+    duration = FloatField(default=0)
+    motion = IntegerField(default=0)
+    objects = IntegerField(default=0)
+    segments = IntegerField(default=0)
+    events = IntegerField(default=0)  # events with a clip
+
+    class Meta:
+        primary_key = CompositeKey("camera", "start_time")
 
 
 class Export(Model):  # type: ignore[misc]
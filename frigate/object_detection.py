@@ -82,6 +82,94 @@ class LocalObjectDetector(ObjectDetector):
             tensor_input = np.transpose(tensor_input, self.input_transform)
         return self.detect_api.detect_raw(tensor_input=tensor_input)
 
+    @property
+    def supports_async(self) -> bool:
+        return self.detect_api.supports_async
+
+    def detect_raw_async(self, tensor_input, callback) -> None:
+        if self.input_transform:
+            tensor_input = np.transpose(tensor_input, self.input_transform)
+        self.detect_api.detect_raw_async(tensor_input=tensor_input, callback=callback)
+
+    def wait_async(self) -> None:
+        self.detect_api.wait_async()
+
+
+class AsyncDetectionRunner:
+    """Keeps several detections in flight for detectors that support it.
+
+    Each completion is written to the output of the camera that requested
+    it. A camera only waits for one detection at a time, but when a request
+    is sent again after a timeout the new request waits for the previous
+    one so results are always delivered in order.
+    """
+
+    def __init__(
+        self,
+        object_detector: LocalObjectDetector,
+        frame_manager,
+        input_shape: tuple[int, int, int, int],
+        outputs: dict[str, dict[str, any]],
+        out_events: dict[str, mp.Event],
+        avg_speed,
+        start,
+    ) -> None:
+        self.object_detector = object_detector
+        self.frame_manager = frame_manager
+        self.input_shape = input_shape
+        self.outputs = outputs
+        self.out_events = out_events
+        self.avg_speed = avg_speed
+        self.start = start
+        self.lock = threading.Lock()
+        self.in_flight: dict[str, tuple[float, threading.Event]] = {}
+
+    def submit(self, connection_id: str) -> None:
+        with self.lock:
+            previous = self.in_flight.get(connection_id)
+
+        if previous is not None:
+            previous[1].wait()
+
+        input_frame = self.frame_manager.get(connection_id, self.input_shape)
+
+        if input_frame is None:
+            logger.warning(f"Failed to get frame {connection_id} from SHM")
+            return
+
+        with self.lock:
+            self.in_flight[connection_id] = (
+                datetime.datetime.now().timestamp(),
+                threading.Event(),
+            )
+            self._update_start()
+
+        self.object_detector.detect_raw_async(
+            input_frame, lambda detections: self._done(connection_id, detections)
+        )
+        self.frame_manager.close(connection_id)
+
+    def _done(self, connection_id: str, detections: np.ndarray) -> None:
+        self.outputs[connection_id]["np"][:] = detections[:]
+        self.out_events[connection_id].set()
+
+        with self.lock:
+            started, done = self.in_flight.pop(connection_id)
+            duration = datetime.datetime.now().timestamp() - started
+            self.avg_speed.value = (self.avg_speed.value * 9 + duration) / 10
+            self._update_start()
+
+        done.set()
+
+    def _update_start(self) -> None:
+        # the watchdog restarts the detector when the oldest request is stuck
+        self.start.value = min(
+            (started for started, _ in self.in_flight.values()), default=0.0
+        )
+
+    def stop(self) -> None:
+        self.object_detector.wait_async()
+
 
 def run_detector(
     name: str,
@@ -114,15 +202,31 @@ def run_detector(
         out_np = np.ndarray((20, 6), dtype=np.float32, buffer=out_shm.buf)
         outputs[name] = {"shm": out_shm, "np": out_np}
 
+    input_shape = (1, detector_config.model.height, detector_config.model.width, 3)
+    async_runner = None
+
+    if object_detector.supports_async:
+        async_runner = AsyncDetectionRunner(
+            object_detector,
+            frame_manager,
+            input_shape,
+            outputs,
+            out_events,
+            avg_speed,
+            start,
+        )
+
     while not stop_event.is_set():
         try:
             connection_id = detection_queue.get(timeout=1)
         except queue.Empty:
             continue
-        input_frame = frame_manager.get(
-            connection_id,
-            (1, detector_config.model.height, detector_config.model.width, 3),
-        )
+
+        if async_runner is not None:
+            async_runner.submit(connection_id)
+            continue
+
+        input_frame = frame_manager.get(connection_id, input_shape)
 
         if input_frame is None:
             logger.warning(f"Failed to get frame {connection_id} from SHM")
@@ -139,6 +243,9 @@ def run_detector(
 
         avg_speed.value = (avg_speed.value * 9 + duration) / 10
 
+    if async_runner is not None:
+        async_runner.stop()
+
     logger.info("Exited detection process...")
 
 
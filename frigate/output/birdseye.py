@@ -10,6 +10,7 @@ import queue
 import subprocess as sp
 import threading
 import traceback
+from typing import Optional
 
 import cv2
 import numpy as np
@@ -344,14 +345,30 @@ class BirdsEyeFrameManager:
             }
 
         self.camera_layout = []
+        self.layout_dimensions: dict[str, tuple[int, int]] = {}
         self.active_cameras = set()
         self.last_output_time = 0.0
+        self.frame_changed = True
+        self.frame_bytes: Optional[bytes] = None
 
     def clear_frame(self):
         logger.debug("Clearing the birdseye frame")
         self.frame[:] = self.blank_frame
+        self.frame_changed = True
 
-    def copy_to_position(self, position, camera=None, frame_time=None):
+        # all tiles need to be copied again
+        for camera in self.cameras.values():
+            camera["layout_frame"] = 0.0
+
+    def get_frame_bytes(self) -> bytes:
+        """Get the birdseye frame as bytes, converted only when it changed."""
+        if self.frame_changed or self.frame_bytes is None:
+            self.frame_bytes = self.frame.tobytes()
+            self.frame_changed = False
+
+        return self.frame_bytes
+
+    def copy_to_position(self, position, camera=None, frame_time=None) -> bool:
         if camera is None:
             frame = None
             channel_dims = None
@@ -363,7 +380,7 @@ class BirdsEyeFrameManager:
 
             if frame is None:
                 logger.debug(f"Unable to copy frame {camera}{frame_time} to birdseye.")
-                return
+                return False
 
             channel_dims = self.cameras[camera]["channel_dims"]
 
@@ -376,6 +393,8 @@ class BirdsEyeFrameManager:
         )
 
         self.frame_manager.close(frame_id)
+        self.frame_changed = True
+        return True
 
     def camera_active(self, mode, object_box_count, motion_box_count):
         if mode == BirdseyeModeEnum.continuous:
@@ -436,12 +455,20 @@ class BirdsEyeFrameManager:
                 self.clear_frame()
                 return True
 
+        layout_dimensions = {
+            camera: tuple(self.cameras[camera]["dimensions"])
+            for camera in active_cameras
+        }
+
         # check if we need to reset the layout because there is a different number of cameras
         if len(self.active_cameras) - len(active_cameras) == 0:
             if len(self.active_cameras) == 1 and self.active_cameras != active_cameras:
                 reset_layout = True
             elif max_camera_refresh:
                 reset_layout = True
+            elif layout_dimensions != self.layout_dimensions:
+                # the aspect ratio of a camera changed
+                reset_layout = True
             else:
                 reset_layout = False
         else:
@@ -452,6 +479,7 @@ class BirdsEyeFrameManager:
             logger.debug("Added new cameras, resetting layout...")
             self.clear_frame()
             self.active_cameras = active_cameras
+            self.layout_dimensions = layout_dimensions
 
             # this also converts added_cameras from a set to a list since we need
             # to pop elements in order
@@ -521,13 +549,22 @@ class BirdsEyeFrameManager:
 
                 self.camera_layout = layout_candidate
 
+        # only copy the cameras that have a new frame since their tile was last copied
+        updated = reset_layout
+
         for row in self.camera_layout:
-            for position in row:
-                self.copy_to_position(
-                    position[1], position[0], self.cameras[position[0]]["current_frame"]
-                )
+            for camera, position in row:
+                camera_data = self.cameras[camera]
+                frame_time = camera_data["current_frame"]
 
-        return True
+                if frame_time == camera_data["layout_frame"]:
+                    continue
+
+                if self.copy_to_position(position, camera, frame_time):
+                    camera_data["layout_frame"] = frame_time
+                    updated = True
+
+        return updated
 
     def calculate_layout(
         self,
@@ -778,9 +815,10 @@ class Birdseye:
             frame_time,
             frame,
         ):
-            frame_bytes = self.birdseye_manager.frame.tobytes()
+            frame_changed = self.birdseye_manager.frame_changed
+            frame_bytes = self.birdseye_manager.get_frame_bytes()
 
-            if self.config.birdseye.restream:
+            if self.config.birdseye.restream and frame_changed:
                 self.birdseye_buffer[:] = frame_bytes
 
             try:
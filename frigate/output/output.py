@@ -23,7 +23,7 @@ from frigate.config import FrigateConfig
 from frigate.const import CACHE_DIR, CLIPS_DIR
 from frigate.output.birdseye import Birdseye
 from frigate.output.camera import JsmpegCamera
-from frigate.output.preview import PreviewRecorder
+from frigate.output.preview import PreviewEncoder, PreviewRecorder
 from frigate.util.image import SharedMemoryFrameManager
 
 logger = logging.getLogger(__name__)
@@ -61,6 +61,7 @@ def output_frames(
 
     jsmpeg_cameras: dict[str, JsmpegCamera] = {}
     birdseye: Optional[Birdseye] = None
+    preview_encoder = PreviewEncoder()
     preview_recorders: dict[str, PreviewRecorder] = {}
     preview_write_times: dict[str, float] = {}
 
@@ -71,7 +72,7 @@ def output_frames(
             continue
 
         jsmpeg_cameras[camera] = JsmpegCamera(cam_config, stop_event, websocket_server)
-        preview_recorders[camera] = PreviewRecorder(cam_config)
+        preview_recorders[camera] = PreviewRecorder(cam_config, preview_encoder)
         preview_write_times[camera] = 0
 
     if config.birdseye.enabled:
@@ -141,6 +142,8 @@ def output_frames(
 
         frame_manager.close(frame_id)
 
+    # wait for queued preview frames to be written before moving them
+    preview_encoder.stop()
     move_preview_frames("clips")
 
     while True:
@@ -7,7 +7,9 @@ import shutil
 import subprocess as sp
 import threading
 import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
 from pathlib import Path
+from typing import Callable, Optional
 
 import cv2
 import numpy as np
@@ -15,7 +17,7 @@ import numpy as np
 from frigate.comms.config_updater import ConfigSubscriber
 from frigate.comms.inter_process import InterProcessRequestor
 from frigate.config import CameraConfig, RecordQualityEnum
-from frigate.const import CACHE_DIR, CLIPS_DIR, INSERT_PREVIEW, PREVIEW_FRAME_TYPE
+from frigate.const import CLIPS_DIR, INSERT_PREVIEW
 from frigate.ffmpeg_presets import (
     FPS_VFR_PARAM,
     EncodeTypeEnum,
@@ -23,12 +25,15 @@ from frigate.ffmpeg_presets import (
 )
 from frigate.models import Previews
 from frigate.object_processing import TrackedObject
+from frigate.output.preview_index import (
+    PREVIEW_CACHE_DIR,
+    PreviewFrameIndex,
+    get_cache_image_name,
+)
 from frigate.util.image import copy_yuv_to_position, get_yuv_crop
 
 logger = logging.getLogger(__name__)
 
-FOLDER_PREVIEW_FRAMES = "preview_frames"
-PREVIEW_CACHE_DIR = os.path.join(CACHE_DIR, FOLDER_PREVIEW_FRAMES)
 PREVIEW_SEGMENT_DURATION = 3600  # one hour
 # important to have lower keyframe to maintain scrubbing performance
 PREVIEW_KEYFRAME_INTERVAL = 40
@@ -47,17 +52,67 @@ PREVIEW_QUALITY_BIT_RATES = {
     RecordQualityEnum.high: 9864,
     RecordQualityEnum.very_high: 10096,
 }
+# frame encoding and hourly conversion happen off of the output loop
+PREVIEW_FRAME_WORKERS = 2
+PREVIEW_FRAME_QUEUE_SIZE = 32
+PREVIEW_CONVERTER_WORKERS = 2
+
+
+def encode_preview_frame(path: str, yuv_frame: np.ndarray, quality: int) -> None:
+    """Convert a downscaled yuv frame and write it to the cache."""
+    cv2.imwrite(
+        path,
+        cv2.cvtColor(yuv_frame, cv2.COLOR_YUV2BGR_I420),
+        [int(cv2.IMWRITE_WEBP_QUALITY), quality],
+    )
 
 
-def get_cache_image_name(camera: str, frame_time: float) -> str:
-    """Get the image name in cache."""
-    return os.path.join(
-        CACHE_DIR,
-        f"{FOLDER_PREVIEW_FRAMES}/preview_{camera}-{frame_time}.{PREVIEW_FRAME_TYPE}",
-    )
+class PreviewEncoder:
+    """Encodes preview frames and hourly previews for all cameras.
+
+    Frames are encoded by a small worker pool with a bounded number of
+    queued frames, and hourly previews are queued so only a limited
+    number of ffmpeg processes run at the top of the hour.
+    """
+
+    def __init__(self) -> None:
+        self.frame_slots = threading.BoundedSemaphore(PREVIEW_FRAME_QUEUE_SIZE)
+        self.frame_executor = ThreadPoolExecutor(
+            max_workers=PREVIEW_FRAME_WORKERS, thread_name_prefix="preview_frame"
+        )
+        self.converter_executor = ThreadPoolExecutor(
+            max_workers=PREVIEW_CONVERTER_WORKERS,
+            thread_name_prefix="preview_converter",
+        )
+
+    def write_frame(
+        self, write_fn: Callable[[], None], block: bool
+    ) -> Optional[Future]:
+        """Queue a frame to be written, returns None if the queue is full."""
+        if not self.frame_slots.acquire(blocking=block):
+            return None
+
+        future = self.frame_executor.submit(write_fn)
+        future.add_done_callback(lambda _: self.frame_slots.release())
+        return future
+
+    def convert(
+        self, converter: "FFMpegConverter", frame_futures: list[Future]
+    ) -> None:
+        """Queue a preview to be created once all of its frames are written."""
+
+        def run_converter() -> None:
+            wait(frame_futures)
+            converter.run()
+
+        self.converter_executor.submit(run_converter)
+
+    def stop(self) -> None:
+        self.frame_executor.shutdown(wait=True)
+        self.converter_executor.shutdown(wait=True)
 
 
-class FFMpegConverter(threading.Thread):
+class FFMpegConverter:
     """Convert a list of still frames into a vfr mp4."""
 
     def __init__(
@@ -65,11 +120,12 @@ class FFMpegConverter(threading.Thread):
         config: CameraConfig,
         frame_times: list[float],
         requestor: InterProcessRequestor,
+        frame_index: PreviewFrameIndex,
     ):
-        super().__init__(name=f"{config.name}_preview_converter")
         self.config = config
         self.frame_times = frame_times
         self.requestor = requestor
+        self.frame_index = frame_index
         self.path = os.path.join(
             CLIPS_DIR,
             f"previews/{self.config.name}/{self.frame_times[0]}-{self.frame_times[-1]}.mp4",
@@ -147,13 +203,17 @@ class FFMpegConverter(threading.Thread):
         for t in self.frame_times[0:-1]:
             Path(get_cache_image_name(self.config.name, t)).unlink(missing_ok=True)
 
+        self.frame_index.remove(self.frame_times[0:-1])
+
 
 class PreviewRecorder:
-    def __init__(self, config: CameraConfig) -> None:
+    def __init__(self, config: CameraConfig, encoder: PreviewEncoder) -> None:
         self.config = config
+        self.encoder = encoder
         self.start_time = 0
         self.last_output_time = 0
         self.output_frames = []
+        self.output_frame_futures: list[Future] = []
         if config.detect.width > config.detect.height:
             self.out_height = PREVIEW_HEIGHT
             self.out_width = (
@@ -211,32 +271,20 @@ class PreviewRecorder:
             .timestamp()
         )
 
-        file_start = f"preview_{config.name}"
-        start_file = f"{file_start}-{start_ts}.webp"
-
-        for file in sorted(os.listdir(os.path.join(CACHE_DIR, FOLDER_PREVIEW_FRAMES))):
-            if not file.startswith(file_start):
-                continue
-
-            if file < start_file:
-                os.unlink(os.path.join(PREVIEW_CACHE_DIR, file))
-                continue
-
-            try:
-                file_time = file.split("-")[-1][: -(len(PREVIEW_FRAME_TYPE) + 1)]
+        self.frame_index = PreviewFrameIndex(config.name)
+        expired_frames = [t for t in self.frame_index.frame_times if t < start_ts]
 
-                if not file_time:
-                    continue
+        for ts in expired_frames:
+            Path(get_cache_image_name(config.name, ts)).unlink(missing_ok=True)
 
-                ts = float(file_time)
-            except ValueError:
-                continue
+        if expired_frames:
+            self.frame_index.remove(expired_frames)
 
-            if self.start_time == 0:
-                self.start_time = ts
+        self.output_frames = list(self.frame_index.frame_times)
 
-            self.last_output_time = ts
-            self.output_frames.append(ts)
+        if self.output_frames:
+            self.start_time = self.output_frames[0]
+            self.last_output_time = self.output_frames[-1]
 
     def should_write_frame(
         self,
@@ -274,8 +322,13 @@ class PreviewRecorder:
 
         return False
 
-    def write_frame_to_cache(self, frame_time: float, frame) -> None:
-        # resize yuv frame
+    def write_frame_to_cache(
+        self, frame_time: float, frame, required: bool = True
+    ) -> bool:
+        """Resize the yuv frame and queue it to be encoded.
+
+        Frames that are not required are dropped when the encoder is busy.
+        """
         small_frame = np.zeros((self.out_height * 3 // 2, self.out_width), np.uint8)
         copy_yuv_to_position(
             small_frame,
@@ -285,18 +338,32 @@ class PreviewRecorder:
             self.channel_dims,
             cv2.INTER_AREA,
         )
-        small_frame = cv2.cvtColor(
-            small_frame,
-            cv2.COLOR_YUV2BGR_I420,
-        )
-        cv2.imwrite(
-            get_cache_image_name(self.config.name, frame_time),
-            small_frame,
-            [
-                int(cv2.IMWRITE_WEBP_QUALITY),
-                PREVIEW_QUALITY_WEBP[self.config.record.preview.quality],
-            ],
-        )
+        quality = PREVIEW_QUALITY_WEBP[self.config.record.preview.quality]
+
+        def write_frame() -> None:
+            try:
+                encode_preview_frame(
+                    get_cache_image_name(self.config.name, frame_time),
+                    small_frame,
+                    quality,
+                )
+            except cv2.error as e:
+                logger.error(f"Failed to write preview frame: {e}")
+                return
+
+            self.frame_index.add(frame_time)
+
+        future = self.encoder.write_frame(write_frame, block=required)
+
+        if future is None:
+            logger.debug(
+                f"Preview encoder is busy, skipping frame for {self.config.name}"
+            )
+            return False
+
+        self.output_frames.append(frame_time)
+        self.output_frame_futures.append(future)
+        return True
 
     def write_data(
         self,
@@ -314,24 +381,29 @@ class PreviewRecorder:
         # always write the first frame
         if self.start_time == 0:
             self.start_time = frame_time
-            self.output_frames.append(frame_time)
             self.write_frame_to_cache(frame_time, frame)
             return False
 
         # check if PREVIEW clip should be generated and cached frames reset
         if frame_time >= self.segment_end:
+            last_frame_future = None
+
             if len(self.output_frames) > 0:
                 # save last frame to ensure consistent duration
                 if self.config.record:
-                    self.output_frames.append(frame_time)
                     self.write_frame_to_cache(frame_time, frame)
+                    last_frame_future = self.output_frame_futures[-1]
 
                 # write the preview if any frames exist for this hour
-                FFMpegConverter(
-                    self.config,
-                    self.output_frames,
-                    self.requestor,
-                ).start()
+                self.encoder.convert(
+                    FFMpegConverter(
+                        self.config,
+                        self.output_frames,
+                        self.requestor,
+                        self.frame_index,
+                    ),
+                    self.output_frame_futures,
+                )
 
             # reset frame cache
             self.segment_end = (
@@ -343,16 +415,20 @@ class PreviewRecorder:
             self.start_time = frame_time
             self.last_output_time = frame_time
             self.output_frames: list[float] = []
+            self.output_frame_futures = []
 
-            # include first frame to ensure consistent duration
+            # include first frame to ensure consistent duration,
+            # reusing the last frame of the previous preview if it was written
             if self.config.record.enabled:
-                self.output_frames.append(frame_time)
-                self.write_frame_to_cache(frame_time, frame)
+                if last_frame_future is not None:
+                    self.output_frames.append(frame_time)
+                    self.output_frame_futures.append(last_frame_future)
+                else:
+                    self.write_frame_to_cache(frame_time, frame)
 
             return True
         elif self.should_write_frame(current_tracked_objects, motion_boxes, frame_time):
-            self.output_frames.append(frame_time)
-            self.write_frame_to_cache(frame_time, frame)
+            self.write_frame_to_cache(frame_time, frame, required=False)
             return False
 
     def flag_offline(self, frame_time: float) -> None:
@@ -361,19 +437,28 @@ class PreviewRecorder:
             if len(self.output_frames) == 0:
                 return
 
+            # the last frame may still be queued for encoding
+            if self.output_frame_futures:
+                wait(self.output_frame_futures[-1:])
+
             old_frame_path = get_cache_image_name(
                 self.config.name, self.output_frames[-1]
             )
             new_frame_path = get_cache_image_name(self.config.name, frame_time)
             shutil.copy(old_frame_path, new_frame_path)
+            self.frame_index.add(frame_time)
 
             # save last frame to ensure consistent duration
             self.output_frames.append(frame_time)
-            FFMpegConverter(
-                self.config,
-                self.output_frames,
-                self.requestor,
-            ).start()
+            self.encoder.convert(
+                FFMpegConverter(
+                    self.config,
+                    self.output_frames,
+                    self.requestor,
+                    self.frame_index,
+                ),
+                self.output_frame_futures,
+            )
 
             # reset frame cache
             self.segment_end = (
@@ -385,6 +470,7 @@ class PreviewRecorder:
             self.start_time = frame_time
             self.last_output_time = frame_time
             self.output_frames = []
+            self.output_frame_futures = []
 
     def stop(self) -> None:
         self.requestor.stop()
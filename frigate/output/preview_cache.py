@@ -0,0 +1,198 @@
+"""Disk cache of preview gifs and mp4s generated for the api."""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+from collections import OrderedDict
+from typing import Callable, NamedTuple, Optional
+
+from frigate.const import CACHE_DIR
+
+logger = logging.getLogger(__name__)
+
+# not matched by the cleanup of preview_*.mp4 files in the cache
+FOLDER_PREVIEW_MEDIA = "preview_media"
+PREVIEW_MEDIA_CACHE_DIR = os.path.join(CACHE_DIR, FOLDER_PREVIEW_MEDIA)
+# bytes, /tmp/cache is usually a small tmpfs that the recording segments
+# waiting to be processed need most of
+MAX_PREVIEW_MEDIA_SIZE = 32 * 1024 * 1024
+# largest part of the file system of the cache that is used
+MAX_PREVIEW_MEDIA_SHARE = 0.05
+
+
+class CachedPreview(NamedTuple):
+    camera: str
+    start_time: float
+    end_time: float
+    path: str
+    size: int
+
+
+class PreviewMediaCache:
+    """Bounded disk cache of generated preview gifs and mp4s.
+
+    Files are named by a digest of the camera, time range and everything used
+    to generate them, such as the ffmpeg arguments and the preview frames or
+    preview mp4 they are made of. When the source changes the digest changes,
+    so a file is never served for a different source.
+
+    Files are evicted in LRU order when the total size exceeds max_size, or
+    MAX_PREVIEW_MEDIA_SHARE of the file system of the cache if less, and
+    dropped when the previews or recordings of their time range expire. Only
+    one request generates a file, others requesting it at the same time wait
+    for it.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str = PREVIEW_MEDIA_CACHE_DIR,
+        max_size: int = MAX_PREVIEW_MEDIA_SIZE,
+    ) -> None:
+        self.cache_dir = cache_dir
+        self.max_size = max_size
+        self.size = 0
+        self.lock = threading.Lock()
+        self.pending: dict[str, threading.Event] = {}
+        self.files: OrderedDict[str, CachedPreview] = OrderedDict()
+        self.created = False
+
+    @staticmethod
+    def get_key(
+        camera: str, start_ts: float, end_ts: float, extension: str, source: list
+    ) -> str:
+        source_key = json.dumps([camera, start_ts, end_ts, extension, source])
+        return hashlib.sha256(source_key.encode()).hexdigest()
+
+    def _create_dir(self) -> None:
+        # files of a previous run are not indexed, so they are removed
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self.max_size = min(
+            self.max_size,
+            int(shutil.disk_usage(self.cache_dir).total * MAX_PREVIEW_MEDIA_SHARE),
+        )
+        self.created = True
+
+    def _get(self, key: str) -> Optional[str]:
+        cached = self.files.get(key)
+
+        if cached is None:
+            return None
+
+        if not os.path.exists(cached.path):
+            del self.files[key]
+            self.size -= cached.size
+            return None
+
+        self.files.move_to_end(key)
+        return cached.path
+
+    def _remove(self, key: str) -> None:
+        cached = self.files.pop(key)
+        self.size -= cached.size
+
+        try:
+            os.remove(cached.path)
+        except OSError:
+            pass
+
+    def get_or_create(
+        self,
+        camera: str,
+        start_ts: float,
+        end_ts: float,
+        extension: str,
+        source: list,
+        create: Callable[[str], bool],
+    ) -> Optional[str]:
+        """Get the path of the cached file, creating it if it does not exist.
+
+        create is called with the path to write the file to and returns
+        True if the file was created. None is returned when it was not.
+        """
+        key = self.get_key(camera, start_ts, end_ts, extension, source)
+
+        while True:
+            with self.lock:
+                if not self.created:
+                    self._create_dir()
+
+                path = self._get(key)
+
+                if path is not None:
+                    return path
+
+                pending = self.pending.get(key)
+
+                if pending is None:
+                    pending = threading.Event()
+                    self.pending[key] = pending
+                    break
+
+            pending.wait()
+
+        path = os.path.join(self.cache_dir, f"{key}.{extension}")
+        tmp_path = os.path.join(self.cache_dir, f".{key}.tmp.{extension}")
+        cached = None
+
+        try:
+            if create(tmp_path):
+                os.replace(tmp_path, path)
+                cached = CachedPreview(
+                    camera, start_ts, end_ts, path, os.path.getsize(path)
+                )
+        finally:
+            if cached is None:
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+
+            with self.lock:
+                del self.pending[key]
+
+                if cached is not None:
+                    self.files[key] = cached
+                    self.size += cached.size
+
+                    # the new file is kept even if it is larger than max_size
+                    while self.size > self.max_size and len(self.files) > 1:
+                        self._remove(next(iter(self.files)))
+
+            pending.set()
+
+        return cached.path if cached is not None else None
+
+    def invalidate(
+        self,
+        camera: Optional[str] = None,
+        start_time: float = float("-inf"),
+        end_time: float = float("inf"),
+    ) -> None:
+        """Remove cached files overlapping the expired time range.
+
+        When camera is None the files of all cameras are checked.
+        """
+        with self.lock:
+            expired = [
+                key
+                for key, cached in self.files.items()
+                if (camera is None or cached.camera == camera)
+                and cached.start_time <= end_time
+                and cached.end_time >= start_time
+            ]
+
+            for key in expired:
+                self._remove(key)
+
+        if expired:
+            logger.debug(f"Removed {len(expired)} cached preview files")
+
+    def clear(self) -> None:
+        self.invalidate()
+
+
+preview_media_cache = PreviewMediaCache()
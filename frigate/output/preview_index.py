@@ -0,0 +1,127 @@
+"""Index of the preview frames cached for each camera."""
+
+import logging
+import os
+import threading
+from bisect import insort
+from typing import Iterable
+
+import numpy as np
+
+from frigate.const import CACHE_DIR, PREVIEW_FRAME_TYPE
+
+logger = logging.getLogger(__name__)
+
+FOLDER_PREVIEW_FRAMES = "preview_frames"
+PREVIEW_CACHE_DIR = os.path.join(CACHE_DIR, FOLDER_PREVIEW_FRAMES)
+PREVIEW_INDEX_DTYPE = np.dtype("<f8")
+
+
+def get_cache_image_name(camera: str, frame_time: float) -> str:
+    """Get the image name in cache."""
+    return os.path.join(
+        CACHE_DIR,
+        f"{FOLDER_PREVIEW_FRAMES}/preview_{camera}-{frame_time}.{PREVIEW_FRAME_TYPE}",
+    )
+
+
+def get_preview_index_path(camera: str) -> str:
+    # not prefixed with preview_ so it is never mistaken for a frame
+    return os.path.join(PREVIEW_CACHE_DIR, f".{camera}.index")
+
+
+class PreviewFrameIndex:
+    """Frame times of the preview frames cached for a camera.
+
+    Owned by the output process, the times are persisted as packed
+    float64 values so other processes can look up frames without
+    listing the preview cache directory.
+    """
+
+    def __init__(self, camera: str) -> None:
+        self.camera = camera
+        self.path = get_preview_index_path(camera)
+        self.lock = threading.Lock()
+
+        if os.path.exists(self.path):
+            self.frame_times: list[float] = read_preview_frame_times(camera).tolist()
+        else:
+            self.frame_times = self._scan_cache()
+            self._write()
+
+    def _scan_cache(self) -> list[float]:
+        """Build the index from the files in the cache."""
+        file_start = f"preview_{self.camera}-"
+        frame_times = []
+
+        for file in os.listdir(PREVIEW_CACHE_DIR):
+            if not file.startswith(file_start):
+                continue
+
+            try:
+                frame_times.append(
+                    float(file[len(file_start) : -(len(PREVIEW_FRAME_TYPE) + 1)])
+                )
+            except ValueError:
+                continue
+
+        return sorted(frame_times)
+
+    def _write(self) -> None:
+        tmp_path = f"{self.path}.tmp"
+        np.array(self.frame_times, dtype=PREVIEW_INDEX_DTYPE).tofile(tmp_path)
+        os.replace(tmp_path, self.path)
+
+    def add(self, frame_time: float) -> None:
+        with self.lock:
+            insort(self.frame_times, frame_time)
+
+            with open(self.path, "ab") as f:
+                f.write(np.array([frame_time], dtype=PREVIEW_INDEX_DTYPE).tobytes())
+
+    def remove(self, frame_times: Iterable[float]) -> None:
+        removed = set(frame_times)
+
+        with self.lock:
+            self.frame_times = [t for t in self.frame_times if t not in removed]
+            self._write()
+
+
+_index_cache: dict[str, tuple[tuple[int, int], np.ndarray]] = {}
+
+
+def read_preview_frame_times(camera: str) -> np.ndarray:
+    """Get the sorted frame times from the index written by the output process."""
+    path = get_preview_index_path(camera)
+
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return np.empty(0, dtype=PREVIEW_INDEX_DTYPE)
+
+    key = (stat.st_mtime_ns, stat.st_size)
+    cached = _index_cache.get(camera)
+
+    if cached is not None and cached[0] == key:
+        return cached[1]
+
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except FileNotFoundError:
+        return np.empty(0, dtype=PREVIEW_INDEX_DTYPE)
+
+    # ignore a partially appended value, frames are appended as they finish
+    # encoding so the values are not guaranteed to be in order
+    data = data[: len(data) - len(data) % PREVIEW_INDEX_DTYPE.itemsize]
+    frame_times = np.sort(np.frombuffer(data, dtype=PREVIEW_INDEX_DTYPE))
+    _index_cache[camera] = (key, frame_times)
+    return frame_times
+
+
+def get_preview_frame_times(camera: str, start_ts: float, end_ts: float) -> list[float]:
+    """Get the times of cached preview frames between start_ts and end_ts."""
+    frame_times = read_preview_frame_times(camera)
+    start = np.searchsorted(frame_times, start_ts, side="left")
+    end = np.searchsorted(frame_times, end_ts, side="right")
+    return frame_times[start:end].tolist()
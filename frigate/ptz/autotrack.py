@@ -13,17 +13,25 @@ from multiprocessing.synchronize import Event as MpEvent
 import cv2
 import numpy as np
 from norfair.camera_motion import (
+    HomographyTransformation,
     HomographyTransformationGetter,
     MotionEstimator,
+    TranslationTransformation,
     TranslationTransformationGetter,
 )
 
 from frigate.camera import PTZMetrics
 from frigate.comms.dispatcher import Dispatcher
-from frigate.config import CameraConfig, FrigateConfig, ZoomingModeEnum
+from frigate.config import (
+    CameraConfig,
+    FrigateConfig,
+    MotionEstimationModeEnum,
+    ZoomingModeEnum,
+)
 from frigate.const import (
     AUTOTRACKING_MAX_AREA_RATIO,
     AUTOTRACKING_MAX_MOVE_METRICS,
+    AUTOTRACKING_MOTION_ESTIMATION_HEIGHT,
     AUTOTRACKING_MOTION_MAX_POINTS,
     AUTOTRACKING_MOTION_MIN_DISTANCE,
     AUTOTRACKING_ZOOM_EDGE_THRESHOLD,
@@ -57,31 +65,124 @@ class PtzMotionEstimator:
         self.coord_transformations = None
         self.ptz_metrics = ptz_metrics
         self.ptz_metrics.reset.set()
+
+        # frames larger than the estimation height are downscaled when enabled
+        self.scale = 1.0
+
+        if (
+            config.onvif.autotracking.motion_estimation
+            == MotionEstimationModeEnum.downscaled
+            and config.detect.height > AUTOTRACKING_MOTION_ESTIMATION_HEIGHT
+        ):
+            self.scale = AUTOTRACKING_MOTION_ESTIMATION_HEIGHT / config.detect.height
+
+        self.frame_size = (
+            int(config.detect.width * self.scale),
+            int(config.detect.height * self.scale),
+        )
+        self.luma = (
+            np.zeros(self.frame_size[::-1], np.uint8) if self.scale != 1.0 else None
+        )
+        self.motion_mask = None
+        self.motion_mask_source = None
+        self.mask = None
+        self.mask_boxes = None
         logger.debug(f"{config.name}: Motion estimator init")
 
-    def motion_estimator(self, detections, frame_time, camera):
-        # If we've just started up or returned to our preset, reset motion estimator for new tracking session
-        if self.ptz_metrics.reset.is_set():
-            self.ptz_metrics.reset.clear()
+    def _get_motion_mask(self) -> np.ndarray:
+        mask = self.camera_config.motion.mask
 
-            # homography is nice (zooming) but slow, translation is pan/tilt only but fast.
-            if (
-                self.camera_config.onvif.autotracking.zooming
-                != ZoomingModeEnum.disabled
-            ):
-                logger.debug(f"{camera}: Motion estimator reset - homography")
-                transformation_type = HomographyTransformationGetter()
-            else:
-                logger.debug(f"{camera}: Motion estimator reset - translation")
-                transformation_type = TranslationTransformationGetter()
+        # a changed motion mask is set as a new array on the camera config
+        if mask is not self.motion_mask_source:
+            self.motion_mask_source = mask
+
+            if self.scale != 1.0:
+                mask = cv2.resize(
+                    mask, dsize=self.frame_size, interpolation=cv2.INTER_NEAREST
+                )
+
+            self.motion_mask = mask
+            self.mask = None
+
+        return self.motion_mask
+
+    def _get_mask(self, detection_boxes: list[tuple[int, int, int, int]]) -> np.ndarray:
+        """Mask out detections for better motion estimation.
+
+        The mask is only rebuilt when the detection boxes or the motion mask change.
+        """
+        boxes = tuple(tuple(box) for box in detection_boxes)
+        motion_mask = self._get_motion_mask()
+
+        if self.mask is not None and boxes == self.mask_boxes:
+            return self.mask
+
+        mask = np.ones(self.frame_size[::-1], np.uint8)
+
+        for x1, y1, x2, y2 in boxes:
+            mask[
+                int(y1 * self.scale) : int(np.ceil(y2 * self.scale)),
+                int(x1 * self.scale) : int(np.ceil(x2 * self.scale)),
+            ] = 0
+
+        # merge camera config motion mask with detections. Norfair function needs 0,1 mask
+        self.mask = np.bitwise_and(mask, motion_mask).clip(max=1)
+        self.mask_boxes = boxes
+        return self.mask
+
+    def _get_frame(self, yuv_frame: np.ndarray) -> np.ndarray:
+        if self.scale == 1.0:
+            return cv2.cvtColor(yuv_frame, cv2.COLOR_YUV2GRAY_I420)
+
+        # the Y plane of an I420 frame is already grayscale
+        cv2.resize(
+            yuv_frame[0 : self.camera_config.detect.height],
+            dsize=self.frame_size,
+            dst=self.luma,
+            interpolation=cv2.INTER_AREA,
+        )
+        return self.luma
+
+    def _to_detect_coordinates(self, coord_transformations):
+        """Rescale a transformation found on the downscaled frame to detect coordinates."""
+        if coord_transformations is None or self.scale == 1.0:
+            return coord_transformations
+
+        if isinstance(coord_transformations, TranslationTransformation):
+            return TranslationTransformation(
+                coord_transformations.movement_vector / self.scale
+            )
 
-            self.norfair_motion_estimator = MotionEstimator(
-                transformations_getter=transformation_type,
-                min_distance=AUTOTRACKING_MOTION_MIN_DISTANCE,
-                max_points=AUTOTRACKING_MOTION_MAX_POINTS,
+        if isinstance(coord_transformations, HomographyTransformation):
+            scale = np.diag([self.scale, self.scale, 1.0])
+            return HomographyTransformation(
+                np.linalg.inv(scale) @ coord_transformations.homography_matrix @ scale
             )
 
-            self.coord_transformations = None
+        return coord_transformations
+
+    def reset(self, camera):
+        # homography is nice (zooming) but slow, translation is pan/tilt only but fast.
+        if self.camera_config.onvif.autotracking.zooming != ZoomingModeEnum.disabled:
+            logger.debug(f"{camera}: Motion estimator reset - homography")
+            transformation_type = HomographyTransformationGetter()
+        else:
+            logger.debug(f"{camera}: Motion estimator reset - translation")
+            transformation_type = TranslationTransformationGetter()
+
+        self.norfair_motion_estimator = MotionEstimator(
+            transformations_getter=transformation_type,
+            min_distance=max(1, int(AUTOTRACKING_MOTION_MIN_DISTANCE * self.scale)),
+            max_points=AUTOTRACKING_MOTION_MAX_POINTS,
+        )
+
+        self.coord_transformations = None
+
+    def motion_estimator(self, detections, frame_time, camera):
+        # If we've just started up or returned to our preset, reset motion estimator for new tracking session
+        if self.ptz_metrics.reset.is_set():
+            self.ptz_metrics.reset.clear()
+            self.reset(camera)
 
         if ptz_moving_at_frame_time(
             frame_time,
@@ -101,33 +202,9 @@ class PtzMotionEstimator:
                 self.coord_transformations = None
                 return None
 
-            frame = cv2.cvtColor(yuv_frame, cv2.COLOR_YUV2GRAY_I420)
-
-            # mask out detections for better motion estimation
-            mask = np.ones(frame.shape[:2], frame.dtype)
-
-            detection_boxes = [x[2] for x in detections]
-            for detection in detection_boxes:
-                x1, y1, x2, y2 = detection
-                mask[y1:y2, x1:x2] = 0
-
-            # merge camera config motion mask with detections. Norfair function needs 0,1 mask
-            mask = np.bitwise_and(mask, self.camera_config.motion.mask).clip(max=1)
-
-            # Norfair estimator function needs color so it can convert it right back to gray
-            frame = cv2.cvtColor(frame, cv2.COLOR_GRAY2BGRA)
-
-            try:
-                self.coord_transformations = self.norfair_motion_estimator.update(
-                    frame, mask
-                )
-            except Exception:
-                # sometimes opencv can't find enough features in the image to find homography, so catch this error
-                # https://github.com/tryolabs/norfair/pull/278
-                logger.warning(
-                    f"Autotracker: motion estimator couldn't get transformations for {camera} at frame time {frame_time}"
-                )
-                self.coord_transformations = None
+            self.coord_transformations = self.estimate(
+                yuv_frame, [x[2] for x in detections], camera, frame_time
+            )
 
             try:
                 logger.debug(
@@ -140,6 +217,26 @@ class PtzMotionEstimator:
 
         return self.coord_transformations
 
+    def estimate(self, yuv_frame, detection_boxes, camera, frame_time):
+        """Estimate the camera motion for a frame in detect coordinates."""
+        frame = self._get_frame(yuv_frame)
+        mask = self._get_mask(detection_boxes)
+
+        # Norfair estimator function needs color so it can convert it right back to gray
+        frame = cv2.cvtColor(frame, cv2.COLOR_GRAY2BGR)
+
+        try:
+            return self._to_detect_coordinates(
+                self.norfair_motion_estimator.update(frame, mask)
+            )
+        except Exception:
+            # sometimes opencv can't find enough features in the image to find homography, so catch this error
+            # https://github.com/tryolabs/norfair/pull/278
+            logger.warning(
+                f"Autotracker: motion estimator couldn't get transformations for {camera} at frame time {frame_time}"
+            )
+            return None
+
 
 class PtzAutoTrackerThread(threading.Thread):
     def __init__(
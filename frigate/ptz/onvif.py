@@ -4,16 +4,17 @@ import logging
 from enum import Enum
 from importlib.util import find_spec
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 import numpy
-from onvif import ONVIFCamera, ONVIFError
-from zeep.exceptions import Fault, TransportError
-from zeep.transports import Transport
 
 from frigate.camera import PTZMetrics
 from frigate.config import FrigateConfig, ZoomingModeEnum
 from frigate.util.builtin import find_by_key
 
+if TYPE_CHECKING:
+    from onvif import ONVIFCamera
+
 logger = logging.getLogger(__name__)
 
 
@@ -38,7 +39,7 @@ class OnvifController:
     def __init__(
         self, config: FrigateConfig, ptz_metrics: dict[str, PTZMetrics]
     ) -> None:
-        self.cams: dict[str, ONVIFCamera] = {}
+        self.cams: dict[str, "ONVIFCamera"] = {}
         self.config = config
         self.ptz_metrics = ptz_metrics
 
@@ -47,6 +48,14 @@ class OnvifController:
                 continue
 
             if cam.onvif.host:
+                # onvif and zeep are only loaded when a camera is configured to use them
+                from onvif import ONVIFCamera, ONVIFError
+                from zeep.exceptions import Fault, TransportError
+                from zeep.transports import Transport
+
+                self.onvif_error = ONVIFError
+                self.request_errors = (ONVIFError, Fault, TransportError)
+
                 try:
                     transport = Transport(timeout=10, operation_timeout=10)
                     self.cams[cam_name] = {
@@ -70,7 +79,7 @@ class OnvifController:
                     logger.error(f"Onvif connection to {cam.name} failed: {e}")
 
     def _init_onvif(self, camera_name: str) -> bool:
-        onvif: ONVIFCamera = self.cams[camera_name]["onvif"]
+        onvif: "ONVIFCamera" = self.cams[camera_name]["onvif"]
 
         # create init services
         media = onvif.create_media_service()
@@ -80,7 +89,7 @@ class OnvifController:
             # this will fire an exception if camera is not a ptz
             capabilities = onvif.get_definition("ptz")
             logger.debug(f"Onvif capabilities for {camera_name}: {capabilities}")
-        except (ONVIFError, Fault, TransportError) as e:
+        except self.request_errors as e:
             logger.error(
                 f"Unable to get Onvif capabilities for camera: {camera_name}: {e}"
             )
@@ -89,7 +98,7 @@ class OnvifController:
         try:
             profiles = media.GetProfiles()
             logger.debug(f"Onvif profiles for {camera_name}: {profiles}")
-        except (ONVIFError, Fault, TransportError) as e:
+        except self.request_errors as e:
             logger.error(
                 f"Unable to get Onvif media profiles for camera: {camera_name}: {e}"
             )
@@ -242,7 +251,7 @@ class OnvifController:
         # setup existing presets
         try:
             presets: list[dict] = ptz.GetPresets({"ProfileToken": profile.token})
-        except ONVIFError as e:
+        except self.onvif_error as e:
             logger.warning(f"Unable to get presets from camera: {camera_name}: {e}")
             presets = []
 
@@ -325,7 +334,7 @@ class OnvifController:
         return True
 
     def _stop(self, camera_name: str) -> None:
-        onvif: ONVIFCamera = self.cams[camera_name]["onvif"]
+        onvif: "ONVIFCamera" = self.cams[camera_name]["onvif"]
         move_request = self.cams[camera_name]["move_request"]
         onvif.get_service("ptz").Stop(
             {
@@ -348,7 +357,7 @@ class OnvifController:
             return
 
         self.cams[camera_name]["active"] = True
-        onvif: ONVIFCamera = self.cams[camera_name]["onvif"]
+        onvif: "ONVIFCamera" = self.cams[camera_name]["onvif"]
         move_request = self.cams[camera_name]["move_request"]
 
         if command == OnvifCommandEnum.move_left:
@@ -372,7 +381,7 @@ class OnvifController:
 
         try:
             onvif.get_service("ptz").ContinuousMove(move_request)
-        except ONVIFError as e:
+        except self.onvif_error as e:
             logger.warning(f"Onvif sending move request to {camera_name} failed: {e}")
 
     def _move_relative(self, camera_name: str, pan, tilt, zoom, speed) -> None:
@@ -399,7 +408,7 @@ class OnvifController:
             camera_name
         ].frame_time.value
         self.ptz_metrics[camera_name].stop_time.value = 0
-        onvif: ONVIFCamera = self.cams[camera_name]["onvif"]
+        onvif: "ONVIFCamera" = self.cams[camera_name]["onvif"]
         move_request = self.cams[camera_name]["relative_move_request"]
 
         # function takes in -1 to 1 for pan and tilt, interpolate to the values of the camera.
@@ -470,7 +479,7 @@ class OnvifController:
         self.ptz_metrics[camera_name].start_time.value = 0
         self.ptz_metrics[camera_name].stop_time.value = 0
         move_request = self.cams[camera_name]["move_request"]
-        onvif: ONVIFCamera = self.cams[camera_name]["onvif"]
+        onvif: "ONVIFCamera" = self.cams[camera_name]["onvif"]
         preset_token = self.cams[camera_name]["presets"][preset]
         onvif.get_service("ptz").GotoPreset(
             {
@@ -493,7 +502,7 @@ class OnvifController:
             return
 
         self.cams[camera_name]["active"] = True
-        onvif: ONVIFCamera = self.cams[camera_name]["onvif"]
+        onvif: "ONVIFCamera" = self.cams[camera_name]["onvif"]
         move_request = self.cams[camera_name]["move_request"]
 
         if command == OnvifCommandEnum.zoom_in:
@@ -525,7 +534,7 @@ class OnvifController:
             camera_name
         ].frame_time.value
         self.ptz_metrics[camera_name].stop_time.value = 0
-        onvif: ONVIFCamera = self.cams[camera_name]["onvif"]
+        onvif: "ONVIFCamera" = self.cams[camera_name]["onvif"]
         move_request = self.cams[camera_name]["absolute_move_request"]
 
         # function takes in 0 to 1 for zoom, interpolate to the values of the camera.
@@ -597,7 +606,7 @@ class OnvifController:
         if not self.cams[camera_name]["init"]:
             self._init_onvif(camera_name)
 
-        onvif: ONVIFCamera = self.cams[camera_name]["onvif"]
+        onvif: "ONVIFCamera" = self.cams[camera_name]["onvif"]
         service_capabilities_request = self.cams[camera_name][
             "service_capabilities_request"
         ]
@@ -626,7 +635,7 @@ class OnvifController:
         if not self.cams[camera_name]["init"]:
             self._init_onvif(camera_name)
 
-        onvif: ONVIFCamera = self.cams[camera_name]["onvif"]
+        onvif: "ONVIFCamera" = self.cams[camera_name]["onvif"]
         status_request = self.cams[camera_name]["status_request"]
         try:
             status = onvif.get_service("ptz").GetStatus(status_request)
@@ -13,7 +13,13 @@ from playhouse.sqlite_ext import SqliteExtDatabase
 from frigate.config import CameraConfig, FrigateConfig, RetainModeEnum
 from frigate.const import CACHE_DIR, CLIPS_DIR, MAX_WAL_SIZE, RECORD_DIR
 from frigate.models import Previews, Recordings, ReviewSegment
-from frigate.record.util import remove_empty_directories, sync_recordings
+from frigate.output.preview_cache import preview_media_cache
+from frigate.record.util import (
+    check_recordings_rollups,
+    remove_empty_directories,
+    sync_recordings,
+)
+from frigate.record.vod import vod_playlist_cache
 from frigate.util.builtin import clear_and_unlink, get_tomorrow_at_time
 
 logger = logging.getLogger(__name__)
@@ -173,6 +179,9 @@ class RecordingCleanup(threading.Thread):
                 Recordings.id << deleted_recordings_list[i : i + max_deletes]
             ).execute()
 
+        if deleted_recordings:
+            vod_playlist_cache.invalidate(config.name, end_time=expire_date)
+
         previews: Previews = (
             Previews.select(
                 Previews.id,
@@ -232,6 +241,9 @@ class RecordingCleanup(threading.Thread):
                 Previews.id << deleted_previews_list[i : i + max_deletes]
             ).execute()
 
+        if deleted_recordings or deleted_previews:
+            preview_media_cache.invalidate(config.name, end_time=expire_date)
+
     def expire_recordings(self) -> None:
         """Delete recordings based on retention config."""
         logger.debug("Start expire recordings.")
@@ -268,6 +280,9 @@ class RecordingCleanup(threading.Thread):
             Recordings.delete().where(
                 Recordings.id << deleted_recordings_list[i : i + max_deletes]
             ).execute()
+
+        if deleted_recordings:
+            vod_playlist_cache.invalidate(end_time=expire_before)
         logger.debug("End deleted cameras.")
 
         logger.debug("Start all cameras.")
@@ -309,6 +324,9 @@ class RecordingCleanup(threading.Thread):
             sync_recordings(limited=False)
             next_sync = get_tomorrow_at_time(3)
 
+        # rebuild the recordings rollups if the db was changed outside of frigate
+        check_recordings_rollups()
+
         # Expire tmp clips every minute, recordings and clean directories every hour.
         for counter in itertools.cycle(range(self.config.record.expire_interval)):
             if self.stop_event.wait(60):
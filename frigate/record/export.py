@@ -8,31 +8,36 @@ import shutil
 import string
 import subprocess as sp
 import threading
+from concurrent.futures import ThreadPoolExecutor
 from enum import Enum
 from pathlib import Path
-from typing import Optional
+from typing import Iterable, Iterator, Optional
 
 from peewee import DoesNotExist
 
 from frigate.config import FfmpegConfig, FrigateConfig
 from frigate.const import (
-    CACHE_DIR,
     CLIPS_DIR,
     EXPORT_DIR,
-    MAX_PLAYLIST_SECONDS,
-    PREVIEW_FRAME_TYPE,
+    MAX_SEGMENT_DURATION,
 )
 from frigate.ffmpeg_presets import (
     EncodeTypeEnum,
     parse_preset_hardware_acceleration_encode,
 )
 from frigate.models import Export, Previews, Recordings
+from frigate.output.preview_index import get_cache_image_name, get_preview_frame_times
 
 logger = logging.getLogger(__name__)
 
 
 TIMELAPSE_DATA_INPUT_ARGS = "-an -skip_frame nokey"
 
+# realtime exports longer than a day are split into chunks that run in parallel
+EXPORT_CHUNK_MIN_SECONDS = 24 * 60 * 60
+EXPORT_CHUNK_SECONDS = 6 * 60 * 60
+MAX_EXPORT_CHUNK_WORKERS = 4
+
 
 def lower_priority():
     os.nice(10)
@@ -151,70 +156,61 @@ class RecordingExporter(threading.Thread):
 
         else:
             # need to generate from existing images
-            preview_dir = os.path.join(CACHE_DIR, "preview_frames")
-            file_start = f"preview_{self.camera}"
-            start_file = f"{file_start}-{self.start_time}.{PREVIEW_FRAME_TYPE}"
-            end_file = f"{file_start}-{self.end_time}.{PREVIEW_FRAME_TYPE}"
-            selected_preview = None
-
-            for file in sorted(os.listdir(preview_dir)):
-                if not file.startswith(file_start):
-                    continue
-
-                if file < start_file:
-                    continue
-
-                if file > end_file:
-                    break
-
-                selected_preview = os.path.join(preview_dir, file)
-                break
+            frame_times = get_preview_frame_times(
+                self.camera, self.start_time, self.end_time
+            )
 
-            if not selected_preview:
+            if not frame_times:
                 return ""
 
-            shutil.copyfile(selected_preview, thumb_path)
+            shutil.copyfile(
+                get_cache_image_name(self.camera, frame_times[0]), thumb_path
+            )
 
         return thumb_path
 
-    def get_record_export_command(self, video_path: str) -> list[str]:
-        if (self.end_time - self.start_time) <= MAX_PLAYLIST_SECONDS:
-            playlist_lines = f"http://127.0.0.1:5000/vod/{self.camera}/start/{self.start_time}/end/{self.end_time}/index.m3u8"
-            ffmpeg_input = (
-                f"-y -protocol_whitelist pipe,file,http,tcp -i {playlist_lines}"
+    def get_export_recordings(self) -> Iterator[Recordings]:
+        """Get the recording segments overlapping the export time range."""
+        return (
+            Recordings.select(
+                Recordings.path,
+                Recordings.start_time,
+                Recordings.end_time,
             )
-        else:
-            playlist_lines = []
-
-            # get full set of recordings
-            export_recordings = (
-                Recordings.select(
-                    Recordings.start_time,
-                    Recordings.end_time,
-                )
-                .where(
-                    Recordings.start_time.between(self.start_time, self.end_time)
-                    | Recordings.end_time.between(self.start_time, self.end_time)
-                    | (
-                        (self.start_time > Recordings.start_time)
-                        & (self.end_time < Recordings.end_time)
-                    )
-                )
-                .where(Recordings.camera == self.camera)
-                .order_by(Recordings.start_time.asc())
+            .where(
+                (Recordings.camera == self.camera)
+                & (Recordings.start_time > self.start_time - MAX_SEGMENT_DURATION)
+                & (Recordings.start_time < self.end_time)
+                & (Recordings.end_time > self.start_time)
             )
+            .order_by(Recordings.start_time.asc())
+            .namedtuples()
+            .iterator()
+        )
 
-            # Use pagination to process records in chunks
-            page_size = 1000
-            num_pages = (export_recordings.count() + page_size - 1) // page_size
+    def get_recording_concat_lines(
+        self, recordings: Iterable[Recordings]
+    ) -> Iterator[str]:
+        """Build concat demuxer lines for the segment files, trimming the ends."""
+        for recording in recordings:
+            yield f"file '{recording.path}'"
 
-            for page in range(1, num_pages + 1):
-                playlist = export_recordings.paginate(page, page_size)
-                playlist_lines.append(
-                    f"file 'http://127.0.0.1:5000/vod/{self.camera}/start/{float(playlist[0].start_time)}/end/{float(playlist[-1].end_time)}/index.m3u8'"
-                )
+            if recording.start_time < self.start_time:
+                yield f"inpoint {self.start_time - recording.start_time:.3f}"
 
-            ffmpeg_input = "-y -protocol_whitelist pipe,file,http,tcp -f concat -safe 0 -i /dev/stdin"
+            if recording.end_time > self.end_time:
+                yield f"outpoint {self.end_time - recording.start_time:.3f}"
+
+    def get_record_export_command(
+        self, video_path: str, recordings: Optional[Iterable[Recordings]] = None
+    ) -> tuple[list[str], Iterator[str]]:
+        if recordings is None:
+            recordings = self.get_export_recordings()
+
+        playlist_lines = self.get_recording_concat_lines(recordings)
+        ffmpeg_input = (
+            "-y -protocol_whitelist pipe,file -f concat -safe 0 -i /dev/stdin"
+        )
 
         if self.playback_factor == PlaybackFactorEnum.realtime:
             ffmpeg_cmd = (
@@ -292,6 +288,100 @@ class RecordingExporter(threading.Thread):
 
         return ffmpeg_cmd, playlist_lines
 
+    def run_export_command(
+        self, ffmpeg_cmd: list[str], playlist_lines: Iterable[str]
+    ) -> tuple[int, str]:
+        """Run ffmpeg, streaming the concat list into its stdin.
+
+        The list is written from a thread while stderr is read, otherwise
+        ffmpeg and the export can both block on a full pipe for long lists.
+        """
+        p = sp.Popen(
+            ffmpeg_cmd,
+            stdin=sp.PIPE,
+            stdout=sp.DEVNULL,
+            stderr=sp.PIPE,
+            encoding="ascii",
+            preexec_fn=lower_priority,
+        )
+        errors: list[Exception] = []
+
+        def write_playlist() -> None:
+            try:
+                for line in playlist_lines:
+                    p.stdin.write(f"{line}\n")
+            except BrokenPipeError:
+                # ffmpeg exited early, the error will be in stderr
+                pass
+            except Exception as e:
+                errors.append(e)
+                p.kill()
+
+            try:
+                p.stdin.close()
+            except BrokenPipeError:
+                pass
+
+        writer = threading.Thread(
+            target=write_playlist, name="export_playlist", daemon=True
+        )
+        writer.start()
+        stderr = p.stderr.read()
+        writer.join()
+        p.wait()
+
+        if errors:
+            raise errors[0]
+
+        return p.returncode, stderr
+
+    def run_chunked_record_export(self, video_path: str) -> tuple[int, str]:
+        """Export long time ranges as parallel chunks that are joined at the end.
+
+        Chunks are split on segment boundaries so no frames are duplicated
+        or dropped when the chunks are concatenated.
+        """
+        chunks: list[list[Recordings]] = []
+
+        for recording in self.get_export_recordings():
+            idx = max(
+                0, int((recording.start_time - self.start_time) // EXPORT_CHUNK_SECONDS)
+            )
+
+            while len(chunks) <= idx:
+                chunks.append([])
+
+            chunks[idx].append(recording)
+
+        chunks = [chunk for chunk in chunks if chunk]
+        chunk_paths = [
+            os.path.join(EXPORT_DIR, f".{self.export_id}.{i}.mp4")
+            for i in range(len(chunks))
+        ]
+
+        def export_chunk(chunk: list[Recordings], chunk_path: str) -> tuple[int, str]:
+            return self.run_export_command(
+                *self.get_record_export_command(chunk_path, chunk)
+            )
+
+        try:
+            with ThreadPoolExecutor(max_workers=MAX_EXPORT_CHUNK_WORKERS) as executor:
+                results = list(executor.map(export_chunk, chunks, chunk_paths))
+
+            for returncode, stderr in results:
+                if returncode != 0:
+                    return returncode, stderr
+
+            ffmpeg_cmd = (
+                f"{self.config.ffmpeg.ffmpeg_path} -hide_banner -y -protocol_whitelist pipe,file -f concat -safe 0 -i /dev/stdin -c copy -movflags +faststart {video_path}"
+            ).split(" ")
+            return self.run_export_command(
+                ffmpeg_cmd, (f"file '{path}'" for path in chunk_paths)
+            )
+        finally:
+            for path in chunk_paths:
+                Path(path).unlink(missing_ok=True)
+
     def run(self) -> None:
         logger.debug(
             f"Beginning export for {self.camera} from {self.start_time} to {self.end_time}"
@@ -315,24 +405,25 @@ class RecordingExporter(threading.Thread):
             }
         ).execute()
 
-        if self.playback_source == PlaybackSourceEnum.recordings:
-            ffmpeg_cmd, playlist_lines = self.get_record_export_command(video_path)
+        if (
+            self.playback_source == PlaybackSourceEnum.recordings
+            and self.playback_factor == PlaybackFactorEnum.realtime
+            and (self.end_time - self.start_time) > EXPORT_CHUNK_MIN_SECONDS
+        ):
+            returncode, stderr = self.run_chunked_record_export(video_path)
         else:
-            ffmpeg_cmd, playlist_lines = self.get_preview_export_command(video_path)
+            if self.playback_source == PlaybackSourceEnum.recordings:
+                ffmpeg_cmd, playlist_lines = self.get_record_export_command(video_path)
+            else:
+                ffmpeg_cmd, playlist_lines = self.get_preview_export_command(video_path)
 
-        p = sp.run(
-            ffmpeg_cmd,
-            input="\n".join(playlist_lines),
-            encoding="ascii",
-            preexec_fn=lower_priority,
-            capture_output=True,
-        )
+            returncode, stderr = self.run_export_command(ffmpeg_cmd, playlist_lines)
 
-        if p.returncode != 0:
+        if returncode != 0:
             logger.error(
-                f"Failed to export {self.playback_source.value} for command {' '.join(ffmpeg_cmd)}"
+                f"Failed to export {self.playback_source.value} for {self.camera} from {self.start_time} to {self.end_time}"
             )
-            logger.error(p.stderr)
+            logger.error(stderr)
             Path(video_path).unlink(missing_ok=True)
             Export.delete().where(Export.id == self.export_id).execute()
             Path(thumb_path).unlink(missing_ok=True)
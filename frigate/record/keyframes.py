@@ -0,0 +1,424 @@
+"""Keyframe index and cached decoding of recording segments."""
+
+import bisect
+import logging
+import struct
+import threading
+from collections import OrderedDict
+from typing import BinaryIO, Callable, Iterator, Optional
+
+import cv2
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# seconds, read forward instead of seeking when there is no keyframe index
+MAX_READ_FORWARD = 1.0
+
+
+def _iter_boxes(data: bytes, start: int = 0, end: Optional[int] = None) -> Iterator:
+    """Iterate over the (type, payload start, payload end) of mp4 boxes."""
+    end = len(data) if end is None else end
+    offset = start
+
+    while offset + 8 <= end:
+        size, box_type = struct.unpack_from(">I4s", data, offset)
+        header = 8
+
+        if size == 1:
+            size = struct.unpack_from(">Q", data, offset + 8)[0]
+            header = 16
+        elif size == 0:
+            size = end - offset
+
+        if size < header:
+            return
+
+        yield box_type, offset + header, min(offset + size, end)
+        offset += size
+
+
+def _find_box(data: bytes, path: list[bytes], start: int, end: int):
+    for box_type, payload_start, payload_end in _iter_boxes(data, start, end):
+        if box_type == path[0]:
+            if len(path) == 1:
+                return payload_start, payload_end
+
+            return _find_box(data, path[1:], payload_start, payload_end)
+
+    return None
+
+
+def _read_moov(file: BinaryIO) -> Optional[bytes]:
+    while True:
+        header = file.read(8)
+
+        if len(header) < 8:
+            return None
+
+        size, box_type = struct.unpack(">I4s", header)
+        header_size = 8
+
+        if size == 1:
+            size = struct.unpack(">Q", file.read(8))[0]
+            header_size = 16
+
+        if box_type == b"moov":
+            return file.read(size - header_size)
+
+        if size == 0:
+            return None
+
+        file.seek(size - header_size, 1)
+
+
+def _get_video_keyframe_times(moov: bytes, trak: tuple[int, int]) -> Optional[list]:
+    hdlr = _find_box(moov, [b"mdia", b"hdlr"], *trak)
+
+    if hdlr is None or moov[hdlr[0] + 8 : hdlr[0] + 12] != b"vide":
+        return None
+
+    mdhd = _find_box(moov, [b"mdia", b"mdhd"], *trak)
+    stbl = _find_box(moov, [b"mdia", b"minf", b"stbl"], *trak)
+
+    if mdhd is None or stbl is None:
+        return None
+
+    version = moov[mdhd[0]]
+    timescale = struct.unpack_from(">I", moov, mdhd[0] + (20 if version else 12))[0]
+
+    # decode time of every sample
+    stts = _find_box(moov, [b"stts"], *stbl)
+
+    if stts is None or timescale == 0:
+        return None
+
+    decode_times = []
+    time = 0
+    (count,) = struct.unpack_from(">I", moov, stts[0] + 4)
+
+    for i in range(count):
+        sample_count, delta = struct.unpack_from(">II", moov, stts[0] + 8 + i * 8)
+
+        for _ in range(sample_count):
+            decode_times.append(time)
+            time += delta
+
+    # presentation offsets when frames are reordered
+    ctts = _find_box(moov, [b"ctts"], *stbl)
+    offsets = [0] * len(decode_times)
+
+    if ctts is not None:
+        (count,) = struct.unpack_from(">I", moov, ctts[0] + 4)
+        sample = 0
+
+        for i in range(count):
+            sample_count, offset = struct.unpack_from(">Ii", moov, ctts[0] + 8 + i * 8)
+
+            for _ in range(sample_count):
+                if sample < len(offsets):
+                    offsets[sample] = offset
+
+                sample += 1
+
+    # the edit list moves the start of the track
+    media_time = 0
+    elst = _find_box(moov, [b"edts", b"elst"], *trak)
+
+    if elst is not None:
+        version = moov[elst[0]]
+        (count,) = struct.unpack_from(">I", moov, elst[0] + 4)
+        entry_size = 20 if version else 12
+
+        for i in range(count):
+            entry = elst[0] + 8 + i * entry_size
+            media = struct.unpack_from(
+                ">q" if version else ">i", moov, entry + (8 if version else 4)
+            )[0]
+
+            if media >= 0:
+                media_time = media
+                break
+
+    # samples that are keyframes, every sample is a keyframe without stss
+    stss = _find_box(moov, [b"stss"], *stbl)
+
+    if stss is None:
+        samples = range(1, len(decode_times) + 1)
+    else:
+        (count,) = struct.unpack_from(">I", moov, stss[0] + 4)
+        samples = struct.unpack_from(f">{count}I", moov, stss[0] + 8)
+
+    return sorted(
+        round(max(0, decode_times[s - 1] + offsets[s - 1] - media_time) / timescale, 3)
+        for s in samples
+        if 0 < s <= len(decode_times)
+    )
+
+
+def get_keyframe_times(path: str) -> Optional[list[float]]:
+    """Get the times of the keyframes in an mp4 file, relative to its start.
+
+    Only the sample tables of the file are read, so this is cheap enough to
+    run for every recording segment.
+    """
+    try:
+        with open(path, "rb") as file:
+            moov = _read_moov(file)
+
+        if moov is None:
+            return None
+
+        for box_type, start, end in _iter_boxes(moov):
+            if box_type == b"trak":
+                keyframes = _get_video_keyframe_times(moov, (start, end))
+
+                if keyframes is not None:
+                    return keyframes
+    except (OSError, struct.error) as e:
+        logger.debug(f"Unable to read keyframes of {path}: {e}")
+
+    return None
+
+
+class SegmentDecoder:
+    """An open decoder of a recording segment and its last decoded frame."""
+
+    def __init__(self, path: str, keyframes: Optional[list[float]]) -> None:
+        self.lock = threading.Lock()
+        self.keyframes = keyframes
+        self.capture = cv2.VideoCapture(path)
+        self.frame: Optional[np.ndarray] = None
+        self.frame_time = -1.0
+        self.previous_frame_time = -1.0
+
+    def is_opened(self) -> bool:
+        return self.capture.isOpened()
+
+    def release(self) -> None:
+        self.capture.release()
+
+    def _read(self) -> bool:
+        ret, frame = self.capture.read()
+
+        if not ret:
+            self.frame = None
+            self.frame_time = -1.0
+            return False
+
+        frame.flags.writeable = False
+        self.previous_frame_time = self.frame_time
+        self.frame = frame
+        self.frame_time = self.capture.get(cv2.CAP_PROP_POS_MSEC) / 1000
+        return True
+
+    def _keyframe_before(self, time: float) -> Optional[float]:
+        if not self.keyframes:
+            return None
+
+        index = bisect.bisect_right(self.keyframes, time) - 1
+        return self.keyframes[index] if index >= 0 else None
+
+    def _should_seek(self, time: float) -> bool:
+        if self.frame is None or time < self.frame_time:
+            return True
+
+        if self.keyframes:
+            # seek when a keyframe is closer than the current frame
+            keyframe = self._keyframe_before(time)
+            return keyframe is not None and keyframe > self.frame_time
+
+        return time - self.frame_time > MAX_READ_FORWARD
+
+    def _seek(self, time: float) -> bool:
+        self.capture.set(cv2.CAP_PROP_POS_MSEC, time * 1000)
+        self.frame_time = -1.0
+
+        if not self._read():
+            return False
+
+        # the frame before the seek position is not known
+        self.previous_frame_time = self.frame_time
+        return True
+
+    def get_frame(self, time: float) -> Optional[np.ndarray]:
+        """Get the first frame at or after time seconds into the segment.
+
+        The last frame is returned for times after it started.
+        """
+        # allow for rounding of the frame times
+        time = max(0, time - 0.001)
+
+        if (
+            self.frame is not None
+            and self.previous_frame_time < time <= self.frame_time
+        ):
+            return self.frame
+
+        if self._should_seek(time) and not self._seek(time):
+            # the time is after the last frame, decode up to it from before
+            keyframe = self._keyframe_before(time)
+
+            if not self._seek(
+                keyframe if keyframe is not None else max(0, time - MAX_READ_FORWARD)
+            ):
+                return None
+
+        while self.frame_time < time:
+            frame = self.frame
+
+            if not self._read():
+                # the time is after the start of the last frame
+                return frame
+
+        return self.frame
+
+
+class RecordingFrameService:
+    """Serves frames of recording segments without starting ffmpeg.
+
+    A few segments are kept open so that requests that move through the same
+    segment, like scrubbing the timeline, continue decoding from the previous
+    frame. The keyframe index of the segment is used to decide between
+    decoding forward and seeking. Encoded frames are cached, and concurrent
+    requests for the same frame wait for the one that is already encoding it.
+    """
+
+    def __init__(self, max_decoders: int = 4, max_entries: int = 128) -> None:
+        self.max_decoders = max_decoders
+        self.max_entries = max_entries
+        self.lock = threading.Lock()
+        self.decoders: OrderedDict[str, SegmentDecoder] = OrderedDict()
+        # segments that can not be decoded here, the oldest are forgotten
+        self.unsupported: OrderedDict[str, None] = OrderedDict()
+        self.results: OrderedDict[tuple, bytes] = OrderedDict()
+        self.pending: dict[tuple, threading.Event] = {}
+
+    def _get_decoder(
+        self, path: str, keyframes: Optional[list[float]]
+    ) -> Optional[SegmentDecoder]:
+        with self.lock:
+            if path in self.unsupported:
+                return None
+
+            decoder = self.decoders.get(path)
+
+            if decoder is not None:
+                self.decoders.move_to_end(path)
+                return decoder
+
+        decoder = SegmentDecoder(path, keyframes)
+
+        if not decoder.is_opened():
+            logger.debug(f"Unable to decode {path}")
+
+            with self.lock:
+                self.unsupported[path] = None
+
+                while len(self.unsupported) > self.max_entries:
+                    self.unsupported.popitem(last=False)
+
+            return None
+
+        released: list[SegmentDecoder] = []
+
+        with self.lock:
+            if path in self.decoders:
+                # opened by another request at the same time
+                released.append(decoder)
+                decoder = self.decoders[path]
+            else:
+                self.decoders[path] = decoder
+
+                while len(self.decoders) > self.max_decoders:
+                    released.append(self.decoders.popitem(last=False)[1])
+
+        # an evicted decoder may be in the middle of a decode, that is waited
+        # for without blocking the other requests
+        for evicted in released:
+            with evicted.lock:
+                evicted.release()
+
+        return decoder
+
+    def get_frame(
+        self, path: str, time: float, keyframes: Optional[list[float]] = None
+    ) -> Optional[np.ndarray]:
+        """Get the BGR frame at time seconds into a segment.
+
+        Returns None when the segment can not be decoded here. The returned
+        frame is shared with other requests and must not be modified.
+        """
+        while True:
+            decoder = self._get_decoder(path, keyframes)
+
+            if decoder is None:
+                return None
+
+            with decoder.lock:
+                # otherwise closed because too many segments are open, and it
+                # is opened again
+                if decoder.is_opened():
+                    return decoder.get_frame(time)
+
+    def _get_or_create(self, key: tuple, create: Callable[[], Optional[bytes]]):
+        while True:
+            with self.lock:
+                if key in self.results:
+                    self.results.move_to_end(key)
+                    return self.results[key]
+
+                pending = self.pending.get(key)
+
+                if pending is None:
+                    pending = threading.Event()
+                    self.pending[key] = pending
+                    break
+
+            pending.wait()
+
+        result = None
+
+        try:
+            result = create()
+        finally:
+            with self.lock:
+                del self.pending[key]
+
+                if result is not None:
+                    self.results[key] = result
+
+                    while len(self.results) > self.max_entries:
+                        self.results.popitem(last=False)
+
+            pending.set()
+
+        return result
+
+    def get_encoded_frame(
+        self,
+        path: str,
+        time: float,
+        keyframes: Optional[list[float]],
+        extension: str,
+        height: Optional[int] = None,
+    ) -> Optional[bytes]:
+        """Get the frame at time seconds into a segment resized and encoded."""
+        key = (path, round(time, 3), extension, height)
+
+        def encode() -> Optional[bytes]:
+            frame = self.get_frame(path, time, keyframes)
+
+            if frame is None:
+                return None
+
+            if height and height != frame.shape[0]:
+                width = max(1, int(height * frame.shape[1] / frame.shape[0]))
+                frame = cv2.resize(
+                    frame, dsize=(width, height), interpolation=cv2.INTER_AREA
+                )
+
+            ret, img = cv2.imencode(f".{extension}", frame)
+            return img.tobytes() if ret else None
+
+        return self._get_or_create(key, encode)
@@ -29,6 +29,7 @@ from frigate.const import (
     RECORD_DIR,
 )
 from frigate.models import Recordings, ReviewSegment
+from frigate.record.keyframes import get_keyframe_times
 from frigate.util.services import get_video_properties
 
 logger = logging.getLogger(__name__)
@@ -470,6 +471,7 @@ class RecordingMaintainer(threading.Thread):
                     Recordings.regions.name: segment_info.region_count,
                     Recordings.dBFS.name: segment_info.average_dBFS,
                     Recordings.segment_size.name: segment_size,
+                    Recordings.keyframes.name: get_keyframe_times(file_path),
                 }
         except Exception as e:
             logger.error(f"Unable to store recording segment {cache_path}")
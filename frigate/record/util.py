@@ -3,14 +3,36 @@
 import datetime
 import logging
 import os
+import re
+from typing import Optional
 
-from peewee import DatabaseError, chunked
+from peewee import DatabaseError, chunked, fn
 
 from frigate.const import RECORD_DIR
 from frigate.models import Recordings, RecordingsToDelete
+from frigate.record.vod import vod_playlist_cache
 
 logger = logging.getLogger(__name__)
 
+DAY_DIR_PATTERN = re.compile(r"\d{4}-\d{2}-\d{2}")
+SYNC_DELETE_BATCH_SIZE = 500
+
+# the rollups of the recordings and events as they are in the raw tables
+EXPECTED_ROLLUPS_SQL = """
+SELECT camera, start_time, SUM(duration) AS duration, SUM(motion) AS motion,
+    SUM(objects) AS objects, SUM(segments) AS segments, SUM(events) AS events
+FROM (
+    SELECT camera, CAST(start_time AS INTEGER) / 900 * 900 AS start_time, duration,
+        COALESCE(motion, 0) AS motion, COALESCE(objects, 0) AS objects,
+        1 AS segments, 0 AS events
+    FROM recordings
+    UNION ALL
+    SELECT camera, CAST(start_time AS INTEGER) / 900 * 900, 0, 0, 0, 0, 1
+    FROM event WHERE has_clip
+)
+GROUP BY camera, start_time
+"""
+
 
 def remove_empty_directories(directory: str) -> None:
     # list all directories recursively and sort them by path,
@@ -28,120 +50,229 @@ def remove_empty_directories(directory: str) -> None:
             os.rmdir(path)
 
 
-def sync_recordings(limited: bool) -> None:
-    """Check the db for stale recordings entries that don't exist in the filesystem."""
+def get_recording_days(cameras: Optional[list[str]] = None) -> list[str]:
+    """Get the sorted day directories that have recordings on disk or in the db."""
+    days = set()
 
-    def delete_db_entries_without_file(check_timestamp: float) -> bool:
-        """Delete db entries where file was deleted outside of frigate."""
+    if os.path.isdir(RECORD_DIR):
+        with os.scandir(RECORD_DIR) as entries:
+            for entry in entries:
+                if entry.is_dir() and DAY_DIR_PATTERN.fullmatch(entry.name):
+                    days.add(entry.name)
 
-        if limited:
-            recordings = Recordings.select(Recordings.id, Recordings.path).where(
-                Recordings.start_time >= check_timestamp
-            )
-        else:
-            # get all recordings in the db
-            recordings = Recordings.select(Recordings.id, Recordings.path)
+    query = Recordings.select(fn.DISTINCT(fn.date(Recordings.start_time, "unixepoch")))
 
-        # Use pagination to process records in chunks
-        page_size = 1000
-        num_pages = (recordings.count() + page_size - 1) // page_size
-        recordings_to_delete = set()
+    if cameras:
+        query = query.where(Recordings.camera << cameras)
 
-        for page in range(num_pages):
-            for recording in recordings.paginate(page, page_size):
-                if not os.path.exists(recording.path):
-                    recordings_to_delete.add(recording.id)
+    days.update(day for (day,) in query.tuples() if day)
+    return sorted(days)
 
-        if len(recordings_to_delete) == 0:
-            return True
 
-        logger.info(
-            f"Deleting {len(recordings_to_delete)} recording DB entries with missing files"
-        )
+def list_recording_files(
+    day: str, cameras: Optional[list[str]] = None, min_hour: str = ""
+) -> set[str]:
+    """List the recording files of a day directory."""
+    files = set()
+    day_dir = os.path.join(RECORD_DIR, day)
 
-        # convert back to list of dictionaries for insertion
-        recordings_to_delete = [
-            {"id": recording_id} for recording_id in recordings_to_delete
-        ]
+    if not os.path.isdir(day_dir):
+        return files
 
-        if float(len(recordings_to_delete)) / max(1, recordings.count()) > 0.5:
-            logger.warning(
-                f"Deleting {(float(len(recordings_to_delete)) / recordings.count()):2f}% of recordings DB entries, could be due to configuration error. Aborting..."
-            )
-            return False
+    with os.scandir(day_dir) as hours:
+        hour_dirs = sorted(h.name for h in hours if h.is_dir() and h.name >= min_hour)
 
-        # create a temporary table for deletion
-        RecordingsToDelete.create_table(temporary=True)
+    for hour in hour_dirs:
+        with os.scandir(os.path.join(day_dir, hour)) as camera_dirs:
+            for camera_dir in camera_dirs:
+                if cameras and camera_dir.name not in cameras:
+                    continue
 
-        # insert ids to the temporary table
-        max_inserts = 1000
-        for batch in chunked(recordings_to_delete, max_inserts):
-            RecordingsToDelete.insert_many(batch).execute()
+                if not camera_dir.is_dir():
+                    # files directly in the hour directory
+                    if not cameras:
+                        files.add(camera_dir.path)
 
-        try:
-            # delete records in the main table that exist in the temporary table
-            query = Recordings.delete().where(
-                Recordings.id.in_(RecordingsToDelete.select(RecordingsToDelete.id))
-            )
-            query.execute()
-        except DatabaseError as e:
-            logger.error(f"Database error during recordings db cleanup: {e}")
+                    continue
+
+                for root, _, names in os.walk(camera_dir.path):
+                    files.update(os.path.join(root, name) for name in names)
+
+    return files
 
-        return True
 
-    def delete_files_without_db_entry(files_on_disk: list[str]):
-        """Delete files where file is not inside frigate db."""
-        files_to_delete = []
+def sync_recordings(
+    limited: bool,
+    cameras: Optional[list[str]] = None,
+    days: Optional[list[str]] = None,
+) -> None:
+    """Check the db for stale recordings entries that don't exist in the filesystem.
+
+    Recordings are compared one day directory at a time. The files of the day
+    and the db entries that started on that day are loaded as sets and the
+    differences between them are deleted in bulk. The sync can be limited to
+    specific cameras and day directories (YYYY-MM-DD).
+    """
+    logger.debug("Start sync recordings.")
+
+    # when limited, start checking on the hour 36 hours ago
+    check_point = datetime.datetime.now().replace(
+        minute=0, second=0, microsecond=0
+    ).astimezone(datetime.timezone.utc) - datetime.timedelta(hours=36)
+    check_day = check_point.strftime("%Y-%m-%d")
 
-        for file in files_on_disk:
-            if not Recordings.select().where(Recordings.path == file).exists():
-                files_to_delete.append(file)
+    recordings_to_delete: list[str] = []
+    files_to_delete: list[str] = []
+    total_recordings = 0
+    total_files = 0
 
-        if len(files_to_delete) == 0:
-            return True
+    for day in days or get_recording_days(cameras):
+        if limited and day < check_day:
+            continue
 
-        logger.info(
-            f"Deleting {len(files_to_delete)} recordings files with missing DB entries"
+        day_start = datetime.datetime.strptime(day, "%Y-%m-%d").replace(
+            tzinfo=datetime.timezone.utc
+        )
+        start = day_start.timestamp()
+        end = (day_start + datetime.timedelta(days=1)).timestamp()
+        min_hour = ""
+
+        if limited and day == check_day:
+            start = check_point.timestamp()
+            min_hour = check_point.strftime("%H")
+
+        files_on_disk = list_recording_files(day, cameras, min_hour)
+        day_prefix = os.path.join(RECORD_DIR, day, "")
+        query = Recordings.select(Recordings.id, Recordings.path).where(
+            (Recordings.start_time >= start) & (Recordings.start_time < end)
         )
 
-        if float(len(files_to_delete)) / max(1, len(files_on_disk)) > 0.5:
-            logger.debug(
-                f"Deleting {(float(len(files_to_delete)) / len(files_on_disk)):2f}% of recordings DB entries, could be due to configuration error. Aborting..."
-            )
-            return False
+        if cameras:
+            query = query.where(Recordings.camera << cameras)
 
-        for file in files_to_delete:
-            os.unlink(file)
+        recording_paths = set()
 
-        return True
+        for recording_id, path in query.tuples().iterator():
+            total_recordings += 1
+            recording_paths.add(path)
 
-    logger.debug("Start sync recordings.")
+            if path in files_on_disk:
+                continue
 
-    # start checking on the hour 36 hours ago
-    check_point = datetime.datetime.now().replace(
-        minute=0, second=0, microsecond=0
-    ).astimezone(datetime.timezone.utc) - datetime.timedelta(hours=36)
-    db_success = delete_db_entries_without_file(check_point.timestamp())
+            # entries outside of the day directory are checked individually
+            if not path.startswith(day_prefix) or not os.path.exists(path):
+                recordings_to_delete.append(recording_id)
+
+        total_files += len(files_on_disk)
+        files_to_delete.extend(sorted(files_on_disk - recording_paths))
 
     # only try to cleanup files if db cleanup was successful
-    if db_success:
-        if limited:
-            # get recording files from last 36 hours
-            hour_check = f"{RECORD_DIR}/{check_point.strftime('%Y-%m-%d/%H')}"
-            files_on_disk = {
-                os.path.join(root, file)
-                for root, _, files in os.walk(RECORD_DIR)
-                for file in files
-                if root > hour_check
-            }
-        else:
-            # get all recordings files on disk and put them in a set
-            files_on_disk = {
-                os.path.join(root, file)
-                for root, _, files in os.walk(RECORD_DIR)
-                for file in files
-            }
-
-        delete_files_without_db_entry(files_on_disk)
+    if delete_recordings_without_file(recordings_to_delete, total_recordings):
+        delete_files_without_recording(files_to_delete, total_files)
 
     logger.debug("End sync recordings.")
+
+
+def delete_recordings_without_file(
+    recordings_to_delete: list[str], total_recordings: int
+) -> bool:
+    """Delete db entries where file was deleted outside of frigate."""
+    if len(recordings_to_delete) == 0:
+        return True
+
+    logger.info(
+        f"Deleting {len(recordings_to_delete)} recording DB entries with missing files"
+    )
+
+    if float(len(recordings_to_delete)) / max(1, total_recordings) > 0.5:
+        logger.warning(
+            f"Deleting {(float(len(recordings_to_delete)) / total_recordings):2f}% of recordings DB entries, could be due to configuration error. Aborting..."
+        )
+        return False
+
+    try:
+        # the ids are staged in a temporary table so the entries are removed by
+        # a single statement, the queued database does not support transactions
+        RecordingsToDelete.create_table(temporary=True)
+
+        for batch in chunked(recordings_to_delete, SYNC_DELETE_BATCH_SIZE):
+            RecordingsToDelete.insert_many([{"id": id} for id in batch]).execute()
+
+        Recordings.delete().where(
+            Recordings.id.in_(RecordingsToDelete.select(RecordingsToDelete.id))
+        ).execute()
+        RecordingsToDelete.drop_table()
+        vod_playlist_cache.clear()
+    except DatabaseError as e:
+        logger.error(f"Database error during recordings db cleanup: {e}")
+
+    return True
+
+
+def delete_files_without_recording(
+    files_to_delete: list[str], total_files: int
+) -> bool:
+    """Delete files where file is not inside frigate db."""
+    if len(files_to_delete) == 0:
+        return True
+
+    logger.info(
+        f"Deleting {len(files_to_delete)} recordings files with missing DB entries"
+    )
+
+    if float(len(files_to_delete)) / max(1, total_files) > 0.5:
+        logger.debug(
+            f"Deleting {(float(len(files_to_delete)) / total_files):2f}% of recordings DB entries, could be due to configuration error. Aborting..."
+        )
+        return False
+
+    for file in files_to_delete:
+        try:
+            os.unlink(file)
+        except FileNotFoundError:
+            pass
+
+    return True
+
+
+def check_recordings_rollups(rebuild: bool = True) -> bool:
+    """Compare the recordings rollups with the raw tables.
+
+    The rollups are kept up to date by triggers, so they only differ when the
+    database was changed outside of frigate. Returns True when they match,
+    otherwise the rollups are rebuilt if rebuild is set.
+    """
+    db = Recordings._meta.database
+    expected = f"SELECT camera, start_time, ROUND(duration), motion, objects, segments, events FROM ({EXPECTED_ROLLUPS_SQL})"
+    actual = "SELECT camera, start_time, ROUND(duration), motion, objects, segments, events FROM recordingsrollup"
+    differences = db.execute_sql(
+        f"SELECT (SELECT COUNT(*) FROM ({expected} EXCEPT {actual})) + (SELECT COUNT(*) FROM ({actual} EXCEPT {expected}))"
+    ).fetchone()[0]
+
+    if differences == 0:
+        return True
+
+    logger.warning(f"Recordings rollups have {differences} differences")
+
+    if rebuild:
+        rebuild_recordings_rollups()
+
+    return False
+
+
+def rebuild_recordings_rollups() -> None:
+    """Recreate the recordings rollups from the raw tables."""
+    logger.info("Rebuilding recordings rollups")
+    db = Recordings._meta.database
+    db.execute_sql("DELETE FROM recordingsrollup")
+    # segments may be inserted by the triggers in between the statements
+    db.execute_sql(
+        f"""INSERT INTO recordingsrollup (camera, start_time, duration, motion, objects, segments, events)
+        SELECT * FROM ({EXPECTED_ROLLUPS_SQL}) WHERE true
+        ON CONFLICT (camera, start_time) DO UPDATE SET
+            duration = excluded.duration,
+            motion = excluded.motion,
+            objects = excluded.objects,
+            segments = excluded.segments,
+            events = excluded.events"""
+    )
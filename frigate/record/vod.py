@@ -0,0 +1,88 @@
+"""Cache of immutable VOD playlists."""
+
+import datetime
+import logging
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# playlists for time ranges that ended longer ago than this are
+# not going to receive any new segments from the recording maintainer
+IMMUTABLE_AFTER = 3600
+
+
+class VodPlaylistCache:
+    """LRU cache of VOD playlists for time ranges that can no longer change.
+
+    Entries are only dropped by LRU eviction or by an explicit invalidation
+    when recordings are deleted for the camera and time range they cover.
+    """
+
+    def __init__(self, max_entries: int = 2048) -> None:
+        self.max_entries = max_entries
+        self.lock = threading.Lock()
+        self.playlists: OrderedDict[tuple[str, float, float], dict] = OrderedDict()
+
+    @staticmethod
+    def is_immutable(end_ts: float) -> bool:
+        """Returns True if no recordings can be added to a range ending at end_ts."""
+        return end_ts < datetime.datetime.now().timestamp() - IMMUTABLE_AFTER
+
+    def get(self, camera: str, start_ts: float, end_ts: float) -> Optional[dict]:
+        key = (camera, start_ts, end_ts)
+
+        with self.lock:
+            playlist = self.playlists.get(key)
+
+            if playlist is not None:
+                self.playlists.move_to_end(key)
+
+            return playlist
+
+    def set(self, camera: str, start_ts: float, end_ts: float, playlist: dict) -> None:
+        """Caches the playlist if the time range is immutable."""
+        if not self.is_immutable(end_ts):
+            return
+
+        key = (camera, start_ts, end_ts)
+
+        with self.lock:
+            self.playlists[key] = playlist
+            self.playlists.move_to_end(key)
+
+            while len(self.playlists) > self.max_entries:
+                self.playlists.popitem(last=False)
+
+    def invalidate(
+        self,
+        camera: Optional[str] = None,
+        start_time: float = float("-inf"),
+        end_time: float = float("inf"),
+    ) -> None:
+        """Drop cached playlists overlapping the deleted time range.
+
+        When camera is None the playlists of all cameras are checked.
+        """
+        with self.lock:
+            expired = [
+                key
+                for key in self.playlists.keys()
+                if (camera is None or key[0] == camera)
+                and key[1] <= end_time
+                and key[2] >= start_time
+            ]
+
+            for key in expired:
+                del self.playlists[key]
+
+        if expired:
+            logger.debug(f"Invalidated {len(expired)} cached vod playlists")
+
+    def clear(self) -> None:
+        with self.lock:
+            self.playlists.clear()
+
+
+vod_playlist_cache = VodPlaylistCache()
@@ -0,0 +1,480 @@
+"""Replay recorded clips through the object processing pipeline.
+
+Frames are decoded from a local video file and fed through the same
+process_frames loop, motion detector, object tracker and detector that run
+for a live camera, so the throughput and the results of the hot path can be
+measured and compared against a stored baseline without a camera.
+
+Usage: python -m frigate.replay clip.mp4 [clip.mp4 ...] [--baseline baseline.json]
+"""
+
+import argparse
+import json
+import logging
+import os
+import queue
+import sys
+import threading
+import time
+from collections import defaultdict
+from typing import Callable, Iterator, Optional
+
+import cv2
+import numpy as np
+
+from frigate.camera import CameraMetrics, PTZMetrics
+from frigate.comms.inter_process import InterProcessRequestor
+from frigate.config import CameraConfig, FrigateConfig
+from frigate.motion.improved_motion import ImprovedMotionDetector
+from frigate.object_detection import LocalObjectDetector, ObjectDetector
+from frigate.track.norfair_tracker import NorfairTracker
+from frigate.util.image import DictFrameManager
+from frigate.util.object import GRID_SIZE
+from frigate.video import process_frames
+
+logger = logging.getLogger(__name__)
+
+REPLAY_CAMERA = "replay"
+STAGES = ["motion", "region", "detect", "track"]
+
+
+class StageTimer:
+    """Collects the time spent in each stage of every processed frame.
+
+    Motion, detect and track are timed around the calls made by
+    process_frames, region is the remainder of the frame which is spent
+    selecting regions, preparing the detector input and consolidating
+    detections.
+    """
+
+    def __init__(self) -> None:
+        self.frame_start: Optional[float] = None
+        self.current: dict[str, float] = defaultdict(float)
+        self.detector_calls = 0
+        self.frames: list[dict[str, float]] = []
+
+    def wrap(self, stage: str, func: Callable) -> Callable:
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.current[stage] += time.perf_counter() - start
+
+                if stage == "detect":
+                    self.detector_calls += 1
+
+        return timed
+
+    def start_frame(self) -> None:
+        self.frame_start = time.perf_counter()
+        self.current = defaultdict(float)
+        self.detector_calls = 0
+
+    def end_frame(self) -> None:
+        if self.frame_start is None:
+            return
+
+        total = time.perf_counter() - self.frame_start
+        timings = {stage: self.current[stage] for stage in STAGES if stage != "region"}
+        timings["region"] = max(0.0, total - sum(timings.values()))
+        timings["total"] = total
+        timings["detector_calls"] = self.detector_calls
+        self.frames.append(timings)
+        self.frame_start = None
+
+
+class ReplayFrameManager(DictFrameManager):
+    """Keeps decoded frames in memory and marks the start of each processed frame."""
+
+    def __init__(self, timer: StageTimer) -> None:
+        super().__init__()
+        self.timer = timer
+
+    def get(self, name, shape):
+        if name not in self.frames:
+            return None
+
+        self.timer.start_frame()
+        return super().get(name, shape)
+
+
+class ReplayFrameQueue:
+    """Frame queue that decodes the next frame of the clip when it is read.
+
+    Frames are only decoded when process_frames asks for them so memory use
+    does not grow with the length of the clip, and the queue is only empty
+    once the clip has ended so process_frames can run with exit_on_empty.
+    """
+
+    def __init__(self, frames: Iterator[float]) -> None:
+        self.frames = frames
+
+    def get(self, block: bool = True, timeout: Optional[float] = None) -> float:
+        try:
+            return next(self.frames)
+        except StopIteration:
+            raise queue.Empty
+
+    def empty(self) -> bool:
+        return False
+
+
+class ReplayResultQueue:
+    """Collects the results of each frame in place of the detected objects queue."""
+
+    def __init__(
+        self, frame_manager: DictFrameManager, timer: StageTimer, camera: str
+    ) -> None:
+        self.frame_manager = frame_manager
+        self.timer = timer
+        self.camera = camera
+        self.motion_boxes = 0
+        self.regions = 0
+        self.objects: dict[str, set[str]] = defaultdict(set)
+
+    def full(self) -> bool:
+        return False
+
+    def put(self, item) -> None:
+        self.timer.end_frame()
+        _, frame_time, detections, motion_boxes, regions = item
+        self.motion_boxes += len(motion_boxes)
+        self.regions += len(regions)
+
+        for obj in detections.values():
+            self.objects[obj["label"]].add(obj["id"])
+
+        self.frame_manager.delete(f"{self.camera}{frame_time}")
+
+
+def read_frames(
+    clip: str,
+    camera_config: CameraConfig,
+    frame_manager: DictFrameManager,
+    max_frames: Optional[int] = None,
+) -> Iterator[float]:
+    """Decode the clip at the detect resolution and fps as I420 frames."""
+    video = cv2.VideoCapture(clip)
+
+    if not video.isOpened():
+        raise ValueError(f"Unable to open {clip}")
+
+    clip_fps = video.get(cv2.CAP_PROP_FPS) or camera_config.detect.fps
+    frame_interval = 1 / min(camera_config.detect.fps, clip_fps)
+    size = (camera_config.detect.width, camera_config.detect.height)
+    frame_index = 0
+    next_frame_time = 0.0
+    frames = 0
+
+    try:
+        while max_frames is None or frames < max_frames:
+            ret, frame = video.read()
+
+            if not ret:
+                break
+
+            frame_time = frame_index / clip_fps
+            frame_index += 1
+
+            # drop frames to match the detect fps
+            if frame_time + 1e-6 < next_frame_time:
+                continue
+
+            next_frame_time += frame_interval
+
+            if (frame.shape[1], frame.shape[0]) != size:
+                frame = cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+
+            yuv = cv2.cvtColor(frame, cv2.COLOR_BGR2YUV_I420)
+            buffer = frame_manager.create(
+                f"{camera_config.name}{frame_time}", yuv.nbytes
+            )
+            np.frombuffer(buffer, np.uint8)[:] = yuv.reshape(-1)
+            frames += 1
+            yield frame_time
+    finally:
+        video.release()
+
+
+def create_config(
+    clip: str, model_path: Optional[str] = None, fps: int = 5
+) -> FrigateConfig:
+    """Create a config with a single camera at the resolution of the clip."""
+    video = cv2.VideoCapture(clip)
+    width = int(video.get(cv2.CAP_PROP_FRAME_WIDTH))
+    height = int(video.get(cv2.CAP_PROP_FRAME_HEIGHT))
+    video.release()
+
+    if not width or not height:
+        raise ValueError(f"Unable to read the resolution of {clip}")
+
+    model = {"path": model_path} if model_path else {}
+
+    return FrigateConfig.parse_object(
+        {
+            "mqtt": {"enabled": False},
+            "detectors": {"cpu": {"type": "cpu"}},
+            "model": model,
+            "cameras": {
+                REPLAY_CAMERA: {
+                    "ffmpeg": {"inputs": [{"path": clip, "roles": ["detect"]}]},
+                    "detect": {"width": width, "height": height, "fps": fps},
+                    "record": {"enabled": False},
+                }
+            },
+        }
+    )
+
+
+def create_detector(config: FrigateConfig) -> LocalObjectDetector:
+    detector_config = next(iter(config.detectors.values()))
+    object_detector = LocalObjectDetector(detector_config=detector_config)
+    object_detector.labels = config.model.merged_labelmap
+    return object_detector
+
+
+def get_empty_region_grid() -> list[list[dict[str, any]]]:
+    return [[{"sizes": []} for _ in range(GRID_SIZE)] for _ in range(GRID_SIZE)]
+
+
+def replay_clip(
+    clip: str,
+    config: FrigateConfig,
+    camera: str,
+    object_detector: ObjectDetector,
+    max_frames: Optional[int] = None,
+) -> dict[str, any]:
+    """Run a clip through process_frames and summarize the results."""
+    camera_config = config.cameras[camera]
+    timer = StageTimer()
+    frame_manager = ReplayFrameManager(timer)
+    frame_queue = ReplayFrameQueue(
+        read_frames(clip, camera_config, frame_manager, max_frames)
+    )
+    results = ReplayResultQueue(frame_manager, timer, camera)
+    ptz_metrics = PTZMetrics(autotracker_enabled=False)
+
+    motion_detector = ImprovedMotionDetector(
+        camera_config.frame_shape,
+        camera_config.motion,
+        camera_config.detect.fps,
+        name=camera,
+    )
+    motion_detector.detect = timer.wrap("motion", motion_detector.detect)
+
+    object_tracker = NorfairTracker(camera_config, ptz_metrics)
+    object_tracker.match_and_update = timer.wrap(
+        "track", object_tracker.match_and_update
+    )
+    object_tracker.update_frame_times = timer.wrap(
+        "track", object_tracker.update_frame_times
+    )
+
+    detect = object_detector.detect
+    object_detector.detect = timer.wrap("detect", detect)
+    requestor = InterProcessRequestor()
+
+    try:
+        process_frames(
+            camera,
+            requestor,
+            frame_queue,
+            camera_config.frame_shape,
+            config.model,
+            camera_config.detect,
+            frame_manager,
+            motion_detector,
+            object_detector,
+            object_tracker,
+            results,
+            CameraMetrics(),
+            camera_config.objects.track,
+            camera_config.objects.filters,
+            # never set, process_frames exits once the clip has ended
+            threading.Event(),
+            ptz_metrics,
+            get_empty_region_grid(),
+            exit_on_empty=True,
+        )
+    finally:
+        object_detector.detect = detect
+
+        # process_frames only stops the requestor when it exits normally
+        if not requestor.socket.closed:
+            requestor.stop()
+
+    return summarize(clip, timer.frames, results)
+
+
+def summarize(
+    clip: str, frames: list[dict[str, float]], results: ReplayResultQueue
+) -> dict[str, any]:
+    frame_count = max(1, len(frames))
+    total = sum(f["total"] for f in frames)
+
+    return {
+        "clip": os.path.basename(clip),
+        "frames": len(frames),
+        "fps": round(len(frames) / total, 2) if total else 0.0,
+        "stages": {
+            stage: {
+                "avg_ms": round(float(np.mean([f[stage] for f in frames])) * 1000, 3)
+                if frames
+                else 0.0,
+                "p95_ms": round(
+                    float(np.percentile([f[stage] for f in frames], 95)) * 1000, 3
+                )
+                if frames
+                else 0.0,
+            }
+            for stage in STAGES + ["total"]
+        },
+        "detector_calls_per_frame": round(
+            sum(f["detector_calls"] for f in frames) / frame_count, 3
+        ),
+        "motion_boxes_per_frame": round(results.motion_boxes / frame_count, 3),
+        "regions_per_frame": round(results.regions / frame_count, 3),
+        "objects": {label: len(ids) for label, ids in sorted(results.objects.items())},
+    }
+
+
+def compare_to_baseline(
+    result: dict[str, any], baseline: dict[str, any], tolerance: float
+) -> list[str]:
+    """Get the regressions of a result compared to its baseline.
+
+    Speed is compared with the relative tolerance, the tracked object
+    counts are expected to match exactly.
+    """
+    regressions = []
+
+    if result["fps"] < baseline["fps"] * (1 - tolerance):
+        regressions.append(f"fps dropped from {baseline['fps']} to {result['fps']}")
+
+    for stage, timings in baseline["stages"].items():
+        current = result["stages"].get(stage)
+
+        # ignore noise on stages that barely take any time
+        if (
+            current is not None
+            and current["avg_ms"] > timings["avg_ms"] * (1 + tolerance)
+            and current["avg_ms"] - timings["avg_ms"] > 0.1
+        ):
+            regressions.append(
+                f"{stage} avg went from {timings['avg_ms']}ms to {current['avg_ms']}ms"
+            )
+
+    if result["detector_calls_per_frame"] > baseline["detector_calls_per_frame"] * (
+        1 + tolerance
+    ):
+        regressions.append(
+            f"detector calls per frame went from {baseline['detector_calls_per_frame']} to {result['detector_calls_per_frame']}"
+        )
+
+    if result["objects"] != baseline["objects"]:
+        regressions.append(
+            f"tracked objects changed from {baseline['objects']} to {result['objects']}"
+        )
+
+    return regressions
+
+
+def print_result(result: dict[str, any]) -> None:
+    print(f"{result['clip']}: {result['frames']} frames at {result['fps']} fps")
+
+    for stage, timings in result["stages"].items():
+        print(
+            f"  {stage:>7}: {timings['avg_ms']:.2f}ms avg, {timings['p95_ms']:.2f}ms p95"
+        )
+
+    print(f"  detector calls per frame: {result['detector_calls_per_frame']}")
+    print(f"  motion boxes per frame: {result['motion_boxes_per_frame']}")
+    print(f"  regions per frame: {result['regions_per_frame']}")
+    print(f"  tracked objects: {result['objects']}")
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.WARNING)
+
+    parser = argparse.ArgumentParser(
+        prog="python -m frigate.replay",
+        description="Replay clips through the object processing pipeline.",
+    )
+    parser.add_argument("clips", nargs="+", help="Video files to replay.")
+    parser.add_argument(
+        "--config",
+        help="Frigate config to use, the clips are resized to the camera's detect resolution.",
+    )
+    parser.add_argument(
+        "--camera", help="Camera from --config to use (default: first camera)."
+    )
+    parser.add_argument("--model", help="Model path for the default cpu detector.")
+    parser.add_argument(
+        "--fps", type=int, default=5, help="Detect fps without --config."
+    )
+    parser.add_argument("--max-frames", type=int, help="Frames to replay per clip.")
+    parser.add_argument("--output", help="Write the results as json to this file.")
+    parser.add_argument("--baseline", help="Compare the results to this json file.")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.1,
+        help="Allowed relative slowdown compared to the baseline (default: 0.1).",
+    )
+    args = parser.parse_args()
+
+    config = None
+
+    if args.config:
+        with open(args.config) as f:
+            config = FrigateConfig.parse(f)
+
+    results = {}
+    object_detector = None
+
+    for clip in args.clips:
+        clip_config = config or create_config(clip, args.model, args.fps)
+        camera = args.camera or next(iter(clip_config.cameras.keys()))
+
+        # the detector is created once, models do not depend on the clip
+        if object_detector is None:
+            object_detector = create_detector(clip_config)
+
+        result = replay_clip(
+            clip, clip_config, camera, object_detector, args.max_frames
+        )
+        results[result["clip"]] = result
+        print_result(result)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+        failed = False
+
+        for clip, result in results.items():
+            if clip not in baseline:
+                print(f"{clip}: not in baseline")
+                continue
+
+            regressions = compare_to_baseline(result, baseline[clip], args.tolerance)
+
+            for regression in regressions:
+                print(f"{clip}: {regression}")
+
+            failed = failed or bool(regressions)
+
+        if failed:
+            sys.exit(1)
+
+        print("No regressions compared to baseline.")
+
+
+if __name__ == "__main__":
+    main()
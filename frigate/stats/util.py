@@ -14,6 +14,7 @@ from requests.exceptions import RequestException
 from frigate.camera import CameraMetrics
 from frigate.config import FrigateConfig
 from frigate.const import CACHE_DIR, CLIPS_DIR, RECORD_DIR
+from frigate.genai.pool import GenAIMetrics
 from frigate.object_detection import ObjectDetectProcess
 from frigate.types import StatsTrackingTypes
 from frigate.util.services import (
@@ -53,10 +54,12 @@ def stats_init(
     camera_metrics: dict[str, CameraMetrics],
     detectors: dict[str, ObjectDetectProcess],
     processes: dict[str, int],
+    genai_metrics: Optional[GenAIMetrics] = None,
 ) -> StatsTrackingTypes:
     stats_tracking: StatsTrackingTypes = {
         "camera_metrics": camera_metrics,
         "detectors": detectors,
+        "genai_metrics": genai_metrics,
         "started": int(time.time()),
         "latest_frigate_version": get_latest_version(config),
         "last_updated": int(time.time()),
@@ -263,6 +266,7 @@ def stats_snapshot(
             "ffmpeg_pid": ffmpeg_pid,
             "audio_rms": round(camera_stats.audio_rms.value, 4),
             "audio_dBFS": round(camera_stats.audio_dBFS.value, 4),
+            "audio_dropped": camera_stats.audio_dropped.value,
         }
 
     stats["detectors"] = {}
@@ -279,6 +283,17 @@ def stats_snapshot(
         }
     stats["detection_fps"] = round(total_detection_fps, 2)
 
+    if genai_metrics := stats_tracking.get("genai_metrics"):
+        stats["genai"] = {
+            "queue_depth": genai_metrics.queue_depth.value,
+            "in_flight": genai_metrics.in_flight.value,
+            "queued_mb": round(genai_metrics.queued_bytes.value / pow(2, 20), 1),
+            "wait_time": round(genai_metrics.wait_time.value, 2),
+            "processed": genai_metrics.processed.value,
+            "coalesced": genai_metrics.coalesced.value,
+            "dropped": genai_metrics.dropped.value,
+        }
+
     get_processing_stats(config, stats, hwaccel_errors)
 
     stats["service"] = {
@@ -10,6 +10,7 @@ from peewee import fn
 from frigate.config import FrigateConfig
 from frigate.const import RECORD_DIR
 from frigate.models import Event, Recordings
+from frigate.record.vod import vod_playlist_cache
 from frigate.util.builtin import clear_and_unlink
 
 logger = logging.getLogger(__name__)
@@ -206,6 +207,10 @@ class StorageMaintainer(threading.Thread):
                 Recordings.id << deleted_recordings_list[i : i + max_deletes]
             ).execute()
 
+        # the oldest recordings of every camera may have been removed
+        if deleted_recordings:
+            vod_playlist_cache.clear()
+
     def run(self):
         """Check every 5 minutes if storage needs to be cleaned up."""
         self.calculate_camera_bandwidth()
@@ -0,0 +1,139 @@
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+
+from frigate.camera import CameraMetrics
+from frigate.config import FrigateConfig
+from frigate.events.audio import (
+    AUDIO_SAMPLES,
+    AudioDetectorService,
+    AudioEventMaintainer,
+)
+
+
+class FakeAudioModel:
+    """Scores every window with its first sample and records the batch sizes."""
+
+    def __init__(self, delay: float = 0) -> None:
+        self.delay = delay
+        self.batch_sizes: list[int] = []
+
+    def detect_batch(self, tensor_inputs):
+        self.batch_sizes.append(len(tensor_inputs))
+        time.sleep(self.delay)
+        return [
+            [("bark", float(tensor_input[0]), (-1, -1, -1, -1))]
+            for tensor_input in tensor_inputs
+        ]
+
+
+class TestAudioDetectorService(unittest.TestCase):
+    def setUp(self):
+        self.stop_event = threading.Event()
+
+    def tearDown(self):
+        self.stop_event.set()
+
+    def create_service(self, cameras, model, timeout=0.5) -> AudioDetectorService:
+        service = AudioDetectorService(
+            cameras, self.stop_event, timeout=timeout, detector=model
+        )
+        service.start()
+        return service
+
+    def test_windows_are_batched(self):
+        cameras = [f"camera_{i}" for i in range(8)]
+        model = FakeAudioModel(delay=0.05)
+        service = self.create_service(cameras, model)
+        results = {}
+
+        def detect(i: int, camera: str) -> None:
+            waveform = np.full(AUDIO_SAMPLES, i / 10, np.float32)
+            results[camera] = service.detect(camera, waveform)
+
+        threads = [
+            threading.Thread(target=detect, args=(i, camera))
+            for i, camera in enumerate(cameras)
+        ]
+
+        for thread in threads:
+            thread.start()
+
+        for thread in threads:
+            thread.join()
+
+        assert sum(model.batch_sizes) == len(cameras)
+        assert len(model.batch_sizes) < len(cameras)
+
+        for i, camera in enumerate(cameras):
+            assert results[camera][0][1] == np.float32(i / 10)
+
+    def test_slow_detection_skips_window(self):
+        model = FakeAudioModel(delay=0.3)
+        service = self.create_service(["front"], model, timeout=0.1)
+
+        assert service.detect("front", np.full(AUDIO_SAMPLES, 0.1, np.float32)) is None
+
+        # the late result of the skipped window is not returned for the next one
+        model.delay = 0
+        service.timeout = 1
+        detections = service.detect("front", np.full(AUDIO_SAMPLES, 0.2, np.float32))
+        assert detections[0][1] == np.float32(0.2)
+
+
+class TestAudioEventMaintainer(unittest.TestCase):
+    def setUp(self):
+        config = FrigateConfig(
+            **{
+                "mqtt": {"host": "mqtt"},
+                "cameras": {
+                    "front": {
+                        "ffmpeg": {
+                            "inputs": [
+                                {
+                                    "path": "rtsp://10.0.0.1/video",
+                                    "roles": ["detect", "audio"],
+                                }
+                            ]
+                        },
+                        "detect": {"width": 1280, "height": 720},
+                        "audio": {"enabled": True, "min_volume": 0},
+                    }
+                },
+            }
+        )
+        self.camera_metrics = {"front": CameraMetrics()}
+        self.detector = MagicMock()
+
+        with (
+            patch("frigate.events.audio.InterProcessRequestor"),
+            patch("frigate.events.audio.ConfigSubscriber"),
+            patch("frigate.events.audio.DetectionPublisher"),
+            patch("frigate.events.audio.LogPipe"),
+        ):
+            self.maintainer = AudioEventMaintainer(
+                config.cameras["front"],
+                self.camera_metrics,
+                self.detector,
+                threading.Event(),
+            )
+
+    def test_skipped_windows_are_counted_and_reported(self):
+        self.detector.detect.return_value = None
+        audio = np.full(AUDIO_SAMPLES, 1000, np.int16)
+
+        with self.assertLogs("audio.front", "WARNING") as logs:
+            for _ in range(3):
+                self.maintainer.detect_audio(audio)
+
+        assert self.camera_metrics["front"].audio_dropped.value == 3
+        # reported once, the next windows are counted until the next report
+        assert len(logs.records) == 1
+        assert self.maintainer.dropped_windows == 2
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
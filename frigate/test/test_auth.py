@@ -0,0 +1,175 @@
+import logging
+import os
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+from peewee_migrate import Router
+from playhouse.sqlite_ext import SqliteExtDatabase
+from playhouse.sqliteq import SqliteQueueDatabase
+
+from frigate.api import auth
+from frigate.api.auth import VerifiedTokenCache, create_encoded_jwt
+from frigate.api.fastapi_app import create_fastapi_app
+from frigate.api.read_pool import MAX_READ_CONNECTIONS
+from frigate.config import FrigateConfig
+from frigate.const import JWT_SECRET_ENV_VAR
+from frigate.models import User
+from frigate.test.const import TEST_DB, TEST_DB_CLEANUPS
+
+JWT_SECRET = "0" * 64
+
+
+class TestVerifiedTokenCache(unittest.TestCase):
+    def test_expires_after_ttl(self):
+        cache = VerifiedTokenCache(ttl=10)
+        expiration = int(time.time()) + 3600
+        cache.set("token", "admin", expiration)
+        assert cache.get("token") == ("admin", expiration)
+
+        with patch("frigate.api.auth.time.time", return_value=time.time() + 11):
+            assert cache.get("token") is None
+
+    def test_not_cached_beyond_expiration(self):
+        cache = VerifiedTokenCache(ttl=60)
+        cache.set("token", "admin", int(time.time()) - 1)
+        assert cache.get("token") is None
+
+    def test_bounded(self):
+        cache = VerifiedTokenCache(max_entries=2)
+        expiration = int(time.time()) + 3600
+
+        for token in ["a", "b", "c"]:
+            cache.set(token, "admin", expiration)
+
+        assert cache.get("a") is None
+        assert cache.get("b") is not None
+        assert cache.get("c") is not None
+
+    def test_invalidate_user(self):
+        cache = VerifiedTokenCache()
+        expiration = int(time.time()) + 3600
+        cache.set("a", "admin", expiration)
+        cache.set("b", "viewer", expiration)
+        cache.invalidate("admin")
+        assert cache.get("a") is None
+        assert cache.get("b") is not None
+
+
+class TestAuth(unittest.TestCase):
+    def setUp(self):
+        migrate_db = SqliteExtDatabase(TEST_DB)
+        del logging.getLogger("peewee_migrate").handlers[:]
+        router = Router(migrate_db)
+        router.run()
+        migrate_db.close()
+        self.db = SqliteQueueDatabase(TEST_DB)
+        self.db.bind([User])
+
+        with patch.dict(os.environ, {JWT_SECRET_ENV_VAR: JWT_SECRET}):
+            self.app = create_fastapi_app(
+                FrigateConfig(
+                    **{
+                        "mqtt": {"host": "mqtt"},
+                        "auth": {"enabled": True},
+                        "cameras": {},
+                    }
+                ),
+                self.db,
+                None,
+                None,
+                None,
+                None,
+                None,
+                None,
+                None,
+            )
+
+    def tearDown(self):
+        if not self.db.is_closed():
+            self.db.close()
+
+        for file in TEST_DB_CLEANUPS:
+            try:
+                os.remove(file)
+            except OSError:
+                pass
+
+    def get_auth(self, client: TestClient, token: str) -> int:
+        client.cookies.set("frigate_token", token)
+        return client.get("/auth").status_code
+
+    def test_token_verified_once(self):
+        token = create_encoded_jwt("admin", int(time.time()) + 86400, JWT_SECRET)
+
+        with (
+            TestClient(self.app) as client,
+            patch.object(auth.jwt, "decode", wraps=auth.jwt.decode) as decode,
+        ):
+            for _ in range(3):
+                assert self.get_auth(client, token) == 202
+
+            assert decode.call_count == 1
+            assert self.get_auth(client, "invalid") == 401
+
+    def test_expired_token_rejected_from_cache(self):
+        # outside of the refresh time
+        expiration = int(time.time()) + 86400
+        token = create_encoded_jwt("admin", expiration, JWT_SECRET)
+
+        with TestClient(self.app) as client:
+            assert self.get_auth(client, token) == 202
+
+            with patch("frigate.api.auth.time.time", return_value=expiration + 1):
+                assert self.get_auth(client, token) == 401
+
+    def test_password_change_invalidates_tokens(self):
+        User.insert(
+            username="admin", password_hash="", notification_tokens=[]
+        ).execute()
+        token = create_encoded_jwt("admin", int(time.time()) + 86400, JWT_SECRET)
+
+        with TestClient(self.app) as client:
+            assert self.get_auth(client, token) == 202
+            assert self.app.jwt_token_cache.get(token) is not None
+
+            response = client.put(
+                "/users/admin/password",
+                json={"password": "new"},
+                headers={"x-server-port": "5000"},
+            )
+            assert response.status_code == 200
+            assert self.app.jwt_token_cache.get(token) is None
+
+            client.delete("/users/admin", headers={"x-server-port": "5000"})
+            assert User.select().count() == 0
+
+    def test_auth_answers_while_read_pool_is_busy(self):
+        token = create_encoded_jwt("admin", int(time.time()) + 86400, JWT_SECRET)
+        release = threading.Event()
+        status = []
+
+        with TestClient(self.app) as client:
+            busy = [
+                self.app.read_pool.executor.submit(release.wait, 10)
+                for _ in range(MAX_READ_CONNECTIONS)
+            ]
+
+            try:
+                request = threading.Thread(
+                    target=lambda: status.append(self.get_auth(client, token))
+                )
+                request.start()
+                request.join(5)
+                assert status == [202]
+            finally:
+                release.set()
+
+            for future in busy:
+                future.result()
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
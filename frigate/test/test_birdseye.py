@@ -1,8 +1,12 @@
 """Test camera user and password cleanup."""
 
+import multiprocessing as mp
 import unittest
 
-from frigate.output.birdseye import get_canvas_shape
+import numpy as np
+
+from frigate.config import FrigateConfig
+from frigate.output.birdseye import BirdsEyeFrameManager, get_canvas_shape
 
 
 class TestBirdseye(unittest.TestCase):
@@ -45,3 +49,69 @@ class TestBirdseye(unittest.TestCase):
         canvas_width, canvas_height = get_canvas_shape(width, height)
         assert canvas_width == width  # width will be the same
         assert canvas_height != height
+
+
+class FakeFrameManager:
+    def __init__(self):
+        self.frames = {}
+        self.requested = []
+
+    def get(self, name, shape):
+        self.requested.append(name)
+        return self.frames.get(name)
+
+    def close(self, name):
+        pass
+
+
+class TestBirdseyeFrameManager(unittest.TestCase):
+    def setUp(self):
+        self.config = FrigateConfig(
+            **{
+                "mqtt": {"host": "mqtt"},
+                "birdseye": {"mode": "continuous"},
+                "cameras": {
+                    camera: {
+                        "ffmpeg": {
+                            "inputs": [
+                                {
+                                    "path": f"rtsp://10.0.0.1/{camera}",
+                                    "roles": ["detect"],
+                                }
+                            ]
+                        },
+                        "detect": {"width": 1280, "height": 720, "fps": 5},
+                    }
+                    for camera in ["front", "back"]
+                },
+            }
+        )
+        self.frame_manager = FakeFrameManager()
+        self.manager = BirdsEyeFrameManager(self.config, self.frame_manager, mp.Event())
+
+    def send(self, camera: str, frame_time: float) -> bool:
+        self.frame_manager.frames[f"{camera}{frame_time}"] = np.full(
+            (1080, 1280), 200, np.uint8
+        )
+        # skip the output fps limit
+        self.manager.last_output_time = 0.0
+        return self.manager.update(camera, 1, 1, frame_time, None)
+
+    def test_only_updated_cameras_are_copied(self):
+        """Test that only cameras with a new frame are copied to the layout."""
+        self.send("front", 1.0)
+        self.send("back", 1.0)
+        self.frame_manager.requested.clear()
+
+        assert self.send("front", 1.2)
+        assert self.frame_manager.requested == ["front1.2"]
+
+    def test_frame_bytes_are_reused(self):
+        """Test that the frame is only converted to bytes when it changed."""
+        self.send("front", 1.0)
+        self.send("back", 1.0)
+        frame_bytes = self.manager.get_frame_bytes()
+
+        assert self.manager.get_frame_bytes() is frame_bytes
+        assert self.send("back", 1.2)
+        assert self.manager.get_frame_bytes() is not frame_bytes
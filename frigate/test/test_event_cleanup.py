@@ -0,0 +1,189 @@
+import datetime
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from unittest.mock import patch
+
+from peewee_migrate import Router
+from playhouse.sqlite_ext import SqliteExtDatabase
+
+from frigate.config import FrigateConfig
+from frigate.events.cleanup import EventCleanup, EventCleanupType
+from frigate.models import Event, Timeline
+from frigate.test.const import TEST_DB, TEST_DB_CLEANUPS
+
+
+class TestEventCleanup(unittest.TestCase):
+    def setUp(self):
+        migrate_db = SqliteExtDatabase(TEST_DB)
+        del logging.getLogger("peewee_migrate").handlers[:]
+        router = Router(migrate_db)
+        router.run()
+        migrate_db.close()
+        self.db = SqliteExtDatabase(TEST_DB)
+        self.db.bind([Event, Timeline])
+        self.clips_dir = tempfile.mkdtemp()
+        self.clips_dir_patch = patch("frigate.events.cleanup.CLIPS_DIR", self.clips_dir)
+        self.clips_dir_patch.start()
+
+        camera = {
+            "ffmpeg": {
+                "inputs": [{"path": "rtsp://10.0.0.1:554/video", "roles": ["detect"]}]
+            },
+            "detect": {"height": 1080, "width": 1920, "fps": 5},
+        }
+        self.config = FrigateConfig(
+            **{
+                "mqtt": {"host": "mqtt"},
+                "record": {"alerts": {"retain": {"days": 20}}},
+                "snapshots": {"retain": {"default": 30}},
+                "cameras": {
+                    "front": {
+                        **camera,
+                        "record": {
+                            "alerts": {"retain": {"days": 5}},
+                            "detections": {"retain": {"days": 3}},
+                        },
+                        "snapshots": {"retain": {"default": 10, "objects": {"car": 2}}},
+                    },
+                    "back": camera,
+                },
+            }
+        )
+        self.cleanup = EventCleanup(self.config, threading.Event(), self.db)
+
+    def tearDown(self):
+        self.clips_dir_patch.stop()
+        shutil.rmtree(self.clips_dir)
+
+        if not self.db.is_closed():
+            self.db.close()
+
+        for file in TEST_DB_CLEANUPS:
+            try:
+                os.remove(file)
+            except OSError:
+                pass
+
+    def insert_event(
+        self, id: str, camera: str, label: str, days: float, **kwargs
+    ) -> None:
+        start_time = (
+            datetime.datetime.now() - datetime.timedelta(days=days)
+        ).timestamp()
+        Event.insert(
+            id=id,
+            label=label,
+            camera=camera,
+            start_time=start_time,
+            end_time=start_time + 20,
+            top_score=1,
+            false_positive=False,
+            zones=[],
+            thumbnail="",
+            region=[],
+            box=[],
+            area=0,
+            has_clip=True,
+            has_snapshot=True,
+            **kwargs,
+        ).execute()
+        Timeline.insert(
+            timestamp=start_time,
+            camera=camera,
+            source="tracked_object",
+            source_id=id,
+            class_type="visible",
+            data={},
+        ).execute()
+
+        for suffix in [".jpg", "-clean.png"]:
+            open(os.path.join(self.clips_dir, f"{camera}-{id}{suffix}"), "wb").close()
+
+    def snapshot_exists(self, camera: str, id: str) -> bool:
+        return os.path.exists(os.path.join(self.clips_dir, f"{camera}-{id}.jpg"))
+
+    def test_expire_snapshots_by_camera_and_label(self):
+        self.insert_event("front_car", "front", "car", 3)
+        self.insert_event("front_person", "front", "person", 3)
+        self.insert_event("front_person_old", "front", "person", 11)
+        self.insert_event("back_car", "back", "car", 11)
+        self.insert_event("back_car_old", "back", "car", 31)
+        self.insert_event("removed_car", "removed", "car", 31)
+        self.insert_event(
+            "front_car_favorite", "front", "car", 31, retain_indefinitely=True
+        )
+
+        expired = self.cleanup.expire(EventCleanupType.snapshots)
+
+        assert sorted(expired) == [
+            "back_car_old",
+            "front_car",
+            "front_person_old",
+            "removed_car",
+        ]
+        assert sorted(
+            e.id for e in Event.select().where(Event.has_snapshot == False)
+        ) == sorted(expired)
+        assert not self.snapshot_exists("front", "front_car")
+        assert not os.path.exists(
+            os.path.join(self.clips_dir, "front-front_car-clean.png")
+        )
+        assert self.snapshot_exists("front", "front_person")
+        assert self.snapshot_exists("front", "front_car_favorite")
+
+        # events are only expired once
+        assert self.cleanup.expire(EventCleanupType.snapshots) == []
+
+    def test_expire_clips(self):
+        self.insert_event("front_new", "front", "person", 4)
+        self.insert_event("front_old", "front", "person", 6)
+        self.insert_event("back_old", "back", "person", 21)
+        self.insert_event("removed_new", "removed", "person", 11)
+        self.insert_event("removed_old", "removed", "person", 21)
+
+        expired = self.cleanup.expire(EventCleanupType.clips)
+        self.cleanup.delete_timeline(expired)
+
+        assert sorted(expired) == ["back_old", "front_old", "removed_old"]
+        assert sorted(e.id for e in Event.select().where(Event.has_clip == True)) == [
+            "front_new",
+            "removed_new",
+        ]
+        assert sorted(t.source_id for t in Timeline.select(Timeline.source_id)) == [
+            "front_new",
+            "removed_new",
+        ]
+        # clips are not stored in /clips, snapshots are kept
+        assert self.snapshot_exists("front", "front_old")
+
+    def test_cleanup_deletes_expired_events(self):
+        self.insert_event("front_old", "front", "car", 6)
+        self.insert_event("front_new", "front", "car", 1)
+        self.insert_event("back_no_clip", "back", "person", 31)
+        Event.update(has_clip=False).where(Event.id == "back_no_clip").execute()
+
+        self.cleanup.cleanup()
+
+        assert [e.id for e in Event.select(Event.id)] == ["front_new"]
+        assert [t.source_id for t in Timeline.select(Timeline.source_id)] == [
+            "front_new"
+        ]
+
+    def test_expire_in_chunks(self):
+        for i in range(25):
+            self.insert_event(f"event_{i:02d}", "front", "car", 3)
+
+        with patch("frigate.events.cleanup.MAX_CHUNK_SIZE", 10):
+            expired = self.cleanup.expire(EventCleanupType.snapshots)
+
+        assert len(expired) == 25
+        assert Event.select().where(Event.has_snapshot == True).count() == 0
+        assert os.listdir(self.clips_dir) == []
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,161 @@
+import os
+import sys
+import tempfile
+import unittest
+from collections import namedtuple
+from unittest.mock import patch
+
+from frigate.config import FrigateConfig
+from frigate.record.export import (
+    EXPORT_CHUNK_SECONDS,
+    PlaybackFactorEnum,
+    PlaybackSourceEnum,
+    RecordingExporter,
+)
+
+Recording = namedtuple("Recording", ["path", "start_time", "end_time"])
+
+
+class TestRecordingExport(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.config = FrigateConfig(
+            **{
+                "mqtt": {"host": "mqtt"},
+                "cameras": {
+                    "front": {
+                        "ffmpeg": {
+                            "inputs": [
+                                {"path": "rtsp://10.0.0.1/video", "roles": ["detect"]}
+                            ]
+                        },
+                        "detect": {"width": 1280, "height": 720},
+                    }
+                },
+            }
+        )
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def get_exporter(self, start_time: float, end_time: float) -> RecordingExporter:
+        with patch("frigate.record.export.CLIPS_DIR", self.tmp_dir.name):
+            return RecordingExporter(
+                self.config,
+                "export_id",
+                "front",
+                None,
+                None,
+                start_time,
+                end_time,
+                PlaybackFactorEnum.realtime,
+                PlaybackSourceEnum.recordings,
+            )
+
+    def test_trims_first_and_last_segment(self):
+        exporter = self.get_exporter(105, 125)
+        recordings = [
+            Recording("/a.mp4", 100, 110),
+            Recording("/b.mp4", 110, 120),
+            Recording("/c.mp4", 120, 130),
+        ]
+
+        assert list(exporter.get_recording_concat_lines(recordings)) == [
+            "file '/a.mp4'",
+            "inpoint 5.000",
+            "file '/b.mp4'",
+            "file '/c.mp4'",
+            "outpoint 5.000",
+        ]
+
+    def test_segment_spanning_chunk_boundary(self):
+        start = 1000
+        end = start + 2 * EXPORT_CHUNK_SECONDS
+        boundary = start + EXPORT_CHUNK_SECONDS
+        exporter = self.get_exporter(start, end)
+        recordings = [
+            Recording("/first.mp4", start - 5, start + 5),
+            Recording("/before.mp4", boundary - 15, boundary - 5),
+            Recording("/spanning.mp4", boundary - 5, boundary + 5),
+            Recording("/after.mp4", boundary + 5, boundary + 15),
+            Recording("/last.mp4", end - 5, end + 5),
+        ]
+        exported = []
+
+        def run_export_command(ffmpeg_cmd, playlist_lines):
+            exported.append((ffmpeg_cmd[-1], list(playlist_lines)))
+            return 0, ""
+
+        with (
+            patch("frigate.record.export.EXPORT_DIR", self.tmp_dir.name),
+            patch.object(exporter, "get_export_recordings", return_value=recordings),
+            patch.object(exporter, "run_export_command", run_export_command),
+        ):
+            assert exporter.run_chunked_record_export("/export.mp4") == (0, "")
+
+        chunks = {path: lines for path, lines in exported}
+        first_chunk = os.path.join(self.tmp_dir.name, ".export_id.0.mp4")
+        second_chunk = os.path.join(self.tmp_dir.name, ".export_id.1.mp4")
+
+        # the spanning segment is exported whole with the chunk it starts in
+        assert chunks[first_chunk] == [
+            "file '/first.mp4'",
+            "inpoint 5.000",
+            "file '/before.mp4'",
+            "file '/spanning.mp4'",
+        ]
+        assert chunks[second_chunk] == [
+            "file '/after.mp4'",
+            "file '/last.mp4'",
+            "outpoint 5.000",
+        ]
+        assert chunks["/export.mp4"] == [
+            f"file '{first_chunk}'",
+            f"file '{second_chunk}'",
+        ]
+
+    def test_concat_list_written_to_stdin(self):
+        exporter = self.get_exporter(105, 115)
+        stdin_path = os.path.join(self.tmp_dir.name, "stdin.txt")
+        _, playlist_lines = exporter.get_record_export_command(
+            "/export.mp4",
+            [Recording("/a.mp4", 100, 110), Recording("/b.mp4", 110, 120)],
+        )
+        # stands in for ffmpeg reading the concat list from /dev/stdin
+        ffmpeg_cmd = [
+            sys.executable,
+            "-c",
+            f"import sys; open({stdin_path!r}, 'w').write(sys.stdin.read())",
+        ]
+
+        assert exporter.run_export_command(ffmpeg_cmd, playlist_lines)[0] == 0
+
+        with open(stdin_path) as f:
+            assert f.read() == (
+                "file '/a.mp4'\ninpoint 5.000\nfile '/b.mp4'\noutpoint 5.000\n"
+            )
+
+    def test_long_concat_list_with_verbose_stderr(self):
+        exporter = self.get_exporter(105, 115)
+        stdin_path = os.path.join(self.tmp_dir.name, "stdin.txt")
+        playlist_lines = [f"file '/recordings/{i}.mp4'" for i in range(20000)]
+        # fills the stderr pipe before reading stdin like a verbose ffmpeg,
+        # the alarm ends it if both sides block on a full pipe
+        ffmpeg_cmd = [
+            sys.executable,
+            "-c",
+            "import signal, sys; signal.alarm(20); "
+            "sys.stderr.write('x' * 1024 * 1024); sys.stderr.flush(); "
+            f"open({stdin_path!r}, 'w').write(sys.stdin.read())",
+        ]
+
+        returncode, stderr = exporter.run_export_command(ffmpeg_cmd, playlist_lines)
+
+        assert returncode == 0
+        assert len(stderr) == 1024 * 1024
+        with open(stdin_path) as f:
+            assert f.read().splitlines() == playlist_lines
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,183 @@
+import threading
+import time
+import unittest
+from typing import Optional
+
+from frigate.config import CameraConfig, FrigateConfig, GenAIConfig
+from frigate.genai import GenAIClient
+from frigate.genai.pool import (
+    GenAIRequest,
+    GenAIRequestPriority,
+    GenAIWorkerPool,
+)
+from frigate.models import Event
+
+
+class FakeProvider(GenAIClient):
+    """Local provider that answers after a delay and records the requests."""
+
+    def __init__(self, genai_config: GenAIConfig, delay: float = 0) -> None:
+        super().__init__(genai_config)
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.active = 0
+        self.max_active = 0
+        self.requests: list[tuple[str, list[bytes], float]] = []
+
+    def _send(self, prompt: str, images: list[bytes]) -> Optional[str]:
+        with self.lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+            self.requests.append((prompt, images, time.monotonic()))
+
+        time.sleep(self.delay)
+
+        with self.lock:
+            self.active -= 1
+
+        return "a person walking"
+
+
+class TestGenAIWorkerPool(unittest.TestCase):
+    def setUp(self):
+        config = FrigateConfig(
+            **{
+                "mqtt": {"host": "mqtt"},
+                "genai": {"enabled": True, "provider": "ollama"},
+                "cameras": {
+                    "front_door": {
+                        "ffmpeg": {
+                            "inputs": [
+                                {
+                                    "path": "rtsp://10.0.0.1:554/video",
+                                    "roles": ["detect"],
+                                }
+                            ]
+                        },
+                        "detect": {"height": 1080, "width": 1920, "fps": 5},
+                        "genai": {"enabled": True, "prompt": "{id}"},
+                    }
+                },
+            }
+        )
+        self.camera_config: CameraConfig = config.cameras["front_door"]
+        self.pools: list[GenAIWorkerPool] = []
+
+    def tearDown(self):
+        for pool in self.pools:
+            pool.stop()
+
+    def create_pool(
+        self, provider: FakeProvider, start: bool = True, **kwargs
+    ) -> GenAIWorkerPool:
+        def handler(request: GenAIRequest) -> None:
+            provider.generate_description(
+                self.camera_config, request.images, request.payload
+            )
+
+        pool = GenAIWorkerPool(
+            GenAIConfig(enabled=True, **kwargs), handler, is_valid=self.is_valid
+        )
+        self.pools.append(pool)
+
+        if start:
+            pool.start()
+
+        return pool
+
+    def is_valid(self, event_id: str) -> bool:
+        return event_id != "deleted"
+
+    def submit(self, pool: GenAIWorkerPool, event_id: str, *args) -> bool:
+        event = Event(id=event_id, label="person", camera="front_door")
+        return pool.submit(event_id, event, [b"jpg"], *args)
+
+    def wait_until_idle(self, pool: GenAIWorkerPool) -> None:
+        for _ in range(500):
+            if (
+                pool.metrics.queue_depth.value == 0
+                and pool.metrics.in_flight.value == 0
+            ):
+                return
+
+            time.sleep(0.01)
+
+        self.fail("pool did not finish the queued requests")
+
+    def test_workers_are_bounded(self):
+        provider = FakeProvider(GenAIConfig(), delay=0.05)
+        pool = self.create_pool(provider, workers=3)
+
+        for i in range(20):
+            assert self.submit(pool, f"event_{i}")
+
+        self.wait_until_idle(pool)
+        assert len(provider.requests) == 20
+        assert provider.max_active <= 3
+        assert pool.metrics.processed.value == 20
+
+    def test_repeated_requests_are_coalesced(self):
+        provider = FakeProvider(GenAIConfig())
+        pool = self.create_pool(provider, start=False)
+
+        self.submit(pool, "event_1")
+        pool.submit("event_1", Event(id="event_1", label="person"), [b"newer"])
+        self.submit(pool, "event_2")
+        pool.start()
+        self.wait_until_idle(pool)
+
+        assert [r[0] for r in provider.requests] == ["event_1", "event_2"]
+        assert provider.requests[0][1] == [b"newer"]
+        assert pool.metrics.coalesced.value == 1
+
+    def test_full_queue_drops_lowest_priority(self):
+        provider = FakeProvider(GenAIConfig())
+        pool = self.create_pool(provider, start=False, queue_size=2)
+
+        assert self.submit(pool, "event_1")
+        assert self.submit(pool, "event_2")
+        assert not self.submit(pool, "event_3")
+        assert self.submit(pool, "event_4", GenAIRequestPriority.regenerate)
+        assert pool.metrics.dropped.value == 2
+
+        pool.start()
+        self.wait_until_idle(pool)
+        assert [r[0] for r in provider.requests] == ["event_4", "event_1"]
+
+    def test_memory_limit_drops_requests(self):
+        provider = FakeProvider(GenAIConfig())
+        pool = self.create_pool(provider, start=False, max_queued_memory=1)
+        image = b"0" * 700 * 1024
+
+        assert pool.submit("event_1", Event(id="event_1"), [image])
+        assert not pool.submit("event_2", Event(id="event_2"), [image])
+        assert pool.metrics.queue_depth.value == 1
+
+    def test_deleted_events_are_dropped(self):
+        provider = FakeProvider(GenAIConfig())
+        pool = self.create_pool(provider, start=False)
+
+        self.submit(pool, "deleted")
+        self.submit(pool, "event_1")
+        pool.start()
+        self.wait_until_idle(pool)
+
+        assert [r[0] for r in provider.requests] == ["event_1"]
+        assert pool.metrics.dropped.value == 1
+
+    def test_requests_are_rate_limited(self):
+        provider = FakeProvider(GenAIConfig())
+        pool = self.create_pool(provider, workers=4, requests_per_minute=600)
+
+        for i in range(4):
+            self.submit(pool, f"event_{i}")
+
+        self.wait_until_idle(pool)
+        start_times = sorted(r[2] for r in provider.requests)
+        assert len(start_times) == 4
+        # 600 requests per minute allows one request every 100ms
+        assert start_times[-1] - start_times[0] >= 0.29
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
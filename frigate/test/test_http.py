@@ -1,8 +1,9 @@
 import datetime
 import logging
 import os
+import tempfile
 import unittest
-from unittest.mock import Mock
+from unittest.mock import MagicMock, Mock, mock_open, patch
 
 from fastapi.testclient import TestClient
 from peewee_migrate import Router
@@ -11,8 +12,10 @@ from playhouse.sqlite_ext import SqliteExtDatabase
 from playhouse.sqliteq import SqliteQueueDatabase
 
 from frigate.api.fastapi_app import create_fastapi_app
+from frigate.api.pagination import NEXT_CURSOR_HEADER
 from frigate.config import FrigateConfig
 from frigate.models import Event, Recordings, Timeline
+from frigate.record.vod import vod_playlist_cache
 from frigate.stats.emitter import StatsEmitter
 from frigate.test.const import TEST_DB, TEST_DB_CLEANUPS
 
@@ -28,6 +31,7 @@ class TestHttp(unittest.TestCase):
         self.db = SqliteQueueDatabase(TEST_DB)
         models = [Event, Recordings, Timeline]
         self.db.bind(models)
+        vod_playlist_cache.clear()
 
         self.minimal_config = {
             "mqtt": {"host": "mqtt"},
@@ -381,6 +385,307 @@ class TestHttp(unittest.TestCase):
             assert recording
             assert recording[0]["id"] == id
 
+    def test_event_list_cursor(self):
+        app = create_fastapi_app(
+            FrigateConfig(**self.minimal_config),
+            self.db,
+            None,
+            None,
+            None,
+            None,
+            None,
+            None,
+            None,
+        )
+        # events that start at the same time are ordered by their id
+        start_times = [100, 200, 200, 200, 300, 400]
+        ids = [f"{start_time}.{i}" for i, start_time in enumerate(start_times)]
+        ascending = ["100.0", "200.1", "200.2", "200.3", "300.4", "400.5"]
+
+        with TestClient(app) as client:
+            for id, start_time in zip(ids, start_times):
+                _insert_mock_event(id, start_time)
+
+            for params, expected in [
+                ({}, ascending[::-1]),
+                ({"sort": "date_asc"}, ascending),
+            ]:
+                seen = []
+                cursor = None
+
+                while True:
+                    response = client.get(
+                        "/events",
+                        params={**params, "limit": 2}
+                        | ({"cursor": cursor} if cursor else {}),
+                    )
+                    assert response.status_code == 200
+                    seen.extend(e["id"] for e in response.json())
+                    cursor = response.headers.get(NEXT_CURSOR_HEADER)
+
+                    if cursor is None:
+                        break
+
+                assert seen == expected
+
+            # the last page is full, so it has a cursor to an empty page
+            response = client.get("/events", params={"limit": 3})
+            cursor = response.headers[NEXT_CURSOR_HEADER]
+            response = client.get("/events", params={"limit": 3, "cursor": cursor})
+            assert len(response.json()) == 3
+            cursor = response.headers[NEXT_CURSOR_HEADER]
+            response = client.get("/events", params={"limit": 3, "cursor": cursor})
+            assert response.json() == []
+            assert NEXT_CURSOR_HEADER not in response.headers
+
+    def test_event_list_invalid_cursor(self):
+        app = create_fastapi_app(
+            FrigateConfig(**self.minimal_config),
+            self.db,
+            None,
+            None,
+            None,
+            None,
+            None,
+            None,
+            None,
+        )
+
+        with TestClient(app) as client:
+            _insert_mock_event("123456.random")
+            response = client.get("/events", params={"cursor": "not a cursor"})
+            assert response.status_code == 400
+            response = client.get("/events", params={"limit": 1})
+            cursor = response.headers[NEXT_CURSOR_HEADER]
+            response = client.get(
+                "/events", params={"cursor": cursor, "sort": "score_desc"}
+            )
+            assert response.status_code == 400
+
+    def test_recordings_cursor(self):
+        app = create_fastapi_app(
+            FrigateConfig(**self.minimal_config),
+            self.db,
+            None,
+            None,
+            None,
+            None,
+            None,
+            None,
+            None,
+        )
+        now = datetime.datetime.now().timestamp()
+        ids = [f"recording.{i}" for i in range(5)]
+
+        with TestClient(app) as client:
+            for i, id in enumerate(ids):
+                _insert_mock_recording(id, now - 300 + i * 10)
+
+            response = client.get("/front_door/recordings")
+            assert [r["id"] for r in response.json()] == ids
+            assert NEXT_CURSOR_HEADER not in response.headers
+
+            response = client.get("/front_door/recordings", params={"limit": 3})
+            assert [r["id"] for r in response.json()] == ids[:3]
+            cursor = response.headers[NEXT_CURSOR_HEADER]
+            response = client.get(
+                "/front_door/recordings", params={"limit": 3, "cursor": cursor}
+            )
+            assert [r["id"] for r in response.json()] == ids[3:]
+            assert NEXT_CURSOR_HEADER not in response.headers
+
+    def test_vod_playlist_cache(self):
+        app = create_fastapi_app(
+            FrigateConfig(**self.minimal_config),
+            self.db,
+            None,
+            None,
+            None,
+            None,
+            None,
+            None,
+            None,
+        )
+        id = "123456.random"
+        start_time = datetime.datetime.now().timestamp() - 7200
+        end_time = start_time + 60
+
+        with TestClient(app) as client:
+            _insert_mock_recording(id, start_time, end_time)
+            playlist = client.get(
+                f"/vod/front_door/start/{start_time - 10}/end/{end_time + 10}"
+            ).json()
+            assert playlist["durations"] == [60000]
+            assert playlist["sequences"][0]["clips"][0]["path"] == f"/recordings/{id}"
+
+            # the hour is immutable so the playlist is served from the cache
+            Recordings.delete().where(Recordings.id == id).execute()
+            response = client.get(
+                f"/vod/front_door/start/{start_time - 10}/end/{end_time + 10}"
+            )
+            assert response.status_code == 200
+            assert response.json() == playlist
+
+            vod_playlist_cache.invalidate("front_door", end_time=end_time)
+            response = client.get(
+                f"/vod/front_door/start/{start_time - 10}/end/{end_time + 10}"
+            )
+            assert response.status_code == 404
+
+    def test_vod_playlist_excludes_adjacent_segments(self):
+        app = create_fastapi_app(
+            FrigateConfig(**self.minimal_config),
+            self.db,
+            None,
+            None,
+            None,
+            None,
+            None,
+            None,
+            None,
+        )
+        start_time = datetime.datetime.now().timestamp() - 7200
+
+        with TestClient(app) as client:
+            _insert_mock_recording("before", start_time - 10, start_time)
+            _insert_mock_recording("during", start_time, start_time + 10)
+            _insert_mock_recording("after", start_time + 10, start_time + 20)
+            playlist = client.get(
+                f"/vod/front_door/start/{start_time}/end/{start_time + 10}"
+            ).json()
+            clips = playlist["sequences"][0]["clips"]
+            assert [c["path"] for c in clips] == ["/recordings/during"]
+
+    def test_recording_clip_is_revalidated(self):
+        app = create_fastapi_app(
+            FrigateConfig(**self.minimal_config),
+            self.db,
+            None,
+            None,
+            None,
+            None,
+            None,
+            None,
+            None,
+        )
+        id = "123456.random"
+        start_time = datetime.datetime.now().timestamp() - 7200
+        end_time = start_time + 60
+        ffmpeg = MagicMock(returncode=0)
+        ffmpeg.__enter__.return_value.stdout.read.side_effect = [b"clip", b""]
+
+        with (
+            TestClient(app) as client,
+            patch("frigate.api.media.open", mock_open(), create=True),
+            patch("frigate.api.media.sp.Popen", return_value=ffmpeg),
+        ):
+            response = client.get(
+                f"/front_door/start/{start_time}/end/{end_time}/clip.mp4"
+            )
+            assert response.status_code == 404
+
+            _insert_mock_recording(id, start_time, end_time)
+            response = client.get(
+                f"/front_door/start/{start_time}/end/{end_time}/clip.mp4"
+            )
+            assert response.status_code == 200
+            assert response.content == b"clip"
+            # ffmpeg may still fail after the headers are sent
+            assert response.headers["Cache-Control"] == "private, no-cache"
+            etag = response.headers["ETag"]
+
+            response = client.get(
+                f"/front_door/start/{start_time}/end/{end_time}/clip.mp4",
+                headers={"If-None-Match": etag},
+            )
+            assert response.status_code == 304
+
+    def test_event_thumbnail_conditional_get(self):
+        app = create_fastapi_app(
+            FrigateConfig(**self.minimal_config),
+            self.db,
+            None,
+            None,
+            None,
+            None,
+            None,
+            None,
+            None,
+        )
+        id = "123456.random"
+
+        with TestClient(app) as client:
+            _insert_mock_event(id)
+            response = client.get(f"/events/{id}/thumbnail.jpg")
+            assert response.status_code == 200
+            assert "immutable" in response.headers["Cache-Control"]
+            etag = response.headers["ETag"]
+
+            response = client.get(
+                f"/events/{id}/thumbnail.jpg", headers={"If-None-Match": etag}
+            )
+            assert response.status_code == 304
+            assert response.headers["ETag"] == etag
+            assert response.content == b""
+
+            response = client.get(
+                f"/events/{id}/thumbnail.jpg",
+                headers={"If-Modified-Since": response.headers["Last-Modified"]},
+            )
+            assert response.status_code == 304
+
+            # the etag changes with the end of the event
+            Event.update(end_time=Event.end_time + 10).where(Event.id == id).execute()
+            response = client.get(
+                f"/events/{id}/thumbnail.jpg", headers={"If-None-Match": etag}
+            )
+            assert response.status_code == 200
+            assert response.headers["ETag"] != etag
+
+    def test_event_snapshot_conditional_get(self):
+        app = create_fastapi_app(
+            FrigateConfig(**self.minimal_config),
+            self.db,
+            None,
+            None,
+            None,
+            None,
+            None,
+            None,
+            None,
+        )
+        id = "123456.random"
+
+        with (
+            tempfile.TemporaryDirectory() as clips_dir,
+            patch("frigate.api.media.CLIPS_DIR", clips_dir),
+            TestClient(app) as client,
+        ):
+            _insert_mock_event(id)
+            snapshot_path = os.path.join(clips_dir, f"front_door-{id}.jpg")
+
+            with open(snapshot_path, "wb") as f:
+                f.write(b"snapshot")
+
+            response = client.get(f"/events/{id}/snapshot.jpg")
+            assert response.content == b"snapshot"
+            etag = response.headers["ETag"]
+
+            response = client.get(
+                f"/events/{id}/snapshot.jpg",
+                headers={"If-None-Match": f'"other", W/{etag}'},
+            )
+            assert response.status_code == 304
+
+            with open(snapshot_path, "wb") as f:
+                f.write(b"new snapshot")
+
+            response = client.get(
+                f"/events/{id}/snapshot.jpg", headers={"If-None-Match": etag}
+            )
+            assert response.status_code == 200
+            assert response.content == b"new snapshot"
+
     def test_stats(self):
         stats = Mock(spec=StatsEmitter)
         stats.get_latest_stats.return_value = self.test_stats
@@ -424,15 +729,19 @@ def _insert_mock_event(
     ).execute()
 
 
-def _insert_mock_recording(id: str) -> Event:
+def _insert_mock_recording(
+    id: str, start_time: float = None, end_time: float = None
+) -> Event:
     """Inserts a basic recording model with a given id."""
+    start_time = start_time or datetime.datetime.now().timestamp() - 60
+    end_time = end_time or start_time + 10
     return Recordings.insert(
         id=id,
         camera="front_door",
         path=f"/recordings/{id}",
-        start_time=datetime.datetime.now().timestamp() - 60,
-        end_time=datetime.datetime.now().timestamp() - 50,
-        duration=10,
+        start_time=start_time,
+        end_time=end_time,
+        duration=end_time - start_time,
         motion=True,
         objects=True,
     ).execute()
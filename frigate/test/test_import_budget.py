@@ -0,0 +1,95 @@
+import json
+import subprocess
+import sys
+import unittest
+
+# modules that only the processes and configs using them should import
+HEAVY_MODULES = [
+    "google.generativeai",
+    "hailo_platform",
+    "ollama",
+    "onnxruntime",
+    "onvif",
+    "openai",
+    "openvino",
+    "pandas",
+    "pycuda",
+    "pywebpush",
+    "tensorflow",
+    "tensorrt",
+    "tflite_runtime",
+    "transformers",
+    "zeep",
+]
+
+# the module each process type runs from, the main process imports all of them
+PROCESS_MODULES = {
+    "main": "frigate.app",
+    "recording_manager": "frigate.record.record",
+    "review_segment_manager": "frigate.review.review",
+    "output": "frigate.output.output",
+    "camera": "frigate.video",
+    "detector": "frigate.object_detection",
+    "audio": "frigate.events.audio",
+    "embeddings_manager": "frigate.embeddings",
+}
+
+# generous limits that catch a heavy runtime being imported again
+IMPORT_TIME_BUDGET = 15
+RSS_BUDGET_MB = 400
+
+MEASURE = """
+import json, resource, sys, time
+
+started = time.perf_counter()
+import {module}
+duration = time.perf_counter() - started
+
+from frigate.config import FrigateConfig
+
+FrigateConfig(
+    mqtt={{"host": "mqtt"}},
+    detectors={{"cpu": {{"type": "cpu"}}}},
+    cameras={{
+        "front": {{
+            "ffmpeg": {{
+                "inputs": [{{"path": "rtsp://10.0.0.1/video", "roles": ["detect"]}}]
+            }},
+            "detect": {{"width": 1280, "height": 720}},
+        }}
+    }},
+)
+print(json.dumps({{
+    "duration": duration,
+    "rss": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    "heavy": [m for m in {heavy!r} if m in sys.modules],
+}}))
+"""
+
+
+class TestImportBudget(unittest.TestCase):
+    def measure(self, module: str) -> dict:
+        result = subprocess.run(
+            [
+                sys.executable,
+                "-c",
+                MEASURE.format(module=module, heavy=HEAVY_MODULES),
+            ],
+            capture_output=True,
+            text=True,
+            timeout=120,
+        )
+        self.assertEqual(result.returncode, 0, result.stderr)
+        return json.loads(result.stdout.splitlines()[-1])
+
+    def test_process_imports(self):
+        for process, module in PROCESS_MODULES.items():
+            with self.subTest(process=process):
+                measured = self.measure(module)
+                self.assertEqual(measured["heavy"], [])
+                self.assertLess(measured["duration"], IMPORT_TIME_BUDGET)
+                self.assertLess(measured["rss"], RSS_BUDGET_MB)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,141 @@
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+
+import cv2
+import numpy as np
+
+from frigate.record.keyframes import RecordingFrameService, get_keyframe_times
+
+
+class TestRecordingKeyframes(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp_dir, "00.00.mp4")
+        self.frames = []
+        writer = cv2.VideoWriter(
+            self.path, cv2.VideoWriter_fourcc(*"mp4v"), 10, (320, 180)
+        )
+
+        for i in range(50):
+            frame = np.full((180, 320, 3), i * 5, np.uint8)
+            cv2.putText(frame, str(i), (20, 150), 0, 4, (255, 255, 255), 5)
+            writer.write(frame)
+
+        writer.release()
+
+        # the frames as the segment decodes them
+        capture = cv2.VideoCapture(self.path)
+
+        while True:
+            ret, frame = capture.read()
+
+            if not ret:
+                break
+
+            self.frames.append(frame)
+
+        capture.release()
+        self.service = RecordingFrameService()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_keyframe_times(self):
+        keyframes = get_keyframe_times(self.path)
+
+        assert keyframes[0] == 0.0
+        assert keyframes == sorted(keyframes)
+        assert 1 < len(keyframes) < 50
+        assert all(round(k * 10, 3).is_integer() and k < 5 for k in keyframes)
+
+    def test_keyframe_times_of_invalid_file(self):
+        path = os.path.join(self.tmp_dir, "invalid.mp4")
+
+        with open(path, "wb") as f:
+            f.write(b"\x00\x00\x00\x08free" + os.urandom(100))
+
+        assert get_keyframe_times(path) is None
+        assert get_keyframe_times(os.path.join(self.tmp_dir, "missing.mp4")) is None
+
+    def test_frames_match_sequential_decoding(self):
+        keyframes = get_keyframe_times(self.path)
+
+        # scrub forwards, backwards and across keyframes
+        for time in [0, 0.25, 0.3, 1.2, 4.9, 0.05, 3.33, 3.4, 2.0, 0.0]:
+            frame = self.service.get_frame(self.path, time, keyframes)
+            index = int(np.ceil(round(time * 10, 3)))
+            assert np.array_equal(frame, self.frames[index]), time
+
+    def test_encoded_frames_are_cached(self):
+        jpg = self.service.get_encoded_frame(self.path, 2.0, None, "jpg", 90)
+        frame = cv2.imdecode(np.frombuffer(jpg, np.uint8), cv2.IMREAD_COLOR)
+
+        assert frame.shape == (90, 160, 3)
+        assert self.service.get_encoded_frame(self.path, 2.0, None, "jpg", 90) is jpg
+
+    def test_frame_at_end_of_segment(self):
+        frame = self.service.get_frame(self.path, 4.95)
+        assert np.array_equal(frame, self.frames[-1])
+        assert np.array_equal(self.service.get_frame(self.path, 1.0), self.frames[10])
+
+    def test_unsupported_segment(self):
+        path = os.path.join(self.tmp_dir, "invalid.mp4")
+
+        with open(path, "wb") as f:
+            f.write(os.urandom(1000))
+
+        assert self.service.get_frame(path, 1.0) is None
+        assert self.service.get_encoded_frame(path, 1.0, None, "png") is None
+
+    def test_unsupported_segments_are_bounded(self):
+        service = RecordingFrameService(max_entries=2)
+
+        for i in range(4):
+            path = os.path.join(self.tmp_dir, f"invalid{i}.mp4")
+
+            with open(path, "wb") as f:
+                f.write(os.urandom(1000))
+
+            assert service.get_frame(path, 1.0) is None
+
+        assert list(service.unsupported) == [
+            os.path.join(self.tmp_dir, "invalid2.mp4"),
+            os.path.join(self.tmp_dir, "invalid3.mp4"),
+        ]
+
+    def test_eviction_waits_outside_of_service_lock(self):
+        service = RecordingFrameService(max_decoders=1)
+        other = os.path.join(self.tmp_dir, "01.00.mp4")
+        shutil.copy(self.path, other)
+        assert service.get_frame(self.path, 1.0) is not None
+        decoder = service.decoders[self.path]
+        frames = []
+
+        with decoder.lock:
+            # evicts the decoder while it is still decoding
+            thread = threading.Thread(
+                target=lambda: frames.append(service.get_frame(other, 1.0))
+            )
+            thread.start()
+
+            while other not in service.decoders:
+                thread.join(0.01)
+
+            # the service is not blocked by the eviction
+            assert service.lock.acquire(timeout=1)
+            service.lock.release()
+            assert thread.is_alive()
+
+        thread.join()
+        assert np.array_equal(frames[0], self.frames[10])
+        assert not decoder.is_opened()
+
+        # a closed decoder is opened again
+        assert np.array_equal(service.get_frame(self.path, 2.0), self.frames[20])
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,76 @@
+import threading
+import time
+import unittest
+
+import cv2
+import numpy as np
+
+from frigate.camera.latest_frame import LatestFrameService
+
+
+class FakeFramesProcessor:
+    def __init__(self) -> None:
+        self.frame_time = 1.0
+        self.render_count = 0
+
+    def get_current_frame_time(self, camera):
+        return self.frame_time
+
+    def get_current_frame(self, camera, draw_options={}):
+        self.render_count += 1
+        # simulate the cost of converting and drawing
+        time.sleep(0.05)
+        return np.zeros((720, 1280, 3), np.uint8)
+
+
+class TestLatestFrameService(unittest.TestCase):
+    def setUp(self):
+        self.processor = FakeFramesProcessor()
+        self.service = LatestFrameService(self.processor)
+        self.params = [int(cv2.IMWRITE_JPEG_QUALITY), 70]
+
+    def test_encoded_frame_is_resized(self):
+        jpg = self.service.get_encoded_frame("front", {}, 360, "jpg", self.params)
+        frame = cv2.imdecode(np.frombuffer(jpg, np.uint8), cv2.IMREAD_COLOR)
+        assert frame.shape == (360, 640, 3)
+
+    def test_concurrent_requests_share_one_render(self):
+        results = []
+
+        def request():
+            results.append(
+                self.service.get_encoded_frame("front", {}, 360, "jpg", self.params)
+            )
+
+        threads = [threading.Thread(target=request) for _ in range(10)]
+
+        for thread in threads:
+            thread.start()
+
+        for thread in threads:
+            thread.join()
+
+        assert self.processor.render_count == 1
+        assert len(results) == 10
+        assert all(r == results[0] for r in results)
+
+    def test_new_frame_is_rendered_again(self):
+        self.service.get_encoded_frame("front", {}, 360, "jpg", self.params)
+        self.service.get_encoded_frame("front", {}, 180, "jpg", self.params)
+        assert self.processor.render_count == 1
+
+        self.processor.frame_time = 2.0
+        self.service.get_encoded_frame("front", {}, 360, "jpg", self.params)
+        assert self.processor.render_count == 2
+
+        # results for the old frame are dropped
+        assert all(key[1] == 2.0 for key in self.service.results.keys())
+
+    def test_draw_options_are_rendered_separately(self):
+        self.service.get_frame("front", {"bounding_boxes": 1})
+        self.service.get_frame("front", {"bounding_boxes": None})
+        assert self.processor.render_count == 2
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
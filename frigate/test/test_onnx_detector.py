@@ -0,0 +1,178 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+import onnx
+from onnx import TensorProto, helper, numpy_helper
+from pydantic import TypeAdapter
+
+from frigate.detectors import DetectorConfig
+from frigate.detectors.plugins.onnx import ONNXDetector
+
+INPUT_SHAPE = (1, 32, 32, 3)
+
+
+def create_model(path: str, predictions: np.ndarray, dynamic: bool) -> None:
+    """Create a yolonas shaped model that moves the boxes by the mean of the input.
+
+    With a dynamic output the number of rows depends on the input, so the
+    shape is not known before the model runs.
+    """
+    nodes = [
+        helper.make_node("Cast", ["input"], ["input_float"], to=TensorProto.FLOAT),
+        helper.make_node("ReduceMean", ["input_float"], ["mean"], keepdims=0),
+        helper.make_node("Mul", ["mean", "box_columns"], ["shift"]),
+        helper.make_node("Add", ["predictions", "shift"], ["moved"]),
+    ]
+
+    if dynamic:
+        nodes += [
+            helper.make_node(
+                "ReduceMax", ["input"], ["max"], keepdims=1, axes=[1, 2, 3]
+            ),
+            helper.make_node("Cast", ["max"], ["max_int"], to=TensorProto.INT64),
+            helper.make_node("Reshape", ["max_int", "one_dim"], ["max_rows"]),
+            helper.make_node("Add", ["max_rows", "all_rows"], ["end"]),
+            helper.make_node("Slice", ["moved", "start", "end", "start"], ["output"]),
+        ]
+    else:
+        nodes.append(helper.make_node("Identity", ["moved"], ["output"]))
+
+    graph = helper.make_graph(
+        nodes,
+        "yolonas",
+        [helper.make_tensor_value_info("input", TensorProto.UINT8, INPUT_SHAPE)],
+        [
+            helper.make_tensor_value_info(
+                "output",
+                TensorProto.FLOAT,
+                ["detections" if dynamic else len(predictions), 7],
+            )
+        ],
+        [
+            numpy_helper.from_array(predictions, "predictions"),
+            numpy_helper.from_array(
+                np.array([0, 1, 1, 1, 1, 0, 0], np.float32), "box_columns"
+            ),
+            numpy_helper.from_array(np.array([0], np.int64), "start"),
+            numpy_helper.from_array(np.array([1], np.int64), "one_dim"),
+            numpy_helper.from_array(np.array([len(predictions)], np.int64), "all_rows"),
+        ],
+    )
+    onnx.save(
+        helper.make_model(
+            graph, ir_version=8, opset_imports=[helper.make_opsetid("", 13)]
+        ),
+        path,
+    )
+
+
+def process_yolonas_loop(predictions: np.ndarray, w: int, h: int) -> np.ndarray:
+    """The per prediction loop the detector used before it was vectorized."""
+    detections = np.zeros((20, 6), np.float32)
+
+    for i, prediction in enumerate(predictions):
+        if i == 20:
+            break
+        (_, x_min, y_min, x_max, y_max, confidence, class_id) = prediction
+        if class_id < 0:
+            break
+        detections[i] = [
+            class_id,
+            confidence,
+            y_min / h,
+            x_min / w,
+            y_max / h,
+            x_max / w,
+        ]
+    return detections
+
+
+def create_predictions(rows: int, empty_from: int = None) -> np.ndarray:
+    rng = np.random.default_rng(rows)
+    predictions = np.zeros((rows, 7), np.float32)
+    predictions[:, 1:5] = rng.uniform(0, 32, (rows, 4))
+    predictions[:, 5] = rng.uniform(0, 1, rows)
+    predictions[:, 6] = rng.integers(0, 80, rows)
+
+    if empty_from is not None:
+        predictions[empty_from:, 6] = -1
+
+    return predictions
+
+
+class TestONNXDetector(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def create_detector(
+        self, predictions: np.ndarray, dynamic: bool = False
+    ) -> ONNXDetector:
+        path = os.path.join(self.tmp_dir.name, "yolonas.onnx")
+        create_model(path, predictions, dynamic)
+        return ONNXDetector(
+            TypeAdapter(DetectorConfig).validate_python(
+                {
+                    "type": "onnx",
+                    "device": "CPU",
+                    "model": {
+                        "path": path,
+                        "width": INPUT_SHAPE[2],
+                        "height": INPUT_SHAPE[1],
+                        "model_type": "yolonas",
+                        "input_tensor": "nhwc",
+                    },
+                }
+            )
+        )
+
+    def test_process_yolonas_matches_loop(self):
+        detector = self.create_detector(create_predictions(20))
+        cases = {
+            "fewer than 20": create_predictions(5),
+            "more than 20": create_predictions(30),
+            "empty after 8": create_predictions(30, empty_from=8),
+            "empty after 20": create_predictions(30, empty_from=25),
+            "all empty": create_predictions(10, empty_from=0),
+            "none": create_predictions(0),
+        }
+
+        for name, predictions in cases.items():
+            with self.subTest(case=name):
+                np.testing.assert_array_equal(
+                    detector.process_yolonas(predictions),
+                    process_yolonas_loop(predictions, detector.w, detector.h),
+                )
+
+    def test_detect_raw_reuses_output_buffer(self):
+        predictions = create_predictions(30, empty_from=12)
+
+        for dynamic in [False, True]:
+            with self.subTest(dynamic=dynamic):
+                detector = self.create_detector(predictions, dynamic)
+                first = np.full(INPUT_SHAPE, 2, np.uint8)
+                second = np.full(INPUT_SHAPE, 6, np.uint8)
+
+                results = [
+                    detector.detect_raw(tensor_input).copy()
+                    for tensor_input in [first, second, first]
+                ]
+
+                for tensor_input, result in zip([first, second], results):
+                    expected = predictions.copy()
+                    expected[:, 1:5] += tensor_input.mean()
+                    np.testing.assert_allclose(
+                        result,
+                        process_yolonas_loop(expected, detector.w, detector.h),
+                        rtol=1e-6,
+                    )
+
+                np.testing.assert_array_equal(results[0], results[2])
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
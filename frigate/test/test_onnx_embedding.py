@@ -0,0 +1,94 @@
+import unittest
+
+import numpy as np
+from tokenizers import Tokenizer, models, pre_tokenizers
+from transformers import PreTrainedTokenizerFast
+
+from frigate.embeddings.functions.onnx import GenericONNXEmbedding, ModelTypeEnum
+
+WORDS = ["a", "person", "walks", "to", "the", "front", "door", "with", "dog"]
+
+
+class FakeRunner:
+    """Pools the token ids, attending to padding when there is no mask."""
+
+    def __init__(self, input_names: list[str]):
+        self.input_names = input_names
+        self.batch_sizes = []
+
+    def get_input_names(self) -> list[str]:
+        return self.input_names
+
+    def run(self, input: dict[str, np.ndarray]) -> list[np.ndarray]:
+        ids = input["input_ids"].astype(np.float32)
+        mask = input.get("attention_mask", np.ones_like(ids)).astype(np.float32)
+        self.batch_sizes.append(len(ids))
+        # positions are weighted so the order of the tokens matters
+        weighted = ids * np.arange(1, ids.shape[1] + 1) * mask
+        return [
+            np.stack([weighted.sum(axis=1) / mask.sum(axis=1), mask.sum(axis=1)], 1)
+        ]
+
+
+class TestGenericONNXEmbedding(unittest.TestCase):
+    def setUp(self):
+        vocab = {"[PAD]": 0, "[UNK]": 1}
+        vocab.update({word: i + 2 for i, word in enumerate(WORDS)})
+        tokenizer = Tokenizer(models.WordLevel(vocab, unk_token="[UNK]"))
+        tokenizer.pre_tokenizer = pre_tokenizers.Whitespace()
+        self.tokenizer = PreTrainedTokenizerFast(
+            tokenizer_object=tokenizer,
+            pad_token="[PAD]",
+            unk_token="[UNK]",
+            model_max_length=6,
+        )
+        self.texts = [
+            "a person walks to the door",
+            "a dog",
+            "the person with a dog walks to the front door",
+            "a person",
+            "front door",
+            "a dog walks",
+            "the dog",
+        ]
+
+    def get_embedding(self, input_names: list[str]) -> GenericONNXEmbedding:
+        embedding = GenericONNXEmbedding.__new__(GenericONNXEmbedding)
+        embedding.model_name = "test"
+        embedding.model_type = ModelTypeEnum.text
+        embedding.tokenizer = self.tokenizer
+        embedding.feature_extractor = None
+        embedding.runner = FakeRunner(input_names)
+        return embedding
+
+    def assert_matches_single_items(self, embedding: GenericONNXEmbedding):
+        expected = [embedding([text])[0] for text in self.texts]
+        embedding.runner.batch_sizes = []
+        batched = embedding(self.texts)
+
+        assert len(batched) == len(self.texts)
+        for result, single in zip(batched, expected):
+            np.testing.assert_allclose(result, single)
+
+        return embedding.runner.batch_sizes
+
+    def test_batch_with_attention_mask(self):
+        embedding = self.get_embedding(["input_ids", "attention_mask"])
+        batch_sizes = self.assert_matches_single_items(embedding)
+        # the text over the limit of the model runs on its own
+        assert batch_sizes == [6, 1]
+
+    def test_batch_without_attention_mask_by_token_length(self):
+        embedding = self.get_embedding(["input_ids"])
+        batch_sizes = self.assert_matches_single_items(embedding)
+        # 6 tokens, 2 tokens and 3 tokens, then the text over the limit
+        assert batch_sizes == [1, 4, 1, 1]
+
+    def test_long_text_is_not_truncated(self):
+        embedding = self.get_embedding(["input_ids", "attention_mask"])
+        results = embedding(self.texts)
+        assert results[2][1] == 10
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,146 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock
+
+import numpy as np
+import openvino as ov
+import openvino.runtime.opset13 as ops
+from pydantic import TypeAdapter
+
+from frigate.detectors import DetectorConfig
+from frigate.object_detection import AsyncDetectionRunner, LocalObjectDetector
+from frigate.util.image import DictFrameManager
+
+INPUT_SHAPE = (1, 32, 32, 3)
+
+
+def create_model(path: str) -> None:
+    """Create an ssd shaped model that outputs the mean of the input."""
+    input = ops.parameter(list(INPUT_SHAPE), np.uint8, name="input")
+    mean = ops.reduce_mean(ops.convert(input, np.float32), np.array([1, 2, 3]))
+    output = ops.broadcast(
+        ops.reshape(mean, np.array([1, 1, 1, 1]), False), np.array([1, 1, 20, 7])
+    )
+    ov.save_model(ov.Model([output], [input], "mean"), path)
+
+
+class SlowFirstDetector:
+    """Completes the first detection after the second one."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.completed: list[float] = []
+        self.threads: list[threading.Thread] = []
+
+    def detect_raw_async(self, tensor_input, callback) -> None:
+        value = float(tensor_input.mean())
+        delay = 0.2 if self.calls == 0 else 0.0
+        self.calls += 1
+
+        def complete():
+            time.sleep(delay)
+            self.completed.append(value)
+            callback(np.full((20, 6), value, np.float32))
+
+        thread = threading.Thread(target=complete)
+        thread.start()
+        self.threads.append(thread)
+
+    def wait_async(self) -> None:
+        for thread in self.threads:
+            thread.join()
+
+
+class TestAsyncDetection(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.model_path = os.path.join(self.tmp_dir.name, "mean.xml")
+        create_model(self.model_path)
+        self.frame_manager = DictFrameManager()
+        self.cameras = ["front", "back", "side", "garage"]
+        self.outputs = {
+            camera: {"np": np.zeros((20, 6), np.float32)} for camera in self.cameras
+        }
+        self.out_events = {camera: threading.Event() for camera in self.cameras}
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def create_detector(self, mode: str) -> LocalObjectDetector:
+        detector_config = TypeAdapter(DetectorConfig).validate_python(
+            {
+                "type": "openvino",
+                "device": "CPU",
+                "mode": mode,
+                "model": {"path": self.model_path, "width": 32, "height": 32},
+            }
+        )
+        return LocalObjectDetector(detector_config=detector_config)
+
+    def create_runner(self, object_detector) -> AsyncDetectionRunner:
+        return AsyncDetectionRunner(
+            object_detector,
+            self.frame_manager,
+            INPUT_SHAPE,
+            self.outputs,
+            self.out_events,
+            MagicMock(value=0.01),
+            MagicMock(value=0.0),
+        )
+
+    def put_frame(self, camera: str, value: int) -> None:
+        mem = self.frame_manager.create(camera, int(np.prod(INPUT_SHAPE)))
+        mem[:] = bytes([value]) * len(mem)
+
+    def test_throughput_mode_matches_latency_mode(self):
+        latency = self.create_detector("latency")
+        throughput = self.create_detector("throughput")
+        assert not latency.supports_async
+        assert throughput.supports_async
+
+        tensor_input = np.full(INPUT_SHAPE, 9, np.uint8)
+        results = []
+        throughput.detect_raw_async(tensor_input, results.append)
+        throughput.wait_async()
+
+        np.testing.assert_array_equal(latency.detect_raw(tensor_input), results[0])
+        np.testing.assert_array_equal(throughput.detect_raw(tensor_input), results[0])
+        assert results[0][0][0] == 9
+
+    def test_results_are_mapped_to_their_camera(self):
+        runner = self.create_runner(self.create_detector("throughput"))
+
+        for i, camera in enumerate(self.cameras):
+            self.put_frame(camera, i + 1)
+            runner.submit(camera)
+
+        runner.stop()
+
+        for i, camera in enumerate(self.cameras):
+            assert self.out_events[camera].is_set()
+            assert self.outputs[camera]["np"][0][0] == i + 1
+
+        assert runner.in_flight == {}
+        assert runner.start.value == 0.0
+
+    def test_results_of_a_camera_are_delivered_in_order(self):
+        object_detector = SlowFirstDetector()
+        runner = self.create_runner(object_detector)
+
+        self.put_frame("front", 1)
+        runner.submit("front")
+
+        # the camera timed out and sent another frame
+        self.put_frame("front", 2)
+        runner.submit("front")
+
+        runner.stop()
+        assert object_detector.completed == [1.0, 2.0]
+        assert self.outputs["front"]["np"][0][0] == 2
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
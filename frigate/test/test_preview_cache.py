@@ -0,0 +1,127 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+from collections import namedtuple
+from unittest.mock import patch
+
+from frigate.output.preview_cache import PreviewMediaCache
+
+DiskUsage = namedtuple("DiskUsage", ["total", "used", "free"])
+
+
+class TestPreviewMediaCache(unittest.TestCase):
+    def setUp(self):
+        self.cache_dir = tempfile.TemporaryDirectory()
+        self.cache = PreviewMediaCache(
+            os.path.join(self.cache_dir.name, "preview_media"), max_size=100
+        )
+        self.created = []
+
+    def tearDown(self):
+        self.cache_dir.cleanup()
+
+    def create(self, size: int, success: bool = True, delay: float = 0):
+        def create(path: str) -> bool:
+            self.created.append(path)
+            time.sleep(delay)
+
+            with open(path, "wb") as f:
+                f.write(b"0" * size)
+
+            return success
+
+        return create
+
+    def get(self, camera: str, start: float, source: str = "a", size: int = 10):
+        return self.cache.get_or_create(
+            camera, start, start + 20, "gif", [source], self.create(size)
+        )
+
+    def test_reuses_file_for_same_source(self):
+        path = self.get("front", 100)
+        assert os.path.getsize(path) == 10
+        assert self.get("front", 100) == path
+        assert len(self.created) == 1
+
+        # a changed source is a different file
+        assert self.get("front", 100, source="b") != path
+        assert len(self.created) == 2
+
+    def test_removes_files_of_previous_run(self):
+        os.makedirs(self.cache.cache_dir)
+        open(os.path.join(self.cache.cache_dir, "old.gif"), "w").close()
+        path = self.get("front", 100)
+        assert os.listdir(self.cache.cache_dir) == [os.path.basename(path)]
+
+    def test_failed_create_is_not_cached(self):
+        path = self.cache.get_or_create(
+            "front", 100, 120, "gif", [], self.create(10, success=False)
+        )
+        assert path is None
+        assert os.listdir(self.cache.cache_dir) == []
+        assert self.get("front", 100, source="") is not None
+
+    def test_evicts_least_recently_used(self):
+        first = self.get("front", 100, size=40)
+        second = self.get("front", 200, size=40)
+        # first is used again, second is now the least recently used
+        self.get("front", 100, size=40)
+        third = self.get("front", 300, size=40)
+
+        assert os.path.exists(first)
+        assert not os.path.exists(second)
+        assert os.path.exists(third)
+        assert self.cache.size == 80
+
+    def test_invalidate_expired_range(self):
+        old = self.get("front", 100)
+        new = self.get("front", 1000)
+        other = self.get("back", 100)
+
+        self.cache.invalidate("front", end_time=500)
+
+        assert not os.path.exists(old)
+        assert os.path.exists(new)
+        assert os.path.exists(other)
+        assert self.get("front", 100) != other
+        assert len(self.created) == 4
+
+    def test_size_limited_by_cache_file_system(self):
+        with patch(
+            "frigate.output.preview_cache.shutil.disk_usage",
+            return_value=DiskUsage(400, 0, 400),
+        ):
+            self.get("front", 100)
+
+        # 5% of the file system is less than max_size
+        assert self.cache.max_size == 20
+        self.get("front", 200)
+        self.get("front", 300)
+        assert self.cache.size == 20
+
+    def test_concurrent_requests_create_once(self):
+        paths = []
+
+        def get():
+            paths.append(
+                self.cache.get_or_create(
+                    "front", 100, 120, "mp4", ["a"], self.create(10, delay=0.1)
+                )
+            )
+
+        threads = [threading.Thread(target=get) for _ in range(4)]
+
+        for thread in threads:
+            thread.start()
+
+        for thread in threads:
+            thread.join()
+
+        assert len(self.created) == 1
+        assert len(set(paths)) == 1 and paths[0].endswith(".mp4")
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,60 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from frigate.output import preview_index
+from frigate.output.preview_index import PreviewFrameIndex, get_preview_frame_times
+
+
+class TestPreviewFrameIndex(unittest.TestCase):
+    def setUp(self):
+        self.cache_dir = tempfile.TemporaryDirectory()
+        self.patcher = patch.object(
+            preview_index, "PREVIEW_CACHE_DIR", self.cache_dir.name
+        )
+        self.patcher.start()
+        preview_index._index_cache.clear()
+
+    def tearDown(self):
+        self.patcher.stop()
+        self.cache_dir.cleanup()
+
+    def test_builds_index_from_existing_frames(self):
+        for name in [
+            "preview_front-100.5.webp",
+            "preview_front-90.0.webp",
+            "preview_front_door-95.0.webp",
+        ]:
+            open(os.path.join(self.cache_dir.name, name), "w").close()
+
+        index = PreviewFrameIndex("front")
+        assert index.frame_times == [90.0, 100.5]
+        assert get_preview_frame_times("front", 0, 200) == [90.0, 100.5]
+
+    def test_range_lookup_is_inclusive(self):
+        index = PreviewFrameIndex("front")
+
+        # frames may finish encoding out of order
+        for frame_time in [10.0, 12.0, 11.0, 13.0]:
+            index.add(frame_time)
+
+        assert get_preview_frame_times("front", 11.0, 12.0) == [11.0, 12.0]
+        assert get_preview_frame_times("front", 13.5, 20.0) == []
+
+    def test_removed_frames_are_not_returned(self):
+        index = PreviewFrameIndex("front")
+
+        for frame_time in [10.0, 11.0, 12.0]:
+            index.add(frame_time)
+
+        assert get_preview_frame_times("front", 0, 20) == [10.0, 11.0, 12.0]
+        index.remove([10.0, 11.0])
+        assert get_preview_frame_times("front", 0, 20) == [12.0]
+
+        # a new index for the camera is loaded from the persisted times
+        assert PreviewFrameIndex("front").frame_times == [12.0]
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,108 @@
+import unittest
+
+import cv2
+import numpy as np
+
+from frigate.camera import PTZMetrics
+from frigate.config import FrigateConfig
+from frigate.ptz.autotrack import PtzMotionEstimator
+
+
+class TestPtzMotionEstimator(unittest.TestCase):
+    def setUp(self):
+        self.width = 1920
+        self.height = 1080
+        rng = np.random.default_rng(0)
+        texture = rng.integers(0, 255, (self.height // 8, self.width // 8), np.uint8)
+        self.scene = cv2.resize(
+            cv2.GaussianBlur(texture, (3, 3), 0),
+            (self.width + 200, self.height + 200),
+            interpolation=cv2.INTER_CUBIC,
+        )
+
+    def create_estimator(self, mode: str, zooming: str = "disabled"):
+        config = FrigateConfig(
+            **{
+                "mqtt": {"host": "mqtt"},
+                "cameras": {
+                    "ptz": {
+                        "ffmpeg": {
+                            "inputs": [
+                                {
+                                    "path": "rtsp://10.0.0.1:554/video",
+                                    "roles": ["detect"],
+                                }
+                            ]
+                        },
+                        "detect": {"width": self.width, "height": self.height},
+                        "onvif": {
+                            "autotracking": {
+                                "zooming": zooming,
+                                "motion_estimation": mode,
+                            }
+                        },
+                    }
+                },
+            }
+        )
+        estimator = PtzMotionEstimator(
+            config.cameras["ptz"], PTZMetrics(autotracker_enabled=False)
+        )
+        estimator.reset("ptz")
+        return estimator
+
+    def get_frame(self, offset: int) -> np.ndarray:
+        frame = self.scene[
+            100 : 100 + self.height, 100 + offset : 100 + offset + self.width
+        ]
+        return cv2.cvtColor(
+            cv2.cvtColor(frame, cv2.COLOR_GRAY2BGR), cv2.COLOR_BGR2YUV_I420
+        )
+
+    def estimate_pan(self, estimator: PtzMotionEstimator) -> np.ndarray:
+        boxes = [(800, 400, 1000, 700)]
+        estimator.estimate(self.get_frame(0), boxes, "ptz", 0)
+        transformation = estimator.estimate(self.get_frame(40), boxes, "ptz", 1)
+        return transformation.rel_to_abs(np.array([[960.0, 540.0]]))[0]
+
+    def test_downscaled_matches_full_translation(self):
+        full = self.create_estimator("full")
+        downscaled = self.create_estimator("downscaled")
+        assert full.scale == 1.0
+        assert downscaled.scale == 1 / 3
+
+        # the scene moved 40px to the left, so the point is 40px further right
+        np.testing.assert_allclose(self.estimate_pan(full), [1000, 540], atol=1)
+        np.testing.assert_allclose(self.estimate_pan(downscaled), [1000, 540], atol=2)
+
+    def test_downscaled_homography_is_in_detect_coordinates(self):
+        downscaled = self.create_estimator("downscaled", zooming="absolute")
+        np.testing.assert_allclose(self.estimate_pan(downscaled), [1000, 540], atol=2)
+
+    def test_mask_is_reused_for_unchanged_boxes(self):
+        estimator = self.create_estimator("downscaled")
+        mask = estimator._get_mask([(300, 300, 600, 600)])
+        assert mask.shape == (360, 640)
+        assert mask[150, 150] == 0
+        assert mask[50, 50] == 1
+        assert estimator._get_mask([(300, 300, 600, 600)]) is mask
+        assert estimator._get_mask([(300, 300, 660, 600)]) is not mask
+
+    def test_mask_is_rebuilt_for_changed_motion_mask(self):
+        estimator = self.create_estimator("downscaled")
+        boxes = [(300, 300, 600, 600)]
+        mask = estimator._get_mask(boxes)
+        assert mask[50, 50] == 1
+
+        motion_mask = np.ones((self.height, self.width), np.uint8)
+        motion_mask[0:300, 0:300] = 0
+        estimator.camera_config.motion.mask = motion_mask
+
+        mask = estimator._get_mask(boxes)
+        assert mask[50, 50] == 0
+        assert mask[200, 50] == 1
+        assert estimator._get_mask(boxes) is mask
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
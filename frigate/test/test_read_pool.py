@@ -0,0 +1,133 @@
+import logging
+import os
+import sqlite3
+import threading
+import unittest
+
+from fastapi import APIRouter, FastAPI, Request
+from fastapi.testclient import TestClient
+from peewee_migrate import Router
+from playhouse.sqlite_ext import SqliteExtDatabase
+from playhouse.sqliteq import SqliteQueueDatabase
+
+from frigate.api.read_pool import ReadConnectionPool, ReadRoute, read_only_endpoint
+from frigate.models import Event
+from frigate.test.const import TEST_DB, TEST_DB_CLEANUPS
+
+
+class TestReadConnectionPool(unittest.TestCase):
+    def setUp(self):
+        migrate_db = SqliteExtDatabase(TEST_DB)
+        del logging.getLogger("peewee_migrate").handlers[:]
+        router = Router(migrate_db)
+        router.run()
+        migrate_db.close()
+        self.db = SqliteQueueDatabase(TEST_DB)
+        self.db.bind([Event])
+
+        router = APIRouter(route_class=ReadRoute)
+
+        @router.get("/read")
+        @read_only_endpoint
+        def read():
+            try:
+                self.db.connection().execute("DELETE FROM event")
+                read_only = False
+            except sqlite3.OperationalError:
+                read_only = True
+
+            return {
+                "thread": threading.current_thread().name,
+                "read_only": read_only,
+                "events": Event.select().count(),
+            }
+
+        @router.get("/request/{value}")
+        @read_only_endpoint
+        def with_request(request: Request, value: int, other: int = 1):
+            return {"path": request.url.path, "value": value + other}
+
+        @router.get("/unmarked")
+        def unmarked():
+            return {"thread": threading.current_thread().name}
+
+        @router.post("/write")
+        def write():
+            Event.delete().execute()
+            return {"thread": threading.current_thread().name}
+
+        self.app = FastAPI()
+        self.app.include_router(router)
+        self.app.read_pool = ReadConnectionPool(self.db, max_connections=2)
+
+    def tearDown(self):
+        self.app.read_pool.close()
+        self.db.stop()
+
+        if not self.db.is_closed():
+            self.db.close()
+
+        for file in TEST_DB_CLEANUPS:
+            try:
+                os.remove(file)
+            except OSError:
+                pass
+
+    def insert_event(self, id: str) -> None:
+        Event.insert(
+            id=id,
+            label="person",
+            camera="front_door",
+            start_time=1,
+            end_time=2,
+            top_score=1,
+            false_positive=False,
+            zones=[],
+            thumbnail="",
+            region=[],
+            box=[],
+            area=0,
+            has_clip=True,
+            has_snapshot=True,
+        ).execute()
+
+    def test_get_runs_on_read_only_connection(self):
+        self.insert_event("1")
+
+        with TestClient(self.app) as client:
+            for _ in range(4):
+                response = client.get("/read").json()
+                assert response["thread"].startswith("api_reader")
+                assert response["read_only"]
+                assert response["events"] == 1
+
+            # other requests write as before
+            response = client.post("/write").json()
+            assert not response["thread"].startswith("api_reader")
+            assert client.get("/read").json()["events"] == 0
+
+    def test_unmarked_get_is_not_on_pool(self):
+        with TestClient(self.app) as client:
+            response = client.get("/unmarked").json()
+            assert not response["thread"].startswith("api_reader")
+
+    def test_get_with_request_parameter(self):
+        with TestClient(self.app) as client:
+            response = client.get("/request/2", params={"other": 3})
+            assert response.json() == {"path": "/request/2", "value": 5}
+
+    def test_without_pool(self):
+        self.app.read_pool.close()
+        self.app.read_pool = None
+
+        with TestClient(self.app) as client:
+            response = client.get("/read").json()
+            assert not response["thread"].startswith("api_reader")
+            response = client.get("/request/2")
+            assert response.json() == {"path": "/request/2", "value": 3}
+
+        self.app.read_pool = ReadConnectionPool(self.db)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,126 @@
+import datetime
+import logging
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from peewee_migrate import Router
+from playhouse.sqlite_ext import SqliteExtDatabase
+from playhouse.sqliteq import SqliteQueueDatabase
+
+from frigate.models import Recordings, RecordingsToDelete
+from frigate.record.util import sync_recordings
+from frigate.test.const import TEST_DB, TEST_DB_CLEANUPS
+
+
+class TestSyncRecordings(unittest.TestCase):
+    def setUp(self):
+        migrate_db = SqliteExtDatabase(TEST_DB)
+        del logging.getLogger("peewee_migrate").handlers[:]
+        router = Router(migrate_db)
+        router.run()
+        migrate_db.close()
+        # the queued database that the recording cleanup uses
+        self.db = SqliteQueueDatabase(TEST_DB)
+        self.db.bind([Recordings, RecordingsToDelete])
+        self.record_dir = tempfile.mkdtemp()
+        self.record_dir_patch = patch("frigate.record.util.RECORD_DIR", self.record_dir)
+        self.record_dir_patch.start()
+
+        rows = []
+
+        for day in ["2024-01-01", "2024-01-02"]:
+            for hour in ["00", "01"]:
+                for camera in ["front", "back"]:
+                    for minute in range(10):
+                        path = self.segment_path(day, hour, camera, minute)
+                        os.makedirs(os.path.dirname(path), exist_ok=True)
+                        open(path, "wb").close()
+                        start = datetime.datetime.strptime(
+                            f"{day} {hour}:{minute:02d}", "%Y-%m-%d %H:%M"
+                        ).replace(tzinfo=datetime.timezone.utc)
+                        rows.append(
+                            {
+                                "id": f"{start.timestamp()}-{camera}",
+                                "camera": camera,
+                                "path": path,
+                                "start_time": start.timestamp(),
+                                "end_time": start.timestamp() + 10,
+                                "duration": 10,
+                            }
+                        )
+
+        Recordings.insert_many(rows).execute()
+
+    def tearDown(self):
+        self.record_dir_patch.stop()
+        shutil.rmtree(self.record_dir)
+        self.db.stop()
+
+        if not self.db.is_closed():
+            self.db.close()
+
+        for file in TEST_DB_CLEANUPS:
+            try:
+                os.remove(file)
+            except OSError:
+                pass
+
+    def segment_path(self, day: str, hour: str, camera: str, minute: int) -> str:
+        return os.path.join(self.record_dir, day, hour, camera, f"{minute:02d}.00.mp4")
+
+    def add_orphan(self, day: str, camera: str) -> str:
+        path = self.segment_path(day, "00", camera, 30)
+        open(path, "wb").close()
+        return path
+
+    def test_sync_removes_both_differences(self):
+        missing = [self.segment_path("2024-01-01", "01", "front", m) for m in range(3)]
+
+        for path in missing:
+            os.remove(path)
+
+        orphans = [
+            self.add_orphan("2024-01-01", "back"),
+            self.add_orphan("2024-01-02", "front"),
+        ]
+
+        sync_recordings(limited=False)
+
+        assert Recordings.select().count() == 77
+        assert not Recordings.select().where(Recordings.path << missing).exists()
+        assert not any(os.path.exists(p) for p in orphans)
+        assert os.path.exists(self.segment_path("2024-01-02", "00", "front", 0))
+
+    def test_sync_by_camera_and_day(self):
+        os.remove(self.segment_path("2024-01-01", "00", "front", 0))
+        os.remove(self.segment_path("2024-01-02", "00", "front", 0))
+        back_orphan = self.add_orphan("2024-01-01", "back")
+
+        sync_recordings(limited=False, cameras=["front"], days=["2024-01-02"])
+
+        assert Recordings.select().count() == 79
+        assert os.path.exists(back_orphan)
+
+        sync_recordings(limited=False, cameras=["back"])
+
+        assert Recordings.select().count() == 79
+        assert not os.path.exists(back_orphan)
+
+        sync_recordings(limited=False)
+
+        assert Recordings.select().count() == 78
+
+    def test_sync_aborts_when_most_files_are_missing(self):
+        shutil.rmtree(os.path.join(self.record_dir, "2024-01-01"))
+        shutil.rmtree(os.path.join(self.record_dir, "2024-01-02", "00"))
+
+        sync_recordings(limited=False)
+
+        assert Recordings.select().count() == 80
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,187 @@
+import datetime
+import json
+import logging
+import os
+import unittest
+
+from peewee import fn
+from peewee_migrate import Router
+from playhouse.sqlite_ext import SqliteExtDatabase
+
+from frigate.api.media import recordings_summary
+from frigate.models import Event, Recordings, RecordingsRollup
+from frigate.record.util import check_recordings_rollups
+from frigate.test.const import TEST_DB, TEST_DB_CLEANUPS
+from frigate.util.builtin import get_tz_modifiers
+
+TIMEZONES = ["utc", "America/New_York", "Asia/Kolkata", "Asia/Kathmandu"]
+
+
+def summary_from_raw_tables(camera: str, timezone: str) -> list[dict]:
+    """The hourly summary grouped from every recordings and event row."""
+    hour_modifier, minute_modifier, seconds_offset = get_tz_modifiers(timezone)
+    recording_groups = (
+        Recordings.select(
+            fn.strftime(
+                "%Y-%m-%d %H",
+                fn.datetime(
+                    Recordings.start_time, "unixepoch", hour_modifier, minute_modifier
+                ),
+            ).alias("hour"),
+            fn.SUM(Recordings.duration).alias("duration"),
+            fn.SUM(Recordings.motion).alias("motion"),
+            fn.SUM(Recordings.objects).alias("objects"),
+        )
+        .where(Recordings.camera == camera)
+        .group_by((Recordings.start_time + seconds_offset).cast("int") / 3600)
+        .order_by(Recordings.start_time.desc())
+        .namedtuples()
+    )
+    event_map = {
+        g.hour: g.count
+        for g in Event.select(
+            fn.strftime(
+                "%Y-%m-%d %H",
+                fn.datetime(
+                    Event.start_time, "unixepoch", hour_modifier, minute_modifier
+                ),
+            ).alias("hour"),
+            fn.COUNT(Event.id).alias("count"),
+        )
+        .where(Event.camera == camera, Event.has_clip)
+        .group_by((Event.start_time + seconds_offset).cast("int") / 3600)
+        .namedtuples()
+    }
+    days = {}
+
+    for group in recording_groups:
+        day, hour = group.hour.split()
+        events = event_map.get(group.hour, 0)
+        days.setdefault(day, {"events": 0, "hours": [], "day": day})
+        days[day]["events"] += events
+        days[day]["hours"].append(
+            {
+                "hour": hour,
+                "events": events,
+                "motion": group.motion,
+                "objects": group.objects,
+                "duration": round(group.duration),
+            }
+        )
+
+    return list(days.values())
+
+
+class TestRecordingsRollup(unittest.TestCase):
+    def setUp(self):
+        migrate_db = SqliteExtDatabase(TEST_DB)
+        del logging.getLogger("peewee_migrate").handlers[:]
+        router = Router(migrate_db)
+        router.run()
+        migrate_db.close()
+        self.db = SqliteExtDatabase(TEST_DB)
+        self.db.bind([Event, Recordings, RecordingsRollup])
+        self.start = datetime.datetime(
+            2024, 3, 1, 22, 0, tzinfo=datetime.timezone.utc
+        ).timestamp()
+
+        # 4 hours of 10 second segments for two cameras
+        rows = []
+
+        for camera in ["front", "back"]:
+            for i in range(4 * 360):
+                start = self.start + i * 10
+                rows.append(
+                    {
+                        "id": f"{start}-{camera}",
+                        "camera": camera,
+                        "path": f"/media/frigate/recordings/{camera}/{start}.mp4",
+                        "start_time": start,
+                        "end_time": start + 10,
+                        "duration": 10,
+                        "motion": i % 7,
+                        "objects": i % 3,
+                    }
+                )
+
+        Recordings.insert_many(rows).execute()
+
+        for i in range(40):
+            self.insert_event(f"event_{i}", self.start + i * 397, has_clip=i % 4 != 0)
+
+    def tearDown(self):
+        if not self.db.is_closed():
+            self.db.close()
+
+        for file in TEST_DB_CLEANUPS:
+            try:
+                os.remove(file)
+            except OSError:
+                pass
+
+    def insert_event(self, event_id: str, start: float, has_clip: bool = True):
+        Event.insert(
+            id=event_id,
+            label="person",
+            camera="front",
+            start_time=start,
+            end_time=start + 20,
+            top_score=0.9,
+            false_positive=False,
+            zones=[],
+            thumbnail="",
+            has_clip=has_clip,
+            has_snapshot=False,
+            region=[],
+            box=[],
+            area=0,
+            data={},
+        ).execute()
+
+    def assert_summary_matches(self):
+        for camera in ["front", "back"]:
+            for timezone in TIMEZONES:
+                summary = json.loads(recordings_summary(camera, timezone).body)
+                assert summary == summary_from_raw_tables(camera, timezone), timezone
+
+    def test_summary_matches_raw_tables(self):
+        self.assert_summary_matches()
+
+    def test_rollups_follow_changes(self):
+        # cleanup deletes segments and an hour is removed completely
+        Recordings.delete().where(
+            Recordings.camera == "front",
+            Recordings.start_time < self.start + 3600 + 600,
+        ).execute()
+        Recordings.update(motion=100).where(
+            Recordings.start_time > self.start + 7200
+        ).execute()
+
+        # events lose their clip, move and are deleted
+        Event.update(has_clip=False).where(Event.id << ["event_1", "event_2"]).execute()
+        Event.update(has_clip=True).where(Event.id == "event_4").execute()
+        Event.update(start_time=self.start + 10000).where(
+            Event.id == "event_5"
+        ).execute()
+        Event.delete().where(Event.id << ["event_6", "event_8"]).execute()
+        self.insert_event("event_new", self.start + 12000)
+
+        self.assert_summary_matches()
+        assert check_recordings_rollups(rebuild=False)
+
+        # empty periods are removed
+        Recordings.delete().execute()
+        Event.delete().execute()
+        assert RecordingsRollup.select().count() == 0
+
+    def test_rollups_are_rebuilt(self):
+        RecordingsRollup.delete().where(RecordingsRollup.camera == "back").execute()
+        RecordingsRollup.update(events=0).execute()
+
+        assert not check_recordings_rollups()
+        assert check_recordings_rollups(rebuild=False)
+        self.assert_summary_matches()
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
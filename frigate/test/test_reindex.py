@@ -0,0 +1,205 @@
+import base64
+import logging
+import os
+import tempfile
+import unittest
+from unittest.mock import Mock
+
+import cv2
+import numpy as np
+from peewee_migrate import Router
+from playhouse.sqlite_ext import SqliteExtDatabase
+
+from frigate.embeddings.reindex import (
+    MAX_RESUME_ATTEMPTS,
+    ReindexPipeline,
+    get_reindex_query,
+    load_checkpoint,
+)
+from frigate.models import Event
+from frigate.test.const import TEST_DB, TEST_DB_CLEANUPS
+
+
+class FakeCursor:
+    rowcount = 1
+
+
+class FakeEmbeddings:
+    def __init__(self, fail_after: int = -1) -> None:
+        self.fail_after = fail_after
+        self.embedded: list[str] = []
+        self.thumbnails: dict[str, np.ndarray] = {}
+        self.descriptions: dict[str, np.ndarray] = {}
+
+    def batch_embed_thumbnail(self, event_thumbs, upsert=True):
+        if self.fail_after == 0:
+            raise RuntimeError("model crashed")
+
+        self.fail_after -= 1
+        self.embedded.extend(event_thumbs.keys())
+        return [np.asarray(t, np.float32)[0, 0] for t in event_thumbs.values()]
+
+    def batch_embed_description(self, event_descriptions, upsert=True):
+        return [np.array([len(d)], np.float32) for d in event_descriptions.values()]
+
+    def upsert_thumbnails(self, ids, embeddings):
+        self.thumbnails.update(zip(ids, embeddings))
+        return FakeCursor()
+
+    def upsert_descriptions(self, ids, embeddings):
+        self.descriptions.update(zip(ids, embeddings))
+        return FakeCursor()
+
+
+class TestReindexPipeline(unittest.TestCase):
+    def setUp(self):
+        migrate_db = SqliteExtDatabase(TEST_DB)
+        del logging.getLogger("peewee_migrate").handlers[:]
+        router = Router(migrate_db)
+        router.run()
+        migrate_db.close()
+        self.db = SqliteExtDatabase(TEST_DB)
+        self.db.bind([Event])
+        self.checkpoint = os.path.join(tempfile.mkdtemp(), "checkpoint.json")
+        self.requestor = Mock()
+
+        Event.insert_many(
+            [
+                {
+                    "id": f"{1000 + i}.0-abc",
+                    "label": "person",
+                    "camera": "front_door",
+                    "start_time": 1000 + i,
+                    "end_time": 1010 + i,
+                    "top_score": 1,
+                    "false_positive": False,
+                    "zones": [],
+                    "thumbnail": base64.b64encode(
+                        cv2.imencode(".png", np.full((1, 1, 3), i, np.uint8))[1]
+                    ).decode(),
+                    "has_clip": True,
+                    "has_snapshot": True,
+                    "data": {"description": "a person" if i % 2 else ""},
+                }
+                for i in range(100)
+            ]
+        ).execute()
+
+    def tearDown(self):
+        if not self.db.is_closed():
+            self.db.close()
+
+        for file in TEST_DB_CLEANUPS:
+            try:
+                os.remove(file)
+            except OSError:
+                pass
+
+    def test_query_includes_events_with_clip_or_snapshot(self):
+        Event.update(has_clip=False).where(Event.id == "1000.0-abc").execute()
+        Event.update(has_snapshot=False).where(Event.id == "1001.0-abc").execute()
+        Event.update(has_clip=False, has_snapshot=False).where(
+            Event.id == "1002.0-abc"
+        ).execute()
+
+        ids = {event.id for event in get_reindex_query()}
+
+        # only a snapshot or only a clip is enough
+        assert "1000.0-abc" in ids
+        assert "1001.0-abc" in ids
+        assert "1002.0-abc" not in ids
+        assert len(ids) == 99
+
+    def test_reindex_embeds_all_events(self):
+        embeddings = FakeEmbeddings()
+        totals = ReindexPipeline(
+            embeddings, self.requestor, batch_size=8, checkpoint_path=self.checkpoint
+        ).run()
+
+        assert len(embeddings.thumbnails) == 100
+        assert len(embeddings.descriptions) == 50
+        assert embeddings.thumbnails["1005.0-abc"][0] == 5
+        assert totals["processed_objects"] == 100
+        assert totals["status"] == "completed"
+        assert load_checkpoint(self.checkpoint) is None
+
+        # progress is reported with an estimate of the remaining time
+        progress = [call.args[1] for call in self.requestor.send_data.call_args_list]
+        assert progress[-1]["time_remaining"] == 0
+
+    def test_reindex_resumes_from_checkpoint(self):
+        embeddings = FakeEmbeddings(fail_after=5)
+
+        with self.assertRaises(RuntimeError):
+            ReindexPipeline(
+                embeddings,
+                self.requestor,
+                batch_size=8,
+                checkpoint_path=self.checkpoint,
+            ).run()
+
+        checkpoint = load_checkpoint(self.checkpoint)
+        assert checkpoint["last_id"] == "1039.0-abc"
+        assert checkpoint["totals"]["processed_objects"] == 40
+
+        resumed = FakeEmbeddings()
+        totals = ReindexPipeline(
+            resumed, self.requestor, batch_size=8, checkpoint_path=self.checkpoint
+        ).run(checkpoint)
+
+        assert resumed.embedded[0] == "1040.0-abc"
+        assert len(resumed.embedded) == 60
+        assert totals["processed_objects"] == 100
+        assert totals["thumbnails"] == 100
+
+    def test_failing_reindex_is_not_resumed_forever(self):
+        with self.assertRaises(RuntimeError):
+            ReindexPipeline(
+                FakeEmbeddings(fail_after=5),
+                self.requestor,
+                batch_size=8,
+                checkpoint_path=self.checkpoint,
+            ).run()
+
+        for _ in range(MAX_RESUME_ATTEMPTS):
+            checkpoint = load_checkpoint(self.checkpoint)
+            assert checkpoint["last_id"] == "1039.0-abc"
+
+            with self.assertRaises(RuntimeError):
+                ReindexPipeline(
+                    FakeEmbeddings(fail_after=0),
+                    self.requestor,
+                    batch_size=8,
+                    checkpoint_path=self.checkpoint,
+                ).run(checkpoint)
+
+        assert load_checkpoint(self.checkpoint) is None
+        assert not os.path.exists(self.checkpoint)
+
+    def test_progress_resets_resume_attempts(self):
+        with self.assertRaises(RuntimeError):
+            ReindexPipeline(
+                FakeEmbeddings(fail_after=1),
+                self.requestor,
+                batch_size=8,
+                checkpoint_path=self.checkpoint,
+            ).run()
+
+        # every resume writes another batch before it fails
+        for _ in range(MAX_RESUME_ATTEMPTS + 1):
+            with self.assertRaises(RuntimeError):
+                ReindexPipeline(
+                    FakeEmbeddings(fail_after=1),
+                    self.requestor,
+                    batch_size=8,
+                    checkpoint_path=self.checkpoint,
+                ).run(load_checkpoint(self.checkpoint))
+
+        checkpoint = load_checkpoint(self.checkpoint)
+        assert checkpoint["totals"]["processed_objects"] == 8 * (
+            MAX_RESUME_ATTEMPTS + 2
+        )
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
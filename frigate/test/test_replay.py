@@ -0,0 +1,111 @@
+import copy
+import os
+import tempfile
+import unittest
+
+import cv2
+import numpy as np
+
+from frigate.object_detection import ObjectDetector
+from frigate.replay import compare_to_baseline, create_config, replay_clip
+from frigate.util.builtin import EventsPerSecond
+
+
+class BrightObjectDetector(ObjectDetector):
+    """Detects the bright pixels in the tensor as a person."""
+
+    def __init__(self) -> None:
+        self.fps = EventsPerSecond()
+
+    def detect(self, tensor_input, threshold=0.4):
+        tensor = tensor_input[0]
+        ys, xs = np.nonzero(tensor.max(axis=2) > 200)
+
+        if len(ys) == 0:
+            return []
+
+        height, width = tensor.shape[0:2]
+        return [
+            (
+                "person",
+                0.9,
+                (
+                    ys.min() / height,
+                    xs.min() / width,
+                    ys.max() / height,
+                    xs.max() / width,
+                ),
+            )
+        ]
+
+
+class TestReplay(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.clip = os.path.join(self.tmp_dir.name, "walk.avi")
+
+        # 6 seconds at 10 fps, a box moves across the frame after 2 seconds
+        writer = cv2.VideoWriter(
+            self.clip, cv2.VideoWriter_fourcc(*"MJPG"), 10, (640, 360)
+        )
+
+        for i in range(60):
+            frame = np.zeros((360, 640, 3), np.uint8)
+
+            if i >= 20:
+                x = 100 + (i - 20) * 10
+                cv2.rectangle(frame, (x, 120), (x + 60, 300), (255, 255, 255), -1)
+
+            writer.write(frame)
+
+        writer.release()
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_replay_clip(self):
+        config = create_config(self.clip, fps=5)
+        result = replay_clip(self.clip, config, "replay", BrightObjectDetector())
+
+        # frames are sampled at the detect fps
+        assert result["frames"] == 30
+        assert result["fps"] > 0
+        assert set(result["stages"].keys()) == {
+            "motion",
+            "region",
+            "detect",
+            "track",
+            "total",
+        }
+        assert result["detector_calls_per_frame"] > 0
+        assert result["objects"] == {"person": 1}
+
+    def test_max_frames(self):
+        config = create_config(self.clip, fps=5)
+        result = replay_clip(
+            self.clip, config, "replay", BrightObjectDetector(), max_frames=5
+        )
+        assert result["frames"] == 5
+
+    def test_compare_to_baseline(self):
+        baseline = {
+            "fps": 100.0,
+            "stages": {"motion": {"avg_ms": 2.0, "p95_ms": 3.0}},
+            "detector_calls_per_frame": 1.0,
+            "objects": {"person": 1},
+        }
+        assert compare_to_baseline(copy.deepcopy(baseline), baseline, 0.1) == []
+
+        result = copy.deepcopy(baseline)
+        result["fps"] = 95.0
+        result["stages"]["motion"]["avg_ms"] = 2.1
+        assert compare_to_baseline(result, baseline, 0.1) == []
+
+        result["fps"] = 80.0
+        result["stages"]["motion"]["avg_ms"] = 3.0
+        result["objects"] = {"person": 2}
+        assert len(compare_to_baseline(result, baseline, 0.1)) == 3
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,207 @@
+import base64
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+from peewee_migrate import Router
+from playhouse.sqlite_ext import SqliteExtDatabase
+
+from frigate.comms.webpush import WebPushClient
+from frigate.config import FrigateConfig
+from frigate.models import User
+from frigate.test.const import TEST_DB, TEST_DB_CLEANUPS
+
+
+class FakePushService(BaseHTTPRequestHandler):
+    """Push endpoint that stalls, expires or accepts depending on the path."""
+
+    release = threading.Event()
+    received: list[str] = []
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers["Content-Length"]))
+
+        if self.path.startswith("/stall"):
+            self.release.wait(10)
+            status = 201
+        elif self.path.startswith("/gone"):
+            status = 410
+        elif self.path.startswith("/flaky") and self.path not in self.received:
+            status = 503
+        else:
+            status = 201
+
+        self.received.append(self.path)
+
+        try:
+            self.send_response(status)
+            self.end_headers()
+        except OSError:
+            pass
+
+    def log_message(self, format, *args):
+        pass
+
+
+def create_subscription(endpoint: str) -> dict[str, object]:
+    public_key = (
+        ec.generate_private_key(ec.SECP256R1())
+        .public_key()
+        .public_bytes(
+            serialization.Encoding.X962,
+            serialization.PublicFormat.UncompressedPoint,
+        )
+    )
+    return {
+        "endpoint": endpoint,
+        "keys": {
+            "p256dh": base64.urlsafe_b64encode(public_key).decode(),
+            "auth": base64.urlsafe_b64encode(os.urandom(16)).decode(),
+        },
+    }
+
+
+def create_review(review_id: str) -> str:
+    return json.dumps(
+        {
+            "type": "new",
+            "before": {},
+            "after": {
+                "id": review_id,
+                "camera": "front_door",
+                "severity": "alert",
+                "thumb_path": "/media/frigate/clips/review/thumb.webp",
+                "data": {"objects": ["person"], "zones": [], "sub_labels": []},
+            },
+        }
+    )
+
+
+class TestWebPushClient(unittest.TestCase):
+    def setUp(self):
+        migrate_db = SqliteExtDatabase(TEST_DB)
+        del logging.getLogger("peewee_migrate").handlers[:]
+        router = Router(migrate_db)
+        router.run()
+        migrate_db.close()
+        self.db = SqliteExtDatabase(TEST_DB)
+        self.db.bind([User])
+
+        FakePushService.release.clear()
+        FakePushService.received = []
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), FakePushService)
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        host = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+        User.insert(
+            username="admin",
+            password_hash="hash",
+            notification_tokens=[
+                create_subscription(f"{host}/stall/1"),
+                create_subscription(f"{host}/gone/1"),
+                create_subscription(f"{host}/flaky/1"),
+                create_subscription(f"{host}/ok/1"),
+            ],
+        ).execute()
+
+        self.config_dir = tempfile.mkdtemp()
+        self.patches = [
+            patch("frigate.comms.webpush.CONFIG_DIR", self.config_dir),
+            patch("frigate.comms.webpush.PUSH_TIMEOUT", 0.5),
+            patch("frigate.comms.webpush.PUSH_RETRY_BACKOFF", 0.05),
+        ]
+
+        for p in self.patches:
+            p.start()
+
+        config = FrigateConfig(
+            **{
+                "mqtt": {"host": "mqtt"},
+                "notifications": {"enabled": True, "email": "admin@example.com"},
+                "cameras": {
+                    "front_door": {
+                        "ffmpeg": {
+                            "inputs": [
+                                {
+                                    "path": "rtsp://10.0.0.1:554/video",
+                                    "roles": ["detect"],
+                                }
+                            ]
+                        },
+                        "detect": {"height": 1080, "width": 1920, "fps": 5},
+                    }
+                },
+            }
+        )
+        self.client = WebPushClient(config)
+
+    def tearDown(self):
+        FakePushService.release.set()
+        self.client.stop()
+        self.client.config_subscriber.stop()
+        self.server.shutdown()
+        self.server.server_close()
+
+        for p in self.patches:
+            p.stop()
+
+        shutil.rmtree(self.config_dir)
+
+        if not self.db.is_closed():
+            self.db.close()
+
+        for file in TEST_DB_CLEANUPS:
+            try:
+                os.remove(file)
+            except OSError:
+                pass
+
+    def wait_for(self, condition) -> None:
+        for _ in range(500):
+            if condition():
+                return
+
+            time.sleep(0.01)
+
+        self.fail("condition was not met")
+
+    def test_stalled_endpoint_does_not_block_publish(self):
+        start = time.monotonic()
+
+        for i in range(10):
+            self.client.publish("reviews", create_review(f"review_{i}"))
+
+        # each publish only queues the notifications
+        assert time.monotonic() - start < 0.5
+
+        # the other endpoints get their notifications while one is stalled
+        self.wait_for(lambda: FakePushService.received.count("/ok/1") == 10)
+        assert FakePushService.received.count("/flaky/1") >= 10
+
+    def test_expired_subscriptions_are_removed(self):
+        self.client.publish("reviews", create_review("review_1"))
+        self.wait_for(lambda: "/gone/1" in FakePushService.received)
+        self.wait_for(lambda: len(self.client.expired_subs) > 0)
+
+        # expired subscriptions are cleaned up with the next alert
+        self.client.publish("reviews", create_review("review_2"))
+
+        endpoints = [
+            token["endpoint"] for token in User.get_by_id("admin").notification_tokens
+        ]
+        assert len(endpoints) == 3
+        assert not any("/gone/" in endpoint for endpoint in endpoints)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
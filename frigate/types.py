@@ -1,13 +1,15 @@
 from enum import Enum
-from typing import TypedDict
+from typing import Optional, TypedDict
 
 from frigate.camera import CameraMetrics
+from frigate.genai.pool import GenAIMetrics
 from frigate.object_detection import ObjectDetectProcess
 
 
 class StatsTrackingTypes(TypedDict):
     camera_metrics: dict[str, CameraMetrics]
     detectors: dict[str, ObjectDetectProcess]
+    genai_metrics: Optional[GenAIMetrics]
     started: int
     latest_frigate_version: str
     last_updated: int
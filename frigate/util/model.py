@@ -3,14 +3,6 @@
 import os
 from typing import Any
 
-import onnxruntime as ort
-
-try:
-    import openvino as ov
-except ImportError:
-    # openvino is not included
-    pass
-
 
 def get_ort_providers(
     force_cpu: bool = False, openvino_device: str = "AUTO", requires_fp16: bool = False
@@ -25,6 +17,9 @@ def get_ort_providers(
             ],
         )
 
+    # only processes running onnx models load the runtime
+    import onnxruntime as ort
+
     providers = []
     options = []
 
@@ -68,21 +63,27 @@ class ONNXModelRunner:
 
     def __init__(self, model_path: str, device: str, requires_fp16: bool = False):
         self.model_path = model_path
-        self.ort: ort.InferenceSession = None
-        self.ov: ov.Core = None
+        self.ort = None
+        self.ov = None
+        self.ov_core = None
         providers, options = get_ort_providers(device == "CPU", device, requires_fp16)
 
         if "OpenVINOExecutionProvider" in providers:
+            import openvino as ov
+
             # use OpenVINO directly
             self.type = "ov"
-            self.ov = ov.Core()
-            self.ov.set_property(
+            self.ov = ov
+            self.ov_core = ov.Core()
+            self.ov_core.set_property(
                 {ov.properties.cache_dir: "/config/model_cache/openvino"}
             )
-            self.interpreter = self.ov.compile_model(
+            self.interpreter = self.ov_core.compile_model(
                 model=model_path, device_name=device
             )
         else:
+            import onnxruntime as ort
+
             # Use ONNXRuntime
             self.type = "ort"
             self.ort = ort.InferenceSession(
@@ -108,11 +109,11 @@ class ONNXModelRunner:
             input_tensor = list(input.values())
 
             if len(input_tensor) == 1:
-                input_tensor = ov.Tensor(array=input_tensor[0])
+                infer_request.infer(self.ov.Tensor(array=input_tensor[0]))
             else:
-                input_tensor = ov.Tensor(array=input_tensor)
-
-            infer_request.infer(input_tensor)
+                infer_request.infer(
+                    {name: self.ov.Tensor(array=value) for name, value in input.items()}
+                )
             return [infer_request.get_output_tensor().data]
         elif self.type == "ort":
             return self.ort.run(None, input)
@@ -0,0 +1,133 @@
+"""Peewee migrations
+
+Some examples (model - class or model name)::
+
+    > Model = migrator.orm['model_name']            # Return model in current state by name
+
+    > migrator.sql(sql)                             # Run custom SQL
+    > migrator.python(func, *args, **kwargs)        # Run python code
+    > migrator.create_model(Model)                  # Create a model (could be used as decorator)
+    > migrator.remove_model(model, cascade=True)    # Remove a model
+    > migrator.add_fields(model, **fields)          # Add fields to a model
+    > migrator.change_fields(model, **fields)       # Change fields
+    > migrator.remove_fields(model, *field_names, cascade=True)
+    > migrator.rename_field(model, old_field_name, new_field_name)
+    > migrator.rename_table(model, new_table_name)
+    > migrator.add_index(model, *col_names, unique=False)
+    > migrator.drop_index(model, *col_names)
+    > migrator.add_not_null(model, *field_names)
+    > migrator.drop_not_null(model, *field_names)
+    > migrator.add_default(model, field_name, default)
+
+"""
+
+import peewee as pw
+
+SQL = pw.SQL
+
+# recordings and events are counted in the 15 minute period they start in
+PERIOD = "CAST({}.start_time AS INTEGER) / 900 * 900"
+
+TRIGGERS = [
+    f"""CREATE TRIGGER IF NOT EXISTS recordings_rollup_insert AFTER INSERT ON recordings
+    BEGIN
+        INSERT INTO recordingsrollup (camera, start_time, duration, motion, objects, segments)
+        VALUES (NEW.camera, {PERIOD.format("NEW")}, NEW.duration, COALESCE(NEW.motion, 0), COALESCE(NEW.objects, 0), 1)
+        ON CONFLICT (camera, start_time) DO UPDATE SET
+            duration = duration + excluded.duration,
+            motion = motion + excluded.motion,
+            objects = objects + excluded.objects,
+            segments = segments + 1;
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS recordings_rollup_delete AFTER DELETE ON recordings
+    BEGIN
+        UPDATE recordingsrollup SET
+            duration = duration - OLD.duration,
+            motion = motion - COALESCE(OLD.motion, 0),
+            objects = objects - COALESCE(OLD.objects, 0),
+            segments = segments - 1
+        WHERE camera = OLD.camera AND start_time = {PERIOD.format("OLD")};
+        DELETE FROM recordingsrollup
+        WHERE camera = OLD.camera AND start_time = {PERIOD.format("OLD")}
+            AND segments <= 0 AND events <= 0;
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS recordings_rollup_update AFTER UPDATE OF camera, start_time, duration, motion, objects ON recordings
+    BEGIN
+        UPDATE recordingsrollup SET
+            duration = duration - OLD.duration,
+            motion = motion - COALESCE(OLD.motion, 0),
+            objects = objects - COALESCE(OLD.objects, 0),
+            segments = segments - 1
+        WHERE camera = OLD.camera AND start_time = {PERIOD.format("OLD")};
+        INSERT INTO recordingsrollup (camera, start_time, duration, motion, objects, segments)
+        VALUES (NEW.camera, {PERIOD.format("NEW")}, NEW.duration, COALESCE(NEW.motion, 0), COALESCE(NEW.objects, 0), 1)
+        ON CONFLICT (camera, start_time) DO UPDATE SET
+            duration = duration + excluded.duration,
+            motion = motion + excluded.motion,
+            objects = objects + excluded.objects,
+            segments = segments + 1;
+        DELETE FROM recordingsrollup
+        WHERE camera = OLD.camera AND start_time = {PERIOD.format("OLD")}
+            AND segments <= 0 AND events <= 0;
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS event_rollup_insert AFTER INSERT ON event
+    WHEN NEW.has_clip
+    BEGIN
+        INSERT INTO recordingsrollup (camera, start_time, events)
+        VALUES (NEW.camera, {PERIOD.format("NEW")}, 1)
+        ON CONFLICT (camera, start_time) DO UPDATE SET events = events + 1;
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS event_rollup_delete AFTER DELETE ON event
+    WHEN OLD.has_clip
+    BEGIN
+        UPDATE recordingsrollup SET events = events - 1
+        WHERE camera = OLD.camera AND start_time = {PERIOD.format("OLD")};
+        DELETE FROM recordingsrollup
+        WHERE camera = OLD.camera AND start_time = {PERIOD.format("OLD")}
+            AND segments <= 0 AND events <= 0;
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS event_rollup_update AFTER UPDATE OF camera, start_time, has_clip ON event
+    WHEN OLD.has_clip IS NOT NEW.has_clip
+        OR (NEW.has_clip AND (OLD.camera IS NOT NEW.camera OR {PERIOD.format("OLD")} IS NOT {PERIOD.format("NEW")}))
+    BEGIN
+        UPDATE recordingsrollup SET events = events - 1
+        WHERE OLD.has_clip AND camera = OLD.camera AND start_time = {PERIOD.format("OLD")};
+        INSERT INTO recordingsrollup (camera, start_time, events)
+        SELECT NEW.camera, {PERIOD.format("NEW")}, 1 WHERE NEW.has_clip
+        ON CONFLICT (camera, start_time) DO UPDATE SET events = events + 1;
+        DELETE FROM recordingsrollup
+        WHERE camera = OLD.camera AND start_time = {PERIOD.format("OLD")}
+            AND segments <= 0 AND events <= 0;
+    END""",
+]
+
+
+def migrate(migrator, database, fake=False, **kwargs):
+    migrator.sql(
+        'CREATE TABLE IF NOT EXISTS "recordingsrollup" ("camera" VARCHAR(20) NOT NULL, "start_time" INTEGER NOT NULL, "duration" REAL NOT NULL DEFAULT 0, "motion" INTEGER NOT NULL DEFAULT 0, "objects" INTEGER NOT NULL DEFAULT 0, "segments" INTEGER NOT NULL DEFAULT 0, "events" INTEGER NOT NULL DEFAULT 0, PRIMARY KEY ("camera", "start_time"))'
+    )
+
+    for trigger in TRIGGERS:
+        migrator.sql(trigger)
+
+    # create the rollups of the existing recordings and events
+    migrator.sql(
+        f"INSERT INTO recordingsrollup (camera, start_time, duration, motion, objects, segments) SELECT camera, {PERIOD.format('recordings')}, SUM(duration), SUM(COALESCE(motion, 0)), SUM(COALESCE(objects, 0)), COUNT(*) FROM recordings GROUP BY 1, 2"
+    )
+    migrator.sql(
+        f"INSERT INTO recordingsrollup (camera, start_time, events) SELECT camera, {PERIOD.format('event')}, COUNT(*) FROM event WHERE has_clip GROUP BY 1, 2 ON CONFLICT (camera, start_time) DO UPDATE SET events = excluded.events"
+    )
+
+
+def rollback(migrator, database, fake=False, **kwargs):
+    for trigger in [
+        "recordings_rollup_insert",
+        "recordings_rollup_delete",
+        "recordings_rollup_update",
+        "event_rollup_insert",
+        "event_rollup_delete",
+        "event_rollup_update",
+    ]:
+        migrator.sql(f"DROP TRIGGER IF EXISTS {trigger}")
+
+    migrator.sql('DROP TABLE IF EXISTS "recordingsrollup"')